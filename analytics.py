@@ -0,0 +1,381 @@
+"""
+실시간 손익 / 자산 곡선 분석
+- 체결 / 현재가 갱신마다 O(1): 평가 자산(현금 + 보유 평가액), 실현 / 미실현 손익,
+  최고점 대비 낙폭 / 최대 낙폭, 포지션 보유 시간 비율
+- 수익률은 고정 간격(bar_seconds, 기본 1시간) 자산 변화로 샘플링해 최근 window개로
+  롤링 샤프 / 소르티노 (합 / 제곱합을 증분 유지)
+- 청산 사유(익절 / 손절 / 에러 …)별 거래 수, 승률, 손익 합 / 평균, profit factor
+  (시작할 때 저널 전체를 집계해 이어서 누적)
+- snapshot() 한 번으로 조회 (지연 시간 스냅샷 logs/latency_metrics.json /
+  BOT_METRICS_PORT의 /metrics에 'analytics' 항목으로 포함)
+- 저널 거래는 NumPy 열로 읽어 벡터화 집계 (수백만 건도 수 초 안)
+
+사용법 (저널 집계):
+    python analytics.py logs/trade_journal.db [--by-day]
+"""
+
+import sys
+import math
+import time
+import logging
+import argparse
+import threading
+from collections import deque
+
+import numpy as np
+
+from clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+# 청산 사유별 누적 [거래 수, 수익 거래 수, 손익 합, 이익 합, 손실 합(양수)]
+COUNT, WINS, PNL, GROSS_PROFIT, GROSS_LOSS = range(5)
+
+
+class RollingStats:
+    """최근 window개 값의 평균 / 표준편차 / 하방 편차 (값 하나 추가 O(1))
+
+    합 / 제곱합을 증분으로 유지하고, 빼기를 반복하며 쌓이는 부동소수 오차는
+    window번 추가할 때마다 한 번 다시 합산해 없앱니다 (분할 상환 O(1)).
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.downside_sq = 0.0
+        self._pushes = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def push(self, value):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+            if old < 0:
+                self.downside_sq -= old * old
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        if value < 0:
+            self.downside_sq += value * value
+
+        self._pushes += 1
+        if self._pushes >= self.window:
+            self._pushes = 0
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+            self.downside_sq = math.fsum(v * v for v in self.values if v < 0)
+
+    def mean(self):
+        return self.total / len(self.values) if self.values else None
+
+    def std(self):
+        n = len(self.values)
+        if n < 2:
+            return None
+        return math.sqrt(max((self.total_sq - self.total * self.total / n) / (n - 1), 0.0))
+
+    def downside_deviation(self):
+        return math.sqrt(self.downside_sq / len(self.values)) if self.values else None
+
+    def sharpe(self, periods_per_year):
+        """연율화 샤프 비율 (무위험 수익률 0, 표본이 2개 미만이거나 변동이 없으면 None)"""
+        std = self.std()
+        if not std:
+            return None
+        return self.mean() / std * math.sqrt(periods_per_year)
+
+    def sortino(self, periods_per_year):
+        """연율화 소르티노 비율 (손실 구간이 없으면 None)"""
+        downside = self.downside_deviation()
+        if not downside:
+            return None
+        return self.mean() / downside * math.sqrt(periods_per_year)
+
+
+def reason_summary(count, wins, pnl, gross_profit, gross_loss):
+    """누적값 → 사유 하나의 요약 dict"""
+    return {
+        'trades': int(count),
+        'wins': int(wins),
+        'win_rate': wins / count if count else None,
+        'pnl': pnl,
+        'avg_pnl': pnl / count if count else None,
+        'profit_factor': gross_profit / gross_loss if gross_loss else None,
+    }
+
+
+class PnLAnalytics:
+    """평가 자산 / 낙폭 / 롤링 샤프·소르티노 / 보유 시간 + 청산 사유별 통계
+
+    on_price() / on_fill() / on_trade()는 모두 O(1)입니다. 평가 자산은
+    시작 자산(equity)을 현금으로 보고 체결마다 현금 / 보유 수량 / 원가를
+    조정해 계산합니다 (봇 손익과 같이 수수료 제외). 갱신은 메인 스레드,
+    snapshot()은 지연 시간 리포터 / HTTP 스레드에서 부르므로 잠금 아래 합니다.
+    """
+
+    def __init__(self, equity, clock=None, bar_seconds=3600, window=720):
+        self.clock = clock or SystemClock()
+        self.lock = threading.Lock()
+        self.bar_seconds = bar_seconds
+        self.periods_per_year = SECONDS_PER_YEAR / bar_seconds
+        self.returns = RollingStats(window)
+
+        self.start_equity = equity
+        self.cash = equity
+        self.quantity = 0.0
+        self.cost = 0.0       # 보유 수량의 매수 원가
+        self.price = None
+        self.realized = 0.0
+        self.equity = equity
+        self.peak = equity
+        self.max_drawdown = 0.0
+
+        now = self.clock.time_ms()
+        self.started_ms = now
+        self.last_ms = now
+        self.exposed_ms = 0
+        self.bar_ms = int(bar_seconds * 1000)
+        self.bar_start = now - now % self.bar_ms
+        self.bar_equity = equity
+
+        self.reasons = {}         # 사유 → 누적 리스트 (저널 전체 + 이번 세션)
+        self.session_trades = 0
+        self.session_wins = 0
+        self.history = None       # 시작 시 저널 집계 결과
+
+    # ------------------------------------------------------------------
+    # 갱신 (모두 O(1))
+    # ------------------------------------------------------------------
+    def _advance(self):
+        """시간 경과 반영: 보유 시간 누적, 지난 수익률 구간 마감"""
+        now = self.clock.time_ms()
+        if now <= self.last_ms:
+            return
+        if self.quantity > 0:
+            self.exposed_ms += now - self.last_ms
+        self.last_ms = now
+
+        if now >= self.bar_start + self.bar_ms:
+            closed = (now - self.bar_start) // self.bar_ms
+            self.returns.push(self.equity / self.bar_equity - 1 if self.bar_equity else 0.0)
+            # 갱신이 없던 구간은 자산 변화 0 (최대 window개만 의미가 있음)
+            for _ in range(min(closed - 1, self.returns.window)):
+                self.returns.push(0.0)
+            self.bar_start += closed * self.bar_ms
+            self.bar_equity = self.equity
+
+    def _revalue(self):
+        self.equity = self.cash + self.quantity * (self.price or 0.0)
+        if self.equity > self.peak:
+            self.peak = self.equity
+        elif self.peak > 0:
+            drawdown = (self.peak - self.equity) / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    def on_price(self, price):
+        """현재가 갱신 (보유 평가액 / 낙폭)"""
+        with self.lock:
+            self._advance()
+            self.price = price
+            self._revalue()
+
+    def on_fill(self, side, quantity, price):
+        """체결 반영 (현금 / 보유 수량 / 원가 / 실현 손익)"""
+        with self.lock:
+            self._advance()
+            notional = quantity * price
+            if side == 'BUY':
+                self.cash -= notional
+                self.quantity += quantity
+                self.cost += notional
+            else:
+                sold = min(quantity, self.quantity)
+                basis = self.cost * sold / self.quantity if self.quantity else 0.0
+                self.realized += sold * price - basis
+                self.cost -= basis
+                self.cash += notional
+                self.quantity = max(self.quantity - quantity, 0.0)
+            self.price = price
+            self._revalue()
+
+    def set_position(self, quantity, price):
+        """재시작 시 복구한 포지션 (시작 자산과 별개로 보유 중이던 수량)"""
+        with self.lock:
+            self.quantity = quantity
+            self.cost = quantity * price
+            self.price = price
+            self._revalue()
+            self.peak = max(self.peak, self.equity)
+            self.bar_equity = self.equity
+
+    def on_trade(self, record):
+        """청산된 거래 1건 (저널 기록 dict) → 사유별 통계"""
+        pnl = record['pnl_amount']
+        with self.lock:
+            stats = self.reasons.get(record['reason'])
+            if stats is None:
+                stats = self.reasons[record['reason']] = [0, 0, 0.0, 0.0, 0.0]
+            stats[COUNT] += 1
+            stats[PNL] += pnl
+            if pnl > 0:
+                stats[WINS] += 1
+                stats[GROSS_PROFIT] += pnl
+                self.session_wins += 1
+            else:
+                stats[GROSS_LOSS] -= pnl
+            self.session_trades += 1
+
+    def load_history(self, journal):
+        """저널 전체 거래를 벡터화 집계 → history, 사유별 통계 초기값 (시작할 때 한 번)"""
+        started = time.perf_counter()
+        summary = summarize_trades(journal.columns())
+        with self.lock:
+            self.history = summary
+            self.reasons = {reason: list(sums) for reason, sums in summary.pop('_sums').items()}
+        if summary['trades']:
+            logger.info(f"📚 저널 거래 {summary['trades']:,}건 집계 "
+                        f"(승률 {summary['win_rate']:.1%}, 손익 ${summary['pnl']:+,.2f}, "
+                        f"{time.perf_counter() - started:.2f}초)")
+        return summary
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def snapshot(self):
+        with self.lock:
+            elapsed = self.last_ms - self.started_ms
+            start = self.start_equity
+            return {
+                'equity': self.equity,
+                'start_equity': start,
+                'return_pct': (self.equity / start - 1) * 100 if start else None,
+                'realized_pnl': self.realized,
+                'unrealized_pnl': self.quantity * (self.price or 0.0) - self.cost,
+                'position': self.quantity,
+                'peak_equity': self.peak,
+                'drawdown_pct': (self.peak - self.equity) / self.peak * 100 if self.peak else 0.0,
+                'max_drawdown_pct': self.max_drawdown * 100,
+                'exposure_pct': self.exposed_ms / elapsed * 100 if elapsed else 0.0,
+                'sharpe': self.returns.sharpe(self.periods_per_year),
+                'sortino': self.returns.sortino(self.periods_per_year),
+                'return_samples': len(self.returns),
+                'bar_seconds': self.bar_seconds,
+                'session_trades': self.session_trades,
+                'session_win_rate': self.session_wins / self.session_trades if self.session_trades else None,
+                'reasons': {reason: reason_summary(*stats) for reason, stats in self.reasons.items()},
+                'history': self.history,
+            }
+
+    def log_summary(self):
+        """세션 성과 요약 로그 (종료 시)"""
+        s = self.snapshot()
+        sharpe = f"{s['sharpe']:.2f}" if s['sharpe'] is not None else '-'
+        sortino = f"{s['sortino']:.2f}" if s['sortino'] is not None else '-'
+        logger.info(f"📈 세션 성과: 자산 ${s['equity']:,.2f} ({s['return_pct']:+.2f}%) | "
+                    f"최대 낙폭 {s['max_drawdown_pct']:.2f}% | 샤프 {sharpe} | 소르티노 {sortino} | "
+                    f"보유 시간 {s['exposure_pct']:.1f}% | 거래 {s['session_trades']}건")
+        for reason, stats in s['reasons'].items():
+            logger.info(f"   - {reason}: {stats['trades']}건, 승률 {stats['win_rate']:.1%}, "
+                        f"손익 ${stats['pnl']:+,.2f}")
+
+
+# ----------------------------------------------------------------------
+# 저널 벡터화 집계
+# ----------------------------------------------------------------------
+def summarize_trades(columns, by_day=False):
+    """저널 거래 열(TradeJournal.columns) → 전체 / 청산 사유별 / (선택) 일별 집계
+
+    손익 누적합으로 거래 단위 자산 곡선과 최대 낙폭(금액)을 구하고, 사유 / 날짜
+    묶음은 np.unique + np.bincount로 한 번에 합산합니다. '_sums'는
+    PnLAnalytics가 사유별 누적값을 이어받는 데 씁니다.
+    """
+    pnl = np.nan_to_num(columns['pnl_amount'])
+    pnl_percent = np.nan_to_num(columns['pnl_percent'])
+    n = len(pnl)
+    wins = pnl > 0
+    profit = np.where(wins, pnl, 0.0)
+    loss = np.where(wins, 0.0, -pnl)
+
+    curve = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(curve, 0.0)) if n else curve
+    summary = {
+        'trades': n,
+        'wins': int(wins.sum()),
+        'win_rate': float(wins.mean()) if n else None,
+        'pnl': float(curve[-1]) if n else 0.0,
+        'avg_pnl': float(pnl.mean()) if n else None,
+        'avg_pnl_percent': float(pnl_percent.mean()) if n else None,
+        'profit_factor': float(profit.sum() / loss.sum()) if loss.sum() else None,
+        'max_drawdown': float((peak - curve).max()) if n else 0.0,
+        'trade_sharpe': float(pnl_percent.mean() / pnl_percent.std(ddof=1))
+        if n > 1 and pnl_percent.std(ddof=1) else None,
+    }
+
+    reasons, inverse = np.unique(columns['reason'], return_inverse=True)
+    sums = np.stack([
+        np.bincount(inverse, minlength=len(reasons)).astype(np.float64),
+        np.bincount(inverse, weights=wins, minlength=len(reasons)),
+        np.bincount(inverse, weights=pnl, minlength=len(reasons)),
+        np.bincount(inverse, weights=profit, minlength=len(reasons)),
+        np.bincount(inverse, weights=loss, minlength=len(reasons)),
+    ], axis=1)
+    summary['_sums'] = {str(reason): [int(row[COUNT]), int(row[WINS]), *map(float, row[PNL:])]
+                        for reason, row in zip(reasons, sums)}
+    summary['reasons'] = {reason: reason_summary(*row) for reason, row in summary['_sums'].items()}
+
+    if by_day:
+        days, day_index = np.unique(columns['close_time'].astype('U10'), return_inverse=True)
+        day_pnl = np.bincount(day_index, weights=pnl, minlength=len(days))
+        day_trades = np.bincount(day_index, minlength=len(days))
+        summary['days'] = {str(day): {'trades': int(count), 'pnl': float(value)}
+                           for day, count, value in zip(days, day_trades, day_pnl)}
+    return summary
+
+
+def main(argv=None):
+    import json
+    from trade_journal import TradeJournal
+
+    parser = argparse.ArgumentParser(description='거래 저널 성과 집계')
+    parser.add_argument('journal', help='trade_journal.db 경로')
+    parser.add_argument('--by-day', action='store_true', help='일별 거래 수 / 손익 포함')
+    parser.add_argument('--json', help='집계 결과를 저장할 JSON 경로')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with TradeJournal(args.journal) as journal:
+        columns = journal.columns()
+    loaded = time.perf_counter()
+    summary = summarize_trades(columns, by_day=args.by_day)
+    summary.pop('_sums')
+    elapsed = time.perf_counter() - loaded
+
+    print(f"📚 거래 {summary['trades']:,}건 (읽기 {loaded - started:.2f}초, 집계 {elapsed:.3f}초)")
+    if summary['trades']:
+        print(f"💰 손익 ${summary['pnl']:+,.2f} | 승률 {summary['win_rate']:.1%} | "
+              f"최대 낙폭 ${summary['max_drawdown']:,.2f} | profit factor {summary['profit_factor'] or 0:.2f}")
+        for reason, stats in summary['reasons'].items():
+            print(f"  - {reason}: {stats['trades']:,}건, 승률 {stats['win_rate']:.1%}, "
+                  f"평균 ${stats['avg_pnl']:+,.2f}, 합계 ${stats['pnl']:+,.2f}")
+        for day, stats in summary.get('days', {}).items():
+            print(f"  {day}: {stats['trades']:,}건, ${stats['pnl']:+,.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"💾 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,283 @@
+"""
+벡터화 백테스트 엔진
+- 로컬 CSV / Parquet 캔들 데이터로 RSI·MACD·볼린저밴드 전략 검증
+- 지표는 전체 배열을 한 번에 계산, 매수 신호는 generate_signal과 같은 조건식
+- 익절 / 손절 / 일일 목표 청산은 캔들 단위 루프 없이 구간 검색으로 시뮬레이션
+- 거래 기록은 BinanceTestnetBot.trade_history와 같은 형식
+
+사용법:
+    python backtest.py klines.csv
+    python backtest.py --synthetic 1000000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from clock import DAY_MS
+from indicators import indicator_columns
+from strategy import buy_mask, RSI_OVERSOLD, BB_ENTRY_MULTIPLIER
+
+# get_market_data와 같은 컬럼 이름 (바이낸스 kline 배열 순서)
+KLINE_COLUMNS = [
+    'open_time', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_av', 'trades', 'tb_base_av', 'tb_quote_av', 'ignore'
+]
+
+
+@dataclass
+class BacktestConfig:
+    """백테스트 파라미터 (기본값은 BinanceTestnetBot과 동일)"""
+    rsi_period: int = 14
+    rsi_oversold: float = RSI_OVERSOLD
+    bb_multiplier: float = BB_ENTRY_MULTIPLIER
+    take_profit_percent: float = 3.0
+    stop_loss_percent: float = 1.5
+    daily_target: float = 20
+    total_asset: float = 3_600
+    quantity: float = None  # None이면 첫 종가 기준 총 자산의 2%
+
+    @classmethod
+    def from_bot(cls, bot):
+        """실행 중인 봇 설정으로 생성"""
+        return cls(
+            rsi_period=bot.rsi_period,
+            rsi_oversold=bot.rsi_oversold,
+            bb_multiplier=bot.bb_multiplier,
+            take_profit_percent=bot.take_profit_percent,
+            stop_loss_percent=bot.stop_loss_percent,
+            daily_target=bot.daily_target,
+            total_asset=bot.total_asset,
+            quantity=bot.quantity,
+        )
+
+
+def load_klines(path):
+    """CSV / Parquet 캔들 파일 또는 로컬 캔들 저장소 → {'open_time', 'close'} NumPy 열
+
+    CSV는 헤더가 있으면 KLINE_COLUMNS 이름으로, 없으면 바이낸스 kline
+    배열 순서(data.binance.vision 덤프 형식)로 읽습니다. 디렉터리
+    ('data/klines/BTCUSDT/1m')를 넘기면 kline_store의 memmap 열을 그대로
+    씁니다.
+    """
+    if os.path.isdir(path):
+        from kline_store import KlineStore
+        window = KlineStore.open_directory(path).window()
+        return {'open_time': window['open_time'], 'close': window['close']}
+
+    import pandas as pd
+
+    usecols = ['open_time', 'close']
+    if path.endswith('.parquet'):
+        try:
+            df = pd.read_parquet(path, columns=usecols)
+        except ImportError as e:
+            raise ImportError("Parquet 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow") from e
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            first = f.readline().split(',')[0].strip()
+        has_header = not first.lstrip('-').isdigit()
+        df = pd.read_csv(
+            path,
+            header=0 if has_header else None,
+            names=None if has_header else KLINE_COLUMNS,
+            usecols=usecols,
+            dtype={'open_time': np.int64, 'close': np.float64},
+            engine='c',
+        )
+
+    return {
+        'open_time': df['open_time'].to_numpy(dtype=np.int64),
+        'close': df['close'].to_numpy(dtype=np.float64),
+    }
+
+
+def synthetic_klines(n, start_price=60_000.0, interval_ms=60_000, seed=0):
+    """기하 브라운 운동 가격 경로 (벤치마크 / 동작 확인용)"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    open_time = np.arange(n, dtype=np.int64) * interval_ms + 1_700_000_000_000
+    return {'open_time': open_time, 'close': close}
+
+
+def _first_exit(close, start, take_price, stop_price, chunk=256):
+    """start 이후 처음으로 익절가 이상 / 손절가 이하가 되는 캔들 인덱스 (없으면 -1)
+
+    구간을 두 배씩 늘려가며 NumPy로 검색하므로 보유 기간에 비례한
+    파이썬 루프가 돌지 않습니다.
+    """
+    n = len(close)
+    pos = start
+    while pos < n:
+        end = min(n, pos + chunk)
+        segment = close[pos:end]
+        hit = (segment >= take_price) | (segment <= stop_price)
+        k = int(hit.argmax())
+        if hit[k]:
+            return pos + k
+        pos = end
+        chunk *= 2
+    return -1
+
+
+def _format_time(ms):
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def simulate(open_time, close, entries, config, quantity):
+    """매수 신호 인덱스로 check_position_exit 청산 규칙을 시뮬레이션
+
+    루프는 거래 단위로만 돕니다. 진입가는 신호 캔들 종가, 청산은 이후
+    종가가 익절가(3% 또는 일일 목표 금액 중 먼저 닿는 가격) 이상이거나
+    손절가 이하가 되는 첫 캔들입니다. 일일 목표를 달성한 날에는 다음 날
+    첫 신호까지 진입하지 않습니다. 날짜 경계는 봇과 같은 UTC 거래일
+    (clock.trading_day)입니다.
+    """
+    trades = []
+    n = len(close)
+    if len(entries) == 0:
+        return trades
+
+    days = open_time // DAY_MS
+    take_ratio = 1 + config.take_profit_percent / 100
+    stop_ratio = 1 - config.stop_loss_percent / 100
+
+    daily_profit = 0.0
+    current_day = None
+    k = 0
+
+    while k < len(entries):
+        i = int(entries[k])
+        entry_price = close[i]
+
+        take_price = min(entry_price * take_ratio, entry_price + config.daily_target / quantity)
+        stop_price = entry_price * stop_ratio
+
+        j = _first_exit(close, i + 1, take_price, stop_price)
+        if j < 0:
+            # 데이터 끝까지 청산되지 않으면 마지막 캔들에서 종료 청산
+            j = n - 1
+            reason = '수동종료'
+        else:
+            reason = '익절' if close[j] >= take_price else '손절'
+        if j <= i:
+            break
+
+        exit_price = close[j]
+        if days[j] != current_day:
+            current_day = days[j]
+            daily_profit = 0.0
+
+        pnl_percent = (exit_price - entry_price) / entry_price * 100
+        pnl_amount = (exit_price - entry_price) * quantity
+        daily_profit += pnl_amount
+
+        trades.append({
+            'open_time': _format_time(open_time[i]),
+            'close_time': _format_time(open_time[j]),
+            'side': 'BUY',
+            'entry_price': float(entry_price),
+            'exit_price': float(exit_price),
+            'quantity': quantity,
+            'pnl_percent': float(pnl_percent),
+            'pnl_amount': float(pnl_amount),
+            'reason': reason,
+            'daily_profit': float(daily_profit),
+        })
+
+        # 다음 진입: 청산 캔들 이후 첫 신호 (목표 달성 시 다음 날부터)
+        next_start = j + 1
+        if daily_profit >= config.daily_target:
+            next_start = max(next_start, int(np.searchsorted(days, current_day + 1)))
+        k = int(np.searchsorted(entries, next_start))
+
+    return trades
+
+
+def run_backtest(data, config=None, columns=None):
+    """백테스트 실행 → (거래 기록, 요약)
+
+    columns를 넘기면 지표 계산을 건너뜁니다 (파라미터 스윕에서 재사용).
+    """
+    config = config or BacktestConfig()
+    open_time = data['open_time']
+    close = data['close']
+
+    if columns is None:
+        columns = indicator_columns(close, config.rsi_period)
+
+    mask = buy_mask(columns, close, config.rsi_oversold, config.bb_multiplier)
+    entries = np.flatnonzero(mask)
+
+    quantity = config.quantity
+    if quantity is None:
+        quantity = round(config.total_asset * 0.02 / close[0], 5)
+
+    trades = simulate(open_time, close, entries, config, quantity)
+    return trades, summarize(trades, len(close), int(mask.sum()))
+
+
+def summarize(trades, bars, signals):
+    """거래 기록 요약"""
+    pnl = np.array([t['pnl_amount'] for t in trades], dtype=np.float64)
+    wins = int((pnl > 0).sum())
+    return {
+        'bars': bars,
+        'signals': signals,
+        'trades': len(trades),
+        'wins': wins,
+        'win_rate': wins / len(trades) * 100 if trades else 0.0,
+        'total_pnl': float(pnl.sum()),
+        'avg_pnl': float(pnl.mean()) if trades else 0.0,
+        'reasons': {r: sum(1 for t in trades if t['reason'] == r) for r in ('익절', '손절', '수동종료')},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='RSI/MACD/볼린저밴드 전략 백테스트')
+    parser.add_argument('path', nargs='?', help='캔들 CSV / Parquet 파일 또는 캔들 저장소 디렉터리')
+    parser.add_argument('--synthetic', type=int, default=0, help='합성 캔들 개수 (파일 대신)')
+    parser.add_argument('--report', help='거래 기록 JSON 저장 경로')
+    for field, value in asdict(BacktestConfig()).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=float if field != 'rsi_period' else int,
+                            default=value, dest=field)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        data = synthetic_klines(args.synthetic)
+    elif args.path:
+        data = load_klines(args.path)
+    else:
+        parser.error('캔들 파일 경로 또는 --synthetic 이 필요합니다')
+
+    config = BacktestConfig(**{f: getattr(args, f) for f in asdict(BacktestConfig())})
+
+    started = time.perf_counter()
+    trades, summary = run_backtest(data, config)
+    elapsed = time.perf_counter() - started
+
+    print(f"📊 캔들 {summary['bars']:,}개 | 신호 {summary['signals']:,}개 | 거래 {summary['trades']:,}건")
+    print(f"💰 총 손익: ${summary['total_pnl']:+,.2f} | 승률: {summary['win_rate']:.1f}%")
+    print(f"🔍 청산 사유: {summary['reasons']}")
+    print(f"⏱️ 계산 시간: {elapsed * 1000:.1f}ms")
+
+    if args.report:
+        os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(trades, f, indent=2, ensure_ascii=False)
+        print(f"📁 거래 기록 저장: {args.report}")
+
+    return summary
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
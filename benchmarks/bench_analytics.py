@@ -0,0 +1,124 @@
+"""
+손익 분석 비용
+- PnLAnalytics 갱신(on_price / on_fill / on_trade) 1회 지연과 snapshot() 비용
+- 합성 거래 N건을 담은 저널을 TradeJournal.columns()로 읽어 summarize_trades로 집계
+  (거래 dict를 하나씩 도는 파이썬 집계와 비교)
+
+사용법:
+    python benchmarks/bench_analytics.py [--trades 1000000] [--updates 1000000]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import PnLAnalytics, summarize_trades
+from clock import VirtualClock
+from trade_journal import TradeJournal, TRADE_FIELDS
+
+REASONS = ('익절', '손절', '수동종료', '에러')
+
+
+def bench_updates(n, seed=0):
+    """1분 간격 가격 n개, 100틱마다 매수 / 매도 번갈아 체결"""
+    rng = np.random.default_rng(seed)
+    prices = (60_000 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))).tolist()
+    clock = VirtualClock(1_700_000_000_000)
+    analytics = PnLAnalytics(10_000.0, clock=clock)
+
+    started = time.perf_counter()
+    for i, price in enumerate(prices):
+        clock.advance(60_000)
+        if i % 100 == 0:
+            if analytics.quantity:
+                analytics.on_fill('SELL', 0.01, price)
+                analytics.on_trade({'reason': REASONS[i // 100 % 2], 'pnl_amount': price * 0.01 - 600})
+            else:
+                analytics.on_fill('BUY', 0.01, price)
+        else:
+            analytics.on_price(price)
+    elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(1_000):
+        snapshot = analytics.snapshot()
+    return elapsed / n, (time.perf_counter() - started) / 1_000, snapshot
+
+
+def fill_journal(path, n, seed=0):
+    rng = np.random.default_rng(seed)
+    pnl_percent = rng.normal(0.1, 1.5, n)
+    entry = 60_000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    quantity = 0.002
+    reasons = rng.choice(len(REASONS), n, p=(0.45, 0.45, 0.05, 0.05))
+    days = rng.integers(0, 365, n)
+    with TradeJournal(path) as journal:
+        rows = (
+            (f"2024-01-01 00:00:00", f"2024-{d // 31 % 12 + 1:02d}-{d % 28 + 1:02d} 12:00:00", 'BUY',
+             e, e * (1 + p / 100), quantity, p, e * p / 100 * quantity, REASONS[r], 0.0)
+            for e, p, r, d in zip(entry.tolist(), pnl_percent.tolist(), reasons.tolist(), days.tolist())
+        )
+        journal.conn.execute('BEGIN')
+        journal.conn.executemany(
+            f"INSERT INTO trades ({', '.join(TRADE_FIELDS)}) VALUES ({', '.join('?' * len(TRADE_FIELDS))})",
+            rows
+        )
+        journal.conn.execute('COMMIT')
+
+
+def python_summary(journal):
+    """비교용: 거래 dict를 하나씩 도는 집계"""
+    stats = {}
+    for trade in journal.trades():
+        s = stats.setdefault(trade['reason'], [0, 0, 0.0])
+        s[0] += 1
+        s[1] += trade['pnl_amount'] > 0
+        s[2] += trade['pnl_amount']
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trades', type=int, default=1_000_000)
+    parser.add_argument('--updates', type=int, default=1_000_000)
+    parser.add_argument('--python', action='store_true', help='파이썬 행 단위 집계도 측정 (느림)')
+    args = parser.parse_args()
+
+    per_update, per_snapshot, snapshot = bench_updates(args.updates)
+    print(f"📈 갱신 {args.updates:,}회: 1회 {per_update * 1e6:.2f}µs | snapshot() {per_snapshot * 1e6:.1f}µs")
+    print(f"   샤프 {snapshot['sharpe']:.2f} | 소르티노 {snapshot['sortino']:.2f} | "
+          f"최대 낙폭 {snapshot['max_drawdown_pct']:.2f}% | 수익률 표본 {snapshot['return_samples']}개")
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'trade_journal.db')
+        started = time.perf_counter()
+        fill_journal(path, args.trades)
+        print(f"🗄️ 합성 저널 {args.trades:,}건 생성: {time.perf_counter() - started:.1f}초")
+
+        with TradeJournal(path) as journal:
+            started = time.perf_counter()
+            columns = journal.columns()
+            loaded = time.perf_counter()
+            summary = summarize_trades(columns, by_day=True)
+            done = time.perf_counter()
+            print(f"📚 벡터화 집계: 읽기 {loaded - started:.2f}초 + 집계 {done - loaded:.3f}초 "
+                  f"(사유 {len(summary['reasons'])}개, 일 {len(summary['days'])}개, "
+                  f"승률 {summary['win_rate']:.1%})")
+
+            if args.python:
+                started = time.perf_counter()
+                python_summary(journal)
+                print(f"🐢 파이썬 행 단위 집계: {time.perf_counter() - started:.2f}초")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,102 @@
+"""
+주문 신호 → 접수(ack) / 체결 통보 지연 시간 (로컬 모의 거래소)
+- sync: python-binance Client.order_market (봇의 기존 경로)
+- async: execution.OrderExecutor (풀링된 aiohttp 세션 + 사용자 데이터 스트림)
+- burst: 주문 N개를 연속으로 낼 때 순차 전송 vs 파이프라인 전송 총 시간
+
+사용법:
+    python benchmarks/bench_execution.py [--orders 300] [--latency-ms 5]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_exchange import MockExchange
+from execution import OrderExecutor
+
+SYMBOL = 'BTCUSDT'
+
+
+def summary(samples_ns):
+    ms = np.asarray(samples_ns) / 1e6
+    return f"p50 {np.percentile(ms, 50):7.2f}ms | p99 {np.percentile(ms, 99):7.2f}ms | 평균 {ms.mean():7.2f}ms"
+
+
+def bench_sync(base_url, n):
+    from binance.client import Client
+
+    client = Client('key', 'secret', ping=False)
+    client.API_URL = base_url + '/api'
+    samples = []
+    for _ in range(n):
+        started = time.perf_counter_ns()
+        client.order_market(symbol=SYMBOL, side='BUY', quantity=0.001)
+        samples.append(time.perf_counter_ns() - started)
+    return samples, client
+
+
+def bench_async(executor, n):
+    acks, fills = [], []
+    for _ in range(n):
+        started = time.perf_counter_ns()
+        state = executor.submit_market(SYMBOL, 'BUY', 0.001).result(10)
+        acks.append(time.perf_counter_ns() - started)
+        state.done.wait(5)
+        fills.append(time.perf_counter_ns() - started)
+    return acks, fills
+
+
+def bench_burst(client, executor, burst):
+    started = time.perf_counter()
+    for _ in range(burst):
+        client.order_market(symbol=SYMBOL, side='BUY', quantity=0.001)
+    sequential = time.perf_counter() - started
+
+    started = time.perf_counter()
+    futures = [executor.submit_market(SYMBOL, 'BUY', 0.001) for _ in range(burst)]
+    for future in futures:
+        future.result(10)
+    pipelined = time.perf_counter() - started
+    return sequential, pipelined
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=300)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='모의 거래소 응답 지연')
+    parser.add_argument('--burst', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with MockExchange([SYMBOL], start_price=60_000.0, latency_ms=args.latency_ms, fill_levels=3) as exchange:
+        with OrderExecutor('key', 'secret', base_url=exchange.base_url, ws_url=exchange.ws_url,
+                           pool_size=args.burst) as executor:
+            # 워밍업 (커넥션 생성)
+            bench_sync(exchange.base_url, 5)
+            bench_async(executor, 5)
+
+            sync_samples, client = bench_sync(exchange.base_url, args.orders)
+            acks, fills = bench_async(executor, args.orders)
+            sequential, pipelined = bench_burst(client, executor, args.burst)
+
+    print(f"📨 주문 {args.orders}회 (모의 거래소 지연 {args.latency_ms}ms, 체결 3건 분할)")
+    print(f"  - sync  신호 → 접수      : {summary(sync_samples)}")
+    print(f"  - async 신호 → 접수      : {summary(acks)}")
+    print(f"  - async 신호 → 체결 통보 : {summary(fills)}")
+    print(f"🚀 주문 {args.burst}개 연속: 순차 {sequential * 1000:.1f}ms / 파이프라인 {pipelined * 1000:.1f}ms "
+          f"({sequential / pipelined:.1f}배)")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,80 @@
+"""
+kline 디코딩 마이크로 벤치마크
+- 기존 경로: BinanceTestnetBot.get_market_data (12컬럼 object DataFrame + astype 4회)
+- 새 경로: kline_decoder.decode_columns / decode_structured
+- 호출당 시간과 tracemalloc 기준 최대 할당량 비교
+
+사용법:
+    python benchmarks/bench_kline_decode.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kline_decoder import decode_columns, decode_structured
+
+
+def make_rows(n, start=1_700_000_000_000, interval_ms=900_000):
+    """바이낸스 응답과 같은 모양의 kline 배열"""
+    rows = []
+    price = 60_000.0
+    for i in range(n):
+        open_time = start + i * interval_ms
+        price *= 1.0001 if i % 3 else 0.9998
+        rows.append([
+            open_time, f"{price:.8f}", f"{price * 1.001:.8f}", f"{price * 0.999:.8f}",
+            f"{price:.8f}", '12.34500000', open_time + interval_ms - 1,
+            '741234.10000000', 1234, '5.10000000', '30000.20000000', '0'
+        ])
+    return rows
+
+
+def measure(func, repeat):
+    """(호출당 평균 마이크로초, 최대 할당 바이트)"""
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    per_call = (time.perf_counter() - started) / repeat * 1e6
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_call, peak
+
+
+def run(sizes=(100, 1000), repeat=500):
+    import logging
+    logging.disable(logging.CRITICAL)
+    from binance_testnet_bot import BinanceTestnetBot
+
+    results = {}
+    for n in sizes:
+        rows = make_rows(n)
+        stub = SimpleNamespace(
+            symbol='BTCUSDT',
+            client=SimpleNamespace(get_klines=lambda **kwargs: rows),
+        )
+        cases = {
+            'pandas_dataframe': lambda: BinanceTestnetBot.get_market_data(stub)['close'].values,
+            'decode_columns': lambda: decode_columns(rows)['close'],
+            'decode_structured': lambda: decode_structured(rows)['close'],
+        }
+        results[n] = {name: measure(func, repeat) for name, func in cases.items()}
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    for n, cases in results.items():
+        print(f"📊 캔들 {n}개")
+        baseline = cases['pandas_dataframe'][0]
+        for name, (per_call, peak) in cases.items():
+            print(f"  - {name:18s}: {per_call:9.1f}µs/회 | 최대 할당 {peak / 1024:8.1f}KiB | "
+                  f"x{baseline / per_call:.1f}")
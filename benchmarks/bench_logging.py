@@ -0,0 +1,114 @@
+"""
+로깅 모드별 매매 판단 지연 시간 비교
+- text: 기존 형식 (FileHandler + 콘솔, 호출 스레드에서 포맷 / 쓰기)
+- structured: 큐 기반 비동기 JSON Lines (log_pipeline)
+- structured+sample: 매수 없음 판단 10%만 기록
+- off: 로깅 비활성화
+- BinanceTestnetBot.generate_signal 1회당 p50 / p99 (콘솔 출력은 /dev/null)
+
+사용법:
+    python benchmarks/bench_logging.py
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_bot():
+    """네트워크 없이 generate_signal만 호출할 수 있는 봇 인스턴스"""
+    from datetime import date
+    from binance_testnet_bot import BinanceTestnetBot
+    from strategy import RsiMacdBollinger, RSI_OVERSOLD, BB_ENTRY_MULTIPLIER
+    from strategy_engine import StrategyEngine
+    from clock import SystemClock
+
+    bot = object.__new__(BinanceTestnetBot)
+    bot.symbol = 'BTCUSDT'
+    bot.clock = SystemClock()
+    bot.daily_profit = 0
+    bot.daily_target = 20
+    bot.last_trade_date = date.today()
+    bot.rsi_oversold = RSI_OVERSOLD
+    bot.bb_multiplier = BB_ENTRY_MULTIPLIER
+    bot.strategy = RsiMacdBollinger(rsi_oversold=RSI_OVERSOLD, bb_multiplier=BB_ENTRY_MULTIPLIER)
+    bot.strategy_engine = StrategyEngine(bot.strategy)
+    return bot
+
+
+ANALYSIS = {
+    'current_price': 60_123.45, 'rsi': 41.2, 'macd': -12.3, 'macd_signal': -10.1,
+    'bb_upper': 61_000.0, 'bb_middle': 60_400.0, 'bb_lower': 59_800.0,
+    'timestamp': '2024-01-01 00:00:00',
+}
+
+
+def configure(mode, log_file, devnull):
+    import log_pipeline
+
+    logging.disable(logging.NOTSET)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    log_pipeline.sampler.rates = {'signal': 0.1} if mode == 'structured+sample' else {}
+    if mode == 'text':
+        logging.basicConfig(
+            level=logging.INFO, force=True,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[logging.FileHandler(log_file, encoding='utf-8'), logging.StreamHandler(devnull)],
+        )
+        return None
+    if mode == 'off':
+        logging.disable(logging.CRITICAL)
+        return None
+
+    stdout = sys.stdout
+    sys.stdout = devnull
+    try:
+        return log_pipeline.setup_async_logging(log_file, structured=True)
+    finally:
+        sys.stdout = stdout
+
+
+def run(n=5_000):
+    bot = make_bot()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w', encoding='utf-8') as devnull:
+        for mode in ('text', 'structured', 'structured+sample', 'off'):
+            log_file = os.path.join(tmp, f"{mode}.log")
+            listener = configure(mode, log_file, devnull)
+            bot.structured_logging = mode.startswith('structured')
+
+            samples = []
+            for _ in range(n):
+                started = time.perf_counter_ns()
+                bot.generate_signal(ANALYSIS)
+                samples.append(time.perf_counter_ns() - started)
+            if listener is not None:
+                from log_pipeline import stop_async_logging
+                stop_async_logging(listener)
+
+            samples.sort()
+            lines = sum(1 for _ in open(log_file, encoding='utf-8')) if os.path.exists(log_file) else 0
+            results[mode] = {
+                'log_lines': lines,
+                'p50_us': samples[len(samples) // 2] / 1000,
+                'p99_us': samples[int(len(samples) * 0.99)] / 1000,
+                'mean_us': sum(samples) / len(samples) / 1000,
+            }
+    logging.disable(logging.NOTSET)
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    print("📊 generate_signal 1회 지연 시간")
+    for mode, r in results.items():
+        print(f"  - {mode:18s}: p50 {r['p50_us']:8.1f}µs | p99 {r['p99_us']:8.1f}µs | 평균 {r['mean_us']:8.1f}µs | "
+              f"기록 {r['log_lines']:,}줄")
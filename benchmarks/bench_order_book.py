@@ -0,0 +1,113 @@
+"""
+로컬 호가창 diff 반영 비용
+- 1,000레벨 스냅샷 위에 최우선 호가 근처를 바꾸는 diff 이벤트 N개 반영
+- 이벤트 / 레벨 처리량, tracemalloc 최대 할당
+- 중간에 업데이트 ID를 건너뛴 이벤트를 넣어 공백 감지 → DepthSync 재동기화 확인
+
+사용법:
+    python benchmarks/bench_order_book.py [--events 50000] [--levels-per-event 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from order_book import OrderBook, DepthSync
+
+
+def make_snapshot(mid=60_000.0, levels=1000, tick=0.01, update_id=1):
+    return {
+        'lastUpdateId': update_id,
+        'bids': [[f"{mid - (i + 1) * tick:.2f}", "0.50000000"] for i in range(levels)],
+        'asks': [[f"{mid + (i + 1) * tick:.2f}", "0.50000000"] for i in range(levels)],
+    }
+
+
+def make_events(n, per_event, mid=60_000.0, tick=0.01, first_id=2, seed=0):
+    """최우선 호가 50틱 안쪽 레벨을 바꾸는 diff 이벤트 (약 20%는 삭제)"""
+    rng = np.random.default_rng(seed)
+    offsets = rng.integers(1, 50, size=(n, 2, per_event))
+    quantities = np.where(rng.random((n, 2, per_event)) < 0.2, 0.0, rng.uniform(0.01, 2.0, (n, 2, per_event)))
+    events = []
+    for i in range(n):
+        events.append({
+            'e': 'depthUpdate',
+            'U': first_id + i, 'u': first_id + i,
+            'b': [[f"{mid - o * tick:.2f}", f"{q:.8f}"] for o, q in zip(offsets[i, 0], quantities[i, 0])],
+            'a': [[f"{mid + o * tick:.2f}", f"{q:.8f}"] for o, q in zip(offsets[i, 1], quantities[i, 1])],
+        })
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=50_000)
+    parser.add_argument('--levels-per-event', type=int, default=10)
+    args = parser.parse_args()
+
+    snapshot = make_snapshot()
+    events = make_events(args.events, args.levels_per_event)
+
+    book = OrderBook('BTCUSDT')
+    book.apply_snapshot(snapshot)
+    started = time.perf_counter()
+    for event in events:
+        book.apply_diff(event)
+    elapsed = time.perf_counter() - started
+    levels = args.events * args.levels_per_event * 2
+
+    book.apply_snapshot(snapshot)
+    tracemalloc.start()
+    for event in events[:10_000]:
+        book.apply_diff(event)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(10_000):
+        book.signals(0.05)
+    signals = (time.perf_counter() - started) / 10_000
+
+    print(f"📚 diff 이벤트 {args.events:,}개 (이벤트당 레벨 {args.levels_per_event * 2}개)")
+    print(f"  - 처리량: 이벤트 {args.events / elapsed:,.0f}/초 | 레벨 {levels / elapsed:,.0f}/초 "
+          f"| 이벤트당 {elapsed / args.events * 1e6:.1f}µs")
+    print(f"  - 최대 할당 (이벤트 1만 개): {peak / 1024:.1f}KiB")
+    print(f"  - signals(): {signals * 1e6:.1f}µs | 레벨 매수 {len(book.bids)} / 매도 {len(book.asks)} | "
+          f"스프레드 {book.spread_bps():.2f}bp")
+
+    # 공백 감지 → 스냅샷 재동기화 (버퍼된 이벤트 이어 반영)
+    fetches = []
+
+    def fetch(limit):
+        # 첫 재동기화는 버퍼보다 오래된 스냅샷 → 한 번 더 요청
+        checkpoint = (1_000, 1_500, 2_500)[min(len(fetches), 2)]
+        fetches.append(limit)
+        return make_snapshot(update_id=events[checkpoint]['u'])
+
+    sync = DepthSync('BTCUSDT', fetch, retry_interval=0.01)
+    sync.resync()
+    while sync.syncing:
+        time.sleep(0.001)
+    for event in events[1_001:2_000]:
+        sync.on_event(event)
+    sync.on_event(events[2_001])  # events[2_000] 누락
+    for event in events[2_002:3_000]:
+        sync.on_event(event)
+    deadline = time.monotonic() + 5
+    while sync.syncing and time.monotonic() < deadline:
+        time.sleep(0.001)
+    print(f"🔁 공백 {sync.book.gaps}회 감지(오래된 스냅샷 포함), 스냅샷 {len(fetches)}회, "
+          f"마지막 업데이트 ID {sync.book.last_update_id}, 동기화 {not sync.syncing}")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,115 @@
+"""
+요청 가중치 스케줄러 동작 확인 (가중치 한도를 강제하는 로컬 모의 거래소)
+- 여러 스레드(심볼 / 봇)가 같은 IP로 시세 / 캔들을 계속 조회하면서 가끔 주문
+- raw: python-binance Client를 그대로 사용 → 429 / 418 발생 횟수
+- scheduled: ScheduledClient 공유 → 거절 횟수, 주문 지연 시간, 캐시 / coalescing 통계
+
+사용법:
+    python benchmarks/bench_request_scheduler.py [--threads 8] [--seconds 6]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_exchange import MockExchange
+from request_scheduler import ScheduledClient
+
+SYMBOL = 'BTCUSDT'
+
+
+def make_client(base_url):
+    from binance.client import Client
+
+    client = Client('key', 'secret', ping=False)
+    client.API_URL = base_url + '/api'
+    return client
+
+
+def workload(get_client, threads, seconds):
+    """스레드마다 10ms 주기로 시세 2회 + 캔들 1회 조회, 20회마다 주문 1건
+
+    캔들은 매번 다른 limit으로 조회해 캐시로 흡수되지 않는 부하를 만듭니다.
+    """
+    errors = []
+    order_latencies = []
+    deadline = time.monotonic() + seconds
+
+    def worker(offset):
+        client = get_client()
+        i = 0
+        while time.monotonic() < deadline:
+            try:
+                client.get_symbol_ticker(symbol=SYMBOL)
+                client.get_symbol_ticker(symbol=SYMBOL)
+                client.get_klines(symbol=SYMBOL, interval='1m', limit=50 + (i * 7 + offset) % 50)
+                if i % 20 == 0:
+                    started = time.perf_counter()
+                    client.order_market(symbol=SYMBOL, side='BUY', quantity=0.001)
+                    order_latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(getattr(e, 'status_code', type(e).__name__))
+            i += 1
+            time.sleep(0.01)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return errors, order_latencies
+
+
+def run(mode, args):
+    options = dict(start_price=60_000.0, weight_limit=args.weight_limit,
+                   weight_window_s=args.window, ban_after=args.ban_after)
+    with MockExchange([SYMBOL], **options) as exchange:
+        if mode == 'raw':
+            errors, latencies = workload(lambda: make_client(exchange.base_url), args.threads, args.seconds)
+            stats = None
+        else:
+            shared = ScheduledClient(make_client(exchange.base_url),
+                                     weight_limit=args.weight_limit, window_s=args.window)
+            errors, latencies = workload(lambda: shared, args.threads, args.seconds)
+            stats = shared.scheduler.stats
+        return exchange, errors, latencies, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=6.0)
+    parser.add_argument('--weight-limit', type=int, default=300)
+    parser.add_argument('--window', type=float, default=2.0, help='가중치 창 길이(초, 실제 거래소는 60)')
+    parser.add_argument('--ban-after', type=int, default=20, help='429 이후 이 횟수를 넘기면 418')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"🧪 스레드 {args.threads}개, {args.seconds}초, 한도 {args.weight_limit} / {args.window}초")
+    for mode in ('raw', 'scheduled'):
+        exchange, errors, latencies, stats = run(mode, args)
+        served = sum(exchange.request_counts.values())
+        line = (f"  - {mode:<9}: 거래소 처리 {served:,}회 | 429 {exchange.rejections[429]:,}회 | "
+                f"418 {exchange.rejections[418]:,}회 | 주문 {len(latencies)}건")
+        if latencies:
+            ms = np.asarray(latencies) * 1000
+            line += f" (p50 {np.percentile(ms, 50):.1f}ms, p99 {np.percentile(ms, 99):.1f}ms)"
+        print(line)
+        if stats:
+            print(f"    전송 {stats['sent']:,} | 캐시 {stats['cached']:,} | 병합 {stats['coalesced']:,} | "
+                  f"대기 {stats['throttled']:,} | 한도 초과 응답 {stats['rate_limited']}")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,147 @@
+"""
+봇 시작 시간
+- import binance_testnet_bot: 새 프로세스에서 N회 (느린 패키지 / 로깅 설정이 임포트 시 일어나지 않는지 확인)
+- BinanceTestnetBot 초기화: 요청마다 실제 지연을 주는 클라이언트로 시작 조회
+  (exchangeInfo / 잔고 / 현재가)를 차례로 보낼 때와 동시에 보낼 때 비교
+- 실제 클라이언트 경로: 같은 지연의 모의 거래소에 python-binance Client +
+  resilient_client()(요청 스케줄러 / 전송 계층)로 붙여 같은 비교
+
+사용법:
+    python benchmarks/bench_startup.py [--runs 5] [--latency-ms 150]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IMPORT_PROBE = """
+import json, logging, sys, time
+started = time.perf_counter()
+import binance_testnet_bot
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'heavy': [m for m in ('pandas', 'binance', 'dotenv') if m in sys.modules],
+    'handlers': len(logging.getLogger().handlers),
+}))
+"""
+
+
+class SlowClient:
+    """요청마다 실제로 latency초 기다리는 클라이언트 (시뮬레이터 호출은 잠금 아래)"""
+
+    def __init__(self, exchange, latency):
+        self.exchange = exchange
+        self.latency = latency
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        attr = getattr(self.exchange, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            time.sleep(self.latency)
+            with self.lock:
+                return attr(*args, **kwargs)
+        return call
+
+
+def measure_import(runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def measure_init(runs, latency, concurrent):
+    from binance_testnet_bot import BinanceTestnetBot
+    from clock import SystemClock, VirtualClock
+    from exchange_simulator import SimulatedExchange
+    from trade_journal import TradeJournal
+
+    timings = []
+    for _ in range(runs):
+        exchange = SimulatedExchange.synthetic(hours=1)
+        # 실제 시계면 동시 요청, 가상 시계면 차례로 요청
+        clock = SystemClock() if concurrent else VirtualClock(exchange.clock.time_ms())
+        with tempfile.TemporaryDirectory() as root:
+            journal = TradeJournal(os.path.join(root, 'trade_journal.db'))
+            started = time.perf_counter()
+            BinanceTestnetBot(client=SlowClient(exchange, latency), clock=clock, journal=journal)
+            timings.append(time.perf_counter() - started)
+            journal.close()
+    return timings
+
+
+def measure_live_stack(runs, latency, concurrent):
+    """모의 거래소(latency초 지연) + resilient_client()로 봇 초기화 시간"""
+    from binance.client import Client
+    from binance_testnet_bot import BinanceTestnetBot
+    from clock import SystemClock, VirtualClock
+    from mock_exchange import MockExchange
+    from trade_journal import TradeJournal
+    from transport import resilient_client
+
+    timings = []
+    with MockExchange(['BTCUSDT'], start_price=60_000.0, latency_ms=latency * 1000) as exchange:
+        for _ in range(runs):
+            # 실행마다 새 클라이언트 (스케줄러 캐시 / 커넥션 재사용 없이)
+            binance_client = Client('bench-key', 'bench-secret', ping=False)
+            binance_client.API_URL = exchange.base_url + '/api'
+            client = resilient_client(binance_client)
+            clock = SystemClock() if concurrent else VirtualClock(int(time.time() * 1000))
+            with tempfile.TemporaryDirectory() as root:
+                journal = TradeJournal(os.path.join(root, 'trade_journal.db'))
+                started = time.perf_counter()
+                BinanceTestnetBot(client=client, clock=clock, journal=journal)
+                timings.append(time.perf_counter() - started)
+                journal.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--latency-ms', type=float, default=150.0, help='요청 1회 왕복 지연')
+    args = parser.parse_args()
+
+    imports = measure_import(args.runs)
+    seconds = [result['seconds'] for result in imports]
+    print(f"📦 import binance_testnet_bot: 중앙값 {statistics.median(seconds) * 1000:.0f}ms "
+          f"(최소 {min(seconds) * 1000:.0f}ms, {args.runs}회)")
+    print(f"   임포트 후 로드된 무거운 패키지: {imports[-1]['heavy'] or '없음'} | "
+          f"루트 로거 핸들러: {imports[-1]['handlers']}개")
+
+    logging.disable(logging.CRITICAL)
+    latency = args.latency_ms / 1000
+    serial = measure_init(args.runs, latency, concurrent=False)
+    concurrent = measure_init(args.runs, latency, concurrent=True)
+    print(f"🚀 봇 초기화 (요청 지연 {args.latency_ms:.0f}ms)")
+    print(f"  - 차례로 요청 : 중앙값 {statistics.median(serial) * 1000:6.0f}ms")
+    print(f"  - 동시에 요청 : 중앙값 {statistics.median(concurrent) * 1000:6.0f}ms")
+
+    serial = measure_live_stack(args.runs, latency, concurrent=False)
+    concurrent = measure_live_stack(args.runs, latency, concurrent=True)
+    print(f"🌐 resilient_client + 모의 거래소 (요청 지연 {args.latency_ms:.0f}ms, 서버 시간 보정 1회 포함)")
+    print(f"  - 차례로 요청 : 중앙값 {statistics.median(serial) * 1000:6.0f}ms")
+    print(f"  - 동시에 요청 : 중앙값 {statistics.median(concurrent) * 1000:6.0f}ms")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,88 @@
+"""
+전략 변형 N개를 틱마다 평가하는 비용
+- loop: 변형마다 전략 인스턴스의 signal() 호출 (전략을 하나씩 돌리는 방식)
+- batch: VariantBatch.evaluate() 한 번 (파라미터 배열 NumPy 연산)
+- shadow: batch + 섀도 장부 갱신 (가상 진입 / 청산)
+- 두 방식의 매수 마스크가 모든 틱에서 같은지 확인
+
+사용법:
+    python benchmarks/bench_strategies.py [--variants 500] [--ticks 2000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import IncrementalIndicators
+from strategy import RsiMacdBollinger
+from strategy_engine import StrategyEngine, VariantBatch
+
+
+def make_batch(n):
+    rng = np.random.default_rng(7)
+    variants = [{'rsi_oversold': float(rsi), 'bb_multiplier': float(bb)}
+                for rsi, bb in zip(rng.uniform(20, 50, n), rng.uniform(0.98, 1.06, n))]
+    return VariantBatch(RsiMacdBollinger, variants=variants)
+
+
+def snapshots(ticks):
+    """합성 가격 경로의 틱별 스냅샷"""
+    rng = np.random.default_rng(1)
+    prices = 60_000 * np.exp(np.cumsum(rng.normal(0, 0.003, ticks + 100)))
+    indicators = IncrementalIndicators()
+    indicators.seed(prices[:100].tolist())
+    engine = StrategyEngine(RsiMacdBollinger(), primary=indicators)
+    result = []
+    for price in prices[100:].tolist():
+        analysis = {'current_price': price, **indicators.peek(price)}
+        result.append(engine.snapshot(analysis))
+        indicators.update(price)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--variants', type=int, default=500)
+    parser.add_argument('--ticks', type=int, default=2000)
+    args = parser.parse_args()
+
+    batch = make_batch(args.variants)
+    strategies = [RsiMacdBollinger(**variant) for variant in batch.variants]
+    ticks = snapshots(args.ticks)
+
+    started = time.perf_counter()
+    loop_masks = [np.array([s.signal(snapshot) == 'BUY' for s in strategies]) for snapshot in ticks]
+    loop = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_masks = [batch.evaluate(snapshot) for snapshot in ticks]
+    vectorized = time.perf_counter() - started
+
+    engine = StrategyEngine(RsiMacdBollinger(), [batch])
+    started = time.perf_counter()
+    for snapshot in ticks:
+        engine.step_shadows(snapshot)
+    shadow = time.perf_counter() - started
+
+    matches = all(np.array_equal(a, b) for a, b in zip(loop_masks, batch_masks))
+    signals = int(sum(mask.sum() for mask in batch_masks))
+
+    print(f"🧪 변형 {args.variants}개 × 틱 {args.ticks:,}회 (매수 신호 {signals:,}건, 마스크 일치: {matches})")
+    for label, seconds in (('loop', loop), ('batch', vectorized), ('shadow', shadow)):
+        print(f"  - {label:<6}: 틱당 {seconds / args.ticks * 1e6:9.1f}µs "
+              f"(변형당 {seconds / args.ticks / args.variants * 1e9:8.1f}ns)")
+    print(f"🚀 batch / loop: {loop / vectorized:.0f}배")
+    best = engine.leaderboard(1)[0]
+    print(f"👥 섀도 1위 {best['variant']}: ${best['pnl'] + best['unrealized']:+,.2f} (거래 {best['trades']}회)")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
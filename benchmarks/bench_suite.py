@@ -0,0 +1,277 @@
+"""
+지표 / 신호 / 주문 경로 벤치마크 모음 (배포 전 성능 회귀 확인용)
+- calculate_rsi / calculate_macd / calculate_bollinger_bands (pandas 경로)
+- get_market_data 디코딩(DataFrame)과 kline_decoder.decode_columns
+- build_analysis → generate_signal
+- run() 1회분(tick)을 거래소 시뮬레이터(모의 클라이언트, 지연 0) 위에서 실행
+- 합성 경로(시드 고정) 또는 기록된 캔들(--data, backtest.load_klines 형식)
+- 전체를 --rounds번 반복해 항목마다 가장 빠른 회차를 사용 (잡음 제거)
+- 항목별 처리량(회/초), 지연 백분위(p50 / p90 / p99), tracemalloc 최대 할당
+- 결과는 JSON으로 저장하고 기준선(benchmarks/baseline.json)과 비교:
+  p50 또는 최대 할당이 허용 비율을 넘게 늘면 종료 코드 1
+
+사용법:
+    python benchmarks/bench_suite.py [--data data/klines/BTCUSDT/1m] [--repeat 300] [--ticks 1000]
+    python benchmarks/bench_suite.py --save-baseline   # 현재 결과를 기준선으로 저장
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from exchange_simulator import SimulatedExchange
+from kline_decoder import decode_columns
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+OUTPUT_PATH = os.path.join(ROOT, 'logs', 'bench_suite.json')
+CHECK_INTERVAL = 60  # run()과 같은 체크 주기(가상 초)
+
+
+def measure(func, repeat, warmup=5, memory_calls=3):
+    """호출별 지연(ns) 측정 + 별도 구간에서 tracemalloc 최대 할당"""
+    for _ in range(warmup):
+        func()
+
+    samples = np.empty(repeat, dtype=np.int64)
+    perf_counter_ns = time.perf_counter_ns
+    started = perf_counter_ns()
+    for i in range(repeat):
+        t0 = perf_counter_ns()
+        func()
+        samples[i] = perf_counter_ns() - t0
+    total = perf_counter_ns() - started
+
+    # tracemalloc은 호출을 크게 느리게 하므로 지연 측정과 분리
+    tracemalloc.start()
+    for _ in range(memory_calls):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return summarize(samples, total, peak)
+
+
+def summarize(samples, total_ns, peak):
+    p50, p90, p99 = np.percentile(samples, (50, 90, 99)) / 1_000
+    return {
+        'calls': int(len(samples)),
+        'ops_per_sec': len(samples) / (total_ns / 1e9) if total_ns else None,
+        'mean_us': float(samples.mean() / 1_000),
+        'p50_us': float(p50),
+        'p90_us': float(p90),
+        'p99_us': float(p99),
+        'max_us': float(samples.max() / 1_000),
+        'peak_kib': peak / 1024,
+    }
+
+
+def make_exchange(args, hours):
+    """합성 경로 또는 기록된 캔들로 시뮬레이터 생성 (지연 / 슬리피지 없음)"""
+    if args.data:
+        from backtest import load_klines
+        exchange = SimulatedExchange({args.symbol: load_klines(args.data)}, seed=args.seed)
+        # 지표 워밍업용 과거 구간(100 x 15분) 뒤에서 시작
+        exchange.clock.advance(100 * 15 * 60_000)
+        return exchange
+    return SimulatedExchange.synthetic((args.symbol,), hours=hours, seed=args.seed)
+
+
+def bench_indicators(bot, rows, repeat):
+    """pandas 지표 / 디코딩 경로 (get_market_data는 고정 응답을 돌려주는 클라이언트로)"""
+    stub = SimpleNamespace(symbol=bot.symbol, client=SimpleNamespace(get_klines=lambda **kwargs: rows))
+    prices = np.array([float(row[4]) for row in rows])
+    get_market_data = type(bot).get_market_data
+    return {
+        'calculate_rsi': measure(lambda: bot.calculate_rsi(prices), repeat),
+        'calculate_macd': measure(lambda: bot.calculate_macd(prices), repeat),
+        'calculate_bollinger_bands': measure(lambda: bot.calculate_bollinger_bands(prices), repeat),
+        'get_market_data': measure(lambda: get_market_data(stub, limit=len(rows))['close'].values, repeat),
+        'decode_columns': measure(lambda: decode_columns(rows)['close'], repeat),
+    }
+
+
+def bench_signal(bot, repeat):
+    """현재가 기준 분석 → 신호 판단 (주문 없음)"""
+    bot.analyze_market()
+    price = bot.get_current_price()
+    analysis = bot.build_analysis(price)
+    return {
+        'build_analysis': measure(lambda: bot.build_analysis(price), repeat),
+        'generate_signal': measure(lambda: bot.generate_signal(analysis), repeat),
+    }
+
+
+def bench_tick(bot, exchange, ticks):
+    """run() 루프 1회분(tick) 지연: 틱마다 가상 시계를 체크 주기만큼 전진"""
+    samples = []
+    perf_counter_ns = time.perf_counter_ns
+    started = perf_counter_ns()
+    while len(samples) < ticks and exchange.clock.time_ms() < exchange.end_ms:
+        t0 = perf_counter_ns()
+        bot.tick()
+        samples.append(perf_counter_ns() - t0)
+        bot.clock.sleep(CHECK_INTERVAL)
+    total = perf_counter_ns() - started  # 시계 전진은 가상이라 비용이 거의 없음
+
+    tracemalloc.start()
+    for _ in range(3):
+        if exchange.clock.time_ms() >= exchange.end_ms:
+            break
+        bot.tick()
+        bot.clock.sleep(CHECK_INTERVAL)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = summarize(np.array(samples, dtype=np.int64), total, peak)
+    result['orders'] = len(exchange.orders)
+    return result
+
+
+def run_suite(args):
+    from binance_testnet_bot import BinanceTestnetBot
+    from kline_store import KlineStore
+    from trade_journal import TradeJournal
+
+    hours = (args.ticks + 10) * CHECK_INTERVAL / 3600 + 1
+    exchange = make_exchange(args, hours)
+    cases = {}
+    with tempfile.TemporaryDirectory() as root:
+        journal = TradeJournal(os.path.join(root, 'trade_journal.db'))
+        bot = BinanceTestnetBot(client=exchange, clock=exchange.clock, journal=journal)
+        bot.kline_store = KlineStore(root)
+        try:
+            rows = exchange.get_klines(symbol=args.symbol, interval='15m', limit=args.candles)
+            cases.update(bench_indicators(bot, rows, args.repeat))
+            cases.update(bench_signal(bot, args.repeat))
+            cases['tick'] = bench_tick(bot, exchange, args.ticks)
+        finally:
+            journal.close()
+
+    return cases
+
+
+def run_rounds(args):
+    """run_suite를 rounds번 반복 → 항목마다 p50이 가장 낮은 회차 (잡음 제거)"""
+    cases = {}
+    for _ in range(args.rounds):
+        for name, case in run_suite(args).items():
+            if name not in cases or case['p50_us'] < cases[name]['p50_us']:
+                cases[name] = case
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        },
+        'parameters': {
+            'data': args.data or f'synthetic(seed={args.seed})',
+            'candles': args.candles,
+            'repeat': args.repeat,
+            'ticks': args.ticks,
+            'rounds': args.rounds,
+        },
+        'cases': cases,
+    }
+
+
+def compare(result, baseline, tolerance, memory_tolerance):
+    """기준선 대비 회귀 목록 [(항목, 지표, 기준값, 현재값)]"""
+    if baseline.get('parameters') != result['parameters']:
+        print(f"⚠️ 기준선과 측정 조건이 달라 비교를 건너뜁니다: "
+              f"{baseline.get('parameters')} → {result['parameters']}")
+        return []
+
+    regressions = []
+    for name, current in result['cases'].items():
+        reference = baseline.get('cases', {}).get(name)
+        if reference is None:
+            continue
+        if current['p50_us'] > reference['p50_us'] * (1 + tolerance):
+            regressions.append((name, 'p50_us', reference['p50_us'], current['p50_us']))
+        # 작은 할당은 실행마다 조금씩 흔들리므로 여유 1KiB
+        if current['peak_kib'] > reference['peak_kib'] * (1 + memory_tolerance) + 1:
+            regressions.append((name, 'peak_kib', reference['peak_kib'], current['peak_kib']))
+    return regressions
+
+
+def print_result(result, baseline=None):
+    reference = (baseline or {}).get('cases', {})
+    print(f"📊 벤치마크 ({result['parameters']['data']}, 캔들 {result['parameters']['candles']}개)")
+    for name, case in result['cases'].items():
+        change = ''
+        if name in reference:
+            change = f" | 기준선 대비 {case['p50_us'] / reference[name]['p50_us'] - 1:+.0%}"
+        print(f"  - {name:<26}: {case['ops_per_sec']:>10,.0f}회/초 | p50 {case['p50_us']:9.1f}µs | "
+              f"p90 {case['p90_us']:9.1f}µs | p99 {case['p99_us']:9.1f}µs | "
+              f"최대 할당 {case['peak_kib']:8.1f}KiB{change}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='지표 / 신호 / 주문 경로 벤치마크')
+    parser.add_argument('--data', help='CSV / Parquet / 캔들 저장소 디렉터리 (없으면 합성 경로)')
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--candles', type=int, default=100, help='지표 계산에 쓰는 캔들 수 (봇 기본값 100)')
+    parser.add_argument('--repeat', type=int, default=300)
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=3, help='반복 횟수 (항목별 최솟값 p50 회차 사용)')
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='현재 결과를 기준선으로 저장')
+    parser.add_argument('--tolerance', type=float, default=0.30, help='p50 허용 증가 비율')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help='최대 할당 허용 증가 비율')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    result = run_rounds(args)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_result(result, baseline)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"💾 결과 저장: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"📌 기준선 저장: {args.baseline}")
+        return 0
+    if baseline is None:
+        print("ℹ️ 기준선이 없습니다 (--save-baseline으로 저장)")
+        return 0
+
+    regressions = compare(result, baseline, args.tolerance, args.memory_tolerance)
+    for name, metric, reference, current in regressions:
+        print(f"❌ 회귀: {name} {metric} {reference:,.1f} → {current:,.1f}")
+    if regressions:
+        return 1
+    print("✅ 기준선 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    sys.exit(main())
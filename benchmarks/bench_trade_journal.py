@@ -0,0 +1,98 @@
+"""
+거래 저널 쓰기 처리량 / 재시작 복구 시간
+- 배치 크기(커밋 1회당 거래 수) / synchronous 설정별 초당 기록 건수
+- 기존 방식 비교: 거래마다 전체 리스트를 json.dump(indent=2)로 다시 쓰기
+- 거래 N건이 쌓인 저널을 열어 포지션 / 일일 수익 / 최근 거래를 복구하는 시간
+
+사용법:
+    python benchmarks/bench_trade_journal.py [--trades 100000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trade_journal import TradeJournal
+
+
+def make_record(i):
+    return {
+        'open_time': '2024-01-01 00:00:00', 'close_time': '2024-01-01 01:00:00',
+        'side': 'BUY', 'entry_price': 60_000.0 + i, 'exit_price': 60_100.0 + i,
+        'quantity': 0.0012, 'pnl_percent': 0.17, 'pnl_amount': 0.12,
+        'reason': '익절' if i % 3 else '손절', 'daily_profit': 0.12 * (i % 50),
+    }
+
+
+def bench_journal(path, n, batch_size, synchronous):
+    with TradeJournal(path, batch_size=batch_size, flush_interval=1e9,
+                      synchronous=synchronous) as journal:
+        started = time.perf_counter()
+        for i in range(n):
+            journal.append_trade(make_record(i))
+        journal.flush()
+        return n / (time.perf_counter() - started)
+
+
+def bench_json_dump(path, n):
+    """기존 save_trade_report 방식을 거래마다 호출했을 때"""
+    history = []
+    started = time.perf_counter()
+    for i in range(n):
+        history.append(make_record(i))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2, ensure_ascii=False)
+    return n / (time.perf_counter() - started)
+
+
+def bench_recovery(path, retention=500, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        journal = TradeJournal(path, retention=retention)
+        state = journal.load_state()
+        recent = len(journal.recent)
+        best = min(best, time.perf_counter() - started)
+        journal.close()
+    return best, state, recent
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trades', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"📝 거래 기록 처리량 (건/초)")
+        for synchronous in ('NORMAL', 'FULL'):
+            for batch_size in (1, 64, 1024):
+                n = args.trades if batch_size > 1 else min(args.trades, 5_000)
+                path = os.path.join(tmp, f"journal_{synchronous}_{batch_size}.db")
+                rate = bench_journal(path, n, batch_size, synchronous)
+                print(f"  - SQLite WAL synchronous={synchronous:<6} 배치 {batch_size:>5}: {rate:>12,.0f}")
+        rate = bench_json_dump(os.path.join(tmp, 'report.json'), 2_000)
+        print(f"  - json.dump 전체 다시 쓰기 (2,000건 기준)     : {rate:>12,.0f}")
+
+        path = os.path.join(tmp, 'recovery.db')
+        with TradeJournal(path, batch_size=4096) as journal:
+            for i in range(args.trades):
+                journal.append_trade(make_record(i))
+            journal.save_state(position={'side': 'BUY', 'entry_price': 60_000.0, 'quantity': 0.0012,
+                                         'time': '2024-01-01 00:00:00', 'order_id': 1},
+                               daily_profit=4.2, last_trade_date='2024-01-01')
+        elapsed, state, recent = bench_recovery(path)
+        print(f"♻️ 복구 ({args.trades:,}건 저널): {elapsed * 1000:.2f}ms "
+              f"(포지션 {'있음' if state.get('position') else '없음'}, "
+              f"일일 수익 ${state.get('daily_profit', 0):.2f}, 최근 거래 {recent}건)")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
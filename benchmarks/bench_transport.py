@@ -0,0 +1,144 @@
+"""
+불안정한 네트워크에서 전송 계층 비교
+- 모의 거래소 앞에 장애 주입 프록시(fault_proxy.py)를 두고 python-binance Client로 요청
+- 기본 Client(세션 기본값, 타임아웃 10초, 재시도 없음) vs resilient_client()
+  (keep-alive 풀, 연결 / 읽기 타임아웃, 지터 재시도, 서킷 브레이커, 서버 시간 보정)
+- 시세 조회: 성공률과 p50 / p99 / 최대 지연
+- 시장가 주문: 실패 / 결과 모름(거래소에는 들어감) / 중복 체결 건수
+- 거래소 장애(모든 요청 503) 동안 서킷 브레이커로 바로 실패하는지, 장애 후 회복되는지
+
+사용법:
+    python benchmarks/bench_transport.py [--calls 500] [--orders 100] [--fault-rate 0.1]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_exchange import MockExchange
+from fault_proxy import FaultProxy
+from transport import resilient_client, CircuitOpenError
+
+SYMBOL = 'BTCUSDT'
+
+# 장애 종류별 비중 (--fault-rate를 이 비율로 나눔)
+FAULT_MIX = {'slow': 0.3, 'stall': 0.1, 'bad_gateway': 0.15, 'unavailable': 0.15,
+             'reset': 0.15, 'lost_response': 0.15}
+
+
+def make_client(base_url, resilient, read_timeout, reset_timeout=30.0):
+    from binance.client import Client
+
+    client = Client('bench-key', 'bench-secret', ping=False)
+    client.API_URL = base_url + '/api'
+    if resilient:
+        # 시세 캐시는 끄고 (요청마다 실제 전송) 전송 계층만 비교
+        client = resilient_client(client, scheduler_options={'ttls': {}},
+                                  session_options={'read_timeout': read_timeout},
+                                  reset_timeout=reset_timeout, seed=0)
+    return client
+
+
+def bench_reads(client, calls):
+    latencies, failures = [], 0
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            client.get_symbol_ticker(symbol=SYMBOL)
+        except Exception:
+            failures += 1
+        latencies.append(time.perf_counter() - started)
+    return np.array(latencies) * 1000, failures
+
+
+def bench_orders(client, exchange, orders):
+    """시장가 매수 orders건 → (실패, 결과 모름, 거래소 체결 건수)"""
+    before = len(exchange.orders)
+    failures = 0
+    for _ in range(orders):
+        try:
+            client.order_market(symbol=SYMBOL, side='BUY', quantity='0.001')
+        except Exception:
+            failures += 1
+    placed = exchange.orders[before:]
+    # 실패로 보였지만 거래소에는 들어간 주문 = 체결 건수 - 성공 건수
+    unknown = len(placed) - (orders - failures)
+    duplicates = sum(n - 1 for n in Counter(o['clientOrderId'] for o in placed).values())
+    return failures, unknown, len(placed), duplicates
+
+
+def bench_outage(client, proxy, calls, reset_timeout):
+    """모든 요청이 503인 동안 calls번 조회 → (서킷 차단 건수, 차단된 호출 중앙값 ms, 회복 여부)"""
+    rates = proxy.rates
+    proxy.rates = {'unavailable': 1.0}
+    rejected = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            client.get_symbol_ticker(symbol=SYMBOL)
+        except CircuitOpenError:
+            rejected.append(time.perf_counter() - started)
+        except Exception:
+            pass
+    proxy.rates = rates
+
+    # 쿨다운 뒤 요청 하나로 회복 확인
+    time.sleep(reset_timeout)
+    client.get_symbol_ticker(symbol=SYMBOL)
+    median = float(np.median(rejected)) * 1000 if rejected else float('nan')
+    return len(rejected), median, client.breakers['market'].state == 'closed'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=500, help='시세 조회 횟수')
+    parser.add_argument('--orders', type=int, default=100, help='시장가 주문 횟수')
+    parser.add_argument('--fault-rate', type=float, default=0.1, help='요청당 장애 확률')
+    parser.add_argument('--stall-s', type=float, default=2.0, help='멈춤 장애 길이')
+    parser.add_argument('--read-timeout', type=float, default=0.5, help='복원력 계층의 읽기 타임아웃')
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='모의 거래소 기본 지연')
+    parser.add_argument('--outage-calls', type=int, default=20, help='거래소 장애 중 조회 횟수')
+    parser.add_argument('--reset-timeout', type=float, default=1.0, help='서킷 쿨다운 (초)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rates = {fault: args.fault_rate * share for fault, share in FAULT_MIX.items()}
+    print(f"🧪 장애 확률 {args.fault_rate:.0%} (멈춤 {args.stall_s:.1f}초) | 조회 {args.calls}회 / 주문 {args.orders}건")
+
+    with MockExchange([SYMBOL], latency_ms=args.latency_ms, seed=args.seed) as exchange:
+        for label, resilient in (('기본 Client', False), ('resilient_client', True)):
+            with FaultProxy(exchange.base_url, rates, stall_s=args.stall_s, seed=args.seed) as proxy:
+                client = make_client(proxy.base_url, resilient, args.read_timeout, args.reset_timeout)
+                latencies, failures = bench_reads(client, args.calls)
+                failed, unknown, placed, duplicates = bench_orders(client, exchange, args.orders)
+                if resilient:
+                    outage = bench_outage(client, proxy, args.outage_calls, args.reset_timeout)
+
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(f"  - {label:17s}: 조회 실패 {failures:3d}/{args.calls} | p50 {p50:6.1f}ms | "
+                  f"p99 {p99:7.1f}ms | 최대 {latencies.max():7.1f}ms")
+            print(f"    {'':17s}  주문 실패 {failed:3d}/{args.orders} (그중 거래소 접수 {unknown}) | "
+                  f"체결 {placed}건 | 중복 체결 {duplicates}건")
+            if resilient:
+                snapshot = client.snapshot()
+                print(f"    {'':17s}  재시도 {snapshot['retries']}회 | 응답 유실 주문 복구 "
+                      f"{snapshot['recovered_orders']}건 | 서킷 열림 "
+                      f"{sum(c['opens'] for c in snapshot['circuits'].values())}번")
+                rejected, median, recovered = outage
+                print(f"    {'':17s}  거래소 장애 중 조회 {args.outage_calls}회: 서킷 차단 {rejected}회 "
+                      f"(중앙값 {median:.3f}ms) | 쿨다운 후 " + ("회복" if recovered else "회복 실패"))
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -7,126 +7,327 @@
 """
 
 import os
+import sys
 import time
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from binance.client import Client
-from binance.enums import *
-import pandas as pd
 import numpy as np
-from dotenv import load_dotenv
+from indicators import IncrementalIndicators
+from market_stream import MarketStream, STREAM_URL, interval_to_ms
+from strategy import exit_reason, exit_prices, BB_ENTRY_MULTIPLIER, STRATEGIES, RsiMacdBollinger
+from strategy_engine import StrategyEngine, default_shadow_grid
+from risk import RiskEngine, bollinger_volatility
+from analytics import PnLAnalytics
+from symbol_filters import SymbolIndex, FilterError, DEFAULT_PATH as SYMBOL_INDEX_PATH
+from kline_store import KlineStore
+from timeframes import MultiTimeframe
+from metrics import metrics, stage, timed
+from log_pipeline import configure_from_env, log_event
+from clock import SystemClock, trading_day
+from trade_journal import TradeJournal
+from transport import resilient_client, CircuitOpenError, UNKNOWN_ORDER
+from replay import Recorder, RecordingClient
+from order_book import DepthSync
+from execution import OrderExecutor, fill_summary, TESTNET_API_URL, TESTNET_WS_URL
 
-# 환경변수 로드
-load_dotenv()
+# pandas / python-binance / python-dotenv는 임포트가 느려(합계 1초 안팎) 쓰는 곳에서 불러옵니다.
+# 임포트 시에는 부작용이 없고, .env 로드 / 로그 디렉토리 생성 / 로깅 설정은 configure()에서 합니다.
 
-# 로깅 설정
-import os
-import sys
-import logging
-
-# Windows 콘솔 인코딩 설정
-if sys.platform == 'win32':
-    import codecs
-    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
-    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
-
-# 로그 디렉토리 생성
+# 로그 디렉토리 / 파일 경로
 log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
-os.makedirs(log_dir, exist_ok=True)
-
-# 로그 파일 경로
 log_file = os.path.join(log_dir, 'testnet_trading_bot.log')
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8', mode='a'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
 # 로거 설정
 logger = logging.getLogger(__name__)
 
-# 초기 로그 메시지
-logger.info("="*50)
-logger.info("바이낸스 테스트넷 봇 로깅 시작")
-logger.info("="*50)
+_structured_logging = None
+
+
+def configure():
+    """.env 로드 + 로그 디렉토리 생성 + 로깅 설정 (처음 한 번만) → 구조화 로깅 여부
+
+    BOT_LOG_MODE=structured 이면 비동기 JSON Lines 로깅입니다. 봇을 만들 때
+    자동으로 호출되고, 로그 수준을 바꾸려는 도구는 먼저 직접 호출합니다.
+    """
+    global _structured_logging
+    if _structured_logging is not None:
+        return _structured_logging
+    
+    # 환경변수 로드
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    # Windows 콘솔 인코딩 설정
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+        sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+    
+    os.makedirs(log_dir, exist_ok=True)
+    _structured_logging = configure_from_env(log_file)
+    
+    # 초기 로그 메시지
+    logger.info("="*50)
+    logger.info("바이낸스 테스트넷 봇 로깅 시작")
+    logger.info("="*50)
+    return _structured_logging
 
 class BinanceTestnetBot:
-    def __init__(self):
-        """바이낸스 테스트넷 봇 초기화"""
+    def __init__(self, client=None, clock=None, journal=None):
+        """바이낸스 테스트넷 봇 초기화
+        
+        client / clock을 넘기면 실제 테스트넷 대신 시뮬레이터나 리플레이
+        클라이언트, 가상 시계로 같은 봇 코드를 실행합니다. journal을 넘기지
+        않으면 logs/trade_journal.db를 씁니다.
+        """
+        started = time.perf_counter()
+        structured_logging = configure()
+        
+        # 시계 (기본: 실제 시간)
+        self.clock = clock or SystemClock()
+        
         # API 키 설정
         self.api_key = os.getenv('BINANCE_TESTNET_API_KEY')
         self.api_secret = os.getenv('BINANCE_TESTNET_SECRET_KEY')
         
-        if not self.api_key or not self.api_secret:
-            logger.error("❌ API 키가 설정되지 않았습니다. .env 파일을 확인하세요.")
-            raise ValueError("API 키 누락")
-        
-        # 바이낸스 테스트넷 클라이언트 초기화
-        self.client = Client(
-            self.api_key, 
-            self.api_secret,
-            testnet=True  # 테스트넷 모드
-        )
-        
-        # 테스트넷 URL 설정
-        self.client.API_URL = 'https://testnet.binance.vision/api'
+        if client is not None:
+            self.client = client
+        else:
+            if not self.api_key or not self.api_secret:
+                logger.error("❌ API 키가 설정되지 않았습니다. .env 파일을 확인하세요.")
+                raise ValueError("API 키 누락")
+            
+            # 바이낸스 테스트넷 클라이언트 초기화
+            from binance.client import Client
+            binance_client = Client(
+                self.api_key, 
+                self.api_secret,
+                testnet=True  # 테스트넷 모드
+            )
+            
+            # 테스트넷 URL 설정
+            binance_client.API_URL = 'https://testnet.binance.vision/api'
+            
+            # 요청 가중치 스케줄러(한도 관리, 주문 우선, 중복 조회 병합 / 캐시) +
+            # 전송 계층(keep-alive 풀, 타임아웃, 일시 오류 재시도, 멱등 주문, 서킷 브레이커, 서버 시간 보정)
+            self.client = resilient_client(binance_client)
+            metrics.add_source('transport', self.client.snapshot)
         
         # 거래 파라미터
         self.symbol = 'BTCUSDT'  # 거래 페어
+        self.interval = '15m'    # 분석 캔들 주기
+        
+        # 시세 녹화 (BOT_RECORD=경로.rec, replay.py로 같은 입력을 그대로 재생)
+        self.recorder = None
+        record_path = os.getenv('BOT_RECORD')
+        if record_path:
+            self.recorder = Recorder(record_path, self.symbol)
+            self.client = RecordingClient(self.client, self.recorder, self.clock)
+            logger.info(f"⏺️ 시세 녹화: {record_path}")
         
         # 자산 및 거래 설정
-        self.total_asset = 3_600  # 총 자산 (USD)
         self.daily_target = 20    # 일일 목표 수익 (USD)
         
         # 일일 수익 추적
         self.daily_profit = 0  # 오늘 누적 수익
         self.last_trade_date = None  # 마지막 거래 날짜
         
-        # 현재 BTC 가격 조회 (실시간으로 가져오기)
+        # 심볼 메타데이터 (tickSize / stepSize / 최소 주문 금액, data/exchange_info.json에 하루 캐시)
+        # 주입된 클라이언트(시뮬레이터 등)의 값은 디스크에 남기지 않음
+        self.symbol_index = SymbolIndex(
+            loader=self.client.get_exchange_info,
+            path=SYMBOL_INDEX_PATH if client is None else None
+        )
+        
+        # 리스크 / 수량 엔진 (실시간 잔고, 변동성 조정 수량, 거래소 수량 규칙, 노출 / 일일 손실 한도)
+        # BOT_CAPITAL을 주면 그 금액까지만 운용 (기본: 견적 자산 잔고 전체)
+        capital = os.getenv('BOT_CAPITAL')
+        self.risk = RiskEngine(
+            quote_asset='USDT',
+            risk_fraction=0.02,  # 1회 거래 금액 = 운용 자본의 2% (변동성에 따라 조정)
+            capital=float(capital) if capital else None,
+            clock=self.clock,
+            rules=self.symbol_index
+        )
+        self.balance_refresh_interval = 300  # 잔고 재조회 주기 (초, 사용자 데이터 스트림이 없을 때)
+        self.balances_updated = None
+        
+        # 현재 BTC 가격 / 잔고 / 수량 규칙 조회 (실시간으로 가져오기)
+        # 실제 시계면 동시에 요청하고, 가상 시계(시뮬레이터 / 리플레이)면 요청 순서가
+        # 곧 시간이므로 재현성을 위해 차례로 요청
         try:
-            ticker = self.client.get_symbol_ticker(symbol=self.symbol)
-            btc_price = float(ticker['price'])
+            btc_price = self.startup_checks(concurrent=isinstance(self.clock, SystemClock))
             
-            # 거래 금액 계산 (총 자산의 2%)
-            trade_amount = self.total_asset * 0.02
-            self.quantity = round(trade_amount / btc_price, 5)
+            # 거래 수량 계산 (주문마다 다시 계산, 여기서는 시작 시점 추정치)
+            self.quantity = self.risk.size(self.symbol, btc_price)
             
             logger.info(f"💰 총 자산: ${self.total_asset:,.2f}")
             logger.info(f"🎯 일일 목표 수익: ${self.daily_target:,.2f}")
-            logger.info(f"💸 1회 거래 금액: ${trade_amount:,.2f}")
+            logger.info(f"💸 1회 거래 금액: ${self.quantity * btc_price:,.2f}")
             logger.info(f"🔢 거래 수량: {self.quantity} BTC")
             logger.info(f"💵 현재 BTC 가격: ${btc_price:,.2f}")
         
         except Exception as e:
             # 기본값으로 설정
             self.quantity = 0.0001  # 소액으로 안전하게 설정
-            logger.warning(f"❗ BTC 가격 조회 실패. 기본 거래 수량 사용: {self.quantity}")
+            logger.warning(f"❗ BTC 가격 / 잔고 조회 실패. 기본 거래 수량 사용: {self.quantity}")
+        
+        # 실시간 손익 분석 (평가 자산 / 낙폭 / 롤링 샤프·소르티노 / 청산 사유별 통계, 갱신마다 O(1))
+        # 지연 시간 스냅샷 / /metrics에 'analytics' 항목으로 함께 노출
+        self.analytics = PnLAnalytics(self.total_asset, clock=self.clock)
+        metrics.add_source('analytics', self.analytics.snapshot)
         
         self.rsi_period = 14
         self.rsi_oversold = 30  # RSI 과매도 기준
         self.rsi_overbought = 70  # RSI 과매수 기준
+        self.bb_multiplier = BB_ENTRY_MULTIPLIER  # 볼린저 밴드 하단 대비 진입 허용 배수
         
         # 손익 설정
         self.take_profit_percent = 3.0  # 익절 3%
         self.stop_loss_percent = 1.5  # 손절 1.5%
         
+        # 거래소 보호 주문 (BOT_PROTECTIVE_EXITS=1, 비동기 실행기 필요)
+        # 익절 / 손절을 OCO로 걸어두고 체결 통보로 청산 처리
+        self.protective_exits = os.getenv('BOT_PROTECTIVE_EXITS') == '1'
+        self.stop_limit_buffer_percent = 0.1  # 스톱 발동 후 지정가 여유폭
+        
+        # 증분 지표 엔진 (마감 캔들마다 O(1) 갱신)
+        self.indicators = IncrementalIndicators(rsi_period=self.rsi_period)
+        
+        # 멀티 타임프레임 (BOT_TIMEFRAMES=1m,5m,1h,4h)
+        # 가장 짧은 주기 캔들만 받아 거래 주기를 포함한 모든 주기를 메모리에서 집계
+        self.mtf = None
+        self.candle_interval = self.interval
+        timeframes = [tf.strip() for tf in os.getenv('BOT_TIMEFRAMES', '').split(',') if tf.strip()]
+        if timeframes:
+            timeframes.append(self.interval)
+            self.candle_interval = min(timeframes, key=interval_to_ms)
+            self.mtf = MultiTimeframe(self.candle_interval, timeframes, rsi_period=self.rsi_period)
+            self.indicators = self.mtf.indicators[self.interval]
+        
+        # 전략 플러그인 (BOT_STRATEGY=이름, 기본 rsi_macd_bb)
+        # BOT_SHADOW=1이면 파라미터 변형들을 실제 주문 없이 나란히 평가
+        strategy_name = os.getenv('BOT_STRATEGY', RsiMacdBollinger.name)
+        if strategy_name not in STRATEGIES:
+            raise ValueError(f"알 수 없는 전략: {strategy_name} (사용 가능: {', '.join(sorted(STRATEGIES))})")
+        strategy_cls = STRATEGIES[strategy_name]
+        if strategy_cls is RsiMacdBollinger:
+            self.strategy = strategy_cls(rsi_oversold=self.rsi_oversold, bb_multiplier=self.bb_multiplier)
+        else:
+            self.strategy = strategy_cls()
+        shadows = [default_shadow_grid()] if os.getenv('BOT_SHADOW') == '1' else []
+        self.strategy_engine = StrategyEngine(
+            self.strategy, shadows, primary=self.indicators,
+            take_profit_percent=self.take_profit_percent,
+            stop_loss_percent=self.stop_loss_percent,
+            quantity=self.quantity
+        )
+        if self.mtf is not None:
+            self.mtf.subscribe(self.interval, self.strategy_engine.update)
+        
+        # 로컬 L2 호가창 (BOT_DEPTH=1): 스프레드 / 잔량 불균형 / 예상 슬리피지를 판단과 주문에 반영
+        # 스트리밍 모드는 diff-depth 스트림으로, 폴링 모드는 체크마다 REST 스냅샷으로 갱신
+        self.depth = None
+        if os.getenv('BOT_DEPTH') == '1':
+            self.depth = DepthSync(
+                self.symbol,
+                lambda limit: self.client.get_order_book(symbol=self.symbol, limit=limit)
+            )
+        self.max_slippage_bps = float(os.getenv('BOT_MAX_SLIPPAGE_BPS', '10'))  # 예상 슬리피지 진입 한도
+        
+        # 로컬 캔들 저장소 (마지막 저장 캔들 이후만 조회)
+        self.kline_store = KlineStore()
+        
+        # 구조화 로깅 모드 (판단 1회당 JSON 레코드 1개)
+        self.structured_logging = structured_logging
+        
+        # 웹소켓 스트림 (run_streaming에서 생성)
+        self.stream = None
+        
+        # 비동기 주문 실행기 (BOT_EXECUTION=async 일 때 start_execution에서 생성)
+        self.executor = None
+        
         # 포지션 관리
         self.position = None
-        self.trade_history = []
+        
+        # 주기 / 이벤트 처리 오류 허용 (전송 계층 재시도 뒤에도 남은 오류)
+        # 연속 max_consecutive_errors번 실패하면 종료 경로(포지션 청산)로 넘김
+        self.max_consecutive_errors = 5
+        self.consecutive_errors = 0
+        
+        # 거래 / 포지션 저널 (최근 거래만 메모리에 유지)
+        self.journal = journal or TradeJournal(os.path.join(log_dir, 'trade_journal.db'))
+        self.trade_history = self.journal.recent
+        self.analytics.load_history(self.journal)
+        self.recover_state()
+        
+        # 이전 실행이 남긴 로컬 캔들로 지표 미리 채우기 (주입된 클라이언트는 저장소를 따로 씀)
+        warmed = self.warm_start() if client is None else 0
         
         logger.info("✅ 바이낸스 테스트넷 봇 초기화 완료")
         logger.info(f"📊 거래 페어: {self.symbol}")
         logger.info(f"💰 거래 수량: {self.quantity} BTC")
+        logger.info(f"⚡ 시작 준비: {time.perf_counter() - started:.2f}초 (지표 워밍업 캔들 {warmed}개)")
+    
+    @property
+    def total_asset(self):
+        """운용 자본 (견적 자산 잔고 + 포지션 평가액, BOT_CAPITAL 상한)"""
+        return self.risk.equity
+    
+    def startup_checks(self, concurrent=True):
+        """시작 시 네트워크 조회 (exchangeInfo / 잔고 / 현재가) → 현재가"""
+        tasks = (
+            self.symbol_index.load,
+            self.refresh_balances,
+            lambda: self.client.get_symbol_ticker(symbol=self.symbol),
+        )
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix='startup') as pool:
+                futures = [pool.submit(task) for task in tasks]
+                results = [future.result() for future in futures]
+        else:
+            results = [task() for task in tasks]
+        return float(results[-1]['price'])
+    
+    def warm_start(self):
+        """로컬 캔들 저장소(이전 실행의 스냅샷)로 지표 상태를 네트워크 없이 채움 → 반영한 캔들 수
+        
+        첫 tick은 저장된 마지막 캔들 이후만 받아 이어서 반영합니다.
+        """
+        series = self.kline_store.series(self.symbol, self.candle_interval)
+        if not len(series):
+            return 0
+        if self.mtf is not None:
+            window = series.window(self.mtf.history_needed())
+            self.mtf.sync_closed(window)
+        else:
+            window = series.window(99)
+            self.indicators.sync_closed(window['open_time'], window['close'])
+            self.strategy_engine.sync_closed(window['open_time'], window['close'])
+        if self.recorder is not None:
+            # 첫 tick은 저장소 이후 캔들만 받으므로 워밍업 구간은 여기서 녹화
+            self.recorder.record_window(window, self.candle_interval, self.clock.time_ms())
+        return len(window['close'])
+    
+    def refresh_balances(self):
+        """계정 잔고 조회 → 리스크 엔진 반영"""
+        self.risk.update_account(self.client.get_account())
+        self.balances_updated = self.clock.time()
+    
+    def order_quantity(self, price, analysis=None):
+        """이번 주문 수량 (변동성 / 한도 / 잔고 / 거래소 수량 규칙 반영, 불가능하면 0)"""
+        volatility = None
+        if analysis:
+            volatility = bollinger_volatility(analysis['bb_upper'], analysis['bb_middle'],
+                                              analysis['bb_lower'], self.indicators.bb_std)
+        return self.risk.size(self.symbol, price, volatility)
     
     def calculate_rsi(self, prices, period=14):
         """RSI(Relative Strength Index) 계산"""
+        import pandas as pd
+        
         deltas = np.diff(prices)
         gain = np.where(deltas > 0, deltas, 0)
         loss = np.where(deltas < 0, -deltas, 0)
@@ -141,6 +342,8 @@ class BinanceTestnetBot:
     
     def calculate_macd(self, prices):
         """MACD(Moving Average Convergence Divergence) 계산"""
+        import pandas as pd
+        
         prices_series = pd.Series(prices)
         
         ema_12 = prices_series.ewm(span=12, adjust=False).mean()
@@ -153,6 +356,8 @@ class BinanceTestnetBot:
     
     def calculate_bollinger_bands(self, prices, period=20):
         """볼린저 밴드 계산"""
+        import pandas as pd
+        
         prices_series = pd.Series(prices)
         
         sma = prices_series.rolling(window=period).mean()
@@ -164,7 +369,9 @@ class BinanceTestnetBot:
         return upper_band.iloc[-1], sma.iloc[-1], lower_band.iloc[-1]
     
     def get_market_data(self, interval='15m', limit=100):
-        """시장 데이터 가져오기"""
+        """시장 데이터 가져오기 (DataFrame, 분석 경로는 kline_store / kline_decoder 사용)"""
+        import pandas as pd
+        
         try:
             klines = self.client.get_klines(
                 symbol=self.symbol,
@@ -188,58 +395,151 @@ class BinanceTestnetBot:
             return None
     
     def get_current_price(self):
-        """현재 가격 조회"""
+        """현재 가격 조회 (스트림이 살아 있으면 스트림 가격 사용)"""
+        if self.stream is not None:
+            price = self.stream.get_price()
+            if price is not None:
+                return price
+        
         try:
-            ticker = self.client.get_symbol_ticker(symbol=self.symbol)
+            with stage('ticker'):
+                ticker = self.client.get_symbol_ticker(symbol=self.symbol)
             return float(ticker['price'])
         except Exception as e:
             logger.error(f"❌ 현재 가격 조회 실패: {e}")
             return None
     
+    def sync_candles(self, limit=100):
+        """로컬 저장소 증분 동기화 → (최근 마감 캔들 뷰, 진행 중인 캔들)
+        
+        멀티 타임프레임 모드에서는 가장 짧은 주기 캔들을 가장 긴 주기 지표에
+        필요한 만큼 받습니다 (처음 한 번만, 이후에는 증분).
+        """
+        if self.mtf is not None:
+            limit = self.mtf.history_needed() + 1
+        series = self.kline_store.series(self.symbol, self.candle_interval)
+        try:
+            live = series.sync(self.client, history=limit, now_ms=self.clock.time_ms())
+        except Exception as e:
+            logger.error(f"❌ 시장 데이터 가져오기 실패: {e}")
+            return None, None
+        
+        return series.window(limit - 1), live
+    
     def analyze_market(self):
         """종합 시장 분석"""
-        df = self.get_market_data()
-        if df is None or len(df) < 50:
+        window, live = self.sync_candles()
+        if window is None:
             return None
         
-        prices = df['close'].values
-        current_price = prices[-1]
+        # 기술적 지표 계산 (진행 중인 캔들은 peek으로만 반영)
+        if self.mtf is not None:
+            with stage('indicators'):
+                self.mtf.sync_closed(window)
+            if self.indicators.count + 1 < 50:
+                return None
+        else:
+            if len(window['close']) + 1 < 50:
+                return None
+            with stage('indicators'):
+                self.indicators.sync_closed(window['open_time'], window['close'])
+                self.strategy_engine.sync_closed(window['open_time'], window['close'])
         
-        # 기술적 지표 계산
-        rsi = self.calculate_rsi(prices, self.rsi_period)
-        macd, signal = self.calculate_macd(prices)
-        upper_bb, middle_bb, lower_bb = self.calculate_bollinger_bands(prices)
+        current_price = float(live[4]) if live else self.get_current_price()
+        if current_price is None:
+            return None
+        
+        # 스트림이 호가창을 유지하지 않으면 REST 스냅샷으로 갱신
+        if self.depth is not None and (self.stream is None or not self.stream.is_fresh()):
+            with stage('depth'):
+                self.depth.poll()
+        
+        return self.build_analysis(current_price)
+    
+    def build_analysis(self, current_price):
+        """현재가 기준 지표 스냅샷 생성"""
+        self.risk.mark(self.symbol, current_price)
+        self.analytics.on_price(current_price)
+        with stage('indicators'):
+            indicators = self.indicators.peek(current_price)
+            timeframes = self.mtf.snapshot(current_price) if self.mtf is not None else None
         
         analysis = {
             'current_price': current_price,
-            'rsi': rsi,
-            'macd': macd,
-            'macd_signal': signal,
-            'bb_upper': upper_bb,
-            'bb_middle': middle_bb,
-            'bb_lower': lower_bb,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            **indicators,
+            'timestamp': self.clock.now().strftime('%Y-%m-%d %H:%M:%S')
         }
+        if timeframes is not None:
+            analysis['timeframes'] = timeframes
+        if self.depth is not None:
+            book = self.depth.signals(self.quantity)
+            if book is not None:
+                analysis['book'] = book
         
-        logger.info(f"📈 현재가: ${current_price:,.2f} | RSI: {rsi:.2f} | MACD: {macd:.2f}")
+        if self.structured_logging:
+            log_event(logger, 'analysis', level=logging.DEBUG, **analysis)
+        else:
+            rsi = analysis['rsi']
+            macd = analysis['macd']
+            logger.info(f"📈 현재가: ${current_price:,.2f} | RSI: {rsi:.2f} | MACD: {macd:.2f}")
+            if timeframes is not None:
+                logger.info("🕒 RSI " + " | ".join(
+                    f"{tf}: {values['rsi']:.1f}" for tf, values in timeframes.items()
+                ))
         
         return analysis
     
+    def recover_state(self):
+        """저널에서 열린 포지션 / 일일 누적 수익 복구"""
+        state = self.journal.load_state()
+        if not state:
+            return
+        
+        self.position = state.get('position')
+        self.daily_profit = state.get('daily_profit', 0)
+        if state.get('last_trade_date'):
+            self.last_trade_date = datetime.strptime(state['last_trade_date'], '%Y-%m-%d').date()
+        
+        if self.last_trade_date == trading_day(self.clock):
+            self.risk.record_pnl(self.daily_profit)
+        if self.position:
+            self.risk.set_position(self.symbol, self.position['quantity'], self.position['entry_price'])
+            self.analytics.set_position(self.position['quantity'], self.position['entry_price'])
+            logger.info(f"♻️ 열린 포지션 복구: {self.position['side']} {self.position['quantity']} "
+                        f"@ ${self.position['entry_price']:,.2f} ({self.position['time']})")
+        logger.info(f"♻️ 오늘의 누적 수익 복구: ${self.daily_profit:,.2f}")
+    
+    def save_state(self):
+        """현재 포지션 / 일일 누적 수익을 저널에 기록"""
+        self.journal.save_state(
+            position=self.position,
+            daily_profit=self.daily_profit,
+            last_trade_date=self.last_trade_date.isoformat() if self.last_trade_date else None
+        )
+    
     def is_daily_target_reached(self):
         """일일 목표 수익 달성 여부 확인"""
-        # 날짜 확인 및 초기화
-        today = datetime.now().date()
+        # 날짜 확인 및 초기화 (UTC 거래일, 백테스트와 같은 경계)
+        today = trading_day(self.clock)
         
         # 날짜가 바뀌면 일일 수익 초기화
         if self.last_trade_date != today:
             self.daily_profit = 0
             self.last_trade_date = today
+            self.save_state()
         
         # 일일 목표 수익 도달 여부 확인
         return self.daily_profit >= self.daily_target
 
+    @timed('signal')
     def generate_signal(self, analysis):
-        """매수 신호 생성"""
+        """매수 신호 생성 (self.strategy 플러그인으로 판단)"""
+        # 섀도 전략은 목표 달성 여부와 관계없이 같은 스냅샷으로 평가
+        snapshot = self.strategy_engine.snapshot(analysis) if analysis else None
+        if snapshot is not None and self.strategy_engine.batches:
+            with stage('shadow'):
+                self.strategy_engine.step_shadows(snapshot)
+        
         # 일일 목표 수익 달성 시 매수 금지
         if self.is_daily_target_reached():
             logger.info("🚫 오늘의 목표 수익 달성. 더 이상 매수하지 않습니다.")
@@ -256,6 +556,9 @@ class BinanceTestnetBot:
         bb_middle = analysis['bb_middle']
         bb_upper = analysis['bb_upper']
         
+        if self.structured_logging:
+            return self._generate_signal_structured(snapshot)
+        
         # 상세 로깅: 현재 시장 상태
         logger.info("📊 현재 시장 상태:")
         logger.info(f"   💰 현재 가격: ${current_price:,.2f}")
@@ -265,150 +568,523 @@ class BinanceTestnetBot:
         logger.info(f"   🟢 볼린저 밴드 하단: ${bb_lower:,.2f}")
         logger.info(f"   ⚪ 볼린저 밴드 중간: ${bb_middle:,.2f}")
         logger.info(f"   🔴 볼린저 밴드 상단: ${bb_upper:,.2f}")
+        book = analysis.get('book')
+        if book is not None:
+            slippage = book['slippage_bps']
+            logger.info(f"   📚 호가: 스프레드 {book['spread_bps']:.2f}bp | 잔량 불균형 {book['imbalance']:+.2f} | "
+                        f"예상 슬리피지 " + (f"{slippage:.2f}bp" if slippage is not None else "잔량 부족"))
         
         # 매수 신호 조건 상세 로깅
         logger.info("\n🕵️ 매수 신호 조건 분석:")
         
-        # RSI 조건 확인 (과매도 상태)
-        rsi_condition = rsi < 30  # 과매도 기준 30 미만
-        logger.info(f"   1. RSI 조건: {rsi_condition}")
-        logger.info(f"      - 현재 RSI: {rsi:.2f}")
-        logger.info(f"      - 과매도 기준: 30")
-        
-        # MACD 조건 확인
-        macd_condition = macd > signal
-        logger.info(f"   2. MACD 조건: {macd_condition}")
-        logger.info(f"      - MACD: {macd:.2f}")
-        logger.info(f"      - MACD 시그널: {signal:.2f}")
-        
-        # 볼린저 밴드 조건 확인
-        bb_condition = current_price <= bb_lower * 1.02
-        logger.info(f"   3. 볼린저 밴드 조건: {bb_condition}")
-        logger.info(f"      - 현재 가격: ${current_price:,.2f}")
-        logger.info(f"      - 볼린저 밴드 하단: ${bb_lower:,.2f}")
-        logger.info(f"      - 볼린저 밴드 하단 * 1.02: ${bb_lower * 1.02:,.2f}")
+        conditions = self.strategy.conditions(snapshot)
+        details = self.strategy.describe(snapshot)
+        for number, (name, condition) in enumerate(conditions.items(), 1):
+            logger.info(f"   {number}. {self.strategy.labels.get(name, name)} 조건: {condition}")
+            for line in details.get(name, ()):
+                logger.info(f"      - {line}")
         
         # 최종 매수 신호 결정
-        if (rsi_condition and macd_condition and bb_condition):
+        if all(conditions.values()):
+            reason = self.liquidity_block_reason(book)
+            if reason:
+                logger.info(f"\n🟡 매수 조건 충족, 유동성 부족으로 보류: {reason}")
+                return None
             logger.info("\n🟢 매수 신호 발생! 모든 조건 충족 🎉")
             return 'BUY'
             
         logger.info("\n🔴 매수 신호 없음. 조건 미충족")
         return None
     
-    def place_order(self, side):
-        """주문 실행 (테스트넷)"""
+    def _generate_signal_structured(self, snapshot):
+        """generate_signal의 구조화 로깅 버전 (판단 1회당 레코드 1개)
+        
+        매수 없음 판단은 BOT_LOG_SAMPLE(예: signal:0.1) 비율로 샘플링하고,
+        매수 신호는 항상 기록합니다.
+        """
+        conditions = self.strategy.conditions(snapshot)
+        book = snapshot.get('book')
+        signal = 'BUY' if all(conditions.values()) else None
+        blocked = self.liquidity_block_reason(book) if signal else None
+        if blocked:
+            signal = None
+        book_fields = {} if book is None else {
+            'spread_bps': book['spread_bps'],
+            'imbalance': book['imbalance'],
+            'slippage_bps': book['slippage_bps'],
+            'blocked': blocked,
+        }
+        
+        log_event(
+            logger, 'signal', sample=signal is None,
+            symbol=self.symbol,
+            price=snapshot['current_price'],
+            rsi=snapshot['rsi'],
+            macd=snapshot['macd'],
+            macd_signal=snapshot['macd_signal'],
+            bb_lower=snapshot['bb_lower'],
+            bb_middle=snapshot['bb_middle'],
+            bb_upper=snapshot['bb_upper'],
+            **{f"{name}_ok": bool(condition) for name, condition in conditions.items()},
+            **book_fields,
+            decision=signal,
+        )
+        return signal
+    
+    def liquidity_block_reason(self, book):
+        """호가창 기준 진입 보류 사유 (호가창이 없거나 통과하면 None)"""
+        if book is None:
+            return None
+        slippage = book['slippage_bps']
+        if slippage is None:
+            return f"호가 잔량 부족 ({self.quantity} BTC)"
+        if slippage > self.max_slippage_bps:
+            return f"예상 슬리피지 {slippage:.2f}bp > 한도 {self.max_slippage_bps:.2f}bp"
+        return None
+    
+    def place_order(self, side, quantity=None, price=None):
+        """주문 실행 (테스트넷)
+        
+        수량은 전송 전에 stepSize로 내림하고 거래소 필터(수량 / 최소 주문 금액,
+        price가 있으면 그 가격 기준)로 검증해, 거절될 주문은 보내지 않습니다.
+        실행기가 있으면 풀링된 세션으로 비동기 전송하고 접수 응답을 기다립니다.
+        체결가는 모든 체결의 VWAP입니다.
+        """
+        quantity = quantity or self.quantity
+        filters = self.symbol_index.get(self.symbol)
         try:
-            order = self.client.order_market(
-                symbol=self.symbol,
-                side=side,
-                quantity=self.quantity
-            )
+            if filters is not None:
+                quantity = filters.round_quantity(quantity, market=True)
+                filters.validate(quantity, price, market=True)
+                quantity = filters.format_quantity(quantity)
+            
+            # 호가창 기준 예상 슬리피지 (체결 뒤 실제 값과 비교해 기록)
+            mid = expected = None
+            if self.depth is not None:
+                mid = self.depth.mid()
+                expected = self.depth.slippage_bps(side, float(quantity))
             
+            with stage('order'):
+                if self.executor is not None:
+                    order = self.execute_market_order(side, quantity)
+                else:
+                    order = self.client.order_market(
+                        symbol=self.symbol,
+                        side=side,
+                        quantity=quantity
+                    )
+            
+            price, filled_qty, commission = fill_summary(order)
             logger.info(f"✅ {side} 주문 체결 성공!")
             logger.info(f"주문 ID: {order['orderId']}")
-            logger.info(f"체결가: ${float(order['fills'][0]['price']):,.2f}")
+            if price is not None:
+                logger.info(f"체결가(VWAP): ${price:,.2f} | 체결 {len(order.get('fills') or ())}건 "
+                            f"{filled_qty} | 수수료 {commission:.8f}")
+                if mid:
+                    actual = (price - mid) / mid * 10_000 * (1 if side == 'BUY' else -1)
+                    logger.info(f"📚 슬리피지: 예상 " + (f"{expected:.2f}bp" if expected is not None else "잔량 부족")
+                                + f" | 실제 {actual:.2f}bp (호가창 중간가 ${mid:,.2f} 기준)")
             
             return order
+        except FilterError as e:
+            logger.error(f"❌ 주문 거부 (거래소 필터, 전송하지 않음): {e}")
+            return None
         except Exception as e:
             logger.error(f"❌ 주문 실패: {e}")
             return None
     
-    def open_position(self, side, price):
-        """포지션 오픈"""
-        order = self.place_order(side)
+    def execute_market_order(self, side, quantity):
+        """실행기로 시장가 주문 → 주문 dict
+
+        접수 응답이 10초 안에 오지 않거나 결과를 모르는 오류로 끝나면 주문이
+        거래소에 들어갔을 수 있으므로, 실패로 보기 전에 같은 clientOrderId로
+        조회합니다. 거래소에 없을 때만 원래 오류를 던집니다.
+        """
+        client_order_id = self.executor.new_client_order_id()
+        future = self.executor.submit_market(self.symbol, side, quantity, client_order_id=client_order_id)
+        try:
+            return future.result(timeout=10).response
+        except Exception as e:
+            state = self.executor.track_order(client_order_id, self.symbol, side, 'MARKET', quantity)
+            if state.status == 'REJECTED':
+                raise   # 거래소에 닿지 않았거나 거절됨 (실행기가 이미 확인)
+            error = e
+        
+        # 시간 초과면 남은 재전송을 멈추고 거래소 기준으로 판단
+        future.cancel()
+        logger.warning(f"⏳ 주문 접수 응답 없음 ({str(error) or type(error).__name__}), "
+                       f"거래소에서 조회: {client_order_id}")
+        try:
+            order = self.executor.query_order(self.symbol, client_order_id).result(timeout=10)
+        except Exception as e:
+            if getattr(e, 'code', None) == UNKNOWN_ORDER:
+                self.executor.discard(client_order_id)
+                raise error
+            logger.error(f"❗ 주문 결과 확인 불가: 거래소에 접수됐을 수 있음 ({client_order_id}): {e}")
+            raise error
+        logger.info(f"🔎 거래소에 접수된 주문 확인: {client_order_id} ({order['status']})")
+        state.apply_response(order)
+        return order
+    
+    def open_position(self, side, price, analysis=None):
+        """포지션 오픈 (수량은 주문마다 리스크 엔진으로 계산, 진입가 / 수량은 실제 체결 기준)"""
+        quantity = self.order_quantity(price, analysis)
+        reason = self.risk.check(self.symbol, side, quantity, price) if quantity else "주문 가능 수량 없음"
+        if reason:
+            logger.warning(f"🛑 매수 보류 (리스크 한도): {reason}")
+            return False
+        self.quantity = quantity
+        
+        order = self.place_order(side, quantity, price)
         
         if order:
+            fill_price, filled_qty, _ = fill_summary(order)
+            price = fill_price or price
             self.position = {
                 'side': side,
                 'entry_price': price,
-                'quantity': self.quantity,
-                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'quantity': filled_qty or quantity,
+                'time': self.clock.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'order_id': order['orderId']
             }
-            logger.info(f"🔓 포지션 오픈: {side} @ ${price:,.2f}")
+            self.risk.on_fill(self.symbol, side, self.position['quantity'], price)
+            self.analytics.on_fill(side, self.position['quantity'], price)
+            logger.info(f"🔓 포지션 오픈: {side} {self.position['quantity']} @ ${price:,.2f}")
+            if self.protective_exits and self.executor is not None:
+                self.place_protection()
+            self.save_state()
             return True
         
         return False
     
     def check_position_exit(self):
-        """포지션 청산 조건 확인"""
-        if not self.position:
+        """포지션 청산 조건 확인 (거래소 보호 주문이 있으면 체결 통보로 처리)"""
+        if not self.position or self.position.get('protection'):
             return
         
         current_price = self.get_current_price()
         if not current_price:
             return
         
-        # 손익 계산
-        pnl_percent = ((current_price - self.position['entry_price']) / 
-                       self.position['entry_price'] * 100)
-        pnl_amount = (current_price - self.position['entry_price']) * self.quantity
-        
         # 익절 조건: 3% 이상 수익 또는 20달러 이상 수익
-        if (pnl_percent >= self.take_profit_percent or 
-            pnl_amount >= self.daily_target):
-            self.close_position(reason='익절')
-        
         # 손절 조건: 1.5% 이상 손실
-        elif pnl_percent <= -self.stop_loss_percent:
-            self.close_position(reason='손절')
+        reason = exit_reason(
+            self.position['entry_price'], current_price, self.position['quantity'],
+            self.take_profit_percent, self.stop_loss_percent, self.daily_target
+        )
+        if reason:
+            self.close_position(reason=reason)
     
     def close_position(self, reason='manual'):
         """포지션 청산"""
         if not self.position:
             return False
         
-        current_price = self.get_current_price()
+        # 거래소 보호 주문이 걸려 있으면 먼저 취소 (이미 체결됐으면 그 체결로 청산)
+        if self.position.get('protection') and not self.cancel_protection():
+            return not self.position
+        
+        quantity = self.position['quantity']
         
         # 매도 주문
-        order = self.place_order('SELL')
+        order = self.place_order('SELL', quantity)
         
         if order:
-            # 손익 계산
-            pnl_percent = ((current_price - self.position['entry_price']) / 
-                           self.position['entry_price'] * 100)
-            pnl_amount = (current_price - self.position['entry_price']) * self.quantity
-            
-            # 일일 누적 수익 업데이트
-            self.daily_profit += pnl_amount
-            
-            # 거래 기록 저장
-            trade_record = {
-                'open_time': self.position['time'],
-                'close_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'side': 'BUY',  # 현물 매수 후 매도
-                'entry_price': self.position['entry_price'],
-                'exit_price': current_price,
-                'quantity': self.quantity,
-                'pnl_percent': pnl_percent,
-                'pnl_amount': pnl_amount,
-                'reason': reason,
-                'daily_profit': self.daily_profit
-            }
-            
-            self.trade_history.append(trade_record)
-            
-            logger.info(f"🔒 포지션 청산: {reason}")
-            logger.info(f"💰 손익: {pnl_percent:+.2f}% (${pnl_amount:+.2f})")
-            logger.info(f"📊 오늘의 누적 수익: ${self.daily_profit:,.2f}")
-            
-            self.position = None
+            # 손익은 실제 체결 VWAP 기준 (체결 정보가 없을 때만 현재가)
+            self.record_close(fill_summary(order)[0] or self.get_current_price(), reason)
             return True
         
+        logger.warning("⚠️ 청산 주문 실패, 포지션 유지 (다음 체크에서 다시 청산 시도)")
         return False
     
+    def record_close(self, exit_price, reason):
+        """청산 체결 반영: 손익 계산, 거래 기록, 포지션 해제"""
+        quantity = self.position['quantity']
+        
+        # 손익 계산
+        pnl_percent = ((exit_price - self.position['entry_price']) / 
+                       self.position['entry_price'] * 100)
+        pnl_amount = (exit_price - self.position['entry_price']) * quantity
+        
+        # 일일 누적 수익 업데이트
+        self.daily_profit += pnl_amount
+        self.risk.on_fill(self.symbol, 'SELL', quantity, exit_price)
+        self.risk.record_pnl(pnl_amount)
+        self.analytics.on_fill('SELL', quantity, exit_price)
+        
+        # 거래 기록 저장
+        trade_record = {
+            'open_time': self.position['time'],
+            'close_time': self.clock.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'side': 'BUY',  # 현물 매수 후 매도
+            'entry_price': self.position['entry_price'],
+            'exit_price': exit_price,
+            'quantity': quantity,
+            'pnl_percent': pnl_percent,
+            'pnl_amount': pnl_amount,
+            'reason': reason,
+            'daily_profit': self.daily_profit
+        }
+        
+        # 거래 행과 포지션 해제를 같은 트랜잭션으로 기록
+        self.position = None
+        self.journal.append_trade(trade_record)
+        self.save_state()
+        self.analytics.on_trade(trade_record)
+        
+        logger.info(f"🔒 포지션 청산: {reason}")
+        logger.info(f"💰 손익: {pnl_percent:+.2f}% (${pnl_amount:+.2f})")
+        logger.info(f"📊 오늘의 누적 수익: ${self.daily_profit:,.2f}")
+    
+    def place_protection(self):
+        """열린 포지션에 익절(지정가) + 손절(스톱 리밋) OCO 매도 주문 걸기"""
+        entry_price = self.position['entry_price']
+        quantity = self.position['quantity']
+        take_profit, stop = exit_prices(
+            entry_price, quantity, self.take_profit_percent, self.stop_loss_percent, self.daily_target
+        )
+        stop_limit = stop * (1 - self.stop_limit_buffer_percent / 100)
+        
+        try:
+            # 가격은 tickSize로 맞추고 각 다리를 전송 전에 검증
+            filters = self.symbol_index[self.symbol]
+            take_profit, stop, stop_limit = (
+                filters.round_price(p) for p in (take_profit, stop, stop_limit)
+            )
+            for leg_price in (take_profit, stop_limit):
+                filters.validate(quantity, leg_price)
+            list_id = self.executor.submit_oco(
+                self.symbol, 'SELL', filters.format_quantity(quantity),
+                filters.format_price(take_profit), filters.format_price(stop),
+                filters.format_price(stop_limit)
+            ).result(timeout=10)
+        except Exception as e:
+            logger.error(f"❌ 보호 주문 실패 (폴링 청산으로 대체): {e}")
+            return False
+        
+        legs = self.executor.list_orders(list_id)
+        self.position['protection'] = {
+            'list_id': list_id,
+            'orders': {leg.client_order_id: leg.type for leg in legs},
+            'take_profit_percent': self.take_profit_percent,
+            'stop_loss_percent': self.stop_loss_percent,
+        }
+        logger.info(f"🛡️ 보호 주문: 익절 ${take_profit:,.2f} / 손절 ${stop:,.2f} (OCO {list_id})")
+        return True
+    
+    def cancel_protection(self):
+        """보호 주문 취소 → 취소됐으면 True (그 사이 체결됐으면 청산 반영 후 False)"""
+        protection = self.position['protection']
+        try:
+            self.executor.cancel_order_list(self.symbol, protection['list_id']).result(timeout=10)
+        except Exception as e:
+            logger.warning(f"⚠️ 보호 주문 취소 실패: {e}")
+            self.reconcile_protection()
+            return False
+        
+        if self.position:
+            self.position.pop('protection', None)
+            self.save_state()
+        return True
+    
+    def update_exit_params(self, take_profit_percent=None, stop_loss_percent=None):
+        """익절 / 손절 기준 변경 (보호 주문이 있으면 취소 후 새 기준으로 다시 걸기)
+        
+        인자 없이 부르면 현재 기준과 다르게 걸린 보호 주문만 다시 겁니다
+        (기준을 바꿔 재시작했을 때 start_execution에서 호출).
+        """
+        if take_profit_percent is not None:
+            self.take_profit_percent = take_profit_percent
+        if stop_loss_percent is not None:
+            self.stop_loss_percent = stop_loss_percent
+        
+        protection = self.position.get('protection') if self.position else None
+        if protection and (protection['take_profit_percent'] != self.take_profit_percent or
+                           protection['stop_loss_percent'] != self.stop_loss_percent):
+            if self.cancel_protection():
+                self.place_protection()
+                self.save_state()
+    
+    def on_protection_fill(self, state):
+        """보호 주문 체결 통보 → 체결 VWAP으로 청산 반영"""
+        reason = '익절' if state.type.startswith('LIMIT') else '손절'
+        logger.info(f"🛡️ 보호 주문 체결 ({state.type})")
+        self.record_close(state.avg_price, reason)
+    
+    def reconcile_protection(self):
+        """보호 주문 상태를 거래소에서 조회해 맞춤 (재시작 / 취소 실패 시)"""
+        protection = self.position.get('protection') if self.position else None
+        if not protection:
+            return
+        
+        for client_order_id, order_type in protection['orders'].items():
+            try:
+                order = self.executor.query_order(self.symbol, client_order_id).result(timeout=10)
+            except Exception as e:
+                logger.warning(f"⚠️ 보호 주문 조회 실패: {e}")
+                return
+            if order['status'] == 'FILLED':
+                state = self.executor.track_order(client_order_id, self.symbol, 'SELL',
+                                                  order_type, order['origQty'])
+                state.apply_response(order)
+                self.on_protection_fill(state)
+                return
+            if order['status'] in ('NEW', 'PARTIALLY_FILLED'):
+                return
+        
+        # 두 주문 모두 체결 없이 끝남 (만료 / 수동 취소) → 폴링 청산으로 복귀
+        logger.warning("⚠️ 보호 주문이 사라졌습니다. 폴링 청산으로 대체")
+        self.position.pop('protection', None)
+        self.save_state()
+    
     def save_trade_report(self):
-        """거래 리포트 저장"""
-        if not self.trade_history:
+        """이번 실행의 거래 리포트 저장 (전체 기록은 저널에 있음)"""
+        trades = self.journal.session_trades()
+        if not trades:
             return
         
-        report_file = f'logs/trade_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        report_file = os.path.join(log_dir, f'trade_report_{self.clock.now().strftime("%Y%m%d_%H%M%S")}.json')
         
         with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(self.trade_history, f, indent=2, ensure_ascii=False)
+            json.dump(trades, f, indent=2, ensure_ascii=False)
         
         logger.info(f"📊 거래 리포트 저장: {report_file}")
+
+    def save_shadow_report(self):
+        """섀도 전략 성과 순위 저장 (BOT_SHADOW=1 일 때만)"""
+        if not self.strategy_engine.batches:
+            return
+
+        self.strategy_engine.log_leaderboard()
+        report_file = os.path.join(log_dir, f'shadow_report_{self.clock.now().strftime("%Y%m%d_%H%M%S")}.json')
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(self.strategy_engine.leaderboard(top=50), f, indent=2, ensure_ascii=False)
+
+        logger.info(f"👥 섀도 리포트 저장: {report_file}")
+
+    def start_execution(self, base_url=TESTNET_API_URL, ws_url=TESTNET_WS_URL):
+        """비동기 주문 실행기 + 사용자 데이터 스트림 시작"""
+        # 서명 시각은 REST 클라이언트(ResilientClient)의 서버 시간 보정값을 함께 씀
+        time_client = self.client if hasattr(self.client, 'sync_time') else None
+        self.executor = OrderExecutor(self.api_key, self.api_secret, base_url=base_url, ws_url=ws_url,
+                                      time_client=time_client)
+        self.executor.start()
+        metrics.add_source('executor', self.executor.snapshot)
+        logger.info(f"⚡ 비동기 주문 실행기 시작 ({base_url})")
+        
+        # 복구된 포지션의 보호 주문 상태 확인 → 익절 / 손절 기준이 바뀌었으면 다시 걸기
+        self.reconcile_protection()
+        self.update_exit_params()
+    
+    def process_executions(self):
+        """사용자 데이터 스트림 체결 통보 처리"""
+        if self.executor is None:
+            return
+        while not self.executor.events.empty():
+            kind, state = self.executor.events.get_nowait()
+            if kind == 'account':
+                self.risk.on_account_event(state)
+                continue
+            protection = self.position.get('protection') if self.position else None
+            if protection and state.client_order_id in protection['orders'] and state.status == 'FILLED':
+                self.on_protection_fill(state)
+            elif state.type != 'MARKET' and state.is_final:
+                logger.info(f"📬 {state.type} {state.side} 주문 {state.status}: "
+                            f"{state.executed_qty} @ {state.avg_price}")
+            # 최종 상태까지 반영한 주문은 실행기 추적 목록에서 제거
+            self.executor.forget(state)
+    
+    def refresh_balances_if_stale(self):
+        """잔고가 balance_refresh_interval초보다 오래됐으면 재조회"""
+        if self.executor is not None and self.executor.stream_connected.is_set():
+            return
+        if self.balances_updated is not None and \
+                self.clock.time() - self.balances_updated < self.balance_refresh_interval:
+            return
+        try:
+            self.refresh_balances()
+        except Exception as e:
+            logger.warning(f"⚠️ 잔고 조회 실패: {e}")
+    
+    def evaluate(self, analysis):
+        """분석 결과로 청산 / 매수 판단"""
+        if not analysis:
+            return
+        
+        # 기존 포지션이 있으면 청산 조건 확인
+        if self.position:
+            self.check_position_exit()
+        
+        # 포지션이 없으면 매수 신호 확인
+        else:
+            signal = self.generate_signal(analysis)
+            
+            if signal == 'BUY':
+                logger.info(f"🎯 매수 신호 발생!")
+                self.open_position(signal, analysis['current_price'], analysis)
+    
+    def tick(self):
+        """REST 폴링 1회 (날짜 확인 → 시장 분석 → 판단)"""
+        with stage('cycle'):
+            # 체결 통보 반영
+            self.process_executions()
+            
+            # 보호 주문이 걸린 포지션은 체결 통보만 기다림 (요청 없음)
+            if self.position and self.position.get('protection'):
+                return
+            
+            # 날짜 초기화 확인
+            self.is_daily_target_reached()
+            
+            # 사용자 데이터 스트림이 없으면 주기적으로 잔고 재조회 (주문 경로 밖에서)
+            self.refresh_balances_if_stale()
+            
+            # 시장 분석
+            self.evaluate(self.analyze_market())
+    
+    def guarded(self, handler, *args):
+        """주기 / 이벤트 처리 1회: 예외는 기록하고 넘어감 → handler 결과 (실패하면 None)
+        
+        일시적 오류는 전송 계층이 이미 재시도했으므로, 여기까지 올라온 예외 하나로
+        봇을 멈추지 않습니다. 연속 max_consecutive_errors번이면 예외를 다시 던져
+        run()의 종료 경로로 넘깁니다.
+        """
+        try:
+            result = handler(*args)
+        except Exception as e:
+            self.consecutive_errors += 1
+            if self.consecutive_errors >= self.max_consecutive_errors:
+                raise
+            logger.error(f"❌ 처리 오류 ({self.consecutive_errors}/{self.max_consecutive_errors}), "
+                         f"다음 체크에서 계속: {e}", exc_info=not isinstance(e, CircuitOpenError))
+            return None
+        self.consecutive_errors = 0
+        return result
+    
+    def start_metrics(self, interval=60):
+        """지연 시간 스냅샷 파일 저장 시작 (BOT_METRICS_PORT가 있으면 HTTP도 노출)"""
+        metrics.start_reporter(os.path.join(log_dir, 'latency_metrics.json'), interval)
+        
+        port = os.getenv('BOT_METRICS_PORT')
+        if port:
+            metrics.serve(int(port))
+    
+    def shutdown(self, reason):
+        """종료 처리: 열린 포지션 청산 후 거래 리포트 저장"""
+        if self.position:
+            logger.info("📤 열린 포지션 청산 중...")
+            self.close_position(reason=reason)
+        
+        self.save_trade_report()
+        self.save_shadow_report()
+        self.analytics.log_summary()
+        self.journal.flush()
+        self.symbol_index.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.executor is not None:
+            self.executor.stop()
+        metrics.write_snapshot(os.path.join(log_dir, 'latency_metrics.json'))
     
     def run(self, check_interval=60):
         """봇 실행"""
@@ -417,56 +1093,128 @@ class BinanceTestnetBot:
         logger.info(f"💰 거래 수량: {self.quantity} BTC")
         logger.info(f"📊 거래 페어: {self.symbol}")
         
+        self.start_metrics()
+        self.symbol_index.start_refresh()
+        if os.getenv('BOT_EXECUTION') == 'async' or self.protective_exits:
+            self.start_execution()
+        
         try:
             while True:
-                # 날짜 초기화 확인
-                self.is_daily_target_reached()
-                
-                # 시장 분석
-                analysis = self.analyze_market()
-                
-                if analysis:
-                    # 기존 포지션이 있으면 청산 조건 확인
-                    if self.position:
-                        self.check_position_exit()
-                    
-                    # 포지션이 없으면 매수 신호 확인
-                    else:
-                        signal = self.generate_signal(analysis)
-                        
-                        if signal == 'BUY':
-                            logger.info(f"🎯 매수 신호 발생!")
-                            self.open_position(signal, analysis['current_price'])
+                self.guarded(self.tick)
                 
                 # 대기
-                time.sleep(check_interval)
+                self.clock.sleep(check_interval)
         
         except KeyboardInterrupt:
             logger.info("\n⏹️ 봇 종료 요청")
-            
-            # 열린 포지션 청산
-            if self.position:
-                logger.info("📤 열린 포지션 청산 중...")
-                self.close_position(reason='수동종료')
-            
-            # 거래 리포트 저장
-            self.save_trade_report()
-            
+            self.shutdown('수동종료')
             logger.info("✅ 봇 종료 완료")
         
         except Exception as e:
             logger.error(f"❌ 예상치 못한 오류: {e}")
             
             # 긴급 포지션 청산
-            if self.position:
-                self.close_position(reason='에러')
+            self.shutdown('에러')
+    
+    def on_kline(self, candle):
+        """kline 이벤트 처리: 마감 캔들은 지표에 반영, 진행 중 캔들로 판단"""
+        if self.mtf is not None:
+            last_open_time = self.mtf.last_open_time
+        else:
+            last_open_time = self.indicators.last_open_time
+        previous_open_time = candle['open_time'] - self.stream.interval_ms
+        
+        # 누락된 마감 캔들이 있으면 REST로 다시 맞춤
+        if last_open_time is None or last_open_time < previous_open_time:
+            logger.warning("⚠️ 캔들 누락 감지. REST로 지표 재동기화")
+            self.tick()
+            return
+        
+        if candle['closed']:
+            if last_open_time == previous_open_time:
+                if self.mtf is not None:
+                    self.mtf.update(candle['open_time'], candle['open'], candle['high'],
+                                    candle['low'], candle['close'], candle['volume'])
+                else:
+                    self.indicators.update(candle['close'], candle['open_time'])
+                    self.strategy_engine.update(candle['close'], candle['open_time'])
+            return
+        
+        self.is_daily_target_reached()
+        self.evaluate(self.build_analysis(candle['close']))
+    
+    def on_book_ticker(self, book):
+        """bookTicker 이벤트 처리: 포지션이 있으면 즉시 청산 조건 확인"""
+        if self.position:
+            self.check_position_exit()
+    
+    def process_event(self, kind, data):
+        """스트림 이벤트 1개 처리 (체결 통보 반영 후 kline / bookTicker 판단)"""
+        self.process_executions()
+        if kind == 'kline':
+            self.on_kline(data)
+        elif kind == 'book':
+            self.on_book_ticker(data)
+    
+    def run_streaming(self, stream_url=STREAM_URL, fallback_interval=60):
+        """웹소켓 스트리밍 모드 실행
+        
+        kline / bookTicker 이벤트마다 신호와 청산을 판단하고,
+        스트림이 끊긴 동안에는 fallback_interval초마다 REST로 폴링합니다.
+        """
+        logger.info("🚀 바이낸스 현물 거래 봇 시작! (스트리밍 모드)")
+        logger.info(f"💰 거래 수량: {self.quantity} BTC")
+        logger.info(f"📊 거래 페어: {self.symbol}")
+        
+        self.stream = MarketStream(self.symbol, self.candle_interval, url=stream_url, depth=self.depth)
+        self.stream.start()
+        self.start_metrics()
+        self.symbol_index.start_refresh()
+        if os.getenv('BOT_EXECUTION') == 'async' or self.protective_exits:
+            self.start_execution()
+        
+        try:
+            # REST로 초기 지표 상태 구성
+            self.tick()
+            last_poll = time.monotonic()
             
-            self.save_trade_report()
+            while True:
+                event = self.stream.get(timeout=1.0)
+                
+                if event is None or event[0] == 'disconnect':
+                    # 스트림 끊김: REST 폴백
+                    if (not self.stream.connected and
+                            time.monotonic() - last_poll >= fallback_interval):
+                        logger.warning("⚠️ 스트림 끊김. REST 폴링으로 대체")
+                        self.guarded(self.tick)
+                        last_poll = time.monotonic()
+                    continue
+                
+                kind, data = event
+                if self.recorder is not None:
+                    self.recorder.record_event(kind, data, self.clock.time_ms())
+                with stage('event'):
+                    self.guarded(self.process_event, kind, data)
+        
+        except KeyboardInterrupt:
+            logger.info("\n⏹️ 봇 종료 요청")
+            self.shutdown('수동종료')
+            logger.info("✅ 봇 종료 완료")
+        
+        except Exception as e:
+            logger.error(f"❌ 예상치 못한 오류: {e}")
+            self.shutdown('에러')
+        
+        finally:
+            self.stream.stop()
+            self.stream = None
 
 def test_connection():
     """테스트넷 연결 테스트"""
     print("🔍 바이낸스 테스트넷 연결 테스트...")
     
+    from dotenv import load_dotenv
+    from binance.client import Client
     load_dotenv()
     api_key = os.getenv('BINANCE_TESTNET_API_KEY')
     api_secret = os.getenv('BINANCE_TESTNET_SECRET_KEY')
@@ -498,11 +1246,16 @@ def test_connection():
         return False
 
 if __name__ == "__main__":
-    # 연결 테스트 먼저 수행
-    if test_connection():
-        print("\n" + "="*50)
+    # 연결 확인은 봇 초기화의 시작 조회(exchangeInfo / 잔고 / 현재가를 동시에 요청)로 대신합니다.
+    # 따로 확인하려면 test_connection()
+    try:
         bot = BinanceTestnetBot()
-        bot.run(check_interval=60)  # 60초마다 체크
+    except ValueError as e:
+        # 설정 오류 (API 키 누락, 알 수 없는 BOT_STRATEGY → 사용 가능한 전략 목록)
+        print(f"\n❌ 봇을 시작할 수 없습니다: {e}")
     else:
-        print("\n❌ 봇을 시작할 수 없습니다. API 설정을 확인하세요.")
-
+        if bot.balances_updated is not None:
+            print("\n" + "="*50)
+            bot.run(check_interval=60)  # 60초마다 체크
+        else:
+            print("\n❌ 봇을 시작할 수 없습니다. API 설정을 확인하세요.")
@@ -0,0 +1,67 @@
+"""
+시계 추상화
+- SystemClock: 실제 시간 (기본값)
+- VirtualClock: 시뮬레이션 / 리플레이용 가상 시간 (sleep이 즉시 시간만 전진, now()는 UTC)
+- trading_day: 일일 목표 / 손실 한도가 초기화되는 거래일 경계 (UTC)
+"""
+
+import time
+from datetime import datetime, timezone
+
+DAY_MS = 86_400_000
+
+
+def utc_datetime(seconds):
+    """유닉스 시각 → UTC datetime (tzinfo 없음, 바이낸스 캔들 / 백테스트 시각과 같은 기준)"""
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(tzinfo=None)
+
+
+def trading_day(clock=None):
+    """거래일 (UTC 날짜)
+
+    바이낸스 일봉, backtest.simulate()의 open_time // DAY_MS와 같은 경계라
+    실행 장비의 시간대와 무관합니다. clock이 None이면 현재 시각 기준입니다.
+    """
+    return utc_datetime(time.time() if clock is None else clock.time()).date()
+
+
+class SystemClock:
+    """실제 시계"""
+
+    def time(self):
+        return time.time()
+
+    def time_ms(self):
+        return int(time.time() * 1000)
+
+    def now(self):
+        return datetime.now()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """가상 시계 (밀리초 정수로 관리해 결과가 항상 재현됨)
+
+    시각은 재생하는 시세 데이터의 시각이므로 now()는 실행 장비의 시간대와
+    무관하게 UTC입니다.
+    """
+
+    def __init__(self, start_ms=0):
+        self.current_ms = int(start_ms)
+
+    def time(self):
+        return self.current_ms / 1000
+
+    def time_ms(self):
+        return self.current_ms
+
+    def now(self):
+        return utc_datetime(self.current_ms / 1000)
+
+    def sleep(self, seconds):
+        self.advance(seconds * 1000)
+
+    def advance(self, ms):
+        self.current_ms += int(ms)
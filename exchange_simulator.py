@@ -0,0 +1,476 @@
+"""
+결정적 거래소 시뮬레이터 (python-binance Client 대체)
+- 봇이 쓰는 Client 메서드(get_klines / get_symbol_ticker / order_market /
+  get_account / get_server_time / get_symbol_info / get_exchange_info)를 같은 응답 형식으로 구현
+- 녹화된 캔들(backtest.load_klines 형식) 또는 합성 가격 경로를 가상 시계로 재생
+- 체결 모델: 호가 스프레드 + 슬리피지, 수수료, 요청 지연 (seed 고정 → 항상 같은 결과)
+- 같은 경로로 웹소켓 kline / bookTicker 프레임 생성 (FakeStreamServer 재생용)
+
+실제 봇 코드(BinanceTestnetBot.tick)를 가상 시간으로 빠르게 돌리기:
+    python exchange_simulator.py --hours 2000 --quiet
+    python exchange_simulator.py --data data/klines/BTCUSDT/1m --hours 500
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+
+from clock import VirtualClock
+from market_stream import interval_to_ms
+
+logger = logging.getLogger(__name__)
+
+QUOTE_ASSETS = ('USDT', 'BUSD', 'USDC', 'FDUSD', 'BTC', 'ETH', 'BNB')
+
+
+def split_symbol(symbol):
+    """'BTCUSDT' → ('BTC', 'USDT')"""
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    return symbol[:-4], symbol[-4:]
+
+
+class SimulatedAPIError(Exception):
+    """바이낸스 API 오류 응답과 같은 code / message를 가진 예외"""
+
+    def __init__(self, code, message):
+        super().__init__(f"APIError(code={code}): {message}")
+        self.code = code
+        self.message = message
+
+
+class SimulatedExchange:
+    """가상 시계 위에서 도는 거래소 (python-binance Client와 같은 메서드)
+
+    paths는 {심볼: {'open_time', 'close'}} 형식의 가격 표본입니다. 시각 t의
+    가격은 t 이전 마지막 표본이고, 캔들의 고가 / 저가는 구간 안 표본의
+    최대 / 최소입니다. 요청마다 시계가 지연 시간만큼 흐르므로 주문은
+    요청 시점이 아닌 도착 시점 가격으로 체결됩니다. 수수료는 단순화를 위해
+    매수 / 매도 모두 호가 자산(USDT)으로 차감합니다.
+    """
+
+    def __init__(self, paths, clock=None, fee_rate=0.001, latency_ms=0.0,
+                 latency_jitter_ms=0.0, spread_bps=1.0, slippage_bps=0.0,
+                 balances=None, seed=0):
+        self.paths = {}
+        for symbol, data in paths.items():
+            open_time = np.ascontiguousarray(data['open_time'], dtype=np.int64)
+            close = np.ascontiguousarray(data['close'], dtype=np.float64)
+            self.paths[symbol] = (open_time, close)
+
+        first = min(open_time[0] for open_time, _ in self.paths.values())
+        self.clock = clock or VirtualClock(first)
+        self.fee_rate = fee_rate
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.spread_bps = spread_bps
+        self.slippage_bps = slippage_bps
+        self.balances = dict(balances or {'USDT': 10_000.0})
+        self.orders = []
+        self.request_count = 0
+        self.API_URL = 'simulated'
+
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def synthetic(cls, symbols=('BTCUSDT',), hours=1_000, warmup_hours=48, step_ms=60_000,
+                  start_price=60_000.0, volatility=0.001, start_ms=1_700_000_000_000,
+                  seed=0, **kwargs):
+        """기하 브라운 운동 경로로 만든 시뮬레이터 (시계는 warmup_hours 뒤에서 시작)"""
+        rng = np.random.default_rng(seed)
+        n = int((hours + warmup_hours) * 3_600_000 // step_ms) + 1
+        open_time = start_ms + np.arange(n, dtype=np.int64) * step_ms
+        paths = {}
+        for i, symbol in enumerate(symbols):
+            base = start_price / (1 + i)
+            paths[symbol] = {
+                'open_time': open_time,
+                'close': base * np.exp(np.cumsum(rng.normal(0, volatility, n))),
+            }
+        clock = VirtualClock(start_ms + warmup_hours * 3_600_000)
+        return cls(paths, clock=clock, seed=seed, **kwargs)
+
+    @property
+    def end_ms(self):
+        """가격 경로가 끝나는 시각"""
+        return min(int(open_time[-1]) for open_time, _ in self.paths.values())
+
+    # ------------------------------------------------------------------
+    # 가격 모델
+    # ------------------------------------------------------------------
+    def _path(self, symbol):
+        path = self.paths.get(symbol)
+        if path is None:
+            raise SimulatedAPIError(-1121, 'Invalid symbol.')
+        return path
+
+    def price_at(self, symbol, ms):
+        open_time, close = self._path(symbol)
+        index = int(np.searchsorted(open_time, ms, side='right')) - 1
+        return float(close[max(index, 0)])
+
+    def price(self, symbol):
+        return self.price_at(symbol, self.clock.time_ms())
+
+    def book(self, symbol):
+        """(최우선 매수호가, 최우선 매도호가)"""
+        price = self.price(symbol)
+        half = price * self.spread_bps / 20_000
+        return price - half, price + half
+
+    def _request(self):
+        """요청 1회: 지연 시간만큼 가상 시계 전진"""
+        self.request_count += 1
+        latency = self.latency_ms
+        if self.latency_jitter_ms:
+            latency += self._rng.uniform(0, self.latency_jitter_ms)
+        if latency:
+            self.clock.advance(latency)
+
+    # ------------------------------------------------------------------
+    # Client 메서드
+    # ------------------------------------------------------------------
+    def ping(self):
+        self._request()
+        return {}
+
+    def get_server_time(self):
+        self._request()
+        return {'serverTime': self.clock.time_ms()}
+
+    def get_klines(self, symbol, interval, limit=500, startTime=None, endTime=None, **kwargs):
+        """kline 배열 (마감 캔들 + 현재 진행 중인 캔들, 바이낸스와 같은 문자열 형식)"""
+        self._request()
+        open_time, close = self._path(symbol)
+        interval_ms = interval_to_ms(interval)
+        limit = min(int(limit), 1000)
+        now = self.clock.time_ms()
+
+        last_open = now - now % interval_ms
+        if endTime is not None:
+            last_open = min(last_open, endTime - endTime % interval_ms)
+        if startTime is not None:
+            first_open = startTime + (-startTime) % interval_ms
+        else:
+            first_open = last_open - (limit - 1) * interval_ms
+        if first_open > last_open:
+            return []
+        last_open = min(last_open, first_open + (limit - 1) * interval_ms)
+
+        opens = np.arange(first_open, last_open + 1, interval_ms, dtype=np.int64)
+        ends = np.minimum(opens + interval_ms - 1, now)
+        first_index = np.maximum(np.searchsorted(open_time, opens, side='right') - 1, 0)
+        last_index = np.maximum(np.searchsorted(open_time, ends, side='right'), first_index + 1)
+
+        rows = []
+        for t, i, j in zip(opens.tolist(), first_index.tolist(), last_index.tolist()):
+            window = close[i:j]
+            rows.append([
+                t, f"{window[0]:.8f}", f"{window.max():.8f}", f"{window.min():.8f}",
+                f"{window[-1]:.8f}", '0.00000000', t + interval_ms - 1,
+                '0.00000000', j - i, '0.00000000', '0.00000000', '0'
+            ])
+        return rows
+
+    def get_symbol_ticker(self, symbol=None, **kwargs):
+        self._request()
+        if symbol is not None:
+            return {'symbol': symbol, 'price': f"{self.price(symbol):.8f}"}
+        return [{'symbol': s, 'price': f"{self.price(s):.8f}"} for s in self.paths]
+
+    def get_orderbook_ticker(self, symbol, **kwargs):
+        self._request()
+        bid, ask = self.book(symbol)
+        return {
+            'symbol': symbol,
+            'bidPrice': f"{bid:.8f}", 'bidQty': '1.00000000',
+            'askPrice': f"{ask:.8f}", 'askQty': '1.00000000',
+        }
+
+    def get_order_book(self, symbol, limit=100, **kwargs):
+        """호가창 스냅샷 (최우선 호가에서 0.1bp 간격, 레벨 잔량은 고정 패턴)"""
+        self._request()
+        bid, ask = self.book(symbol)
+        step = (bid + ask) / 2 * 1e-5
+        levels = min(int(limit), 5000)
+        return {
+            'lastUpdateId': self.request_count,
+            'bids': [[f"{bid - i * step:.8f}", f"{0.02 * (1 + i % 5):.8f}"] for i in range(levels)],
+            'asks': [[f"{ask + i * step:.8f}", f"{0.02 * (1 + i % 5):.8f}"] for i in range(levels)],
+        }
+
+    def symbol_info(self, symbol):
+        """exchangeInfo의 심볼 항목 (LOT_SIZE / PRICE_FILTER / NOTIONAL)"""
+        self._path(symbol)
+        base, quote = split_symbol(symbol)
+        return {
+            'symbol': symbol, 'status': 'TRADING', 'baseAsset': base, 'quoteAsset': quote,
+            'baseAssetPrecision': 8, 'quoteAssetPrecision': 8,
+            'orderTypes': ['LIMIT', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+            'ocoAllowed': True,
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.01000000',
+                 'maxPrice': '1000000.00000000', 'tickSize': '0.01000000'},
+                {'filterType': 'LOT_SIZE', 'minQty': '0.00001000',
+                 'maxQty': '9000.00000000', 'stepSize': '0.00001000'},
+                {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'applyMinToMarket': True,
+                 'maxNotional': '9000000.00000000', 'applyMaxToMarket': False, 'avgPriceMins': 5},
+            ],
+        }
+
+    def get_symbol_info(self, symbol):
+        self._request()
+        return self.symbol_info(symbol)
+
+    def get_exchange_info(self, **kwargs):
+        self._request()
+        return {
+            'timezone': 'UTC',
+            'serverTime': self.clock.time_ms(),
+            'rateLimits': [],
+            'symbols': [self.symbol_info(symbol) for symbol in self.paths],
+        }
+
+    def get_account(self, **kwargs):
+        self._request()
+        return {
+            'accountType': 'SPOT',
+            'canTrade': True,
+            'updateTime': self.clock.time_ms(),
+            'balances': [
+                {'asset': asset, 'free': f"{free:.8f}", 'locked': '0.00000000'}
+                for asset, free in self.balances.items()
+            ],
+        }
+
+    def order_market(self, symbol, side, quantity, newClientOrderId=None, **kwargs):
+        """시장가 주문: 도착 시점 호가 ± 슬리피지로 전량 체결"""
+        self._request()
+        quantity = float(quantity)
+        if quantity <= 0:
+            raise SimulatedAPIError(-1013, 'Invalid quantity.')
+        # 거래소와 같은 LOT_SIZE 검사 (stepSize 0.00001)
+        steps = quantity / 0.00001
+        if abs(steps - round(steps)) > 1e-6:
+            raise SimulatedAPIError(-1013, 'Filter failure: LOT_SIZE')
+
+        base, quote = split_symbol(symbol)
+        bid, ask = self.book(symbol)
+        slip = self.slippage_bps / 10_000
+        price = ask * (1 + slip) if side == 'BUY' else bid * (1 - slip)
+        notional = price * quantity
+        if notional < 5.0:
+            raise SimulatedAPIError(-1013, 'Filter failure: NOTIONAL')
+        commission = notional * self.fee_rate
+
+        if side == 'BUY':
+            if self.balances.get(quote, 0.0) < notional + commission:
+                raise SimulatedAPIError(-2010, 'Account has insufficient balance for requested action.')
+            self.balances[quote] = self.balances.get(quote, 0.0) - notional - commission
+            self.balances[base] = self.balances.get(base, 0.0) + quantity
+        elif side == 'SELL':
+            if self.balances.get(base, 0.0) < quantity - 1e-12:
+                raise SimulatedAPIError(-2010, 'Account has insufficient balance for requested action.')
+            self.balances[base] = self.balances.get(base, 0.0) - quantity
+            self.balances[quote] = self.balances.get(quote, 0.0) + notional - commission
+        else:
+            raise SimulatedAPIError(-1102, f"Invalid side: {side}")
+
+        order_id = len(self.orders) + 1
+        order = {
+            'symbol': symbol,
+            'orderId': order_id,
+            'clientOrderId': newClientOrderId or f"sim{order_id}",
+            'transactTime': self.clock.time_ms(),
+            'price': '0.00000000',
+            'origQty': f"{quantity:.8f}",
+            'executedQty': f"{quantity:.8f}",
+            'cummulativeQuoteQty': f"{notional:.8f}",
+            'status': 'FILLED',
+            'type': 'MARKET',
+            'side': side,
+            'fills': [{
+                'price': f"{price:.8f}",
+                'qty': f"{quantity:.8f}",
+                'commission': f"{commission:.8f}",
+                'commissionAsset': quote,
+            }],
+        }
+        self.orders.append(order)
+        return order
+
+    def order_market_buy(self, **params):
+        return self.order_market(side='BUY', **params)
+
+    def order_market_sell(self, **params):
+        return self.order_market(side='SELL', **params)
+
+    # ------------------------------------------------------------------
+    # 웹소켓 프레임
+    # ------------------------------------------------------------------
+    def stream_frames(self, symbol, interval, start_ms, end_ms, step_ms=1_000):
+        """start_ms ~ end_ms 구간의 결합 스트림 프레임 [(지연 초, 원본 JSON)]
+
+        step_ms마다 진행 중인 kline과 bookTicker를 한 번씩 보내고, 캔들이
+        마감되는 시점에는 x=true kline을 보냅니다. FakeStreamServer(frames,
+        speed=배속)로 재생하면 MarketStream이 실제 스트림처럼 받습니다.
+        """
+        open_time, close = self._path(symbol)
+        interval_ms = interval_to_ms(interval)
+        name = symbol.lower()
+        kline_stream = f"{name}@kline_{interval}"
+        book_stream = f"{name}@bookTicker"
+        half = self.spread_bps / 20_000
+
+        frames = []
+        update_id = 0
+        candle_open = start_ms - start_ms % interval_ms
+        high = low = first = None
+        last_t = start_ms
+        for t in range(start_ms, end_ms + 1, step_ms):
+            price = self.price_at(symbol, t)
+            current_open = t - t % interval_ms
+            if current_open != candle_open:
+                # 직전 캔들 마감 프레임
+                if first is not None:
+                    frames.append((0.0, self._kline_frame(
+                        kline_stream, symbol, interval, candle_open, interval_ms,
+                        first, high, low, self.price_at(symbol, current_open - 1), True)))
+                candle_open = current_open
+                first = high = low = None
+            if first is None:
+                first = high = low = self.price_at(symbol, current_open)
+            high = max(high, price)
+            low = min(low, price)
+
+            delay = (t - last_t) / 1000
+            last_t = t
+            frames.append((delay, self._kline_frame(
+                kline_stream, symbol, interval, candle_open, interval_ms,
+                first, high, low, price, False)))
+            update_id += 1
+            frames.append((0.0, json.dumps({'stream': book_stream, 'data': {
+                'u': update_id, 's': symbol,
+                'b': f"{price * (1 - half):.8f}", 'B': '1.00000000',
+                'a': f"{price * (1 + half):.8f}", 'A': '1.00000000',
+            }})))
+        return frames
+
+    @staticmethod
+    def _kline_frame(stream, symbol, interval, open_time, interval_ms, first, high, low, price, closed):
+        return json.dumps({'stream': stream, 'data': {
+            'e': 'kline', 'E': open_time, 's': symbol,
+            'k': {
+                't': open_time, 'T': open_time + interval_ms - 1, 's': symbol, 'i': interval,
+                'o': f"{first:.8f}", 'h': f"{high:.8f}", 'l': f"{low:.8f}", 'c': f"{price:.8f}",
+                'v': '0.00000000', 'x': closed,
+            },
+        }})
+
+
+def simulate_bot(bot, exchange, hours, check_interval=60):
+    """실제 봇 코드(tick)를 가상 시간으로 hours시간 동안 실행 → 요약 dict
+
+    run()과 같은 순서(tick → check_interval 대기)로 돌고, 대기는 가상
+    시계를 전진시키기만 합니다. 끝날 때 열린 포지션은 청산합니다.
+    """
+    clock = exchange.clock
+    end_ms = min(clock.time_ms() + int(hours * 3_600_000), exchange.end_ms)
+    start_balances = dict(exchange.balances)
+    started_ms = clock.time_ms()
+
+    ticks = 0
+    started = time.perf_counter()
+    while clock.time_ms() < end_ms:
+        bot.tick()
+        ticks += 1
+        bot.clock.sleep(check_interval)
+    if bot.position:
+        bot.close_position(reason='시뮬레이션종료')
+    elapsed = time.perf_counter() - started
+
+    simulated_hours = (clock.time_ms() - started_ms) / 3_600_000
+    _, quote = split_symbol(bot.symbol)
+    trades = bot.journal.session_trades()
+    return {
+        'ticks': ticks,
+        'simulated_hours': simulated_hours,
+        'wall_seconds': elapsed,
+        'simulated_hours_per_minute': simulated_hours / elapsed * 60 if elapsed else None,
+        'requests': exchange.request_count,
+        'orders': len(exchange.orders),
+        'trades': len(trades),
+        'bot_pnl': sum(t['pnl_amount'] for t in trades),
+        'quote_balance_change': exchange.balances.get(quote, 0.0) - start_balances.get(quote, 0.0),
+        'shadow': bot.strategy_engine.leaderboard(5) if bot.strategy_engine.batches else [],
+        'analytics': bot.analytics.snapshot(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='거래소 시뮬레이터로 봇 실행')
+    parser.add_argument('--data', help='CSV / Parquet / 캔들 저장소 디렉터리 (없으면 합성 경로)')
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--hours', type=float, default=1_000)
+    parser.add_argument('--check-interval', type=float, default=60, help='봇 체크 주기(가상 초)')
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--fee', type=float, default=0.001)
+    parser.add_argument('--slippage-bps', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quiet', action='store_true', help='봇 로그는 경고 이상만 출력')
+    args = parser.parse_args(argv)
+
+    options = dict(fee_rate=args.fee, latency_ms=args.latency_ms,
+                   latency_jitter_ms=args.jitter_ms, slippage_bps=args.slippage_bps)
+    if args.data:
+        from backtest import load_klines
+        data = load_klines(args.data)
+        exchange = SimulatedExchange({args.symbol: data}, seed=args.seed, **options)
+        # 지표 워밍업용 과거 구간(100 x 15분) 뒤에서 시작
+        exchange.clock.advance(100 * 15 * 60_000)
+    else:
+        exchange = SimulatedExchange.synthetic((args.symbol,), hours=args.hours, seed=args.seed, **options)
+
+    from binance_testnet_bot import BinanceTestnetBot, configure
+    from kline_store import KlineStore
+    from trade_journal import TradeJournal
+
+    if args.quiet:
+        configure()
+        logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as root:
+        journal = TradeJournal(os.path.join(root, 'trade_journal.db'))
+        bot = BinanceTestnetBot(client=exchange, clock=exchange.clock, journal=journal)
+        bot.kline_store = KlineStore(root)
+        result = simulate_bot(bot, exchange, args.hours, check_interval=args.check_interval)
+        journal.close()
+
+    print(f"⏱️ 가상 {result['simulated_hours']:,.0f}시간 / 실제 {result['wall_seconds']:.1f}초 "
+          f"({result['simulated_hours_per_minute']:,.0f}시간/분, 체크 {result['ticks']:,}회)")
+    print(f"📨 요청 {result['requests']:,}회, 주문 {result['orders']:,}건, 거래 {result['trades']:,}건")
+    print(f"💰 봇 기준 손익: ${result['bot_pnl']:+,.2f} / "
+          f"잔고 변화(수수료·슬리피지 포함): ${result['quote_balance_change']:+,.2f}")
+    stats = result['analytics']
+    sharpe, sortino = (f"{stats[key]:.2f}" if stats[key] is not None else '-' for key in ('sharpe', 'sortino'))
+    print(f"📉 최대 낙폭 {stats['max_drawdown_pct']:.2f}% | 샤프 {sharpe} | 소르티노 {sortino} | "
+          f"보유 시간 {stats['exposure_pct']:.1f}%")
+    for rank, row in enumerate(result['shadow'], 1):
+        print(f"👥 섀도 {rank}위 {row['variant']}: ${row['pnl'] + row['unrealized']:+,.2f} "
+              f"(거래 {row['trades']}회, 승률 {row['win_rate']:.0%})")
+    return result
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,589 @@
+"""
+주문 실행 계층
+- 백그라운드 asyncio 루프 + keep-alive 커넥션 풀(aiohttp)로 서명된 주문을 비동기 전송
+- 사용자 데이터 스트림(executionReport)으로 주문 상태 / 체결 추적
+- 모든 체결을 합친 VWAP 체결가와 수수료 계산
+- 거래소에 걸어두는 보호 주문: OCO(익절 지정가 + 손절 스톱 리밋), 스톱 리밋
+- 신호 → 접수(ack) / 신호 → 체결 통보 지연 시간을 metrics에 기록
+- 전송 계층(transport.py)과 같은 규칙: 서버 시간 보정(-1021이면 즉시 재보정), 일시 오류만
+  지터 백오프 재시도, 서킷 브레이커, 응답이 애매한 주문은 같은 clientOrderId로 조회 후에만 재전송
+
+메인 스레드는 submit_*()이 돌려주는 Future로 접수 결과를 받고, 체결 통보는
+events 큐(('execution', OrderState))에서, 잔고 변경은 ('account', 이벤트)로
+꺼내 처리합니다.
+"""
+
+import hmac
+import json
+import time
+import random
+import uuid
+import queue
+import asyncio
+import hashlib
+import logging
+import itertools
+import threading
+from urllib.parse import urlencode
+
+from metrics import metrics
+from transport import CircuitBreaker, CircuitOpenError, TIMESTAMP_ERROR, UNKNOWN_ORDER, is_transient
+
+logger = logging.getLogger(__name__)
+
+TESTNET_API_URL = 'https://testnet.binance.vision'
+TESTNET_WS_URL = 'wss://stream.testnet.binance.vision'
+
+FINAL_STATUSES = frozenset({'FILLED', 'CANCELED', 'REJECTED', 'EXPIRED', 'EXPIRED_IN_MATCH'})
+
+
+def fill_summary(order):
+    """주문 응답 → (VWAP 체결가, 체결 수량, 수수료)
+
+    fills 전체를 수량 가중 평균합니다. fills가 없는 응답(ACK / RESULT
+    형식)은 cummulativeQuoteQty / executedQty로 계산합니다. 체결이 없으면
+    (None, 0.0, 0.0)입니다.
+    """
+    fills = order.get('fills') or ()
+    qty = quote = commission = 0.0
+    for fill in fills:
+        fill_qty = float(fill['qty'])
+        qty += fill_qty
+        quote += float(fill['price']) * fill_qty
+        commission += float(fill.get('commission', 0.0))
+
+    if not fills:
+        qty = float(order.get('executedQty', 0.0))
+        quote = float(order.get('cummulativeQuoteQty', 0.0))
+
+    if qty <= 0:
+        return None, 0.0, commission
+    return quote / qty, qty, commission
+
+
+class ExchangeError(Exception):
+    """거래소 오류 응답 (python-binance BinanceAPIException과 같은 status_code / code)"""
+
+    def __init__(self, status_code, code, message):
+        super().__init__(f"APIError(code={code}): {message}")
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+
+def _transient(error):
+    """다시 보내 볼 만한 오류 (aiohttp 연결 오류 / 타임아웃 포함)"""
+    import aiohttp
+    if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+        return True
+    return is_transient(error)
+
+
+def _not_sent(error):
+    """거래소에 닿지 않은 게 확실한 오류 (연결 실패 / 연결 시간 초과 / 서킷 차단)"""
+    import aiohttp
+    return isinstance(error, (CircuitOpenError, aiohttp.ClientConnectorError,
+                              aiohttp.ConnectionTimeoutError))
+
+
+class OrderState:
+    """주문 하나의 상태 (REST 응답과 executionReport로 갱신)"""
+
+    __slots__ = ('client_order_id', 'symbol', 'side', 'type', 'status', 'order_id',
+                 'list_client_order_id', 'orig_qty', 'executed_qty', 'cum_quote',
+                 'commission', 'fills', 'response', 'submitted_ns', 'ack_ns', 'done')
+
+    def __init__(self, client_order_id, symbol, side, order_type, orig_qty,
+                 list_client_order_id=None):
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.status = 'PENDING_NEW'
+        self.order_id = None
+        self.list_client_order_id = list_client_order_id
+        self.orig_qty = float(orig_qty)
+        self.executed_qty = 0.0
+        self.cum_quote = 0.0
+        self.commission = 0.0
+        self.fills = {}           # 체결 ID → (가격, 수량, 수수료)
+        self.response = None      # REST 응답 원본
+        self.submitted_ns = time.perf_counter_ns()
+        self.ack_ns = None
+        self.done = threading.Event()
+
+    @property
+    def avg_price(self):
+        """VWAP 체결가 (체결 전이면 None)"""
+        if self.executed_qty <= 0:
+            return None
+        return self.cum_quote / self.executed_qty
+
+    @property
+    def is_final(self):
+        return self.status in FINAL_STATUSES
+
+    def apply_response(self, order):
+        """REST 주문 응답 반영 (FULL 형식이면 fills 포함)"""
+        self.response = order
+        self.order_id = order.get('orderId')
+        if order.get('status') and not self.is_final:
+            self._set_status(order['status'])
+        for i, fill in enumerate(order.get('fills') or ()):
+            self.fills.setdefault(fill.get('tradeId', -1 - i), (
+                float(fill['price']), float(fill['qty']), float(fill.get('commission', 0.0))
+            ))
+        self._update_totals(order.get('executedQty'), order.get('cummulativeQuoteQty'))
+
+    def apply_report(self, report):
+        """executionReport 반영 → 새 체결이 있었으면 True"""
+        self.order_id = report.get('i', self.order_id)
+        traded = report.get('x') == 'TRADE' and report.get('t') not in self.fills
+        if traded:
+            self.fills[report['t']] = (float(report['L']), float(report['l']), float(report.get('n', 0)))
+        self._update_totals(report.get('z'), report.get('Z'))
+        if report['X'] in FINAL_STATUSES or self.status not in FINAL_STATUSES:
+            self._set_status(report['X'])
+        return traded
+
+    def _update_totals(self, executed_qty, cum_quote):
+        # 누적 값은 거래소 기준 (REST 응답과 체결 통보가 어떤 순서로 와도 같은 결과)
+        if executed_qty is not None and float(executed_qty) >= self.executed_qty:
+            self.executed_qty = float(executed_qty)
+            self.cum_quote = float(cum_quote or 0.0)
+        elif executed_qty is None and self.fills:
+            self.executed_qty = sum(q for _, q, _ in self.fills.values())
+            self.cum_quote = sum(p * q for p, q, _ in self.fills.values())
+        self.commission = sum(c for _, _, c in self.fills.values())
+
+    def _set_status(self, status):
+        self.status = status
+        if status in FINAL_STATUSES:
+            self.done.set()
+
+
+class OrderExecutor:
+    """비동기 주문 실행기
+
+    start()하면 별도 스레드에서 이벤트 루프, HTTP 세션, 사용자 데이터
+    스트림(listenKey 발급 / 30분마다 연장)을 엽니다. 주문에는 항상
+    newClientOrderId를 붙여 REST 응답과 체결 통보를 같은 OrderState로
+    모읍니다.
+
+    서명 시각에는 서버 시간 차이를 더합니다. time_client(봇의 ResilientClient)를
+    주면 그 time_offset을 함께 쓰고 -1021이면 그쪽으로 다시 맞추며, 없으면
+    /api/v3/time으로 직접 맞춥니다. 재시도 / 서킷 브레이커 설정은
+    ResilientClient와 같습니다.
+    """
+
+    def __init__(self, api_key, api_secret, base_url=TESTNET_API_URL, ws_url=TESTNET_WS_URL,
+                 pool_size=4, recv_window=5000, user_stream=True, keepalive_interval=1800,
+                 time_client=None, max_retries=3, base_delay=0.2, max_delay=2.0,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url.rstrip('/')
+        self.ws_url = ws_url.rstrip('/')
+        self.pool_size = pool_size
+        self.recv_window = recv_window
+        self.user_stream = user_stream
+        self.keepalive_interval = keepalive_interval
+        self.time_client = time_client
+        self.time_offset = 0
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = CircuitBreaker('executor', failure_threshold, reset_timeout)
+        self.stats = {'retries': 0, 'recovered_orders': 0, 'time_syncs': 0}
+
+        self.orders = {}          # clientOrderId → OrderState (처리가 끝난 최종 상태는 forget()으로 제거)
+        self.events = queue.Queue()
+        self.stream_connected = threading.Event()
+
+        # 실행기마다 다른 접두사 (재시작해도 이전 주문 ID와 겹치지 않음)
+        self._prefix = f"bot{uuid.uuid4().hex[:10]}-"
+        self._ids = itertools.count(1)
+        self._rng = random.Random()
+        self._orders_lock = threading.Lock()   # orders: 메인 스레드(주문) / 루프 스레드(체결 통보)
+        self._loop = None
+        self._session = None
+        self._listen_key = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stopped = None
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+    def start(self, timeout=10):
+        self._thread = threading.Thread(target=self._run, name='order-executor', daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self.user_stream:
+            self.stream_connected.wait(timeout)
+        return self
+
+    def stop(self):
+        """실행기 종료 (이미 멈췄으면 아무것도 하지 않음)"""
+        if self._loop is not None and self._stopped is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        import aiohttp
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'X-MBX-APIKEY': self.api_key or ''},
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+        tasks = []
+        try:
+            if self.user_stream:
+                tasks.append(asyncio.create_task(self._user_stream()))
+            self._ready.set()
+            await self._stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._listen_key:
+                try:
+                    await self._request('DELETE', '/api/v3/userDataStream',
+                                        {'listenKey': self._listen_key}, signed=False)
+                except Exception:
+                    pass
+            await self._session.close()
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def snapshot(self):
+        """재시도 / 복구 / 서킷 상태 요약 (metrics 소스용)"""
+        return dict(self.stats, circuit=self.breaker.state, circuit_opens=self.breaker.opens)
+
+    def _timestamp(self):
+        """서버 시간 기준 현재 시각 (ms)"""
+        offset = self.time_client.time_offset if self.time_client is not None else self.time_offset
+        return int(time.time() * 1000) + offset
+
+    def _sign(self, params):
+        params = dict(params, recvWindow=self.recv_window, timestamp=self._timestamp())
+        query = urlencode(params)
+        signature = hmac.new(self.api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+        return f"{query}&signature={signature}"
+
+    async def _send(self, method, path, params, signed=True):
+        query = self._sign(params) if signed else urlencode(params)
+        url = f"{self.base_url}{path}?{query}" if query else self.base_url + path
+        async with self._session.request(method, url) as response:
+            body = await response.text()
+        if response.status >= 400:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                data = {'msg': body[:200]}   # 게이트웨이 HTML 오류 페이지 등
+            raise ExchangeError(response.status, data.get('code'), data.get('msg'))
+        return json.loads(body)
+
+    async def _request(self, method, path, params, signed=True, resend=True):
+        """재시도 / 서킷 브레이커를 거친 요청
+
+        일시 오류는 지터 백오프로 최대 max_retries번 다시 보내고, -1021이면
+        서버 시간을 다시 맞춘 뒤 바로 보냅니다. resend=False면 거래소에 닿았을
+        수 있는 실패는 다시 보내지 않고 그대로 던집니다 (주문 전송).
+        """
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before()
+                data = await self._send(method, path, params, signed)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                if not _transient(e):
+                    self.breaker.success()   # 거래소가 응답함 (업무 오류)
+                    raise
+                code = getattr(e, 'code', None)
+                if code == TIMESTAMP_ERROR:
+                    # 서명 시각이 recvWindow 밖: 거래소가 거절했으므로 다시 보내도 안전
+                    self.breaker.success()
+                    await self._sync_time()
+                else:
+                    self.breaker.failure()
+                    if not resend and not _not_sent(e):
+                        raise
+
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                delay = 0.0 if code == TIMESTAMP_ERROR else self._backoff(attempt)
+                self.stats['retries'] += 1
+                logger.warning(f"🔁 {method} {path} 일시 오류, {delay:.2f}초 후 재시도 "
+                               f"({attempt}/{self.max_retries}): {str(e) or type(e).__name__}")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.success()
+            return data
+
+    def _backoff(self, attempt):
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return cap / 2 + self._rng.uniform(0, cap / 2)
+
+    async def _sync_time(self):
+        """서버 시간 재보정 (-1021 응답 시)"""
+        try:
+            if self.time_client is not None:
+                # 봇의 REST 클라이언트와 같은 보정값 공유 (블로킹 요청이라 스레드에서)
+                await asyncio.get_running_loop().run_in_executor(None, self.time_client.sync_time)
+            else:
+                started = time.time()
+                data = await self._send('GET', '/api/v3/time', {}, signed=False)
+                finished = time.time()
+                self.time_offset = int(data['serverTime'] - (started + finished) / 2 * 1000)
+            self.stats['time_syncs'] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ 서버 시간 조회 실패: {e}")
+
+    async def _find_order(self, symbol, client_order_id):
+        """같은 clientOrderId 주문 조회 → 주문 dict (거래소에 없으면 None)"""
+        try:
+            return await self._request('GET', '/api/v3/order', {
+                'symbol': symbol, 'origClientOrderId': client_order_id
+            })
+        except ExchangeError as e:
+            if e.code == UNKNOWN_ORDER:
+                return None
+            raise
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def new_client_order_id(self):
+        return f"{self._prefix}{next(self._ids)}"
+
+    # ------------------------------------------------------------------
+    # 주문
+    # ------------------------------------------------------------------
+    def submit_market(self, symbol, side, quantity, client_order_id=None):
+        """시장가 주문 → Future[OrderState] (접수 응답 시 완료)
+
+        client_order_id를 미리 받아 두면(new_client_order_id()) Future가 시간 초과로
+        끝나도 그 ID로 거래소에서 주문을 조회할 수 있습니다.
+        """
+        state = self._track(symbol, side, 'MARKET', quantity, client_order_id=client_order_id)
+        params = {
+            'symbol': symbol, 'side': side, 'type': 'MARKET',
+            'quantity': quantity, 'newClientOrderId': state.client_order_id,
+            'newOrderRespType': 'FULL',
+        }
+        return self._submit(self._place(state, '/api/v3/order', params))
+
+    def submit_stop_limit(self, symbol, side, quantity, price, stop_price, client_order_id=None):
+        """스톱 리밋 주문 (stop_price 도달 시 price 지정가로 전환)"""
+        state = self._track(symbol, side, 'STOP_LOSS_LIMIT', quantity, client_order_id=client_order_id)
+        params = {
+            'symbol': symbol, 'side': side, 'type': 'STOP_LOSS_LIMIT', 'timeInForce': 'GTC',
+            'quantity': quantity, 'price': price, 'stopPrice': stop_price,
+            'newClientOrderId': state.client_order_id,
+        }
+        return self._submit(self._place(state, '/api/v3/order', params))
+
+    def submit_oco(self, symbol, side, quantity, price, stop_price, stop_limit_price):
+        """OCO 주문 (지정가 + 스톱 리밋, 한쪽 체결 시 다른 쪽 취소) → Future[list_client_order_id]"""
+        list_id = self.new_client_order_id()
+        limit_leg = self._track(symbol, side, 'LIMIT_MAKER', quantity, list_id)
+        stop_leg = self._track(symbol, side, 'STOP_LOSS_LIMIT', quantity, list_id)
+        params = {
+            'symbol': symbol, 'side': side, 'quantity': quantity,
+            'price': price, 'stopPrice': stop_price, 'stopLimitPrice': stop_limit_price,
+            'stopLimitTimeInForce': 'GTC', 'listClientOrderId': list_id,
+            'limitClientOrderId': limit_leg.client_order_id,
+            'stopClientOrderId': stop_leg.client_order_id,
+        }
+        return self._submit(self._place_list(list_id, params))
+
+    def cancel_order(self, symbol, client_order_id):
+        return self._submit(self._request('DELETE', '/api/v3/order', {
+            'symbol': symbol, 'origClientOrderId': client_order_id
+        }))
+
+    def cancel_order_list(self, symbol, list_client_order_id):
+        return self._submit(self._request('DELETE', '/api/v3/orderList', {
+            'symbol': symbol, 'listClientOrderId': list_client_order_id
+        }))
+
+    def query_order(self, symbol, client_order_id):
+        """주문 조회 → Future[주문 dict] (거래소에 없으면 ExchangeError, code -2013)"""
+        return self._submit(self._request('GET', '/api/v3/order', {
+            'symbol': symbol, 'origClientOrderId': client_order_id
+        }))
+
+    def open_orders(self, symbol):
+        """미체결 주문 목록 → Future[list]"""
+        return self._submit(self._request('GET', '/api/v3/openOrders', {'symbol': symbol}))
+
+    def list_orders(self, list_client_order_id):
+        """OCO 주문의 다리(OrderState) 목록"""
+        with self._orders_lock:
+            states = list(self.orders.values())
+        return [s for s in states if s.list_client_order_id == list_client_order_id]
+
+    def track_order(self, client_order_id, symbol, side, order_type, orig_qty):
+        """clientOrderId의 OrderState (없으면 새로 추적, 재시작 후 조회한 주문 등)"""
+        with self._orders_lock:
+            state = self.orders.get(client_order_id)
+            if state is None:
+                state = OrderState(client_order_id, symbol, side, order_type, orig_qty)
+                self.orders[client_order_id] = state
+            return state
+
+    def forget(self, state):
+        """처리가 끝난 최종 상태 주문을 추적 목록에서 제거 (오래 도는 봇에서 계속 쌓이지 않게)"""
+        if not state.is_final:
+            return
+        with self._orders_lock:
+            if self.orders.get(state.client_order_id) is state:
+                del self.orders[state.client_order_id]
+
+    def discard(self, client_order_id):
+        """거래소에 없는 것으로 확인된 주문을 거절 처리하고 추적 목록에서 제거"""
+        with self._orders_lock:
+            state = self.orders.pop(client_order_id, None)
+        if state is not None and not state.is_final:
+            state._set_status('REJECTED')
+
+    def _track(self, symbol, side, order_type, quantity, list_id=None, client_order_id=None):
+        state = OrderState(client_order_id or self.new_client_order_id(), symbol, side, order_type,
+                           quantity, list_id)
+        with self._orders_lock:
+            self.orders[state.client_order_id] = state
+        return state
+
+    async def _place(self, state, path, params):
+        attempt = 0
+        while True:
+            try:
+                order = await self._request('POST', path, params, resend=False)
+                break
+            except Exception as e:
+                if not _transient(e) or _not_sent(e):
+                    state._set_status('REJECTED')
+                    raise
+                error = e
+
+            # 응답을 못 받음: 거래소에 들어갔을 수 있으므로 같은 clientOrderId로 먼저 조회
+            try:
+                order = await self._find_order(state.symbol, state.client_order_id)
+            except Exception:
+                logger.error(f"❗ 주문 전송 결과 확인 불가: 거래소에 접수됐을 수 있음 "
+                             f"(clientOrderId {state.client_order_id})")
+                raise error
+            if order is not None:
+                self.stats['recovered_orders'] += 1
+                logger.info(f"🔎 주문 응답 유실, 거래소에 접수된 주문 확인: {state.client_order_id}")
+                break
+            attempt += 1
+            if attempt > self.max_retries:
+                state._set_status('REJECTED')
+                raise error
+            self.stats['retries'] += 1
+            logger.warning(f"🔁 주문이 거래소에 없어 같은 clientOrderId로 다시 전송 "
+                           f"({attempt}/{self.max_retries}): {str(error) or type(error).__name__}")
+        state.ack_ns = time.perf_counter_ns()
+        metrics.record('order_ack', state.ack_ns - state.submitted_ns)
+        state.apply_response(order)
+        return state
+
+    async def _place_list(self, list_id, params):
+        legs = self.list_orders(list_id)
+        try:
+            response = await self._request('POST', '/api/v3/order/oco', params, resend=False)
+        except Exception as e:
+            if _transient(e) and not _not_sent(e):
+                # 거래소에 들어갔을 수 있음 (다리 상태는 체결 통보 / 조회로 맞춤)
+                logger.error(f"❗ OCO 전송 결과 확인 불가: 거래소에 접수됐을 수 있음 "
+                             f"(listClientOrderId {list_id})")
+                raise
+            for leg in legs:
+                leg._set_status('REJECTED')
+            raise
+        now = time.perf_counter_ns()
+        metrics.record('order_ack', now - legs[0].submitted_ns)
+        by_id = {r['clientOrderId']: r for r in response.get('orderReports', ())}
+        for leg in legs:
+            leg.ack_ns = now
+            if leg.client_order_id in by_id:
+                leg.apply_response(by_id[leg.client_order_id])
+        return list_id
+
+    # ------------------------------------------------------------------
+    # 사용자 데이터 스트림
+    # ------------------------------------------------------------------
+    async def _user_stream(self):
+        import aiohttp
+
+        delay = 1.0
+        while True:
+            try:
+                data = await self._request('POST', '/api/v3/userDataStream', {}, signed=False)
+                self._listen_key = data['listenKey']
+                keepalive = asyncio.create_task(self._keepalive())
+                try:
+                    async with self._session.ws_connect(f"{self.ws_url}/ws/{self._listen_key}",
+                                                        heartbeat=30) as ws:
+                        self.stream_connected.set()
+                        delay = 1.0
+                        logger.info("🔌 사용자 데이터 스트림 연결")
+                        async for message in ws:
+                            if message.type == aiohttp.WSMsgType.TEXT:
+                                self._handle(message.json())
+                            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                finally:
+                    keepalive.cancel()
+                    self.stream_connected.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ 사용자 데이터 스트림 끊김: {e} ({delay:.0f}초 후 재연결)")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self._request('PUT', '/api/v3/userDataStream',
+                                    {'listenKey': self._listen_key}, signed=False)
+            except Exception as e:
+                logger.warning(f"⚠️ listenKey 연장 실패: {e}")
+
+    def _handle(self, message):
+        data = message.get('data', message)
+        if data.get('e') == 'outboundAccountPosition':
+            self.events.put(('account', data))
+            return
+        if data.get('e') != 'executionReport':
+            return
+        client_order_id = data['C'] if data.get('x') == 'CANCELED' and data.get('C') else data['c']
+        # 다른 곳에서 낸 주문도 추적
+        state = self.track_order(client_order_id, data['s'], data['S'], data['o'], data['q'])
+        state.apply_report(data)
+        if state.status == 'FILLED':
+            metrics.record('order_fill', time.perf_counter_ns() - state.submitted_ns)
+        self.events.put(('execution', state))
@@ -0,0 +1,199 @@
+"""
+장애 주입 프록시 (REST)
+- 로컬 모의 거래소(또는 다른 REST 서버) 앞에 두고 요청을 그대로 전달하면서 불안정한 네트워크 흉내
+- 요청마다 seed 고정 난수로 장애 하나를 고름:
+  느린 응답 / 멈춤(읽기 타임아웃보다 길게) / 502 게이트웨이 오류 / 503 거래소 내부 오류 /
+  전달 전 연결 끊기 / 전달 후 응답 유실 (주문은 거래소에 들어갔지만 클라이언트는 모름)
+- 장애 종류별 주입 횟수 집계
+- 전송 계층(transport.py) 꼬리 지연 / 멱등성 확인용
+"""
+
+import sys
+import time
+import random
+import asyncio
+import threading
+from collections import Counter
+
+# 장애 종류 (rates 키)
+FAULTS = ('slow', 'stall', 'bad_gateway', 'unavailable', 'reset', 'lost_response')
+
+# 응답으로 돌려줄 업스트림 헤더
+FORWARD_HEADERS = ('Content-Type', 'Retry-After', 'X-MBX-USED-WEIGHT-1M')
+
+
+class FaultProxy:
+    """장애 주입 리버스 프록시 서버
+
+    upstream_url로 요청을 전달합니다. rates는 장애 종류 → 요청당 확률이고
+    (합이 1 이하), 나머지 요청은 그대로 통과합니다. slow는 slow_ms, stall은
+    stall_s만큼 늦게 응답합니다. paths를 주면 그 경로로 시작하는 요청에만
+    장애를 넣습니다. base_url 속성을 클라이언트에 넘기면 됩니다.
+    """
+
+    def __init__(self, upstream_url, rates=None, slow_ms=200.0, stall_s=3.0, paths=None,
+                 seed=0, host='127.0.0.1', port=0):
+        self.upstream_url = upstream_url.rstrip('/')
+        self.rates = dict(rates or {})
+        unknown = set(self.rates) - set(FAULTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 장애 종류: {sorted(unknown)}")
+        self.slow_ms = slow_ms
+        self.stall_s = stall_s
+        self.paths = tuple(paths) if paths else None
+        self.host = host
+        self.port = port
+        self.base_url = None
+
+        self.injected = Counter()
+        self.requests = 0
+        self._rng = random.Random(seed)
+
+        self._loop = None
+        self._stopped = None
+        self._ready = threading.Event()
+        self._thread = None
+        self._session = None
+
+    def pick(self, path):
+        """이번 요청에 넣을 장애 (없으면 None)"""
+        if self.paths is not None and not path.startswith(self.paths):
+            return None
+        roll = self._rng.random()
+        for fault in FAULTS:
+            roll -= self.rates.get(fault, 0.0)
+            if roll < 0:
+                return fault
+        return None
+
+    # ------------------------------------------------------------------
+    # HTTP 핸들러
+    # ------------------------------------------------------------------
+    async def _forward(self, request):
+        from aiohttp import web
+
+        headers = {k: v for k, v in request.headers.items()
+                   if k.lower() in ('x-mbx-apikey', 'content-type')}
+        async with self._session.request(request.method, self.upstream_url + request.path_qs,
+                                         data=await request.read(), headers=headers) as upstream:
+            body = await upstream.read()
+            return web.Response(
+                body=body, status=upstream.status,
+                headers={k: upstream.headers[k] for k in FORWARD_HEADERS if k in upstream.headers}
+            )
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        self.requests += 1
+        fault = self.pick(request.path)
+        if fault is not None:
+            self.injected[fault] += 1
+
+        if fault == 'reset':
+            request.transport.abort()
+            return web.Response()
+        if fault == 'bad_gateway':
+            return web.Response(status=502, content_type='text/html',
+                                text='<html><body><h1>502 Bad Gateway</h1></body></html>')
+        if fault == 'unavailable':
+            return web.json_response({'code': -1001, 'msg': 'Internal error; unable to process '
+                                      'your request. Please try again.'}, status=503)
+        if fault == 'slow':
+            await asyncio.sleep(self.slow_ms / 1000)
+        elif fault == 'stall':
+            await asyncio.sleep(self.stall_s)
+
+        response = await self._forward(request)
+        if fault == 'lost_response':
+            request.transport.abort()
+        return response
+
+    # ------------------------------------------------------------------
+    # 서버 수명 주기 (별도 스레드)
+    # ------------------------------------------------------------------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='fault-proxy', daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        import aiohttp
+        from aiohttp import web
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{self.host}:{port}"
+        self._ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            await runner.cleanup()
+            await self._session.close()
+
+
+def main():
+    import argparse
+    from mock_exchange import MockExchange
+
+    parser = argparse.ArgumentParser(description='모의 거래소 앞에 장애 주입 프록시 띄우기')
+    parser.add_argument('--upstream', help='전달할 REST 서버 (기본: 내장 모의 거래소)')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--slow-ms', type=float, default=200.0)
+    parser.add_argument('--stall-s', type=float, default=3.0)
+    for fault in FAULTS:
+        parser.add_argument(f"--{fault.replace('_', '-')}", type=float, default=0.0, metavar='P',
+                            help=f'{fault} 장애 확률')
+    args = parser.parse_args()
+
+    exchange = None
+    upstream = args.upstream
+    if upstream is None:
+        exchange = MockExchange(['BTCUSDT', 'ETHUSDT']).start()
+        upstream = exchange.base_url
+
+    rates = {fault: getattr(args, fault) for fault in FAULTS if getattr(args, fault)}
+    proxy = FaultProxy(upstream, rates, args.slow_ms, args.stall_s, seed=args.seed, port=args.port).start()
+    print(f"🧪 장애 주입 프록시: {proxy.base_url} → {upstream} | {rates or '장애 없음'}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"   요청 {proxy.requests:,}건 | 주입 {dict(proxy.injected)}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+        if exchange is not None:
+            exchange.stop()
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
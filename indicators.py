@@ -0,0 +1,347 @@
+"""
+증분(O(1)) 기술적 지표 엔진
+- 캔들 마감 시 RSI / MACD / 볼린저밴드 상태를 상수 시간에 갱신
+- 진행 중인 캔들 가격은 상태를 바꾸지 않고 peek()으로 미리 계산
+- BinanceTestnetBot.calculate_* (pandas) 결과와 수치 검증: python indicators.py
+"""
+
+import math
+from collections import deque
+
+
+class RollingSum:
+    """고정 길이 윈도우의 누적 합 / 제곱합 (링 버퍼)
+
+    큰 가격(예: BTC 6만 달러대)에서 제곱합의 자릿수 손실을 막기 위해
+    첫 값(shift)을 빼고 누적합니다. 덧셈/뺄셈 누적 오차는 윈도우가 한 바퀴
+    돌 때마다 버퍼로부터 다시 합산해 제거합니다 (분할상환 O(1)).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.shift = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._since_resum = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def push(self, value):
+        if self.shift is None:
+            self.shift = value
+        if len(self.values) == self.size:
+            old = self.values[0] - self.shift
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(value)
+        x = value - self.shift
+        self.total += x
+        self.total_sq += x * x
+
+        self._since_resum += 1
+        if self._since_resum >= self.size:
+            self._resum()
+
+    def _resum(self):
+        """누적 오차 제거를 위한 재합산 (shift도 최근 값으로 이동)"""
+        self.shift = self.values[-1]
+        self.total = 0.0
+        self.total_sq = 0.0
+        for value in self.values:
+            x = value - self.shift
+            self.total += x
+            self.total_sq += x * x
+        self._since_resum = 0
+
+    @property
+    def sum(self):
+        """윈도우 값의 실제 합계"""
+        if self.shift is None:
+            return 0.0
+        return self.total + len(self.values) * self.shift
+
+    def oldest(self):
+        return self.values[0]
+
+    def newest(self):
+        return self.values[-1]
+
+
+class IncrementalIndicators:
+    """RSI / MACD / 볼린저밴드 증분 계산기
+
+    update(close)는 마감된 캔들을 상태에 반영하고, peek(price)는 진행 중인
+    캔들의 현재가를 마지막 값으로 가정한 지표를 상태 변경 없이 돌려줍니다.
+    둘 다 O(1)입니다.
+
+    MACD의 EMA는 전체 이력을 반영하므로, 매번 최근 100개 캔들만으로 EMA를
+    새로 시작하는 기존 pandas 경로와는 초기값 절단 오차만큼(26 EMA 기준
+    (25/27)^100 ≈ 5e-4 배) 차이가 날 수 있습니다. 같은 가격 배열 전체에
+    대해서는 pandas 결과와 부동소수점 오차 범위 내에서 일치합니다.
+    """
+
+    def __init__(self, rsi_period=14, macd_fast=12, macd_slow=26,
+                 macd_signal=9, bb_period=20, bb_std=2):
+        self.rsi_period = rsi_period
+        self.bb_period = bb_period
+        self.bb_std = bb_std
+
+        self.alpha_fast = 2 / (macd_fast + 1)
+        self.alpha_slow = 2 / (macd_slow + 1)
+        self.alpha_signal = 2 / (macd_signal + 1)
+
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.count = 0
+        self.last_close = None
+        self.last_open_time = None
+
+        # RSI: 최근 rsi_period 개 상승폭 / 하락폭
+        self.gains = RollingSum(self.rsi_period)
+        self.losses = RollingSum(self.rsi_period)
+
+        # MACD: EMA 상태
+        self.ema_fast = None
+        self.ema_slow = None
+        self.macd_signal = None
+
+        # 볼린저밴드: 최근 bb_period 개 종가
+        self.closes = RollingSum(self.bb_period)
+
+    @property
+    def ready(self):
+        """peek() 결과가 모두 유효한지 여부"""
+        return (len(self.gains) >= self.rsi_period - 1
+                and len(self.closes) >= self.bb_period - 1
+                and self.last_close is not None)
+
+    def seed(self, closes, open_time=None):
+        """가격 배열로 상태를 처음부터 다시 구성"""
+        self.reset()
+        for close in closes:
+            self.update(close)
+        self.last_open_time = open_time
+
+    def update(self, close, open_time=None):
+        """마감된 캔들 하나를 반영 (O(1))"""
+        close = float(close)
+
+        if self.last_close is not None:
+            delta = close - self.last_close
+            self.gains.push(delta if delta > 0 else 0.0)
+            self.losses.push(-delta if delta < 0 else 0.0)
+
+        if self.ema_fast is None:
+            self.ema_fast = close
+            self.ema_slow = close
+            self.macd_signal = 0.0
+        else:
+            self.ema_fast += self.alpha_fast * (close - self.ema_fast)
+            self.ema_slow += self.alpha_slow * (close - self.ema_slow)
+            macd = self.ema_fast - self.ema_slow
+            self.macd_signal += self.alpha_signal * (macd - self.macd_signal)
+
+        self.closes.push(close)
+        self.last_close = close
+        if open_time is not None:
+            self.last_open_time = open_time
+        self.count += 1
+
+    def sync_closed(self, open_times, closes):
+        """REST로 받은 마감 캔들 배열과 상태를 맞춤
+
+        직전에 반영한 캔들 이후의 캔들만 update()하고, 이어지지 않으면
+        (최초 호출, 누락 구간) 전체를 다시 seed()합니다.
+        """
+        n = len(closes)
+        if n == 0:
+            return
+
+        start = None
+        if self.last_open_time is not None:
+            for i in range(n - 1, -1, -1):
+                if open_times[i] == self.last_open_time:
+                    start = i + 1
+                    break
+                if open_times[i] < self.last_open_time:
+                    break
+
+        if start is None:
+            self.seed(closes, open_times[-1])
+            return
+
+        for i in range(start, n):
+            self.update(closes[i], open_times[i])
+
+    def _rsi(self, price):
+        period = self.rsi_period
+        if len(self.gains) < period - 1:
+            return float('nan')
+
+        delta = price - self.last_close
+        gain_sum = self.gains.sum
+        loss_sum = self.losses.sum
+        if len(self.gains) == period:
+            gain_sum -= self.gains.oldest()
+            loss_sum -= self.losses.oldest()
+        gain_sum += delta if delta > 0 else 0.0
+        loss_sum += -delta if delta < 0 else 0.0
+
+        avg_gain = gain_sum / period
+        avg_loss = loss_sum / period
+        if avg_loss == 0:
+            return float('nan') if avg_gain == 0 else 100.0
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def _macd(self, price):
+        ema_fast = self.ema_fast + self.alpha_fast * (price - self.ema_fast)
+        ema_slow = self.ema_slow + self.alpha_slow * (price - self.ema_slow)
+        macd = ema_fast - ema_slow
+        signal = self.macd_signal + self.alpha_signal * (macd - self.macd_signal)
+        return macd, signal
+
+    def _bollinger(self, price):
+        period = self.bb_period
+        window = self.closes
+        if len(window) < period - 1:
+            nan = float('nan')
+            return nan, nan, nan
+
+        shift = window.shift
+        total = window.total
+        total_sq = window.total_sq
+        if len(window) == period:
+            old = window.oldest() - shift
+            total -= old
+            total_sq -= old * old
+        x = price - shift
+        total += x
+        total_sq += x * x
+
+        mean = total / period
+        var = (total_sq - total * mean) / (period - 1)
+        std = math.sqrt(var) if var > 0 else 0.0
+        sma = mean + shift
+        return sma + std * self.bb_std, sma, sma - std * self.bb_std
+
+    def peek(self, price):
+        """진행 중인 캔들 가격을 포함한 지표 (상태 변경 없음)"""
+        price = float(price)
+        macd, signal = self._macd(price)
+        upper_bb, middle_bb, lower_bb = self._bollinger(price)
+        return {
+            'rsi': self._rsi(price),
+            'macd': macd,
+            'macd_signal': signal,
+            'bb_upper': upper_bb,
+            'bb_middle': middle_bb,
+            'bb_lower': lower_bb,
+        }
+
+
+def rsi_column(prices, period=14):
+    """전체 구간 RSI 열 (i번째 값 = calculate_rsi(prices[:i+1]))"""
+    import numpy as np
+    import pandas as pd
+
+    prices = np.asarray(prices, dtype=np.float64)
+    deltas = np.diff(prices)
+    gain = pd.Series(np.where(deltas > 0, deltas, 0.0))
+    loss = pd.Series(np.where(deltas < 0, -deltas, 0.0))
+    avg_gain = gain.rolling(window=period).mean().to_numpy()
+    avg_loss = loss.rolling(window=period).mean().to_numpy()
+
+    rsi = np.full(len(prices), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi[1:] = 100 - (100 / (1 + avg_gain / avg_loss))
+    return rsi
+
+
+def macd_columns(prices):
+    """전체 구간 MACD / 시그널 열"""
+    import numpy as np
+    import pandas as pd
+
+    series = pd.Series(np.asarray(prices, dtype=np.float64))
+    ema_fast = series.ewm(span=12, adjust=False).mean()
+    ema_slow = series.ewm(span=26, adjust=False).mean()
+    macd_line = ema_fast - ema_slow
+    signal_line = macd_line.ewm(span=9, adjust=False).mean()
+    return {'macd': macd_line.to_numpy(), 'macd_signal': signal_line.to_numpy()}
+
+
+def bollinger_columns(prices, period=20, num_std=2):
+    """전체 구간 볼린저 밴드 열"""
+    import numpy as np
+    import pandas as pd
+
+    series = pd.Series(np.asarray(prices, dtype=np.float64))
+    sma = series.rolling(window=period).mean()
+    std = series.rolling(window=period).std()
+    return {
+        'bb_upper': (sma + std * num_std).to_numpy(),
+        'bb_middle': sma.to_numpy(),
+        'bb_lower': (sma - std * num_std).to_numpy(),
+    }
+
+
+def indicator_columns(prices, rsi_period=14, bb_period=20, bb_std=2):
+    """전체 가격 배열의 지표를 한 번에 계산 (백테스트용 NumPy 열)
+
+    i번째 값은 prices[:i+1]에 BinanceTestnetBot.calculate_*를 적용한 값과
+    같습니다. pandas의 rolling / ewm C 커널을 그대로 써서 기준 구현과
+    같은 수식을 공유하고, 결과는 float64 NumPy 배열로 돌려줍니다.
+    """
+    return {
+        'rsi': rsi_column(prices, rsi_period),
+        **macd_columns(prices),
+        **bollinger_columns(prices, bb_period, bb_std),
+    }
+
+
+def verify_against_pandas(prices, rsi_period=14):
+    """같은 가격 배열에 대해 pandas 기준 구현과의 최대 오차 계산
+
+    prices[:-1]을 마감 캔들로, prices[-1]을 진행 중인 캔들로 보고
+    각 시점마다 peek() 결과를 BinanceTestnetBot.calculate_* 와 비교합니다.
+    """
+    from binance_testnet_bot import BinanceTestnetBot
+
+    engine = IncrementalIndicators(rsi_period=rsi_period)
+    errors = {'rsi': 0.0, 'macd': 0.0, 'macd_signal': 0.0,
+              'bb_upper': 0.0, 'bb_middle': 0.0, 'bb_lower': 0.0}
+
+    for end in range(1, len(prices)):
+        window = prices[:end + 1]
+        engine.update(prices[end - 1])
+        if not engine.ready:
+            continue
+
+        result = engine.peek(prices[end])
+        expected = {'rsi': BinanceTestnetBot.calculate_rsi(None, window, rsi_period)}
+        expected['macd'], expected['macd_signal'] = BinanceTestnetBot.calculate_macd(None, window)
+        (expected['bb_upper'], expected['bb_middle'],
+         expected['bb_lower']) = BinanceTestnetBot.calculate_bollinger_bands(None, window)
+
+        for key, value in expected.items():
+            if math.isnan(value) and math.isnan(result[key]):
+                continue
+            errors[key] = max(errors[key], abs(result[key] - value))
+
+    return errors
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    rng = np.random.default_rng(42)
+    prices = 60_000 * np.exp(np.cumsum(rng.normal(0, 0.002, 500)))
+
+    print("🔍 증분 지표 vs pandas 기준 구현 최대 오차")
+    for name, error in verify_against_pandas(prices).items():
+        print(f"  - {name:12s}: {error:.3e}")
@@ -0,0 +1,39 @@
+"""
+kline 응답 디코더 (pandas 없이 NumPy 열로 바로 변환)
+- 바이낸스 kline 배열(list of lists, 가격은 문자열)을 필요한 필드만 float64 / int64 열로 파싱
+- 12개 object 컬럼 DataFrame + astype 4회를 거치는 get_market_data 대비 수십 배 빠름
+  (benchmarks/bench_kline_decode.py)
+"""
+
+import numpy as np
+
+# 필드 이름 → (kline 배열 인덱스, dtype)
+KLINE_FIELDS = {
+    'open_time': (0, np.int64),
+    'open': (1, np.float64),
+    'high': (2, np.float64),
+    'low': (3, np.float64),
+    'close': (4, np.float64),
+    'volume': (5, np.float64),
+    'close_time': (6, np.int64),
+}
+
+# 전략 / 저장소가 쓰는 필드만 담은 구조화 dtype
+KLINE_DTYPE = np.dtype([(name, dtype) for name, (_, dtype) in KLINE_FIELDS.items()])
+
+
+def decode_columns(rows, fields=('open_time', 'close')):
+    """kline 배열 → {필드: NumPy 열} (요청한 필드만 파싱)"""
+    columns = {}
+    for name in fields:
+        index, dtype = KLINE_FIELDS[name]
+        columns[name] = np.array([row[index] for row in rows], dtype=dtype)
+    return columns
+
+
+def decode_structured(rows):
+    """kline 배열 → KLINE_DTYPE 구조화 배열 (행 단위로 다룰 때)"""
+    out = np.empty(len(rows), dtype=KLINE_DTYPE)
+    for name, (index, dtype) in KLINE_FIELDS.items():
+        out[name] = np.array([row[index] for row in rows], dtype=dtype)
+    return out
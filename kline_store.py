@@ -0,0 +1,202 @@
+"""
+로컬 캔들 저장소 (심볼 / 주기별 append-only 컬럼 파일)
+- 컬럼마다 하나의 바이너리 파일(int64 / float64)에 이어 쓰기
+- 읽기는 np.memmap 기반 복사 없는 뷰
+- 마지막으로 저장한 캔들 이후만 REST로 받아 공백을 채움 (증분 동기화)
+- 재시작 / 백테스트 시 다시 받지 않고 바로 사용
+
+사용법 (과거 데이터 미리 받기):
+    python kline_store.py BTCUSDT 1m --days 365
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+import numpy as np
+
+from kline_decoder import decode_columns, KLINE_FIELDS
+from market_stream import interval_to_ms
+from metrics import stage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'klines')
+
+# (컬럼 이름, kline 배열 인덱스, dtype)
+COLUMNS = tuple((name, index, dtype) for name, (index, dtype) in KLINE_FIELDS.items())
+
+
+class KlineSeries:
+    """심볼 하나 / 주기 하나의 캔들 컬럼 파일 묶음
+
+    마감된 캔들만 저장합니다. 비정상 종료로 컬럼 길이가 어긋나면 열 때
+    가장 짧은 길이에 맞춰 잘라 항상 행 단위로 일관된 상태를 유지합니다.
+    """
+
+    def __init__(self, directory, symbol, interval):
+        self.directory = directory
+        self.symbol = symbol
+        self.interval = interval
+        self.interval_ms = interval_to_ms(interval)
+        os.makedirs(directory, exist_ok=True)
+
+        self._maps = {}
+        self.length = self._recover()
+
+    def __len__(self):
+        return self.length
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _recover(self):
+        """컬럼 파일 길이를 맞추고 행 수 반환"""
+        lengths = []
+        for name, _, dtype in COLUMNS:
+            path = self._path(name)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths.append(size // np.dtype(dtype).itemsize)
+
+        length = min(lengths)
+        for (name, _, dtype), n in zip(COLUMNS, lengths):
+            if n != length or not os.path.exists(self._path(name)):
+                with open(self._path(name), 'ab') as f:
+                    f.truncate(length * np.dtype(dtype).itemsize)
+        return length
+
+    def column(self, name):
+        """컬럼 전체의 읽기 전용 memmap 뷰"""
+        mapped = self._maps.get(name)
+        if mapped is not None and len(mapped) == self.length:
+            return mapped
+
+        dtype = next(d for n, _, d in COLUMNS if n == name)
+        if self.length == 0:
+            return np.empty(0, dtype=dtype)
+
+        mapped = np.memmap(self._path(name), dtype=dtype, mode='r', shape=(self.length,))
+        self._maps[name] = mapped
+        return mapped
+
+    def window(self, n=None):
+        """최근 n개 캔들의 컬럼 뷰 dict (복사 없음)"""
+        start = 0 if n is None else max(0, self.length - n)
+        return {name: self.column(name)[start:] for name, _, _ in COLUMNS}
+
+    @property
+    def last_open_time(self):
+        if self.length == 0:
+            return None
+        return int(self.column('open_time')[-1])
+
+    def append(self, rows):
+        """마감된 kline 배열(list of lists) 이어 쓰기 (이미 저장된 구간은 무시)"""
+        last = self.last_open_time
+        if last is not None:
+            rows = [r for r in rows if r[0] > last]
+        if not rows:
+            return 0
+
+        with stage('decode'):
+            columns = decode_columns(rows, [name for name, _, _ in COLUMNS])
+        for name, _, _ in COLUMNS:
+            with open(self._path(name), 'ab') as f:
+                f.write(columns[name].tobytes())
+
+        self.length += len(rows)
+        return len(rows)
+
+    def sync(self, client, history=1000, limit=1000, now_ms=None):
+        """마지막 저장 캔들 이후를 받아 저장하고 진행 중인 캔들(원본 배열) 반환
+
+        저장소가 비어 있으면 최근 history개부터 받습니다. 응답의 마지막
+        캔들은 진행 중인 캔들이므로 저장하지 않고 돌려줍니다. now_ms는
+        가상 시계로 돌릴 때 넘깁니다 (기본: 현재 시각).
+        """
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        if self.length:
+            start = self.last_open_time + self.interval_ms
+        else:
+            start = now_ms - now_ms % self.interval_ms - history * self.interval_ms
+
+        live = None
+        while True:
+            with stage('fetch'):
+                rows = client.get_klines(
+                    symbol=self.symbol, interval=self.interval, startTime=start, limit=limit
+                )
+            if not rows:
+                break
+
+            # 아직 마감되지 않은 캔들이 나오면 거기서 멈춤
+            closed = len(rows) if len(rows) == limit else len(rows) - 1
+            while closed > 0 and rows[closed - 1][6] >= now_ms:
+                closed -= 1
+            self.append(rows[:closed])
+
+            if closed < len(rows):
+                live = rows[closed]
+                break
+            start = rows[-1][0] + self.interval_ms
+
+        return live
+
+
+class KlineStore:
+    """심볼 / 주기별 KlineSeries 모음"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self._series = {}
+
+    def series(self, symbol, interval):
+        key = (symbol, interval)
+        if key not in self._series:
+            directory = os.path.join(self.root, symbol, interval)
+            self._series[key] = KlineSeries(directory, symbol, interval)
+        return self._series[key]
+
+    @staticmethod
+    def open_directory(directory):
+        """'<root>/<symbol>/<interval>' 경로로 바로 열기 (백테스트용)"""
+        directory = os.path.abspath(directory)
+        interval = os.path.basename(directory)
+        symbol = os.path.basename(os.path.dirname(directory))
+        return KlineSeries(directory, symbol, interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='로컬 캔들 저장소 채우기')
+    parser.add_argument('symbol')
+    parser.add_argument('interval')
+    parser.add_argument('--days', type=float, default=30, help='저장소가 비어 있을 때 받을 기간(일)')
+    parser.add_argument('--root', default=DEFAULT_ROOT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    from binance.client import Client
+    client = Client(testnet=True)
+    client.API_URL = 'https://testnet.binance.vision/api'
+
+    series = KlineStore(args.root).series(args.symbol, args.interval)
+    before = len(series)
+    history = int(args.days * 86_400_000 / series.interval_ms)
+
+    started = time.perf_counter()
+    series.sync(client, history=history)
+    elapsed = time.perf_counter() - started
+
+    print(f"📁 {series.directory}")
+    print(f"📊 캔들 {before:,}개 → {len(series):,}개 ({elapsed:.1f}초)")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
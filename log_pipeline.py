@@ -0,0 +1,174 @@
+"""
+비동기 구조화 로깅 파이프라인
+- 거래 스레드는 LogRecord를 큐에 넣기만 하고, 포맷팅과 파일 / 콘솔 출력은
+  백그라운드 리스너 스레드에서 처리 (logging.handlers.QueueListener)
+- 한 줄 JSON(JSON Lines) 레코드: 지표 값 등은 문장이 아닌 필드로 기록
+- 이벤트별 샘플링 (예: 매수 없음 판단은 10%만 기록)
+
+환경 변수:
+    BOT_LOG_MODE=structured     구조화 + 비동기 모드 (기본: text, 기존 형식)
+    BOT_LOG_LEVEL=DEBUG         로그 레벨 (기본: INFO)
+    BOT_LOG_SAMPLE=signal:0.1   이벤트별 기록 비율 (쉼표 구분)
+"""
+
+import os
+import sys
+import json
+import math
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+
+
+class JsonLineFormatter(logging.Formatter):
+    """LogRecord → 한 줄 JSON
+
+    log_event()로 남긴 레코드는 {"ts", "lvl", "event", ...필드}, 일반 로그는
+    {"ts", "lvl", "msg"} 형태입니다.
+    """
+
+    def format(self, record):
+        data = {
+            'ts': round(record.created, 6),
+            'lvl': record.levelname,
+        }
+        fields = getattr(record, 'fields', None)
+        if fields is not None:
+            data['event'] = record.msg
+            data.update(fields)
+        else:
+            data['msg'] = record.getMessage()
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        try:
+            return json.dumps(data, ensure_ascii=False, allow_nan=False, default=_json_default)
+        except ValueError:
+            # 워밍업 중 지표(NaN) 등 JSON에 없는 값이 있을 때만 한 번 더 훑어 null로 바꿈
+            return json.dumps(_finite(data), ensure_ascii=False, allow_nan=False, default=_json_default)
+
+
+def _json_default(value):
+    # NumPy 스칼라(np.bool_, np.float32 등)
+    if hasattr(value, 'item'):
+        value = value.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+    return str(value)
+
+
+def _finite(value):
+    """NaN / ±inf → None (dict / list / tuple은 안쪽까지)"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """포맷팅 없이 레코드를 그대로 큐에 넣는 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷합니다.
+    여기서는 리스너 스레드에서 포맷하도록 레코드만 넘깁니다.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class EventSampler:
+    """이벤트 이름별 기록 비율"""
+
+    def __init__(self, rates=None, seed=None):
+        self.rates = dict(rates or {})
+        self._random = random.Random(seed).random
+
+    @classmethod
+    def from_env(cls, value=None):
+        value = value if value is not None else os.getenv('BOT_LOG_SAMPLE', '')
+        rates = {}
+        for item in filter(None, (v.strip() for v in value.split(','))):
+            name, _, rate = item.partition(':')
+            rates[name] = float(rate or 1.0)
+        return cls(rates)
+
+    def should_log(self, event):
+        rate = self.rates.get(event, 1.0)
+        return rate >= 1.0 or self._random() < rate
+
+
+sampler = EventSampler.from_env()
+
+
+def log_event(logger, event, level=logging.INFO, sample=True, **fields):
+    """구조화 이벤트 기록 (레벨 / 샘플링에 걸리면 필드 dict도 만들지 않음)"""
+    if not logger.isEnabledFor(level):
+        return False
+    if sample and not sampler.should_log(event):
+        return False
+    logger.log(level, event, extra={'fields': fields})
+    return True
+
+
+def setup_async_logging(log_file, level=logging.INFO, structured=True, stdout=True):
+    """루트 로거를 큐 기반 비동기 파이프라인으로 구성 → QueueListener
+
+    structured=False면 출력 형식은 기존 텍스트 형식 그대로이고 I/O만
+    백그라운드로 옮깁니다. 종료 시 atexit에서 남은 레코드를 모두 씁니다.
+    """
+    if structured:
+        formatter = JsonLineFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s',
+                                      datefmt='%Y-%m-%d %H:%M:%S')
+
+    handlers = [logging.FileHandler(log_file, encoding='utf-8', mode='a')]
+    if stdout:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_DeferredQueueHandler(records))
+    root.setLevel(level)
+
+    listener.start()
+    atexit.register(stop_async_logging, listener)
+    return listener
+
+
+def stop_async_logging(listener):
+    """남은 레코드를 모두 쓰고 리스너 종료 (여러 번 호출해도 안전)"""
+    atexit.unregister(stop_async_logging)
+    if getattr(listener, '_thread', None) is not None:
+        listener.stop()
+
+
+def configure_from_env(log_file):
+    """BOT_LOG_MODE / BOT_LOG_LEVEL에 따라 로깅 구성 → 구조화 모드 여부"""
+    level = getattr(logging, os.getenv('BOT_LOG_LEVEL', 'INFO').upper(), logging.INFO)
+    structured = os.getenv('BOT_LOG_MODE', 'text').lower() == 'structured'
+
+    if structured:
+        setup_async_logging(log_file, level=level, structured=True)
+    else:
+        logging.basicConfig(
+            level=level,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
+            handlers=[
+                logging.FileHandler(log_file, encoding='utf-8', mode='a'),
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+    return structured
@@ -0,0 +1,299 @@
+"""
+바이낸스 웹소켓 시장 데이터 스트림
+- kline / bookTicker 결합 스트림 구독 (depth를 넘기면 diff-depth도 받아 로컬 호가창 갱신)
+- 백그라운드 스레드에서 수신, 메인 스레드는 이벤트 큐로 처리
+- 연결 끊김 시 지수 백오프로 재연결 (그동안 봇은 REST로 폴백)
+- 녹화 프레임을 재생하는 로컬 가짜 서버 (FakeStreamServer)
+"""
+
+import json
+import queue
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# 테스트넷 스트림 엔드포인트
+STREAM_URL = 'wss://stream.testnet.binance.vision'
+
+_INTERVAL_UNITS_MS = {
+    's': 1_000,
+    'm': 60_000,
+    'h': 3_600_000,
+    'd': 86_400_000,
+    'w': 604_800_000,
+}
+
+
+def interval_to_ms(interval):
+    """'15m', '1h' 같은 캔들 주기를 밀리초로 변환"""
+    return int(interval[:-1]) * _INTERVAL_UNITS_MS[interval[-1]]
+
+
+def parse_kline(data):
+    """kline 이벤트 → 캔들 dict"""
+    k = data['k']
+    return {
+        'open_time': k['t'],
+        'close_time': k['T'],
+        'open': float(k['o']),
+        'high': float(k['h']),
+        'low': float(k['l']),
+        'close': float(k['c']),
+        'volume': float(k['v']),
+        'closed': k['x'],
+    }
+
+
+def parse_book_ticker(data):
+    """bookTicker 이벤트 → 최우선 호가 dict"""
+    return {
+        'update_id': data['u'],
+        'bid': float(data['b']),
+        'bid_qty': float(data['B']),
+        'ask': float(data['a']),
+        'ask_qty': float(data['A']),
+    }
+
+
+class MarketStream:
+    """심볼 하나의 kline + bookTicker 스트림
+
+    수신 스레드는 파싱한 이벤트를 큐에 넣기만 하고, 봇 상태 변경은
+    get()으로 이벤트를 꺼내는 메인 스레드에서만 일어납니다.
+    이벤트 형식: ('kline', candle) / ('book', book) / ('disconnect', None)
+
+    depth(order_book.DepthSync)를 넘기면 diff-depth 이벤트는 큐를 거치지
+    않고 수신 스레드에서 바로 호가창에 반영합니다 (초당 수천 건).
+    연결될 때마다 스냅샷부터 다시 맞춥니다.
+    """
+
+    def __init__(self, symbol, interval='15m', url=STREAM_URL,
+                 buffer_size=500, reconnect_delay=1.0, max_reconnect_delay=30.0,
+                 stale_after=5.0, depth=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.interval_ms = interval_to_ms(interval)
+        self.depth = depth
+
+        name = symbol.lower()
+        self.url = f"{url}/stream?streams={name}@kline_{interval}/{name}@bookTicker"
+        if depth is not None:
+            self.url += f"/{name}@depth@100ms"
+
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.stale_after = stale_after
+
+        # 마감된 캔들 버퍼 (최근 buffer_size 개)
+        self.candles = deque(maxlen=buffer_size)
+        self.current_candle = None
+        self.book = None
+
+        self.connected = False
+        self.last_event_time = None
+        self.events = queue.Queue()
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """수신 스레드 시작"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='market-stream', daemon=True)
+        self._thread.start()
+        logger.info(f"📡 스트림 구독 시작: {self.url}")
+
+    def stop(self, timeout=5.0):
+        """수신 스레드 종료"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get(self, timeout=None):
+        """다음 이벤트 (timeout 동안 없으면 None)"""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def is_fresh(self):
+        """연결되어 있고 최근 stale_after초 안에 이벤트를 받았는지"""
+        return (self.connected and self.last_event_time is not None
+                and time.monotonic() - self.last_event_time < self.stale_after)
+
+    def get_price(self):
+        """스트림 기준 현재가 (매도 기준 최우선 매수호가, 없으면 kline 종가)
+
+        스트림이 끊겼거나 오래되었으면 None을 반환해 REST 조회로 넘깁니다.
+        """
+        if not self.is_fresh():
+            return None
+        if self.book is not None:
+            return self.book['bid']
+        if self.current_candle is not None:
+            return self.current_candle['close']
+        return None
+
+    def _run(self):
+        asyncio.run(self._consume())
+
+    async def _consume(self):
+        import websockets
+
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(self.url, ping_interval=20) as ws:
+                    self.connected = True
+                    delay = self.reconnect_delay
+                    logger.info("✅ 스트림 연결 성공")
+                    if self.depth is not None:
+                        self.depth.resync()
+                    while not self._stop.is_set():
+                        try:
+                            raw = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                        except asyncio.TimeoutError:
+                            continue
+                        self._handle(raw)
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning(f"⚠️ 스트림 연결 끊김: {e}")
+            finally:
+                if self.connected:
+                    self.connected = False
+                    self.events.put(('disconnect', None))
+
+            if self._stop.is_set():
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _handle(self, raw):
+        message = json.loads(raw)
+        stream = message.get('stream', '')
+        data = message.get('data', message)
+        self.last_event_time = time.monotonic()
+
+        if data.get('e') == 'depthUpdate':
+            if self.depth is not None:
+                self.depth.on_event(data)
+        elif stream.endswith('@bookTicker') or ('b' in data and 'a' in data and 'k' not in data):
+            self.book = parse_book_ticker(data)
+            self.events.put(('book', self.book))
+        elif data.get('e') == 'kline':
+            candle = parse_kline(data)
+            self.current_candle = candle
+            if candle['closed']:
+                self.candles.append(candle)
+            self.events.put(('kline', candle))
+
+
+def load_frames(path):
+    """녹화 파일(JSON Lines: {"delay": 초, "data": 원본 프레임}) 읽기"""
+    frames = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                frames.append((record['delay'], record['data']))
+    return frames
+
+
+def record_frames(url, path, duration):
+    """실제 스트림 프레임을 duration초 동안 녹화 (FakeStreamServer 재생용)"""
+    import websockets
+
+    async def _record():
+        deadline = time.monotonic() + duration
+        last = time.monotonic()
+        count = 0
+        async with websockets.connect(url) as ws:
+            with open(path, 'w', encoding='utf-8') as f:
+                while time.monotonic() < deadline:
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=deadline - time.monotonic())
+                    except asyncio.TimeoutError:
+                        break
+                    now = time.monotonic()
+                    f.write(json.dumps({'delay': now - last, 'data': raw}) + '\n')
+                    last = now
+                    count += 1
+        return count
+
+    count = asyncio.run(_record())
+    logger.info(f"💾 스트림 프레임 {count}개 녹화: {path}")
+    return count
+
+
+class FakeStreamServer:
+    """녹화된 프레임을 재생하는 로컬 웹소켓 서버
+
+    접속한 클라이언트마다 frames를 처음부터 speed 배속으로 보내고,
+    close_after=True면 재생이 끝난 뒤 연결을 끊어 REST 폴백 경로를
+    확인할 수 있게 합니다. url 속성을 MarketStream(url=...)에 넘기면 됩니다.
+    """
+
+    def __init__(self, frames, host='127.0.0.1', port=0, speed=1.0, close_after=True):
+        self.frames = frames
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.close_after = close_after
+        self.url = None
+        self.connections = 0
+
+        self._loop = None
+        self._stopped = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='fake-stream-server', daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _handler(self, websocket, path=None):
+        import websockets
+
+        self.connections += 1
+        try:
+            for delay, data in self.frames:
+                if delay > 0 and self.speed > 0:
+                    await asyncio.sleep(delay / self.speed)
+                await websocket.send(data)
+            if not self.close_after:
+                await self._stopped.wait()
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _serve(self):
+        import websockets
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        async with websockets.serve(self._handler, self.host, self.port) as server:
+            port = list(server.sockets)[0].getsockname()[1]
+            self.url = f"ws://{self.host}:{port}"
+            self._ready.set()
+            await self._stopped.wait()
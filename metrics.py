@@ -0,0 +1,237 @@
+"""
+지연 시간 계측
+- 단계별(fetch / decode / indicators / signal / order ...) 단조 시계 측정
+- HDR 방식 로그-선형 히스토그램 (기록 O(1), 상대 오차 약 3%)
+- with stage('이름') / @timed('이름') 으로 새 단계를 한 줄로 추가
+- 주기적 스냅샷 파일(JSON)과 로컬 HTTP 엔드포인트(/metrics)로 p50 / p99 노출
+  (add_source로 손익 분석 같은 다른 스냅샷도 함께 노출)
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 2의 거듭제곱 구간마다 2^SUB_BITS개 하위 버킷 → 상대 오차 약 1/32
+SUB_BITS = 5
+SUB_COUNT = 1 << SUB_BITS
+
+
+def _bucket_bounds(index):
+    """버킷의 [하한, 상한) 값"""
+    if index < SUB_COUNT:
+        return index, index + 1
+    shift = (index >> SUB_BITS) - 1
+    mantissa = (index & (SUB_COUNT - 1)) + SUB_COUNT
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LatencyHistogram:
+    """나노초 단위 지연 시간 히스토그램"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (SUB_COUNT * 40)  # 2^40ns ≈ 18분까지, 넘으면 확장
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self._lock = threading.Lock()
+
+    def record(self, value_ns):
+        # 버킷 인덱스: 하위 SUB_COUNT 값은 그대로, 그 위는 (지수, 가수 상위 비트)
+        if value_ns < SUB_COUNT:
+            value_ns = max(0, int(value_ns))
+            index = value_ns
+        else:
+            value_ns = int(value_ns)
+            shift = value_ns.bit_length() - SUB_BITS - 1
+            index = ((shift + 1) << SUB_BITS) + ((value_ns >> shift) - SUB_COUNT)
+        with self._lock:
+            if index >= len(self.counts):
+                self.counts.extend([0] * (index + 1 - len(self.counts)))
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value_ns
+            if self.min is None or value_ns < self.min:
+                self.min = value_ns
+            if value_ns > self.max:
+                self.max = value_ns
+
+    def percentile(self, p):
+        """p 백분위 값 (버킷 중간값, ns)"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(round(p / 100 * self.count)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= rank:
+                    low, high = _bucket_bounds(index)
+                    return min((low + high - 1) / 2, self.max)
+        return float(self.max)
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * len(self.counts)
+            self.count = 0
+            self.total = 0
+            self.min = None
+            self.max = 0
+
+    def summary(self):
+        """밀리초 단위 요약"""
+        if self.count == 0:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count / 1e6,
+            'min_ms': self.min / 1e6,
+            'p50_ms': self.percentile(50) / 1e6,
+            'p90_ms': self.percentile(90) / 1e6,
+            'p99_ms': self.percentile(99) / 1e6,
+            'max_ms': self.max / 1e6,
+        }
+
+
+class _Stage:
+    __slots__ = ('histogram', 'started')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter_ns() - self.started)
+        return False
+
+
+class Metrics:
+    """단계 이름 → LatencyHistogram 레지스트리"""
+
+    def __init__(self):
+        self.histograms = {}
+        self.sources = {}
+        self.started_at = time.time()
+        self._reporter = None
+        self._server = None
+        self._stop = threading.Event()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name, value_ns):
+        self.histogram(name).record(value_ns)
+
+    def stage(self, name):
+        """with metrics.stage('fetch'): ... 블록 실행 시간 기록"""
+        return _Stage(self.histogram(name))
+
+    def timed(self, name):
+        """함수 실행 시간을 기록하는 데코레이터"""
+        def decorator(func):
+            histogram = self.histogram(name)
+
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    histogram.record(time.perf_counter_ns() - started)
+
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            wrapper.__wrapped__ = func
+            return wrapper
+        return decorator
+
+    def add_source(self, name, snapshot):
+        """스냅샷에 항목 추가 (snapshot()이 돌려주는 dict를 name 키로, 예: 손익 분석)"""
+        self.sources[name] = snapshot
+
+    def snapshot(self):
+        snapshot = {
+            'timestamp': time.time(),
+            'uptime_s': time.time() - self.started_at,
+            'stages': {name: h.summary() for name, h in sorted(self.histograms.items())},
+        }
+        for name, source in self.sources.items():
+            snapshot[name] = source()
+        return snapshot
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def write_snapshot(self, path):
+        """스냅샷 JSON 파일 쓰기 (임시 파일 후 교체)"""
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def start_reporter(self, path, interval=60):
+        """interval초마다 스냅샷 파일 갱신하는 백그라운드 스레드"""
+        if self._reporter is not None:
+            return
+
+        def _loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.write_snapshot(path)
+                except OSError as e:
+                    logger.warning(f"⚠️ 지연 시간 스냅샷 저장 실패: {e}")
+
+        self._reporter = threading.Thread(target=_loop, name='metrics-reporter', daemon=True)
+        self._reporter.start()
+        logger.info(f"⏱️ 지연 시간 스냅샷: {path} ({interval}초마다)")
+
+    def serve(self, port, host='127.0.0.1'):
+        """GET /metrics 로 스냅샷 JSON을 돌려주는 로컬 HTTP 서버"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') != '/metrics':
+                    self.send_error(404)
+                    return
+                body = json.dumps(metrics.snapshot()).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True)
+        thread.start()
+        logger.info(f"⏱️ 지연 시간 엔드포인트: http://{host}:{self._server.server_address[1]}/metrics")
+        return self._server.server_address[1]
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+# 프로세스 전역 레지스트리
+metrics = Metrics()
+stage = metrics.stage
+timed = metrics.timed
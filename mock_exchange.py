@@ -0,0 +1,602 @@
+"""
+로컬 모의 거래소 (REST)
+- 봇이 쓰는 바이낸스 현물 REST 엔드포인트 일부를 흉내내는 aiohttp 서버
+- 심볼별 결정적(seed 고정) 가격 경로, 엔드포인트별 요청 수 집계
+- 시장가 주문을 여러 체결로 나눠 처리 (VWAP 확인용), 지정가 / 스톱 리밋 / OCO 대기 주문
+- 사용자 데이터 스트림 (listenKey + /ws/<listenKey> 웹소켓으로 executionReport 전송)
+- 멀티 심볼 엔진 벤치마크 / 오프라인 동작 확인용
+"""
+
+import json
+import time
+import asyncio
+import itertools
+import threading
+from collections import Counter
+
+import numpy as np
+
+from market_stream import interval_to_ms
+
+
+class MockExchange:
+    """모의 거래소 서버
+
+    가격은 step_ms마다 한 칸씩 움직이는 심볼별 기하 브라운 운동 경로를
+    실제 시계에 맞춰 읽습니다. latency_ms를 주면 모든 응답을 그만큼
+    지연시킵니다. base_url 속성을 클라이언트에 넘기면 됩니다 (사용자 데이터
+    스트림은 ws_url). 시장가 주문은 fill_levels개 체결로 나뉘어 한 단계마다
+    level_bps만큼 불리한 가격으로 체결됩니다. 대기 주문은 match_interval초마다
+    현재가와 비교해 체결합니다. clock_offset_ms만큼 서버 시계를 로컬 시계와
+    어긋나게 두면 /api/v3/time이 그 시각을 돌려주고, timestamp가 recvWindow
+    밖인 서명 요청은 실제 거래소처럼 -1021로 거절합니다.
+    """
+
+    def __init__(self, symbols, start_price=100.0, step_ms=1_000, path_length=100_000,
+                 latency_ms=0.0, fee_rate=0.001, seed=0, host='127.0.0.1', port=0,
+                 fill_levels=1, level_bps=1.0, match_interval=0.05,
+                 weight_limit=None, weight_window_s=60.0, ban_after=None, clock_offset_ms=0):
+        self.symbols = list(symbols)
+        self.step_ms = step_ms
+        self.latency_ms = latency_ms
+        self.fee_rate = fee_rate
+        self.fill_levels = fill_levels
+        self.level_bps = level_bps
+        self.match_interval = match_interval
+        self.clock_offset_ms = clock_offset_ms
+        self.host = host
+        self.port = port
+        self.base_url = None
+        self.ws_url = None
+
+        # 요청 가중치 한도 (None이면 제한 없음)
+        # 한도를 넘으면 429, 429 이후에도 ban_after번 넘게 계속 보내면 418
+        self.weight_limit = weight_limit
+        self.weight_window_s = weight_window_s
+        self.ban_after = ban_after
+        self.used_weight = 0
+        self.weight_window = None
+        self.banned_until = 0.0
+        self.rejections = Counter()
+        self._violations = 0
+        self.signed_params = {}   # 경로 → 마지막 서명 요청 파라미터 (recvWindow 등 확인용)
+
+        rng = np.random.default_rng(seed)
+        self.paths = {}
+        for i, symbol in enumerate(self.symbols):
+            base = start_price * (1 + i)
+            self.paths[symbol] = base * np.exp(np.cumsum(rng.normal(0, 0.0005, path_length)))
+
+        self.request_counts = Counter()
+        self.orders = []
+        self.balances = {'USDT': 1_000_000.0}
+        self.open_orders = {}     # clientOrderId → 대기 주문
+        self.order_lists = {}     # listClientOrderId → [clientOrderId]
+        self._trade_ids = itertools.count(1)
+        self._listen_keys = {}    # listenKey → 연결된 웹소켓 집합
+
+        self._loop = None
+        self._stopped = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # 가격 모델
+    # ------------------------------------------------------------------
+    def price_at(self, symbol, ms):
+        path = self.paths[symbol]
+        return float(path[(ms // self.step_ms) % len(path)])
+
+    def price(self, symbol):
+        return self.price_at(symbol, int(time.time() * 1000))
+
+    def klines(self, symbol, interval, limit):
+        """interval 캔들 limit개 (마지막은 진행 중인 캔들)"""
+        interval_ms = interval_to_ms(interval)
+        now = int(time.time() * 1000)
+        current_open = now - now % interval_ms
+
+        rows = []
+        for k in range(limit - 1, -1, -1):
+            open_time = current_open - k * interval_ms
+            close_time = open_time + interval_ms - 1
+            open_price = self.price_at(symbol, open_time)
+            close_price = self.price_at(symbol, min(close_time, now))
+            high = max(open_price, close_price) * 1.0005
+            low = min(open_price, close_price) * 0.9995
+            rows.append([
+                open_time, f"{open_price:.8f}", f"{high:.8f}", f"{low:.8f}", f"{close_price:.8f}",
+                '10.0', close_time, '0', 100, '0', '0', '0'
+            ])
+        return rows
+
+    def fill_market(self, symbol, side, quantity, client_order_id=None):
+        """시장가 주문 전량 체결 (fill_levels개 체결로 분할)"""
+        price = self.price(symbol)
+        order_id = len(self.orders) + 1
+        direction = 1 if side == 'BUY' else -1
+
+        fills = []
+        remaining = quantity
+        for level in range(self.fill_levels):
+            qty = remaining if level == self.fill_levels - 1 else round(quantity / self.fill_levels, 8)
+            remaining -= qty
+            fill_price = price * (1 + direction * level * self.level_bps / 10_000)
+            fills.append({
+                'price': f"{fill_price:.8f}",
+                'qty': f"{qty:.8f}",
+                'commission': f"{fill_price * qty * self.fee_rate:.8f}",
+                'commissionAsset': 'USDT',
+                'tradeId': next(self._trade_ids),
+            })
+        quote = sum(float(f['price']) * float(f['qty']) for f in fills)
+
+        order = {
+            'symbol': symbol,
+            'orderId': order_id,
+            'clientOrderId': client_order_id or f"mock{order_id}",
+            'transactTime': int(time.time() * 1000),
+            'price': '0.00000000',
+            'origQty': f"{quantity:.8f}",
+            'executedQty': f"{quantity:.8f}",
+            'cummulativeQuoteQty': f"{quote:.8f}",
+            'status': 'FILLED',
+            'type': 'MARKET',
+            'side': side,
+            'fills': fills,
+        }
+        self.orders.append(order)
+        return order
+
+    def rest_order(self, params, order_type, price=None, stop_price=None,
+                   client_order_id=None, list_client_order_id=None):
+        """지정가 / 스톱 리밋 대기 주문 등록"""
+        order_id = len(self.orders) + 1
+        order = {
+            'symbol': params['symbol'],
+            'orderId': order_id,
+            'orderListId': -1,
+            'clientOrderId': client_order_id or f"mock{order_id}",
+            'transactTime': int(time.time() * 1000),
+            'price': f"{float(price or 0):.8f}",
+            'stopPrice': f"{float(stop_price or 0):.8f}",
+            'origQty': f"{float(params['quantity']):.8f}",
+            'executedQty': '0.00000000',
+            'cummulativeQuoteQty': '0.00000000',
+            'status': 'NEW',
+            'type': order_type,
+            'side': params['side'],
+            'triggered': False,
+            'listClientOrderId': list_client_order_id,
+        }
+        self.orders.append(order)
+        self.open_orders[order['clientOrderId']] = order
+        return order
+
+    def _match(self, order, price):
+        """대기 주문 체결 가격 (체결 안 되면 None)"""
+        limit = float(order['price'])
+        sell = order['side'] == 'SELL'
+        if order['type'] == 'STOP_LOSS_LIMIT' and not order['triggered']:
+            stop = float(order['stopPrice'])
+            if (sell and price <= stop) or (not sell and price >= stop):
+                order['triggered'] = True
+            return None
+        if sell and price >= limit:
+            return price
+        if not sell and price <= limit:
+            return price
+        return None
+
+    # ------------------------------------------------------------------
+    # 사용자 데이터 스트림
+    # ------------------------------------------------------------------
+    def _report(self, order, execution_type, last_qty=0.0, last_price=0.0, trade_id=-1,
+                orig_client_order_id=''):
+        return {
+            'e': 'executionReport', 'E': int(time.time() * 1000), 's': order['symbol'],
+            'c': order['clientOrderId'], 'S': order['side'], 'o': order['type'], 'f': 'GTC',
+            'q': order['origQty'], 'p': order['price'], 'P': order.get('stopPrice', '0.00000000'),
+            'x': execution_type, 'X': order['status'], 'r': 'NONE', 'i': order['orderId'],
+            'l': f"{last_qty:.8f}", 'z': order['executedQty'], 'L': f"{last_price:.8f}",
+            'n': f"{last_price * last_qty * self.fee_rate:.8f}", 'N': 'USDT',
+            'T': int(time.time() * 1000), 't': trade_id, 'g': order.get('orderListId', -1),
+            'C': orig_client_order_id, 'Z': order['cummulativeQuoteQty'],
+        }
+
+    async def _publish(self, report):
+        text = json.dumps(report)
+        for sockets in self._listen_keys.values():
+            for ws in list(sockets):
+                try:
+                    await ws.send_str(text)
+                except Exception:
+                    sockets.discard(ws)
+
+    async def _publish_fills(self, order):
+        """시장가 주문 체결 통보 (체결마다 executionReport 1개)"""
+        executed = quote = 0.0
+        for fill in order['fills']:
+            qty, price = float(fill['qty']), float(fill['price'])
+            executed += qty
+            quote += qty * price
+            partial = dict(order, executedQty=f"{executed:.8f}", cummulativeQuoteQty=f"{quote:.8f}",
+                           status='FILLED' if executed >= float(order['origQty']) - 1e-12 else 'PARTIALLY_FILLED')
+            await self._publish(self._report(partial, 'TRADE', qty, price, fill['tradeId']))
+
+    async def _fill_resting(self, order, price):
+        qty = float(order['origQty'])
+        order.update(status='FILLED', executedQty=f"{qty:.8f}",
+                     cummulativeQuoteQty=f"{qty * price:.8f}")
+        self.open_orders.pop(order['clientOrderId'], None)
+        await self._publish(self._report(order, 'TRADE', qty, price, next(self._trade_ids)))
+
+        # OCO: 한쪽이 체결되면 나머지 취소
+        list_id = order.get('listClientOrderId')
+        if list_id:
+            for other_id in self.order_lists.pop(list_id, ()):
+                other = self.open_orders.pop(other_id, None)
+                if other is not None:
+                    other['status'] = 'CANCELED'
+                    await self._publish(self._report(other, 'CANCELED'))
+
+    async def _matcher(self):
+        while True:
+            await asyncio.sleep(self.match_interval)
+            for order in list(self.open_orders.values()):
+                if order['clientOrderId'] not in self.open_orders:
+                    continue
+                fill_price = self._match(order, self.price(order['symbol']))
+                if fill_price is not None:
+                    await self._fill_resting(order, fill_price)
+
+    # ------------------------------------------------------------------
+    # 요청 가중치 한도
+    # ------------------------------------------------------------------
+    @staticmethod
+    def request_weight(request):
+        path = request.path
+        query = request.query
+        if path == '/api/v3/ticker/price':
+            return 2 if 'symbol' in query else 4
+        if path == '/api/v3/account':
+            return 20
+        if path == '/api/v3/openOrders':
+            return 6
+        if path == '/api/v3/order' and request.method == 'GET':
+            return 4
+        if path == '/api/v3/klines':
+            return 2
+        if path == '/api/v3/exchangeInfo':
+            return 20
+        return 1
+
+    def _check_weight(self, request):
+        """(응답 상태, Retry-After) → 허용이면 (None, None)"""
+        now = time.time()
+        window = now - now % self.weight_window_s
+        if window != self.weight_window:
+            self.weight_window = window
+            self.used_weight = 0
+        reset_in = window + self.weight_window_s - now
+
+        if now < self.banned_until:
+            return 418, self.banned_until - now
+
+        self.used_weight += self.request_weight(request)
+        if self.used_weight <= self.weight_limit:
+            return None, None
+
+        self._violations += 1
+        if self.ban_after is not None and self._violations > self.ban_after:
+            self.banned_until = now + 2 * self.weight_window_s
+            return 418, self.banned_until - now
+        return 429, reset_in
+
+    def _weight_middleware(self):
+        from aiohttp import web
+
+        @web.middleware
+        async def middleware(request, handler):
+            if self.weight_limit is None or not request.path.startswith('/api/'):
+                return await handler(request)
+            status, retry_after = self._check_weight(request)
+            if status is not None:
+                self.rejections[status] += 1
+                return web.json_response(
+                    {'code': -1003, 'msg': 'Too much request weight used.'}, status=status,
+                    headers={'Retry-After': str(max(1, int(retry_after + 0.999))),
+                             'X-MBX-USED-WEIGHT-1M': str(self.used_weight)})
+            response = await handler(request)
+            response.headers['X-MBX-USED-WEIGHT-1M'] = str(self.used_weight)
+            return response
+
+        return middleware
+
+    def server_ms(self):
+        return int(time.time() * 1000) + self.clock_offset_ms
+
+    def _timestamp_middleware(self):
+        from aiohttp import web
+
+        @web.middleware
+        async def middleware(request, handler):
+            params = dict(request.query)
+            if request.method == 'POST':
+                params.update(await request.post())
+            if 'timestamp' in params:
+                self.signed_params[request.path] = params
+                # 실제 거래소 규칙: 서버 시각보다 1초 넘게 앞서거나 recvWindow보다 오래됨
+                now = self.server_ms()
+                timestamp = int(params['timestamp'])
+                if timestamp > now + 1000 or now - timestamp > int(params.get('recvWindow', 5000)):
+                    self.rejections[-1021] += 1
+                    return web.json_response(
+                        {'code': -1021, 'msg': 'Timestamp for this request is outside of the recvWindow.'},
+                        status=400)
+            return await handler(request)
+
+        return middleware
+
+    # ------------------------------------------------------------------
+    # HTTP 핸들러
+    # ------------------------------------------------------------------
+    async def _delay(self, request):
+        self.request_counts[request.path] += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    async def _ping(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        return web.json_response({})
+
+    async def _time(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        return web.json_response({'serverTime': self.server_ms()})
+
+    async def _klines(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        q = request.query
+        symbol = q['symbol']
+        if symbol not in self.paths:
+            return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+        limit = min(int(q.get('limit', 500)), 1000)
+        return web.json_response(self.klines(symbol, q['interval'], limit))
+
+    async def _ticker_price(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        symbol = request.query.get('symbol')
+        if symbol:
+            if symbol not in self.paths:
+                return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+            return web.json_response({'symbol': symbol, 'price': f"{self.price(symbol):.8f}"})
+        return web.json_response([
+            {'symbol': s, 'price': f"{self.price(s):.8f}"} for s in self.symbols
+        ])
+
+    def symbol_info(self, symbol):
+        """exchangeInfo의 심볼 항목 (모든 심볼 tickSize 0.01 / stepSize 0.00001 / 최소 주문 5 USDT)"""
+        return {
+            'symbol': symbol, 'status': 'TRADING', 'baseAsset': symbol[:-4], 'quoteAsset': symbol[-4:],
+            'baseAssetPrecision': 8, 'quoteAssetPrecision': 8,
+            'orderTypes': ['LIMIT', 'MARKET', 'STOP_LOSS_LIMIT', 'TAKE_PROFIT_LIMIT'],
+            'ocoAllowed': True,
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.01000000',
+                 'maxPrice': '1000000.00000000', 'tickSize': '0.01000000'},
+                {'filterType': 'LOT_SIZE', 'minQty': '0.00001000',
+                 'maxQty': '9000.00000000', 'stepSize': '0.00001000'},
+                {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'applyMinToMarket': True,
+                 'maxNotional': '9000000.00000000', 'applyMaxToMarket': False, 'avgPriceMins': 5},
+            ],
+        }
+
+    async def _exchange_info(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        symbol = request.query.get('symbol')
+        if symbol and symbol not in self.paths:
+            return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+        symbols = [symbol] if symbol else self.symbols
+        return web.json_response({
+            'timezone': 'UTC', 'serverTime': int(time.time() * 1000), 'rateLimits': [],
+            'symbols': [self.symbol_info(s) for s in symbols],
+        })
+
+    async def _order(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        params = dict(request.query)
+        params.update(await request.post())
+        symbol = params.get('symbol')
+        if symbol not in self.paths:
+            return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+        order_type = params.get('type', 'MARKET')
+        client_order_id = params.get('newClientOrderId')
+        if order_type == 'MARKET':
+            order = self.fill_market(symbol, params['side'], float(params['quantity']), client_order_id)
+            response = web.json_response(order)
+            asyncio.get_running_loop().create_task(self._publish_fills(order))
+            return response
+        order = self.rest_order(params, order_type, params.get('price'), params.get('stopPrice'),
+                                client_order_id)
+        await self._publish(self._report(order, 'NEW'))
+        return web.json_response({k: v for k, v in order.items() if k not in ('triggered', 'listClientOrderId')})
+
+    async def _order_oco(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        params = dict(request.query)
+        params.update(await request.post())
+        if params.get('symbol') not in self.paths:
+            return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+        list_id = params.get('listClientOrderId') or f"list{len(self.order_lists) + 1}"
+        limit_leg = self.rest_order(params, 'LIMIT_MAKER', params['price'], None,
+                                    params.get('limitClientOrderId'), list_id)
+        stop_leg = self.rest_order(params, 'STOP_LOSS_LIMIT', params['stopLimitPrice'],
+                                   params['stopPrice'], params.get('stopClientOrderId'), list_id)
+        self.order_lists[list_id] = [limit_leg['clientOrderId'], stop_leg['clientOrderId']]
+        for leg in (limit_leg, stop_leg):
+            await self._publish(self._report(leg, 'NEW'))
+        return web.json_response({
+            'orderListId': len(self.order_lists), 'contingencyType': 'OCO',
+            'listStatusType': 'EXEC_STARTED', 'listOrderStatus': 'EXECUTING',
+            'listClientOrderId': list_id, 'symbol': params['symbol'],
+            'orderReports': [
+                {k: v for k, v in leg.items() if k not in ('triggered', 'listClientOrderId')}
+                for leg in (limit_leg, stop_leg)
+            ],
+        })
+
+    async def _cancel_order(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        client_order_id = request.query.get('origClientOrderId')
+        order = self.open_orders.pop(client_order_id, None)
+        if order is None:
+            return web.json_response({'code': -2011, 'msg': 'Unknown order sent.'}, status=400)
+        order['status'] = 'CANCELED'
+        await self._publish(self._report(order, 'CANCELED'))
+        return web.json_response({k: v for k, v in order.items() if k not in ('triggered', 'listClientOrderId')})
+
+    async def _cancel_order_list(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        list_id = request.query.get('listClientOrderId')
+        legs = self.order_lists.pop(list_id, None)
+        if legs is None:
+            return web.json_response({'code': -2011, 'msg': 'Order list does not exist.'}, status=400)
+        for client_order_id in legs:
+            order = self.open_orders.pop(client_order_id, None)
+            if order is not None:
+                order['status'] = 'CANCELED'
+                await self._publish(self._report(order, 'CANCELED'))
+        return web.json_response({'listClientOrderId': list_id, 'listOrderStatus': 'ALL_DONE'})
+
+    async def _query_order(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        client_order_id = request.query.get('origClientOrderId')
+        for order in reversed(self.orders):
+            if order['clientOrderId'] == client_order_id:
+                return web.json_response({k: v for k, v in order.items()
+                                          if k not in ('triggered', 'listClientOrderId', 'fills')})
+        return web.json_response({'code': -2013, 'msg': 'Order does not exist.'}, status=400)
+
+    async def _open_orders(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        symbol = request.query.get('symbol')
+        return web.json_response([
+            {k: v for k, v in o.items() if k not in ('triggered', 'listClientOrderId')}
+            for o in self.open_orders.values() if symbol in (None, o['symbol'])
+        ])
+
+    async def _user_data_stream(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        if request.method == 'POST':
+            listen_key = f"mockListenKey{len(self._listen_keys) + 1}"
+            self._listen_keys[listen_key] = set()
+            return web.json_response({'listenKey': listen_key})
+        if request.method == 'DELETE':
+            self._listen_keys.pop(request.query.get('listenKey'), None)
+        return web.json_response({})
+
+    async def _user_ws(self, request):
+        from aiohttp import web
+        sockets = self._listen_keys.get(request.match_info['listen_key'])
+        if sockets is None:
+            raise web.HTTPNotFound()
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        sockets.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            sockets.discard(ws)
+        return ws
+
+    async def _account(self, request):
+        from aiohttp import web
+        await self._delay(request)
+        return web.json_response({
+            'accountType': 'SPOT',
+            'canTrade': True,
+            'balances': [
+                {'asset': asset, 'free': f"{free:.8f}", 'locked': '0.00000000'}
+                for asset, free in self.balances.items()
+            ],
+        })
+
+    def make_app(self):
+        from aiohttp import web
+
+        app = web.Application(middlewares=[self._weight_middleware(), self._timestamp_middleware()])
+        app.router.add_get('/api/v3/ping', self._ping)
+        app.router.add_get('/api/v3/time', self._time)
+        app.router.add_get('/api/v3/klines', self._klines)
+        app.router.add_get('/api/v3/ticker/price', self._ticker_price)
+        app.router.add_get('/api/v3/exchangeInfo', self._exchange_info)
+        app.router.add_post('/api/v3/order', self._order)
+        app.router.add_delete('/api/v3/order', self._cancel_order)
+        app.router.add_get('/api/v3/order', self._query_order)
+        app.router.add_post('/api/v3/order/oco', self._order_oco)
+        app.router.add_delete('/api/v3/orderList', self._cancel_order_list)
+        app.router.add_get('/api/v3/openOrders', self._open_orders)
+        app.router.add_get('/api/v3/account', self._account)
+        app.router.add_route('*', '/api/v3/userDataStream', self._user_data_stream)
+        app.router.add_get('/ws/{listen_key}', self._user_ws)
+        return app
+
+    # ------------------------------------------------------------------
+    # 서버 수명 주기 (별도 스레드)
+    # ------------------------------------------------------------------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='mock-exchange', daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        asyncio.run(self._serve())
+
+    async def _serve(self):
+        from aiohttp import web
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, self.host, self.port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{self.host}:{port}"
+        self.ws_url = f"ws://{self.host}:{port}"
+        matcher = asyncio.create_task(self._matcher())
+        self._ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            matcher.cancel()
+            for sockets in self._listen_keys.values():
+                for ws in list(sockets):
+                    await ws.close()
+            await runner.cleanup()
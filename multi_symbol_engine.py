@@ -0,0 +1,377 @@
+"""
+asyncio 기반 멀티 심볼 거래 엔진
+- 하나의 엔진 / 하나의 HTTP 세션(keep-alive 커넥션 풀)으로 여러 심볼 관리
+- 현재가는 전 심볼 ticker/price 한 번으로 일괄 조회
+- 캔들은 심볼별로 새 캔들이 마감됐을 때만 조회 → 증분 지표 갱신
+- 심볼별 신호 판단은 세마포어로 동시성을 제한해 병렬 실행
+- 주문 수량 / 노출 / 일일 손실 한도는 전 심볼이 공유하는 RiskEngine으로 관리
+
+사용법 (로컬 모의 거래소 벤치마크):
+    python multi_symbol_engine.py --mock --symbols 50 --cycles 20
+"""
+
+import os
+import sys
+import hmac
+import time
+import asyncio
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from urllib.parse import urlencode
+
+from clock import trading_day
+from indicators import IncrementalIndicators
+from kline_decoder import decode_columns
+from market_stream import interval_to_ms
+from strategy import buy_conditions, exit_reason, RSI_OVERSOLD, BB_ENTRY_MULTIPLIER
+from risk import RiskEngine, bollinger_volatility
+from symbol_filters import SymbolIndex, FilterError
+from execution import fill_summary
+
+logger = logging.getLogger(__name__)
+
+TESTNET_API_URL = 'https://testnet.binance.vision'
+
+
+class SymbolState:
+    """심볼별 지표 / 포지션 상태"""
+
+    def __init__(self, symbol, rsi_period=14):
+        self.symbol = symbol
+        self.indicators = IncrementalIndicators(rsi_period=rsi_period)
+        self.position = None
+        self.quantity = None
+        self.last_price = None
+        self.next_close_time = None  # 진행 중인 캔들의 마감 시각 (ms)
+
+
+class MultiSymbolEngine:
+    """여러 심볼을 동시에 거래하는 비동기 엔진
+
+    BinanceTestnetBot과 같은 전략(strategy.buy_conditions / exit_reason)과
+    손익 규칙을 심볼마다 독립적으로 적용합니다. 일일 수익과 목표, 리스크
+    한도(risk)는 엔진 전체에서 공유합니다. total_asset은 운용 자본 상한이고,
+    계정 잔고를 받으면 그보다 작은 쪽을 씁니다.
+    """
+
+    def __init__(self, symbols, api_key, api_secret, base_url=TESTNET_API_URL,
+                 interval='15m', max_concurrency=8, total_asset=3_600, daily_target=20):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url.rstrip('/')
+        self.interval = interval
+        self.interval_ms = interval_to_ms(interval)
+        self.max_concurrency = max_concurrency
+
+        # 자산 및 전략 설정 (BinanceTestnetBot 기본값과 동일)
+        self.total_asset = total_asset
+        self.daily_target = daily_target
+        self.rsi_period = 14
+        self.rsi_oversold = RSI_OVERSOLD
+        self.bb_multiplier = BB_ENTRY_MULTIPLIER
+        self.take_profit_percent = 3.0
+        self.stop_loss_percent = 1.5
+
+        self.daily_profit = 0
+        self.last_trade_date = None
+        self.symbol_index = SymbolIndex(path=None)
+        self.risk = RiskEngine(capital=total_asset, rules=self.symbol_index)
+
+        self.states = {s: SymbolState(s, self.rsi_period) for s in symbols}
+        self.trade_history = []
+
+        self.session = None
+        self._semaphore = None
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        """keep-alive 커넥션 풀을 가진 세션 생성"""
+        import aiohttp
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency * 2, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'X-MBX-APIKEY': self.api_key or ''},
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+        await self.load_account()
+
+    async def load_account(self):
+        """심볼별 수량 규칙(exchangeInfo) + 계정 잔고 → 리스크 엔진 (실패하면 total_asset 기준)"""
+        try:
+            self.symbol_index.update(await self._get('/api/v3/exchangeInfo'))
+        except Exception as e:
+            logger.warning(f"⚠️ exchangeInfo 조회 실패: {e}")
+        try:
+            self.risk.update_account(await self._signed('GET', '/api/v3/account', {}))
+        except Exception as e:
+            logger.warning(f"⚠️ 계정 잔고 조회 실패 (자본 ${self.total_asset:,.2f} 기준): {e}")
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _get(self, path, params=None):
+        async with self.session.get(self.base_url + path, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def _signed(self, method, path, params):
+        params = dict(params, timestamp=int(time.time() * 1000))
+        query = urlencode(params)
+        signature = hmac.new(self.api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+        url = f"{self.base_url}{path}?{query}&signature={signature}"
+        async with self.session.request(method, url) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def _signed_post(self, path, params):
+        return await self._signed('POST', path, params)
+
+    # ------------------------------------------------------------------
+    # 시장 데이터
+    # ------------------------------------------------------------------
+    async def fetch_prices(self):
+        """전 심볼 현재가 일괄 조회 (심볼별 get_symbol_ticker 대신 요청 1회)"""
+        tickers = await self._get('/api/v3/ticker/price')
+        return {t['symbol']: float(t['price']) for t in tickers if t['symbol'] in self.states}
+
+    async def sync_candles(self, state, limit=100):
+        """마감된 새 캔들이 있을 때만 kline을 받아 지표 상태 갱신"""
+        klines = await self._get('/api/v3/klines', {
+            'symbol': state.symbol, 'interval': self.interval, 'limit': limit
+        })
+        columns = decode_columns(klines[:-1])
+        state.indicators.sync_closed(columns['open_time'], columns['close'])
+        state.next_close_time = klines[-1][6]
+
+    # ------------------------------------------------------------------
+    # 주문
+    # ------------------------------------------------------------------
+    async def place_order(self, symbol, side, quantity, price=None):
+        """시장가 주문 (거래소 필터 위반이면 보내지 않음)"""
+        filters = self.symbol_index.get(symbol)
+        try:
+            if filters is not None:
+                quantity = filters.round_quantity(quantity, market=True)
+                filters.validate(quantity, price, market=True)
+                quantity = filters.format_quantity(quantity)
+            order = await self._signed_post('/api/v3/order', {
+                'symbol': symbol, 'side': side, 'type': 'MARKET', 'quantity': quantity
+            })
+            logger.info(f"✅ {symbol} {side} 주문 체결 성공! (주문 ID: {order['orderId']})")
+            return order
+        except FilterError as e:
+            logger.error(f"❌ {symbol} 주문 거부 (거래소 필터, 전송하지 않음): {e}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ {symbol} 주문 실패: {e}")
+            return None
+
+    def is_daily_target_reached(self):
+        """일일 목표 수익 달성 여부 확인 (날짜가 바뀌면 초기화)"""
+        today = trading_day()
+        if self.last_trade_date != today:
+            self.daily_profit = 0
+            self.last_trade_date = today
+        return self.daily_profit >= self.daily_target
+
+    async def open_position(self, state, price, analysis):
+        volatility = bollinger_volatility(analysis['bb_upper'], analysis['bb_middle'], analysis['bb_lower'])
+        quantity = self.risk.size(state.symbol, price, volatility)
+        reason = self.risk.check(state.symbol, 'BUY', quantity, price) if quantity else "주문 가능 수량 없음"
+        if reason:
+            logger.info(f"🛑 {state.symbol} 매수 보류 (리스크 한도): {reason}")
+            return
+        state.quantity = quantity
+
+        # 검사와 같은 동기 구간에서 예약 (전송을 기다리는 동안 다른 심볼이 같은 한도를 쓰지 않게)
+        self.risk.reserve(state.symbol, quantity, price)
+        try:
+            order = await self.place_order(state.symbol, 'BUY', quantity, price)
+        finally:
+            self.risk.release(state.symbol, quantity, price)
+        if order:
+            # 진입가 / 수량은 실제 체결 기준 (체결 정보가 없을 때만 현재가 / 주문 수량)
+            fill_price, filled_qty, _ = fill_summary(order)
+            price = fill_price or price
+            quantity = filled_qty or quantity
+            state.position = {
+                'side': 'BUY',
+                'entry_price': price,
+                'quantity': quantity,
+                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'order_id': order['orderId'],
+            }
+            self.risk.on_fill(state.symbol, 'BUY', quantity, price)
+            logger.info(f"🔓 {state.symbol} 포지션 오픈: BUY {quantity} @ ${price:,.4f}")
+
+    async def close_position(self, state, price, reason):
+        order = await self.place_order(state.symbol, 'SELL', state.position['quantity'])
+        if not order:
+            return
+
+        # 손익은 실제 체결 VWAP 기준 (체결 정보가 없을 때만 현재가)
+        price = fill_summary(order)[0] or price
+        entry_price = state.position['entry_price']
+        pnl_percent = (price - entry_price) / entry_price * 100
+        pnl_amount = (price - entry_price) * state.position['quantity']
+        self.daily_profit += pnl_amount
+        self.risk.on_fill(state.symbol, 'SELL', state.position['quantity'], price)
+        self.risk.record_pnl(pnl_amount)
+
+        self.trade_history.append({
+            'symbol': state.symbol,
+            'open_time': state.position['time'],
+            'close_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'side': 'BUY',
+            'entry_price': entry_price,
+            'exit_price': price,
+            'quantity': state.position['quantity'],
+            'pnl_percent': pnl_percent,
+            'pnl_amount': pnl_amount,
+            'reason': reason,
+            'daily_profit': self.daily_profit,
+        })
+        logger.info(f"🔒 {state.symbol} 포지션 청산: {reason} | 손익: {pnl_percent:+.2f}% (${pnl_amount:+.2f})")
+        state.position = None
+
+    # ------------------------------------------------------------------
+    # 판단
+    # ------------------------------------------------------------------
+    async def evaluate_symbol(self, state, price, now_ms):
+        """심볼 하나의 청산 / 매수 판단 (동시성 제한)"""
+        async with self._semaphore:
+            state.last_price = price
+            self.risk.mark(state.symbol, price)
+
+            if state.position:
+                reason = exit_reason(
+                    state.position['entry_price'], price, state.position['quantity'],
+                    self.take_profit_percent, self.stop_loss_percent, self.daily_target
+                )
+                if reason:
+                    await self.close_position(state, price, reason)
+                return
+
+            if state.next_close_time is None or now_ms > state.next_close_time:
+                await self.sync_candles(state)
+            if not state.indicators.ready or self.daily_profit >= self.daily_target:
+                return
+
+            analysis = state.indicators.peek(price)
+            conditions = buy_conditions(
+                analysis['rsi'], analysis['macd'], analysis['macd_signal'],
+                price, analysis['bb_lower'], self.rsi_oversold, self.bb_multiplier
+            )
+            if all(conditions):
+                logger.info(f"🎯 {state.symbol} 매수 신호 발생! RSI: {analysis['rsi']:.2f}")
+                await self.open_position(state, price, analysis)
+
+    async def run_cycle(self):
+        """1회 판단: 현재가 일괄 조회 → 전 심볼 동시 판단"""
+        self.is_daily_target_reached()
+        prices = await self.fetch_prices()
+        now_ms = int(time.time() * 1000)
+
+        symbols = [s for s in self.states if s in prices]
+        results = await asyncio.gather(*(
+            self.evaluate_symbol(self.states[s], prices[s], now_ms) for s in symbols
+        ), return_exceptions=True)
+
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ {symbol} 판단 실패: {result}")
+
+    async def run(self, check_interval=60, cycles=None):
+        """엔진 실행 (cycles가 None이면 무한 반복)"""
+        logger.info(f"🚀 멀티 심볼 엔진 시작! 심볼 {len(self.states)}개 | 동시성 {self.max_concurrency}")
+        count = 0
+        while cycles is None or count < cycles:
+            started = time.monotonic()
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.error(f"❌ 사이클 실패: {e}")
+            count += 1
+            await asyncio.sleep(max(0.0, check_interval - (time.monotonic() - started)))
+
+
+async def benchmark(engine, cycles):
+    """사이클별 지연 시간 측정 (초 단위 목록)"""
+    latencies = []
+    for _ in range(cycles):
+        started = time.perf_counter()
+        await engine.run_cycle()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='멀티 심볼 비동기 거래 엔진')
+    parser.add_argument('--symbols', type=int, default=20, help='모의 거래소 심볼 수 (--mock)')
+    parser.add_argument('--universe', help='거래 심볼 목록 (쉼표 구분, 실거래 테스트넷)')
+    parser.add_argument('--mock', action='store_true', help='로컬 모의 거래소로 벤치마크')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='모의 거래소 응답 지연')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--cycles', type=int, default=10)
+    parser.add_argument('--interval', type=int, default=60, help='실행 모드 체크 주기(초)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.mock else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.mock:
+        import numpy as np
+        from mock_exchange import MockExchange
+
+        symbols = [f"SYM{i:03d}USDT" for i in range(args.symbols)]
+        with MockExchange(symbols, latency_ms=args.latency_ms) as exchange:
+            async def _bench():
+                async with MultiSymbolEngine(symbols, 'mock', 'mock', base_url=exchange.base_url,
+                                             max_concurrency=args.concurrency) as engine:
+                    return await benchmark(engine, args.cycles)
+
+            latencies = np.array(asyncio.run(_bench())) * 1000
+
+        print(f"📊 심볼 {args.symbols}개 | 사이클 {args.cycles}회 | 응답 지연 {args.latency_ms}ms")
+        print(f"⏱️ 첫 사이클(지표 초기화): {latencies[0]:.1f}ms")
+        print(f"⏱️ 이후 p50: {np.percentile(latencies[1:], 50):.1f}ms | "
+              f"p99: {np.percentile(latencies[1:], 99):.1f}ms")
+        print(f"🌐 요청 수: {dict(exchange.request_counts)}")
+        return
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    universe = (args.universe or 'BTCUSDT,ETHUSDT,BNBUSDT').split(',')
+
+    async def _run():
+        async with MultiSymbolEngine(universe, os.getenv('BINANCE_TESTNET_API_KEY'),
+                                     os.getenv('BINANCE_TESTNET_SECRET_KEY'),
+                                     max_concurrency=args.concurrency) as engine:
+            await engine.run(check_interval=args.interval)
+
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        logger.info("⏹️ 엔진 종료")
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
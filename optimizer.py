@@ -0,0 +1,190 @@
+"""
+멀티프로세스 파라미터 스윕 (그리드 최적화)
+- 캔들 이력을 공유 메모리에 한 번만 올리고 프로세스 풀로 평가 분산
+- 워커별 지표 열 캐시 (RSI는 기간별 1개, MACD / 볼린저밴드는 1개)
+- 같은 RSI 기간끼리 묶어 전달해 캐시 적중률을 높임
+- 결과는 끝나는 순서대로 JSON Lines 파일에 바로 기록
+
+사용법:
+    python optimizer.py klines.csv --grid grid.json --out logs/sweep.jsonl
+    grid.json 예: {"rsi_period": [10, 14], "rsi_oversold": [25, 30], "take_profit_percent": [2, 3]}
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from functools import lru_cache
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backtest import BacktestConfig, load_klines, synthetic_klines, run_backtest
+from indicators import rsi_column, macd_columns, bollinger_columns
+
+# 기본 탐색 범위
+DEFAULT_GRID = {
+    'rsi_period': [10, 14, 21],
+    'rsi_oversold': [25, 30, 35],
+    'bb_multiplier': [1.0, 1.01, 1.02, 1.03],
+    'take_profit_percent': [1.5, 2.0, 3.0],
+    'stop_loss_percent': [1.0, 1.5, 2.0],
+}
+
+
+def expand_grid(grid):
+    """{'파라미터': [값, ...]} → 파라미터 조합 목록 (RSI 기간 순으로 정렬)"""
+    valid = {f.name for f in fields(BacktestConfig)}
+    unknown = set(grid) - valid
+    if unknown:
+        raise ValueError(f"알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    combos.sort(key=lambda p: p.get('rsi_period', BacktestConfig.rsi_period))
+    return combos
+
+
+class SharedKlines:
+    """캔들 열(open_time, close)을 담은 공유 메모리 블록
+
+    워커는 이름만 받아 views()로 복사 없이 NumPy 뷰를 만듭니다.
+    """
+
+    def __init__(self, data):
+        n = len(data['close'])
+        self.length = n
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, n * 16))
+        open_time, close = self.views(self.shm.buf, n)
+        open_time[:] = data['open_time']
+        close[:] = data['close']
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @staticmethod
+    def views(buf, n):
+        open_time = np.ndarray((n,), dtype=np.int64, buffer=buf, offset=0)
+        close = np.ndarray((n,), dtype=np.float64, buffer=buf, offset=n * 8)
+        return open_time, close
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 워커 프로세스 전역 상태
+_shm = None
+_data = None
+
+
+def _init_worker(name, length):
+    global _shm, _data
+    _shm = shared_memory.SharedMemory(name=name)
+    open_time, close = SharedKlines.views(_shm.buf, length)
+    _data = {'open_time': open_time, 'close': close}
+
+
+@lru_cache(maxsize=None)
+def _rsi(period):
+    return rsi_column(_data['close'], period)
+
+
+@lru_cache(maxsize=1)
+def _base_columns():
+    return {**macd_columns(_data['close']), **bollinger_columns(_data['close'])}
+
+
+def _evaluate(batch):
+    """파라미터 조합 묶음 평가 (워커 프로세스에서 실행)"""
+    results = []
+    for params in batch:
+        config = BacktestConfig(**params)
+        columns = {'rsi': _rsi(config.rsi_period), **_base_columns()}
+        _, summary = run_backtest(_data, config, columns=columns)
+        results.append({'params': params, **summary})
+    return results
+
+
+def _batches(combos, batch_size):
+    """같은 RSI 기간끼리만 묶어 batch_size 단위로 분할"""
+    for _, group in itertools.groupby(combos, key=lambda p: p.get('rsi_period')):
+        group = list(group)
+        for i in range(0, len(group), batch_size):
+            yield group[i:i + batch_size]
+
+
+def run_sweep(data, grid, out_path, workers=None, batch_size=16):
+    """그리드 스윕 실행 → 총 손익 기준 정렬된 결과 목록
+
+    각 결과는 완료되는 즉시 out_path(JSON Lines)에 한 줄씩 기록됩니다.
+    """
+    combos = expand_grid(grid)
+    workers = workers or os.cpu_count()
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+
+    results = []
+    with SharedKlines(data) as shared, open(out_path, 'w', encoding='utf-8') as out:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.name, shared.length)) as pool:
+            futures = [pool.submit(_evaluate, batch) for batch in _batches(combos, batch_size)]
+            for future in as_completed(futures):
+                for result in future.result():
+                    out.write(json.dumps(result, ensure_ascii=False) + '\n')
+                    results.append(result)
+                out.flush()
+
+    results.sort(key=lambda r: r['total_pnl'], reverse=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='전략 파라미터 그리드 스윕')
+    parser.add_argument('path', nargs='?', help='캔들 CSV / Parquet 파일 또는 캔들 저장소 디렉터리')
+    parser.add_argument('--synthetic', type=int, default=0, help='합성 캔들 개수 (파일 대신)')
+    parser.add_argument('--grid', help='파라미터 그리드 JSON 파일 (기본: DEFAULT_GRID)')
+    parser.add_argument('--out', default='logs/sweep_results.jsonl', help='결과 JSON Lines 경로')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--top', type=int, default=10, help='출력할 상위 결과 수')
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        data = synthetic_klines(args.synthetic)
+    elif args.path:
+        data = load_klines(args.path)
+    else:
+        parser.error('캔들 파일 경로 또는 --synthetic 이 필요합니다')
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid, 'r', encoding='utf-8') as f:
+            grid = json.load(f)
+
+    started = time.perf_counter()
+    results = run_sweep(data, grid, args.out, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(f"📊 조합 {len(results):,}개 평가 완료 ({elapsed:.1f}초) → {args.out}")
+    for rank, result in enumerate(results[:args.top], 1):
+        print(f"  {rank:2d}. ${result['total_pnl']:+,.2f} | 거래 {result['trades']}건 | "
+              f"승률 {result['win_rate']:.1f}% | {result['params']}")
+
+    return results
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,277 @@
+"""
+로컬 L2 호가창
+- REST 스냅샷(get_order_book) + diff-depth 스트림(<symbol>@depth@100ms) 증분 반영
+- 가격 레벨은 정렬된 array('d') 두 개(키 / 잔량)에 저장하고 bisect + 제자리 삽입 / 삭제로 갱신
+  (레벨마다 객체를 만들지 않음, 최우선 호가가 배열 끝이라 이동 구간이 짧음)
+- 업데이트 ID 연속성 검사 → 공백이 보이면 스냅샷을 다시 받고 그동안 온 이벤트는 버퍼에 보관
+- 스프레드, 상위 N호가 잔량 불균형, 지정 수량 시장가 주문의 예상 슬리피지
+
+사용법 (성능 확인):
+    python benchmarks/bench_order_book.py
+"""
+
+import time
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class BookSide:
+    """한쪽 호가 (최우선 호가가 배열 끝에 오도록 키 오름차순)
+
+    키는 매수 쪽이면 가격, 매도 쪽이면 -가격입니다. 레벨 수가
+    max_levels를 넘으면 최우선 호가에서 가장 먼 레벨부터 버립니다.
+    """
+
+    def __init__(self, sign, max_levels=5000):
+        self.sign = sign
+        self.max_levels = max_levels
+        self.keys = array('d')
+        self.quantities = array('d')
+
+    def __len__(self):
+        return len(self.keys)
+
+    def load(self, levels):
+        """스냅샷 [[가격, 잔량], ...] (문자열)로 전체 교체"""
+        pairs = sorted((self.sign * float(price), float(quantity)) for price, quantity in levels
+                       if float(quantity) > 0)[-self.max_levels:]
+        self.keys = array('d', [key for key, _ in pairs])
+        self.quantities = array('d', [quantity for _, quantity in pairs])
+
+    def set(self, price, quantity):
+        """레벨 하나 갱신 (잔량 0이면 삭제)"""
+        keys = self.keys
+        key = self.sign * price
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if quantity:
+                self.quantities[i] = quantity
+            else:
+                del keys[i]
+                del self.quantities[i]
+        elif quantity:
+            if len(keys) >= self.max_levels:
+                if i == 0:
+                    return
+                del keys[0]
+                del self.quantities[0]
+                i -= 1
+            keys.insert(i, key)
+            self.quantities.insert(i, quantity)
+
+    def best(self):
+        """(최우선 가격, 잔량), 비어 있으면 None"""
+        if not self.keys:
+            return None
+        return self.sign * self.keys[-1], self.quantities[-1]
+
+    def depth(self, levels):
+        """상위 levels개 레벨 잔량 합"""
+        quantities = self.quantities
+        total = 0.0
+        for i in range(len(quantities) - 1, max(len(quantities) - levels, 0) - 1, -1):
+            total += quantities[i]
+        return total
+
+    def sweep(self, quantity):
+        """quantity를 최우선 호가부터 소진할 때 평균 체결가 (잔량이 모자라면 None)"""
+        keys, quantities = self.keys, self.quantities
+        remaining = quantity
+        cost = 0.0
+        for i in range(len(keys) - 1, -1, -1):
+            take = min(remaining, quantities[i])
+            cost += take * self.sign * keys[i]
+            remaining -= take
+            if remaining <= 1e-12:
+                return cost / quantity
+        return None
+
+
+class OrderBook:
+    """심볼 하나의 L2 호가창 (스냅샷 + diff 이벤트)
+
+    last_update_id가 None이면 동기화되지 않은 상태입니다. diff 이벤트는
+    바이낸스 규칙대로 u <= last_update_id면 버리고, U > last_update_id + 1이면
+    공백으로 보고 동기화를 해제합니다.
+    """
+
+    def __init__(self, symbol, max_levels=5000):
+        self.symbol = symbol
+        self.bids = BookSide(1, max_levels)
+        self.asks = BookSide(-1, max_levels)
+        self.last_update_id = None
+        self.updates = 0
+        self.gaps = 0
+
+    @property
+    def synced(self):
+        return self.last_update_id is not None
+
+    def reset(self):
+        self.last_update_id = None
+
+    def apply_snapshot(self, snapshot):
+        """REST get_order_book 응답 반영"""
+        self.bids.load(snapshot['bids'])
+        self.asks.load(snapshot['asks'])
+        self.last_update_id = snapshot['lastUpdateId']
+
+    def apply_diff(self, event):
+        """diff-depth 이벤트 반영 → False면 공백 (재동기화 필요)"""
+        if self.last_update_id is None:
+            return False
+        if event['u'] <= self.last_update_id:
+            return True
+        if event['U'] > self.last_update_id + 1:
+            self.gaps += 1
+            self.last_update_id = None
+            return False
+
+        bids, asks = self.bids, self.asks
+        for price, quantity in event['b']:
+            bids.set(float(price), float(quantity))
+        for price, quantity in event['a']:
+            asks.set(float(price), float(quantity))
+        self.last_update_id = event['u']
+        self.updates += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # 미시구조 지표
+    # ------------------------------------------------------------------
+    def mid(self):
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread_bps(self):
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (ask[0] - bid[0]) / ((ask[0] + bid[0]) / 2) * 10_000
+
+    def imbalance(self, levels=10):
+        """상위 levels호가 잔량 불균형 (-1 매도 우위 ~ +1 매수 우위)"""
+        bid_depth = self.bids.depth(levels)
+        ask_depth = self.asks.depth(levels)
+        total = bid_depth + ask_depth
+        return (bid_depth - ask_depth) / total if total else 0.0
+
+    def slippage_bps(self, side, quantity):
+        """시장가 side 주문 quantity의 중간가 대비 예상 불리 체결 폭 (잔량이 모자라면 None)"""
+        mid = self.mid()
+        if mid is None or quantity <= 0:
+            return None
+        if side == 'BUY':
+            price = self.asks.sweep(quantity)
+            return None if price is None else (price - mid) / mid * 10_000
+        price = self.bids.sweep(quantity)
+        return None if price is None else (mid - price) / mid * 10_000
+
+    def signals(self, quantity, levels=10):
+        """판단 / 주문에 쓰는 요약 (동기화 전이면 None)"""
+        if not self.synced or self.mid() is None:
+            return None
+        return {
+            'spread_bps': self.spread_bps(),
+            'imbalance': self.imbalance(levels),
+            'slippage_bps': self.slippage_bps('BUY', quantity),
+            'exit_slippage_bps': self.slippage_bps('SELL', quantity),
+        }
+
+
+class DepthSync:
+    """스트림 수신 스레드에서 diff 이벤트를 받아 OrderBook을 유지
+
+    스냅샷을 받는 동안 도착한 이벤트는 버퍼에 쌓았다가 스냅샷 뒤에
+    이어서 반영합니다 (바이낸스 문서의 로컬 호가창 관리 절차). 공백이
+    보이거나 스트림이 다시 연결되면 같은 절차를 백그라운드에서 다시
+    밟습니다. 읽기(signals)는 메인 스레드에서 잠금 아래 합니다.
+    """
+
+    def __init__(self, symbol, fetch_snapshot, max_levels=5000, buffer_size=10_000,
+                 retry_interval=1.0):
+        self.book = OrderBook(symbol, max_levels)
+        self.fetch_snapshot = fetch_snapshot  # limit → get_order_book 응답
+        self.retry_interval = retry_interval
+        self.lock = threading.Lock()
+        self.buffer = deque(maxlen=buffer_size)
+        self.syncing = False
+        self.resyncs = 0
+
+    def on_event(self, event):
+        """diff-depth 이벤트 (수신 스레드)"""
+        with self.lock:
+            if self.syncing:
+                self.buffer.append(event)
+                return
+            if self.book.apply_diff(event):
+                return
+            self.buffer.append(event)
+        logger.warning(f"⚠️ 호가창 업데이트 공백 감지 ({self.book.symbol}). 스냅샷 재동기화")
+        self.resync()
+
+    def resync(self):
+        """스냅샷 재요청 (백그라운드, 이미 진행 중이면 무시)"""
+        with self.lock:
+            if self.syncing:
+                return
+            self.syncing = True
+            self.book.reset()
+        threading.Thread(target=self._resync, name='depth-resync', daemon=True).start()
+
+    def _resync(self):
+        while True:
+            try:
+                snapshot = self.fetch_snapshot(1000)
+            except Exception as e:
+                logger.warning(f"⚠️ 호가창 스냅샷 조회 실패: {e}")
+                time.sleep(self.retry_interval)
+                continue
+
+            with self.lock:
+                self.book.apply_snapshot(snapshot)
+                pending = list(self.buffer)
+                self.buffer.clear()
+                if all(self.book.apply_diff(event) for event in pending):
+                    self.syncing = False
+                    self.resyncs += 1
+                    logger.info(f"📚 호가창 동기화 완료 ({self.book.symbol}, "
+                                f"업데이트 ID {self.book.last_update_id}, 버퍼 {len(pending)}건 반영)")
+                    return
+                # 스냅샷이 버퍼보다 오래됨 → 새 이벤트를 버퍼에 받으며 잠시 뒤 다시 요청
+                self.book.reset()
+            time.sleep(self.retry_interval)
+
+    def poll(self, limit=100):
+        """REST 폴링 모드: 스냅샷만으로 호가창 교체 (스트림이 없을 때)"""
+        try:
+            snapshot = self.fetch_snapshot(limit)
+        except Exception as e:
+            logger.warning(f"⚠️ 호가창 스냅샷 조회 실패: {e}")
+            return
+        with self.lock:
+            if not self.syncing:
+                self.book.apply_snapshot(snapshot)
+
+    def signals(self, quantity, levels=10):
+        with self.lock:
+            if self.syncing:
+                return None
+            return self.book.signals(quantity, levels)
+
+    def slippage_bps(self, side, quantity):
+        with self.lock:
+            if self.syncing or not self.book.synced:
+                return None
+            return self.book.slippage_bps(side, quantity)
+
+    def mid(self):
+        with self.lock:
+            return None if self.syncing or not self.book.synced else self.book.mid()
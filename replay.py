@@ -0,0 +1,329 @@
+"""
+리플레이 / 페이퍼 트레이딩
+- 실제 세션의 시세(티커 / 호가 / 캔들)를 압축 바이너리 파일로 녹화 (BOT_RECORD=경로)
+- 녹화 파일, CSV / Parquet, 캔들 저장소를 거래소 시뮬레이터에 올려
+  BinanceTestnetBot.run()을 수정 없이 그대로 실행
+- 가상 시계: sleep은 시간만 전진 (기본: 최대 속도, --speed N이면 N배속으로 실제 대기)
+- 같은 입력 + 같은 시드 → 같은 주문. 주문 내역 지문(sha256)으로 코드 버전 간 결과 비교
+
+녹화 파일 형식 (.rec):
+    헤더 24바이트 = 매직 b'BTREC001' + 심볼(ASCII, 16바이트 0 채움)
+    레코드 16바이트 = 시각(ms, int64 LE) + 가격(float64 LE), append-only
+    레코드는 받은 순서대로 쓰고 읽을 때 시각순으로 정렬합니다. 첫 레코드 시각이
+    녹화를 시작한 시점(라이브 세션 시작)이고, 그 이전 레코드는 지표 워밍업용
+    과거 캔들입니다.
+
+사용법:
+    BOT_RECORD=data/sessions/2024-05-01.rec python binance_testnet_bot.py   # 녹화
+    python replay.py data/sessions/2024-05-01.rec [--speed 3600] [--orders orders.json]
+    python replay.py data/klines/BTCUSDT/1m --hours 168
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+
+from clock import VirtualClock
+from market_stream import interval_to_ms
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BTREC001'
+HEADER_SIZE = 24
+RECORD = np.dtype([('time', '<i8'), ('price', '<f8')])
+WARMUP_MS = 100 * 15 * 60_000  # CSV / 캔들 저장소 재생 시 지표 워밍업 구간 (100 x 15분)
+
+
+# ----------------------------------------------------------------------
+# 녹화
+# ----------------------------------------------------------------------
+class Recorder:
+    """심볼 하나의 가격 표본을 .rec 파일에 이어 쓰기
+
+    기존 파일이면 이어서 쓰고, 쓰다 끊긴 마지막 레코드는 잘라냅니다.
+    캔들은 마감된 것만, 이미 기록한 캔들 이후만 씁니다.
+    """
+
+    def __init__(self, path, symbol):
+        self.path = path
+        self.symbol = symbol
+        self.last_candle = None  # 마지막으로 기록한 마감 캔들 open_time
+        self.count = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            header_symbol = read_header(path)
+            if header_symbol != symbol:
+                raise ValueError(f"녹화 파일 심볼이 다릅니다: {header_symbol} != {symbol}")
+            size = os.path.getsize(path)
+            usable = HEADER_SIZE + (size - HEADER_SIZE) // RECORD.itemsize * RECORD.itemsize
+            if usable != size:
+                os.truncate(path, usable)
+            self.count = (usable - HEADER_SIZE) // RECORD.itemsize
+            self.file = open(path, 'ab')
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(MAGIC + symbol.encode('ascii').ljust(HEADER_SIZE - len(MAGIC), b'\0'))
+
+    def write(self, samples):
+        """[(시각 ms, 가격)] 기록"""
+        if not samples:
+            return
+        self.file.write(np.array(samples, dtype=RECORD).tobytes())
+        self.file.flush()
+        self.count += len(samples)
+
+    def record_price(self, time_ms, price):
+        self.write([(int(time_ms), float(price))])
+
+    def record_klines(self, klines, interval, now_ms):
+        """kline 응답 기록: 마감 캔들은 시가 / 고가 / 저가 / 종가 4개 표본, 진행 중 캔들은 현재가"""
+        interval_ms = interval_to_ms(interval)
+        samples = []
+        for kline in klines:
+            open_time = int(kline[0])
+            if open_time + interval_ms > now_ms:
+                samples.append((now_ms, float(kline[4])))
+                continue
+            if self.last_candle is not None and open_time <= self.last_candle:
+                continue
+            open_, high, low, close = (float(v) for v in kline[1:5])
+            # 캔들 안 고가 / 저가 순서는 알 수 없으므로 시가 → 종가 방향과 반대쪽 극값을 먼저
+            first, second = (low, high) if close >= open_ else (high, low)
+            step = interval_ms // 3
+            samples += [(open_time, open_), (open_time + step, first),
+                        (open_time + 2 * step, second), (open_time + interval_ms - 1, close)]
+            self.last_candle = open_time
+        self.write(samples)
+
+    def record_window(self, window, interval, now_ms):
+        """캔들 저장소 컬럼 뷰(KlineSeries.window) 기록 → record_klines와 같은 표본
+
+        네트워크 없이 저장소로 지표를 채운 워밍업 구간도 녹화해야 재생할 때
+        같은 지표 상태에서 시작합니다.
+        """
+        columns = (window[name].tolist() for name in ('open_time', 'open', 'high', 'low', 'close'))
+        self.record_klines(list(zip(*columns)), interval, now_ms)
+
+    def record_event(self, kind, data, now_ms):
+        """스트리밍 모드 이벤트(REST를 거치지 않는 가격) 기록"""
+        if kind == 'book':
+            self.record_price(now_ms, (data['bid'] + data['ask']) / 2)
+        elif kind == 'kline':
+            self.record_price(now_ms, data['close'])
+
+    def close(self):
+        self.file.close()
+
+
+class RecordingClient:
+    """클라이언트 래퍼: 시세 조회 응답을 Recorder에 남기고 그대로 반환
+
+    주문 / 잔고 등 나머지 메서드는 감싼 클라이언트로 바로 넘깁니다.
+    """
+
+    def __init__(self, client, recorder, clock):
+        self.client = client
+        self.recorder = recorder
+        self.clock = clock
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def get_symbol_ticker(self, **kwargs):
+        ticker = self.client.get_symbol_ticker(**kwargs)
+        if isinstance(ticker, dict) and ticker.get('symbol') == self.recorder.symbol:
+            self.recorder.record_price(self.clock.time_ms(), ticker['price'])
+        return ticker
+
+    def get_orderbook_ticker(self, **kwargs):
+        book = self.client.get_orderbook_ticker(**kwargs)
+        if isinstance(book, dict) and book.get('symbol') == self.recorder.symbol:
+            mid = (float(book['bidPrice']) + float(book['askPrice'])) / 2
+            self.recorder.record_price(self.clock.time_ms(), mid)
+        return book
+
+    def get_klines(self, **kwargs):
+        klines = self.client.get_klines(**kwargs)
+        if kwargs.get('symbol') == self.recorder.symbol and klines:
+            self.recorder.record_klines(klines, kwargs['interval'], self.clock.time_ms())
+        return klines
+
+
+# ----------------------------------------------------------------------
+# 읽기
+# ----------------------------------------------------------------------
+def read_header(path):
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError(f"녹화 파일이 아닙니다: {path}")
+    return header[len(MAGIC):].rstrip(b'\0').decode('ascii')
+
+
+def load_recording(path):
+    """.rec → {'symbol', 'start_ms', 'open_time', 'close'} (시각순 정렬 NumPy 열)"""
+    symbol = read_header(path)
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD.itemsize
+    records = np.fromfile(path, dtype=RECORD, count=count, offset=HEADER_SIZE)
+    if not len(records):
+        raise ValueError(f"녹화된 표본이 없습니다: {path}")
+    order = np.argsort(records['time'], kind='stable')
+    return {
+        'symbol': symbol,
+        'start_ms': int(records['time'][0]),
+        'open_time': np.ascontiguousarray(records['time'][order]),
+        'close': np.ascontiguousarray(records['price'][order]),
+    }
+
+
+def load_replay_data(path, symbol='BTCUSDT'):
+    """녹화 파일 또는 backtest.load_klines 형식 → (심볼, 가격 열, 시작 시각 ms)"""
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            is_recording = f.read(len(MAGIC)) == MAGIC
+        if is_recording:
+            data = load_recording(path)
+            return data['symbol'], data, data['start_ms']
+
+    from backtest import load_klines
+    data = load_klines(path)
+    return symbol, data, int(data['open_time'][0]) + WARMUP_MS
+
+
+# ----------------------------------------------------------------------
+# 재생
+# ----------------------------------------------------------------------
+class ReplayFinished(KeyboardInterrupt):
+    """재생 데이터 끝: run()의 종료 경로(포지션 청산 → 리포트 저장)를 그대로 타도록
+    KeyboardInterrupt로 전달합니다."""
+
+
+class ReplayClock(VirtualClock):
+    """재생용 가상 시계
+
+    speed가 없으면 sleep은 시간만 전진하고, speed=N이면 가상 시간
+    1초당 실제 1/N초를 기다립니다 (스레드 / 지연 관련 문제 재현용).
+    end_ms를 넘어 잠들려 하면 ReplayFinished를 던집니다.
+    """
+
+    def __init__(self, start_ms, end_ms, speed=None):
+        super().__init__(start_ms)
+        self.end_ms = end_ms
+        self.speed = speed
+
+    def sleep(self, seconds):
+        if self.current_ms + seconds * 1000 >= self.end_ms:
+            raise ReplayFinished()
+        if self.speed:
+            time.sleep(seconds / self.speed)
+        super().sleep(seconds)
+
+
+def order_digest(orders):
+    """주문 내역 지문 (같은 입력 / 코드면 같은 값)"""
+    fields = ('symbol', 'side', 'type', 'transactTime', 'origQty', 'executedQty',
+              'cummulativeQuoteQty', 'status')
+    canonical = [[order.get(field) for field in fields] for order in orders]
+    return hashlib.sha256(json.dumps(canonical, separators=(',', ':')).encode()).hexdigest()
+
+
+def replay(path, symbol='BTCUSDT', hours=None, check_interval=60, speed=None, seed=0,
+           latency_ms=0.0, jitter_ms=0.0, fee_rate=0.001, slippage_bps=0.0):
+    """녹화 / 과거 데이터로 BinanceTestnetBot.run()을 그대로 실행 → 요약 dict"""
+    from exchange_simulator import SimulatedExchange
+    from binance_testnet_bot import BinanceTestnetBot
+    from kline_store import KlineStore
+    from trade_journal import TradeJournal
+
+    symbol, data, start_ms = load_replay_data(path, symbol)
+    end_ms = int(data['open_time'][-1])
+    if hours is not None:
+        end_ms = min(end_ms, start_ms + int(hours * 3_600_000))
+    if start_ms >= end_ms:
+        raise ValueError("재생할 구간이 없습니다 (워밍업 구간보다 데이터가 짧음)")
+
+    clock = ReplayClock(start_ms, end_ms, speed)
+    exchange = SimulatedExchange({symbol: data}, clock=clock, seed=seed, fee_rate=fee_rate,
+                                 latency_ms=latency_ms, latency_jitter_ms=jitter_ms,
+                                 slippage_bps=slippage_bps)
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as root:
+        journal = TradeJournal(os.path.join(root, 'trade_journal.db'))
+        bot = BinanceTestnetBot(client=exchange, clock=clock, journal=journal)
+        bot.kline_store = KlineStore(root)
+        try:
+            if bot.symbol != symbol:
+                raise ValueError(f"봇 거래 페어({bot.symbol})와 데이터 심볼({symbol})이 다릅니다")
+            bot.run(check_interval=check_interval)
+            trades = journal.session_trades()
+        finally:
+            journal.close()
+    elapsed = time.perf_counter() - started
+
+    simulated_hours = (clock.time_ms() - start_ms) / 3_600_000
+    return {
+        'symbol': symbol,
+        'simulated_hours': simulated_hours,
+        'wall_seconds': elapsed,
+        'compression': simulated_hours * 3600 / elapsed if elapsed else None,
+        'requests': exchange.request_count,
+        'orders': exchange.orders,
+        'trades': len(trades),
+        'bot_pnl': sum(t['pnl_amount'] for t in trades),
+        'digest': order_digest(exchange.orders),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='녹화 / 과거 데이터로 봇 run() 재생 (페이퍼 트레이딩)')
+    parser.add_argument('path', help='.rec 녹화 파일, CSV / Parquet, 캔들 저장소 디렉터리')
+    parser.add_argument('--symbol', default='BTCUSDT', help='CSV / 캔들 저장소의 심볼 (.rec는 헤더 사용)')
+    parser.add_argument('--hours', type=float, help='재생할 가상 시간 (기본: 데이터 끝까지)')
+    parser.add_argument('--check-interval', type=float, default=60, help='봇 체크 주기(가상 초)')
+    parser.add_argument('--speed', type=float, help='N배속 실제 대기 (기본: 대기 없이 최대 속도)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--fee', type=float, default=0.001)
+    parser.add_argument('--slippage-bps', type=float, default=0.0)
+    parser.add_argument('--orders', help='주문 내역 JSON 저장 경로 (코드 버전 간 diff용)')
+    parser.add_argument('--quiet', action='store_true', help='봇 로그는 경고 이상만 출력')
+    args = parser.parse_args(argv)
+
+    if args.quiet:
+        from binance_testnet_bot import configure
+        configure()
+        logging.getLogger().setLevel(logging.WARNING)
+
+    result = replay(args.path, symbol=args.symbol, hours=args.hours,
+                    check_interval=args.check_interval, speed=args.speed, seed=args.seed,
+                    latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                    fee_rate=args.fee, slippage_bps=args.slippage_bps)
+
+    print(f"⏱️ 가상 {result['simulated_hours']:,.1f}시간 / 실제 {result['wall_seconds']:.1f}초 "
+          f"(x{result['compression']:,.0f})")
+    print(f"📨 요청 {result['requests']:,}회, 주문 {len(result['orders']):,}건, 거래 {result['trades']:,}건, "
+          f"손익 ${result['bot_pnl']:+,.2f}")
+    print(f"🔑 주문 지문: {result['digest']}")
+    if args.orders:
+        with open(args.orders, 'w', encoding='utf-8') as f:
+            json.dump(result['orders'], f, ensure_ascii=False, indent=2)
+        print(f"💾 주문 내역 저장: {args.orders}")
+    return result
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
@@ -0,0 +1,349 @@
+"""
+요청 가중치(weight) 인식 스케줄러
+- 응답 헤더 X-MBX-USED-WEIGHT-1M으로 현재 분 사용량 추적, 한도 전에 스스로 대기
+- 우선순위 큐: 주문 > 계정 > 시장 데이터 (시장 데이터는 주문용 여유분을 남기고 사용)
+- 주문은 전용 실행 스레드로 보내 처리 중인 느린 조회 뒤에서 기다리지 않음
+- 같은 요청이 처리 중이면 새로 보내지 않고 결과 공유 (coalescing)
+- 시세처럼 자주 겹치는 조회는 짧은 TTL 캐시에서 응답
+- 429 / 418 응답은 Retry-After만큼 전체 요청을 멈춘 뒤 재시도
+
+ScheduledClient(client)는 python-binance Client와 같은 메서드로 감싸서
+봇 코드를 바꾸지 않고 끼워 넣을 수 있습니다.
+"""
+
+import time
+import heapq
+import queue
+import logging
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+
+# 메서드별 요청 가중치 (바이낸스 현물 API 기준)
+METHOD_WEIGHTS = {
+    'ping': 1,
+    'get_server_time': 1,
+    'get_klines': 2,
+    'get_symbol_ticker': 2,        # 심볼 없이 전체 조회는 4
+    'get_orderbook_ticker': 2,     # 심볼 없이 전체 조회는 4
+    'get_order_book': 5,           # limit에 따라 5 / 25 / 50 / 250
+    'get_exchange_info': 20,
+    'get_symbol_info': 20,
+    'get_account': 20,
+    'get_open_orders': 6,
+    'get_order': 4,
+    'order_market': 1,
+    'order_market_buy': 1,
+    'order_market_sell': 1,
+    'create_order': 1,
+    'create_oco_order': 1,
+    'cancel_order': 1,
+}
+
+# 주문 / 취소는 캐시도 coalescing도 하지 않음
+ORDER_METHODS = frozenset({
+    'order_market', 'order_market_buy', 'order_market_sell',
+    'create_order', 'create_oco_order', 'cancel_order',
+})
+
+# 메서드별 캐시 TTL (초)
+DEFAULT_TTLS = {
+    'get_symbol_ticker': 0.5,
+    'get_orderbook_ticker': 0.5,
+    'get_klines': 0.5,
+    'get_server_time': 0.5,
+    'get_account': 2.0,
+    'get_exchange_info': 60.0,
+    'get_symbol_info': 60.0,
+}
+
+
+def request_weight(method, params):
+    """메서드 + 파라미터 → 요청 가중치"""
+    if method in ('get_symbol_ticker', 'get_orderbook_ticker') and not params.get('symbol'):
+        return 4
+    if method == 'get_order_book':
+        limit = int(params.get('limit', 100))
+        return 5 if limit <= 100 else 25 if limit <= 500 else 50 if limit <= 1000 else 250
+    return METHOD_WEIGHTS.get(method, 1)
+
+
+def _status_code(error):
+    return getattr(error, 'status_code', None)
+
+
+def _retry_after(error, default):
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After', default))
+    except (TypeError, ValueError):
+        return default
+
+
+class _Request:
+    __slots__ = ('key', 'func', 'weight', 'priority', 'ttl', 'future', 'attempts')
+
+    def __init__(self, key, func, weight, priority, ttl):
+        self.key = key
+        self.func = func
+        self.weight = weight
+        self.priority = priority
+        self.ttl = ttl
+        self.future = Future()
+        self.attempts = 0
+
+
+class RequestScheduler:
+    """가중치 한도를 지키며 요청을 우선순위 순으로 실행
+
+    사용량은 고정 window_s초 창(바이낸스는 1분) 단위로 셉니다. 응답 헤더로
+    받은 값이 있으면 그 값을 믿고, 없으면 보낸 요청의 가중치를 더해
+    추정합니다. 시장 데이터는 한도의 (1 - order_reserve)까지만 쓰고 나머지는
+    주문용으로 남깁니다.
+
+    순서 / 가중치 판단은 스레드 하나(request-scheduler)가 하고, 허용된 요청은
+    주문이면 주문 전용 스레드, 나머지는 조회용 스레드 workers개에서 실행합니다
+    (시작 시 조회처럼 동시에 보낸 요청이 서로 기다리지 않게).
+    """
+
+    def __init__(self, weight_limit=6000, window_s=60.0, order_reserve=0.1,
+                 headers_of=None, max_retries=3, ban_retry_after=60.0, workers=4):
+        self.weight_limit = weight_limit
+        self.window_s = window_s
+        self.order_reserve = order_reserve
+        self.headers_of = headers_of
+        self.max_retries = max_retries
+        self.ban_retry_after = ban_retry_after
+
+        self.used_weight = 0
+        self.window_start = self._window(time.time())
+        self.blocked_until = 0.0
+
+        self.stats = {'sent': 0, 'cached': 0, 'coalesced': 0, 'throttled': 0, 'rate_limited': 0}
+
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._inflight = {}
+        self._cache = {}
+        self._expiry = []   # (만료 시각, key) 힙: 만료된 캐시 항목 정리용
+        self._lock = threading.Lock()
+        self._order_lane = ThreadPoolExecutor(1, thread_name_prefix='request-order')
+        self._lane = ThreadPoolExecutor(workers, thread_name_prefix='request')
+        self._thread = threading.Thread(target=self._dispatch, name='request-scheduler', daemon=True)
+        self._thread.start()
+
+    def _window(self, now):
+        return now - now % self.window_s
+
+    # ------------------------------------------------------------------
+    # 제출
+    # ------------------------------------------------------------------
+    def submit(self, key, func, weight=1, priority=PRIORITY_MARKET_DATA, ttl=0.0):
+        """요청 제출 → Future
+
+        key가 None이면 캐시 / coalescing 없이 항상 새로 보냅니다.
+        """
+        with self._lock:
+            if key is not None:
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self.stats['cached'] += 1
+                    future = Future()
+                    future.set_result(cached[1])
+                    return future
+                inflight = self._inflight.get(key)
+                if inflight is not None:
+                    self.stats['coalesced'] += 1
+                    return inflight.future
+
+            request = _Request(key, func, weight, priority, ttl)
+            if key is not None:
+                self._inflight[key] = request
+        self._queue.put((priority, next(self._seq), request))
+        return request.future
+
+    def call(self, key, func, weight=1, priority=PRIORITY_MARKET_DATA, ttl=0.0):
+        """submit() 후 결과를 기다림 (예외도 그대로 전달)"""
+        return self.submit(key, func, weight, priority, ttl).result()
+
+    # ------------------------------------------------------------------
+    # 가중치 추적
+    # ------------------------------------------------------------------
+    def observe(self, headers):
+        """응답 헤더의 사용량 반영"""
+        value = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('x-mbx-used-weight-1m')
+        if value is not None:
+            with self._lock:
+                self._roll(time.time())
+                self.used_weight = int(value)
+
+    def _roll(self, now):
+        window = self._window(now)
+        if window != self.window_start:
+            self.window_start = window
+            self.used_weight = 0
+
+    def _wait_for_budget(self, request):
+        """가중치 여유가 생길 때까지 대기 → 실행해도 되면 True
+
+        기다리는 동안 더 급한 요청(주문)이 들어오면 이 요청을 큐에 되돌리고
+        False를 반환해 그 요청을 먼저 처리하게 합니다.
+        """
+        budget = self.weight_limit
+        if request.priority > PRIORITY_ORDER:
+            budget = int(self.weight_limit * (1 - self.order_reserve))
+
+        throttled = False
+        while True:
+            now = time.time()
+            with self._lock:
+                self._roll(now)
+                if now >= self.blocked_until and (
+                        self.used_weight + request.weight <= budget or self.used_weight == 0):
+                    self.used_weight += request.weight
+                    return True
+                wait = max(self.blocked_until, self.window_start + self.window_s) - now
+
+            if not throttled:
+                throttled = True
+                with self._lock:
+                    self.stats['throttled'] += 1
+                logger.debug(f"⏳ 요청 가중치 한도 근접 ({self.used_weight}/{self.weight_limit}), "
+                             f"{wait:.2f}초 대기")
+
+            with self._queue.mutex:
+                head = self._queue.queue[0] if self._queue.queue else None
+            if head is not None and head[0] < request.priority:
+                self._queue.put((request.priority, next(self._seq), request))
+                return False
+            time.sleep(min(max(wait, 0.001), 0.05))
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def _dispatch(self):
+        """우선순위 순으로 꺼내 가중치 여유가 있으면 실행 스레드로 넘김"""
+        while True:
+            _, _, request = self._queue.get()
+            if not self._wait_for_budget(request):
+                continue
+            lane = self._order_lane if request.priority == PRIORITY_ORDER else self._lane
+            lane.submit(self._execute, request)
+
+    def _execute(self, request):
+        request.attempts += 1
+        try:
+            result = request.func()
+        except Exception as e:
+            status = _status_code(e)
+            if status in (429, 418) and request.attempts <= self.max_retries:
+                self._rate_limited(status, _retry_after(e, self.window_s if status == 429
+                                                        else self.ban_retry_after))
+                self._queue.put((request.priority, next(self._seq), request))
+                return
+            self._finish(request, error=e)
+            return
+
+        with self._lock:
+            self.stats['sent'] += 1
+        if self.headers_of is not None:
+            headers = self.headers_of()
+            if headers:
+                self.observe(headers)
+        self._finish(request, result=result)
+
+    def _rate_limited(self, status, retry_after):
+        with self._lock:
+            self.stats['rate_limited'] += 1
+            self.blocked_until = time.time() + retry_after
+            self.used_weight = self.weight_limit
+        label = '429 요청 한도 초과' if status == 429 else '418 IP 차단'
+        logger.warning(f"🚫 {label}: {retry_after:.1f}초 동안 요청 중단")
+
+    def _finish(self, request, result=None, error=None):
+        with self._lock:
+            if request.key is not None:
+                self._inflight.pop(request.key, None)
+                if error is None and request.ttl > 0:
+                    now = time.monotonic()
+                    self._evict(now)
+                    expires = now + request.ttl
+                    self._cache[request.key] = (expires, result)
+                    heapq.heappush(self._expiry, (expires, next(self._seq), request.key))
+        if error is not None:
+            request.future.set_exception(error)
+        else:
+            request.future.set_result(result)
+
+    def _evict(self, now):
+        """만료된 캐시 항목 제거 (startTime이 매번 다른 get_klines처럼 다시 쓰이지 않는 키가 쌓이지 않게)"""
+        while self._expiry and self._expiry[0][0] <= now:
+            expires, _, key = heapq.heappop(self._expiry)
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == expires:
+                del self._cache[key]
+
+
+class ScheduledClient:
+    """python-binance Client를 RequestScheduler로 감싼 프록시
+
+    METHOD_WEIGHTS에 있는 메서드는 스케줄러를 거치고, 나머지 속성은 원래
+    클라이언트로 그대로 넘깁니다. 가중치 헤더는 Client.response가 아니라
+    세션 응답 훅으로 요청을 보낸 실행 스레드에 기록해 읽습니다 (조회용 스레드
+    여러 개가 Client 하나를 같이 쓰므로 Client.response는 다른 요청의 응답일
+    수 있음).
+    """
+
+    def __init__(self, client, scheduler=None, ttls=None, **scheduler_options):
+        self.client = client
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._responses = threading.local()
+        session = getattr(client, 'session', None)
+        if session is not None:
+            session.hooks['response'].append(self._on_response)
+        self.scheduler = scheduler or RequestScheduler(headers_of=self._headers, **scheduler_options)
+
+    def _on_response(self, response, *args, **kwargs):
+        self._responses.headers = response.headers
+
+    def _headers(self):
+        """이 실행 스레드가 방금 보낸 요청의 응답 헤더"""
+        return getattr(self._responses, 'headers', None)
+
+    def _run(self, method, params):
+        self._responses.headers = None
+        return method(**params)
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name not in METHOD_WEIGHTS:
+            return attr
+
+        def scheduled(**params):
+            if name in ORDER_METHODS:
+                key, priority, ttl = None, PRIORITY_ORDER, 0.0
+            else:
+                key = (name, tuple(sorted(params.items())))
+                priority = PRIORITY_ACCOUNT if name in ('get_account', 'get_open_orders', 'get_order') \
+                    else PRIORITY_MARKET_DATA
+                ttl = self.ttls.get(name, 0.0)
+            return self.scheduler.call(
+                key, lambda: self._run(attr, params), request_weight(name, params), priority, ttl
+            )
+
+        scheduled.__name__ = name
+        return scheduled
+
+    def __setattr__(self, name, value):
+        if name in ('client', 'ttls', 'scheduler', '_responses'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.client, name, value)
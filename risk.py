@@ -0,0 +1,234 @@
+"""
+포트폴리오 리스크 / 주문 수량 엔진
+- 잔고: get_account 응답과 사용자 데이터 스트림(outboundAccountPosition)으로 갱신
+- 주문마다 수량 재계산: 자본 × 1회 비중을 변동성에 반비례해 조정, LOT_SIZE / MIN_NOTIONAL 반영
+- 여러 심볼 합산 노출 한도, 심볼별 노출 한도, 일일 손실 한도
+- 노출 / 자본 합계는 증분으로 유지 → 주문당 검사는 심볼 / 포지션 수와 무관하게 O(1)
+"""
+
+import math
+import logging
+
+from clock import trading_day
+
+logger = logging.getLogger(__name__)
+
+
+def bollinger_volatility(bb_upper, bb_middle, bb_lower, num_std=2):
+    """볼린저 밴드 폭 → 종가 표준편차(이동평균 대비 %)
+
+    지표 엔진이 이미 계산한 값을 쓰므로 추가 비용이 없습니다.
+    """
+    if not bb_middle or math.isnan(bb_middle):
+        return None
+    return (bb_upper - bb_lower) / (2 * num_std) / bb_middle * 100
+
+
+class RiskEngine:
+    """여러 심볼이 공유하는 잔고 / 노출 / 손실 한도
+
+    equity(운용 자본)는 견적 자산 잔고 + 보유 포지션 평가액입니다. capital을
+    주면 그 금액을 상한으로 쓰고, 잔고를 아직 못 받았을 때의 자본으로도
+    씁니다. 수량은 equity × risk_fraction을 기준으로, 변동성이
+    target_volatility(%)보다 크면 줄이고 작으면 늘립니다 (volatility_bounds 배).
+
+    체결은 on_fill()로 바로 반영하고(잔고 추정치도 같이 조정), 거래소
+    잔고 응답 / 이벤트가 오면 그 값으로 덮어씁니다. 거래소 수량 규칙은
+    rules(SymbolIndex)에서 심볼별로 찾습니다.
+    """
+
+    def __init__(self, quote_asset='USDT', risk_fraction=0.02, capital=None,
+                 target_volatility=0.5, volatility_bounds=(0.25, 2.0),
+                 max_exposure=0.5, max_symbol_exposure=0.2, max_daily_loss=0.03, clock=None,
+                 rules=None):
+        self.quote_asset = quote_asset
+        self.risk_fraction = risk_fraction
+        self.capital = capital
+        self.target_volatility = target_volatility
+        self.volatility_bounds = volatility_bounds
+        self.max_exposure = max_exposure
+        self.max_symbol_exposure = max_symbol_exposure
+        self.max_daily_loss = max_daily_loss
+        self.clock = clock
+
+        self.balances = {}   # 자산 → [free, locked]
+        self.rules = {} if rules is None else rules  # 심볼 → SymbolFilters (dict 또는 SymbolIndex)
+        self.positions = {}  # 심볼 → [수량, 평가 가격]
+        self.exposure = 0.0  # Σ 수량 × 평가 가격
+
+        self.day = None
+        self.day_start_equity = None
+        self.daily_pnl = 0.0
+        self.halted = False
+
+    # ------------------------------------------------------------------
+    # 잔고 / 규칙
+    # ------------------------------------------------------------------
+    def set_rules(self, filters):
+        """심볼 하나의 symbol_filters.SymbolFilters 등록 (rules가 dict일 때)"""
+        self.rules[filters.symbol] = filters
+
+    def update_account(self, account):
+        """get_account 응답의 잔고 전체 반영"""
+        self.balances = {
+            b['asset']: [float(b['free']), float(b['locked'])] for b in account.get('balances', ())
+        }
+
+    def on_account_event(self, event):
+        """사용자 데이터 스트림 outboundAccountPosition 이벤트 반영 (바뀐 자산만)"""
+        for balance in event.get('B', ()):
+            self.balances[balance['a']] = [float(balance['f']), float(balance['l'])]
+
+    @property
+    def cash(self):
+        """견적 자산 잔고 (잔고를 아직 못 받았으면 capital)"""
+        balance = self.balances.get(self.quote_asset)
+        if balance is None:
+            return self.capital or 0.0
+        return balance[0] + balance[1]
+
+    @property
+    def free_cash(self):
+        balance = self.balances.get(self.quote_asset)
+        if balance is None:
+            return self.capital or 0.0
+        return balance[0]
+
+    @property
+    def equity(self):
+        equity = self.cash + self.exposure
+        if self.capital is not None:
+            equity = min(equity, self.capital)
+        return equity
+
+    # ------------------------------------------------------------------
+    # 포지션 / 손익
+    # ------------------------------------------------------------------
+    def mark(self, symbol, price):
+        """현재가 반영 (보유 중인 심볼만 노출 합계 조정)"""
+        position = self.positions.get(symbol)
+        if position is not None:
+            self.exposure += position[0] * (price - position[1])
+            position[1] = price
+
+    def set_position(self, symbol, quantity, price):
+        """포지션 직접 설정 (재시작 복구용)"""
+        position = self.positions.pop(symbol, None)
+        if position is not None:
+            self.exposure -= position[0] * position[1]
+        if quantity > 0:
+            self.positions[symbol] = [quantity, price]
+            self.exposure += quantity * price
+
+    def on_fill(self, symbol, side, quantity, price):
+        """체결 반영 (포지션 / 노출 / 견적 자산 잔고 추정치)"""
+        position = self.positions.get(symbol)
+        held = position[0] if position is not None else 0.0
+        notional = quantity * price
+        balance = self.balances.get(self.quote_asset)
+        if side == 'BUY':
+            self.set_position(symbol, held + quantity, price)
+            if balance is not None:
+                balance[0] -= notional
+        else:
+            self.set_position(symbol, max(held - quantity, 0.0), price)
+            if balance is not None:
+                balance[0] += notional
+
+    def reserve(self, symbol, quantity, price):
+        """매수 주문 전송 전 예약: 체결된 것으로 보고 노출 / 잔고에 먼저 반영
+
+        비동기로 여러 심볼이 동시에 주문할 때 check()와 on_fill() 사이에 다른
+        주문이 끼어들어 한도를 넘지 않게 합니다. 전송이 끝나면 release()로 되돌리고
+        실제 체결을 on_fill()로 반영합니다.
+        """
+        self.on_fill(symbol, 'BUY', quantity, price)
+
+    def release(self, symbol, quantity, price):
+        """reserve() 되돌리기 (같은 수량 / 가격)"""
+        self.on_fill(symbol, 'SELL', quantity, price)
+
+    def _roll_day(self):
+        today = trading_day(self.clock) if self.clock is not None else None
+        if self.day is None or today != self.day:
+            self.day = today
+            self.day_start_equity = self.equity
+            self.daily_pnl = 0.0
+            self.halted = False
+
+    def record_pnl(self, amount):
+        """실현 손익 반영 → 일일 손실 한도에 닿으면 신규 진입 중단"""
+        self._roll_day()
+        self.daily_pnl += amount
+        limit = self.max_daily_loss * self.day_start_equity
+        if not self.halted and limit > 0 and self.daily_pnl <= -limit:
+            self.halted = True
+            logger.warning(f"🛑 일일 손실 한도 도달 (${self.daily_pnl:,.2f} / -${limit:,.2f}). "
+                           f"오늘은 신규 진입 중단")
+
+    # ------------------------------------------------------------------
+    # 수량 / 검사 (주문당 O(1))
+    # ------------------------------------------------------------------
+    def volatility_scale(self, volatility):
+        if not volatility or not self.target_volatility or math.isnan(volatility):
+            return 1.0
+        low, high = self.volatility_bounds
+        return min(max(self.target_volatility / volatility, low), high)
+
+    def size(self, symbol, price, volatility=None):
+        """매수 수량 (한도 / 잔고 / 거래소 규칙을 넘지 않게 내림, 불가능하면 0)"""
+        equity = self.equity
+        notional = equity * self.risk_fraction * self.volatility_scale(volatility)
+
+        position = self.positions.get(symbol)
+        held = position[0] * position[1] if position is not None else 0.0
+        notional = min(
+            notional,
+            self.max_exposure * equity - self.exposure,
+            self.max_symbol_exposure * equity - held,
+            self.free_cash,
+        )
+        if notional <= 0 or price <= 0:
+            return 0.0
+
+        rules = self.rules.get(symbol)
+        if rules is None:
+            return round(notional / price, 8)
+        quantity = rules.round_quantity(notional / price, market=True)
+        return 0.0 if rules.reject_reason(quantity, price) else quantity
+
+    def check(self, symbol, side, quantity, price):
+        """주문 거절 사유 (통과하면 None). 매도는 규칙 검사만 합니다."""
+        rules = self.rules.get(symbol)
+        if rules is not None:
+            reason = rules.reject_reason(quantity, price)
+            if reason:
+                return reason
+        if side != 'BUY':
+            return None
+
+        self._roll_day()
+        if self.halted:
+            return "일일 손실 한도 도달"
+
+        equity = self.equity
+        notional = quantity * price
+        if self.exposure + notional > self.max_exposure * equity + 1e-9:
+            return f"전체 노출 한도 초과 (${self.exposure + notional:,.2f} > ${self.max_exposure * equity:,.2f})"
+        position = self.positions.get(symbol)
+        held = position[0] * position[1] if position is not None else 0.0
+        if held + notional > self.max_symbol_exposure * equity + 1e-9:
+            return f"심볼 노출 한도 초과 (${held + notional:,.2f} > ${self.max_symbol_exposure * equity:,.2f})"
+        if notional > self.free_cash + 1e-9:
+            return f"잔고 부족 (${notional:,.2f} > ${self.free_cash:,.2f})"
+        return None
+
+    def snapshot(self):
+        return {
+            'equity': self.equity,
+            'cash': self.cash,
+            'exposure': self.exposure,
+            'positions': {symbol: position[0] for symbol, position in self.positions.items()},
+            'daily_pnl': self.daily_pnl,
+            'halted': self.halted,
+        }
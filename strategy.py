@@ -0,0 +1,163 @@
+"""
+매수 전략 규칙
+- 실시간 봇(generate_signal)과 백테스트가 같은 조건식을 공유
+- 스칼라와 NumPy 배열 모두에 동작 (배열이면 원소별 마스크)
+- 전략 플러그인: 필요한 지표를 선언하고 읽기 전용 스냅샷으로 신호를 반환
+"""
+
+import numpy as np
+
+# 기본 임계값
+RSI_OVERSOLD = 30          # RSI 과매도 기준
+BB_ENTRY_MULTIPLIER = 1.02  # 볼린저 밴드 하단 대비 진입 허용 배수
+
+
+def buy_conditions(rsi, macd, macd_signal, price, bb_lower,
+                   rsi_oversold=RSI_OVERSOLD, bb_multiplier=BB_ENTRY_MULTIPLIER):
+    """매수 조건 (RSI 조건, MACD 조건, 볼린저 밴드 조건) 반환"""
+    rsi_condition = rsi < rsi_oversold
+    macd_condition = macd > macd_signal
+    bb_condition = price <= bb_lower * bb_multiplier
+    return rsi_condition, macd_condition, bb_condition
+
+
+def buy_mask(columns, prices, rsi_oversold=RSI_OVERSOLD, bb_multiplier=BB_ENTRY_MULTIPLIER):
+    """지표 열(indicators.indicator_columns)로 전체 구간의 매수 신호 마스크 계산"""
+    rsi_condition, macd_condition, bb_condition = buy_conditions(
+        columns['rsi'], columns['macd'], columns['macd_signal'],
+        prices, columns['bb_lower'], rsi_oversold, bb_multiplier
+    )
+    return rsi_condition & macd_condition & bb_condition
+
+
+def exit_reason(entry_price, price, quantity, take_profit_percent, stop_loss_percent, daily_target):
+    """청산 사유 ('익절' / '손절' / None)
+
+    익절: 수익률이 take_profit_percent 이상이거나 수익 금액이 daily_target 이상
+    손절: 손실률이 stop_loss_percent 이상
+    """
+    pnl_percent = (price - entry_price) / entry_price * 100
+    pnl_amount = (price - entry_price) * quantity
+
+    if pnl_percent >= take_profit_percent or pnl_amount >= daily_target:
+        return '익절'
+    if pnl_percent <= -stop_loss_percent:
+        return '손절'
+    return None
+
+
+def exit_prices(entry_price, quantity, take_profit_percent, stop_loss_percent, daily_target):
+    """exit_reason과 같은 기준의 (익절가, 손절가) → 거래소 보호 주문용
+
+    익절가는 수익률 기준과 수익 금액 기준 중 먼저 닿는 가격입니다.
+    """
+    take_profit = entry_price * (1 + take_profit_percent / 100)
+    if quantity > 0:
+        take_profit = min(take_profit, entry_price + daily_target / quantity)
+    stop = entry_price * (1 - stop_loss_percent / 100)
+    return take_profit, stop
+
+
+# ----------------------------------------------------------------------
+# 전략 플러그인
+# ----------------------------------------------------------------------
+STRATEGIES = {}
+
+
+def register(cls):
+    """전략 클래스를 이름으로 등록 (BOT_STRATEGY로 선택)"""
+    STRATEGIES[cls.name] = cls
+    return cls
+
+
+class Strategy:
+    """전략 플러그인 기본 클래스
+
+    indicators에는 필요한 지표를 'rsi', 'bb_lower' 처럼 적고, 기본값과
+    다른 기간이 필요하면 'rsi:7', 'bb_lower:10:1.5' 처럼 적습니다. 같은
+    지표는 strategy_engine.IndicatorLayer가 전략 수와 관계없이 캔들당 한 번만
+    계산합니다.
+
+    conditions(snapshot)는 {조건 이름: bool}을 반환하고, 모든 조건이 참이면
+    매수입니다. snapshot은 읽기 전용 매핑이므로 전략끼리 값을 바꿀 수 없습니다.
+    """
+
+    name = 'base'
+    indicators = ()
+    params = {}
+    labels = {}  # 조건 이름 → 로그용 이름
+
+    def __init__(self, **params):
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise ValueError(f"{self.name} 전략에 없는 파라미터: {', '.join(sorted(unknown))}")
+        self.params = {**type(self).params, **params}
+
+    def __getattr__(self, name):
+        params = self.__dict__.get('params', {})
+        if name in params:
+            return params[name]
+        raise AttributeError(name)
+
+    def conditions(self, snapshot):
+        """{조건 이름: bool}"""
+        raise NotImplementedError
+
+    def describe(self, snapshot):
+        """{조건 이름: [로그 줄, ...]} (사람이 읽는 로그용, 선택)"""
+        return {}
+
+    def signal(self, snapshot):
+        """'BUY' 또는 None"""
+        return 'BUY' if all(self.conditions(snapshot).values()) else None
+
+    @classmethod
+    def batch(cls, snapshot, **params):
+        """파라미터 배열(변형 N개) → 매수 마스크 (길이 N)
+
+        기본 구현은 변형마다 conditions()를 부르므로, 변형을 많이 돌리는
+        전략은 NumPy 연산으로 덮어씁니다.
+        """
+        names = list(params)
+        columns = [np.asarray(params[name]) for name in names]
+        return np.array([
+            all(cls(**dict(zip(names, values))).conditions(snapshot).values())
+            for values in zip(*(column.tolist() for column in columns))
+        ], dtype=bool)
+
+
+@register
+class RsiMacdBollinger(Strategy):
+    """기본 전략: RSI 과매도 + MACD 상향 + 볼린저 밴드 하단 근처"""
+
+    name = 'rsi_macd_bb'
+    indicators = ('rsi', 'macd', 'macd_signal', 'bb_lower')
+    params = {'rsi_oversold': RSI_OVERSOLD, 'bb_multiplier': BB_ENTRY_MULTIPLIER}
+    labels = {'rsi': 'RSI', 'macd': 'MACD', 'bb': '볼린저 밴드'}
+
+    def conditions(self, snapshot):
+        rsi_condition, macd_condition, bb_condition = buy_conditions(
+            snapshot['rsi'], snapshot['macd'], snapshot['macd_signal'],
+            snapshot['current_price'], snapshot['bb_lower'],
+            self.rsi_oversold, self.bb_multiplier
+        )
+        return {'rsi': rsi_condition, 'macd': macd_condition, 'bb': bb_condition}
+
+    def describe(self, snapshot):
+        price = snapshot['current_price']
+        bb_lower = snapshot['bb_lower']
+        return {
+            'rsi': [f"현재 RSI: {snapshot['rsi']:.2f}", f"과매도 기준: {self.rsi_oversold}"],
+            'macd': [f"MACD: {snapshot['macd']:.2f}", f"MACD 시그널: {snapshot['macd_signal']:.2f}"],
+            'bb': [f"현재 가격: ${price:,.2f}", f"볼린저 밴드 하단: ${bb_lower:,.2f}",
+                   f"볼린저 밴드 하단 * {self.bb_multiplier}: ${bb_lower * self.bb_multiplier:,.2f}"],
+        }
+
+    @classmethod
+    def batch(cls, snapshot, rsi_oversold=RSI_OVERSOLD, bb_multiplier=BB_ENTRY_MULTIPLIER):
+        rsi_condition, macd_condition, bb_condition = buy_conditions(
+            snapshot['rsi'], snapshot['macd'], snapshot['macd_signal'],
+            snapshot['current_price'], snapshot['bb_lower'],
+            np.asarray(rsi_oversold), np.asarray(bb_multiplier)
+        )
+        return rsi_condition & macd_condition & bb_condition
@@ -0,0 +1,269 @@
+"""
+전략 엔진
+- 공용 지표 계층: 전략들이 선언한 지표를 심볼 / 캔들마다 한 번만 계산
+- 전략에는 읽기 전용 스냅샷(MappingProxyType) 전달
+- 파라미터 변형 수백 개를 틱마다 NumPy 배치 한 번으로 평가
+- 섀도 모드: 실제 주문 없이 변형별 가상 진입 / 청산을 나란히 기록하고 실시간 비교
+"""
+
+import itertools
+import logging
+from types import MappingProxyType
+
+import numpy as np
+
+from indicators import IncrementalIndicators
+
+logger = logging.getLogger(__name__)
+
+# 스펙 접미사 없이 쓴 지표의 기본 기간
+DEFAULT_CONFIG = (14, 20, 2)  # (rsi_period, bb_period, bb_std)
+INDICATOR_FIELDS = ('rsi', 'macd', 'macd_signal', 'bb_upper', 'bb_middle', 'bb_lower')
+
+
+def parse_spec(spec, default=DEFAULT_CONFIG):
+    """'rsi:7' / 'bb_lower:10:1.5' → (필드, (rsi_period, bb_period, bb_std))"""
+    field, *args = spec.split(':')
+    if field not in INDICATOR_FIELDS:
+        raise ValueError(f"알 수 없는 지표: {spec}")
+    rsi_period, bb_period, bb_std = default
+    if args:
+        if field == 'rsi':
+            rsi_period = int(args[0])
+        elif field.startswith('bb_'):
+            bb_period = int(args[0])
+            if len(args) > 1:
+                bb_std = float(args[1])
+        else:
+            raise ValueError(f"{field}는 기간을 지정할 수 없습니다: {spec}")
+    return field, (rsi_period, bb_period, bb_std)
+
+
+class IndicatorLayer:
+    """전략들이 선언한 지표 스펙 → 설정별 증분 지표 엔진 하나씩
+
+    기간 설정이 같은 스펙은 엔진 하나를 공유합니다. primary를 넘기면 기본
+    설정은 그 엔진(봇이 이미 갱신하는 것)을 그대로 쓰고 다시 계산하지
+    않습니다.
+    """
+
+    def __init__(self, specs=(), primary=None):
+        self.primary = primary
+        self.default = DEFAULT_CONFIG if primary is None else \
+            (primary.rsi_period, primary.bb_period, primary.bb_std)
+        self.engines = {}
+        self.fields = {}  # 스펙 → (설정, 필드)
+        self.require(specs)
+
+    def require(self, specs):
+        """스펙 추가 (처음 보는 설정이면 엔진 생성)"""
+        for spec in specs:
+            if spec in self.fields:
+                continue
+            field, config = parse_spec(spec, self.default)
+            if config not in self.engines:
+                if self.primary is not None and config == self.default:
+                    self.engines[config] = self.primary
+                else:
+                    rsi_period, bb_period, bb_std = config
+                    self.engines[config] = IncrementalIndicators(
+                        rsi_period=rsi_period, bb_period=bb_period, bb_std=bb_std
+                    )
+            self.fields[spec] = (config, field)
+
+    def _owned(self):
+        return [engine for engine in self.engines.values() if engine is not self.primary]
+
+    def sync_closed(self, open_times, closes):
+        """마감 캔들 열에서 아직 반영하지 않은 캔들만 반영 (primary는 봇이 갱신)"""
+        for engine in self._owned():
+            engine.sync_closed(open_times, closes)
+
+    def update(self, close, open_time=None):
+        """마감 캔들 하나 반영"""
+        for engine in self._owned():
+            engine.update(close, open_time)
+
+    def values(self, price, known=None):
+        """현재가 기준 {스펙: 값} (엔진마다 peek 한 번)
+
+        known(봇의 분석 결과)에 이미 있는 기본 설정 지표는 다시 계산하지 않습니다.
+        """
+        known = known or {}
+        values = {}
+        pending = {}
+        for spec, (config, field) in self.fields.items():
+            if config == self.default and spec in known:
+                values[spec] = known[spec]
+            else:
+                pending[spec] = (config, field)
+
+        peeked = {}
+        for spec, (config, field) in pending.items():
+            if config not in peeked:
+                engine = self.engines[config]
+                peeked[config] = engine.peek(price) if engine.last_close is not None else None
+            indicators = peeked[config]
+            values[spec] = indicators[field] if indicators is not None else np.nan
+        return values
+
+
+class VariantBatch:
+    """한 전략의 파라미터 변형 N개 (격자 또는 명시적 목록)
+
+    grid={'rsi_oversold': [25, 30, 35], 'bb_multiplier': [1.0, 1.02]}이면
+    모든 조합 6개를 만들고 evaluate()는 길이 6 매수 마스크를 반환합니다.
+    """
+
+    def __init__(self, strategy_cls, grid=None, variants=None, name=None):
+        if variants is None:
+            keys = list(grid)
+            variants = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+        if not variants:
+            raise ValueError("변형이 하나 이상 필요합니다")
+        self.strategy_cls = strategy_cls
+        self.name = name or strategy_cls.name
+        self.variants = variants
+        keys = list(variants[0])
+        self.params = {key: np.array([variant[key] for variant in variants]) for key in keys}
+
+    def __len__(self):
+        return len(self.variants)
+
+    @property
+    def indicators(self):
+        return self.strategy_cls.indicators
+
+    def label(self, index):
+        params = ', '.join(f"{key}={value:.6g}" if isinstance(value, float) else f"{key}={value}"
+                           for key, value in self.variants[index].items())
+        return f"{self.name}({params})"
+
+    def evaluate(self, snapshot):
+        mask = self.strategy_cls.batch(snapshot, **self.params)
+        return np.broadcast_to(np.asarray(mask, dtype=bool), (len(self),))
+
+
+class ShadowBook:
+    """변형 N개의 가상 포지션 / 성과 (모든 갱신이 길이 N 배열 연산)
+
+    진입은 매수 신호가 난 가격, 청산은 strategy.exit_reason과 같은 기준
+    (수익률 익절 / 손절)입니다. 수량은 변형마다 같은 quantity로 가정합니다.
+    """
+
+    def __init__(self, size, take_profit_percent, stop_loss_percent, quantity=1.0, fee_rate=0.0):
+        self.take_profit_percent = take_profit_percent
+        self.stop_loss_percent = stop_loss_percent
+        self.quantity = quantity
+        self.fee_rate = fee_rate
+
+        self.entry = np.full(size, np.nan)
+        self.trades = np.zeros(size, dtype=np.int64)
+        self.wins = np.zeros(size, dtype=np.int64)
+        self.pnl = np.zeros(size)
+        self.signals = np.zeros(size, dtype=np.int64)
+
+    def step(self, price, buy_mask):
+        """현재가 + 이번 틱 매수 마스크 반영 → 이번 틱에 청산된 변형 수"""
+        holding = ~np.isnan(self.entry)
+        pnl_percent = np.where(holding, (price - self.entry) / self.entry * 100, 0.0)
+        exits = holding & ((pnl_percent >= self.take_profit_percent)
+                           | (pnl_percent <= -self.stop_loss_percent))
+        if exits.any():
+            entry = self.entry[exits]
+            profit = (price - entry) * self.quantity - (price + entry) * self.quantity * self.fee_rate
+            self.pnl[exits] += profit
+            self.wins[exits] += profit > 0
+            self.trades[exits] += 1
+            self.entry[exits] = np.nan
+
+        self.signals += buy_mask
+        entries = buy_mask & np.isnan(self.entry)
+        self.entry[entries] = price
+        return int(exits.sum())
+
+    def unrealized(self, price):
+        return np.where(np.isnan(self.entry), 0.0, (price - self.entry) * self.quantity)
+
+
+class StrategyEngine:
+    """전략 / 변형 배치 묶음 + 공용 지표 계층 + 섀도 장부
+
+    live 전략 하나의 신호만 실제 주문에 쓰고, 나머지 전략과 변형 배치는
+    섀도 모드로 같은 스냅샷에서 평가만 합니다.
+    """
+
+    def __init__(self, live, shadows=(), primary=None, take_profit_percent=3.0,
+                 stop_loss_percent=1.5, quantity=1.0, fee_rate=0.0):
+        self.live = live
+        self.batches = [shadow if isinstance(shadow, VariantBatch)
+                        else VariantBatch(type(shadow), variants=[shadow.params], name=shadow.name)
+                        for shadow in shadows]
+        self.layer = IndicatorLayer(primary=primary)
+        self.layer.require(live.indicators)
+        for batch in self.batches:
+            self.layer.require(batch.indicators)
+        self.books = [ShadowBook(len(batch), take_profit_percent, stop_loss_percent, quantity, fee_rate)
+                      for batch in self.batches]
+        self.last_price = None
+
+    @property
+    def variant_count(self):
+        return sum(len(batch) for batch in self.batches)
+
+    def sync_closed(self, open_times, closes):
+        self.layer.sync_closed(open_times, closes)
+
+    def update(self, close, open_time=None):
+        self.layer.update(close, open_time)
+
+    def snapshot(self, analysis):
+        """분석 결과 + 선언된 지표 → 읽기 전용 스냅샷"""
+        return MappingProxyType({**analysis, **self.layer.values(analysis['current_price'], analysis)})
+
+    def step_shadows(self, snapshot):
+        """섀도 변형 전체 평가 + 가상 장부 갱신"""
+        price = snapshot['current_price']
+        for batch, book in zip(self.batches, self.books):
+            book.step(price, batch.evaluate(snapshot))
+        self.last_price = price
+
+    def leaderboard(self, top=10):
+        """변형별 성과 (실현 + 미실현 손익 순)"""
+        rows = []
+        for batch, book in zip(self.batches, self.books):
+            unrealized = book.unrealized(self.last_price) if self.last_price is not None \
+                else np.zeros(len(batch))
+            total = book.pnl + unrealized
+            for index in np.argsort(-total)[:top]:
+                rows.append({
+                    'variant': batch.label(index),
+                    'pnl': float(book.pnl[index]),
+                    'unrealized': float(unrealized[index]),
+                    'trades': int(book.trades[index]),
+                    'win_rate': float(book.wins[index] / book.trades[index]) if book.trades[index] else 0.0,
+                    'signals': int(book.signals[index]),
+                    'holding': bool(not np.isnan(book.entry[index])),
+                })
+        rows.sort(key=lambda row: row['pnl'] + row['unrealized'], reverse=True)
+        return rows[:top]
+
+    def log_leaderboard(self, top=5):
+        rows = self.leaderboard(top)
+        if not rows:
+            return
+        logger.info(f"👥 섀도 전략 상위 {len(rows)}개 (변형 {self.variant_count}개 중)")
+        for rank, row in enumerate(rows, 1):
+            logger.info(f"   {rank}. {row['variant']}: 실현 ${row['pnl']:,.2f} | "
+                        f"미실현 ${row['unrealized']:,.2f} | 거래 {row['trades']}회 | "
+                        f"승률 {row['win_rate']:.0%}")
+
+
+def default_shadow_grid():
+    """BOT_SHADOW=1 기본 변형: RSI 기준 20~45 × 볼린저 배수 1.00~1.05 (11 × 11 = 121개)"""
+    from strategy import RsiMacdBollinger
+
+    return VariantBatch(RsiMacdBollinger, grid={
+        'rsi_oversold': [float(v) for v in np.arange(20, 45.1, 2.5)],
+        'bb_multiplier': [round(float(v), 3) for v in np.linspace(1.0, 1.05, 11)],
+    })
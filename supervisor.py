@@ -0,0 +1,631 @@
+"""
+멀티 계정 / 멀티 봇 실행기 (시세 공유)
+- 감독자 프로세스 하나만 현재가 / 캔들을 받아 (심볼, 주기)별 공유 메모리에 게시하고
+  전략 워커들은 거기서 복사해 읽음 → 시세 요청 수가 워커 수와 무관
+  (체크마다 현재가 1회, 캔들은 진행 중 캔들이 마감될 때만 증분 조회)
+- 전략 워커: 프로세스마다 BinanceTestnetBot.run()을 그대로 실행
+  (워커별 환경변수로 전략 / 운용 자본 / 타임프레임 지정, 로그 / 저널은 logs/workers/<이름>/)
+- 잔고 / 주문 요청은 계정별 실행 워커 프로세스 하나로 보냄
+  (API 키는 실행 워커만 가짐, 요청 가중치 스케줄러로 한도 관리 / 같은 조회 병합)
+- 워커가 프로세스라 전략 계산이 CPU 코어에 나뉘어 돌고, --pin-cpus면 코어를 고정
+- --mock: 프로세스마다 같은 시드의 합성 경로 시뮬레이터를 만들고 배속 시계로 함께 진행
+
+사용법:
+    python supervisor.py --config workers.json
+    python supervisor.py --mock --workers 4 --accounts 2 --speed 600 --minutes 2
+
+    workers.json 예:
+    {
+      "accounts": {"main": {"api_key_env": "BINANCE_TESTNET_API_KEY",
+                            "api_secret_env": "BINANCE_TESTNET_SECRET_KEY"}},
+      "workers": [
+        {"name": "base", "account": "main", "env": {"BOT_CAPITAL": "500"}},
+        {"name": "mtf", "account": "main", "env": {"BOT_CAPITAL": "500", "BOT_TIMEFRAMES": "5m,1h"}}
+      ]
+    }
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import logging
+import argparse
+import tempfile
+import itertools
+import threading
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from clock import SystemClock, utc_datetime
+from kline_decoder import KLINE_FIELDS
+from market_stream import interval_to_ms
+from replay import ReplayFinished
+
+logger = logging.getLogger(__name__)
+
+ROW_FIELDS = len(KLINE_FIELDS)  # 공유 메모리 캔들 행: open_time ~ close_time (7개, float64)
+HEADER_BYTES = 48               # int64 x 4 (seq, count, updated_ms, live_close_ms) + float64 x 2 (price, 예비)
+
+# 워커에서 떼어내는 설정: 실행기 / 보호 주문은 API 키로 사용자 데이터 스트림을 직접 열어야 함
+WORKER_DISABLED_ENV = ('BOT_EXECUTION', 'BOT_PROTECTIVE_EXITS', 'BINANCE_TESTNET_API_KEY',
+                       'BINANCE_TESTNET_SECRET_KEY')
+
+
+class AccountError(Exception):
+    """실행 워커가 돌려준 오류 (원래 예외 이름 / 메시지 / 코드 보존)"""
+
+    def __init__(self, kind, message, code=None):
+        super().__init__(f"{kind}: {message}")
+        self.kind = kind
+        self.code = code
+
+
+class ScaledClock:
+    """실제 시간을 speed배로 흘리는 시계
+
+    프로세스마다 같은 start_ms / epoch로 만들면 모두 같은 가상 시각을
+    봅니다 (--mock). now()는 VirtualClock과 같이 UTC입니다. end_ms를 넘어
+    잠들려 하면 ReplayFinished를 던져 run()의 종료 경로를 그대로 탑니다.
+    """
+
+    def __init__(self, start_ms, epoch, speed=1.0, end_ms=None):
+        self.start_ms = int(start_ms)
+        self.epoch = epoch
+        self.speed = speed
+        self.end_ms = end_ms
+
+    def time_ms(self):
+        return self.start_ms + int((time.time() - self.epoch) * 1000 * self.speed)
+
+    def time(self):
+        return self.time_ms() / 1000
+
+    def now(self):
+        return utc_datetime(self.time_ms() / 1000)
+
+    def sleep(self, seconds):
+        if self.end_ms is not None and self.time_ms() + seconds * 1000 >= self.end_ms:
+            raise ReplayFinished()
+        time.sleep(seconds / self.speed)
+
+    def advance(self, ms):
+        """시뮬레이터 요청 지연용 (배속 시계는 실제 시간으로만 흐름)"""
+
+
+class MarketFeed:
+    """(심볼, 주기) 하나의 시세 공유 메모리 블록
+
+    헤더 + 최근 capacity개 캔들 행(float64)입니다. 쓰는 쪽(감독자)은
+    seqlock으로 seq를 홀수로 올린 뒤 쓰고 다시 짝수로 올리며, 읽는 쪽은
+    seq가 짝수이고 읽기 전후가 같을 때만 결과를 씁니다 (잠금 없음).
+    """
+
+    def __init__(self, symbol, interval, capacity, name=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.capacity = capacity
+        self.owner = name is None
+        size = HEADER_BYTES + capacity * ROW_FIELDS * 8
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        buf = self.shm.buf
+        self.header = np.ndarray((4,), dtype=np.int64, buffer=buf, offset=0)
+        self.quote = np.ndarray((2,), dtype=np.float64, buffer=buf, offset=32)
+        self.rows = np.ndarray((capacity, ROW_FIELDS), dtype=np.float64, buffer=buf, offset=HEADER_BYTES)
+        if self.owner:
+            self.header[:] = 0
+            self.quote[:] = 0.0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def spec(self):
+        """워커에 넘기는 연결 정보"""
+        return self.symbol, self.interval, self.capacity, self.name
+
+    @classmethod
+    def attach(cls, spec):
+        symbol, interval, capacity, name = spec
+        return cls(symbol, interval, capacity, name=name)
+
+    def publish(self, price, now_ms, rows=None, live_close_ms=None):
+        """현재가 게시. rows를 주면 캔들 블록 전체 교체, 아니면 진행 중 캔들에 현재가 반영
+
+        live_close_ms는 rows의 마지막 행이 진행 중 캔들일 때 그 close_time (없으면 0).
+        """
+        header = self.header
+        header[0] += 1  # 홀수: 쓰는 중
+        try:
+            if rows is not None:
+                n = min(len(rows), self.capacity)
+                self.rows[:n] = rows[len(rows) - n:]
+                header[1] = n
+                header[3] = live_close_ms or 0
+            elif header[3] and header[1]:
+                live = self.rows[header[1] - 1]
+                live[2] = max(live[2], price)
+                live[3] = min(live[3], price)
+                live[4] = price
+            self.quote[0] = price
+            header[2] = now_ms
+        finally:
+            header[0] += 1
+
+    def read(self, start_time=None, end_time=None, limit=500):
+        """(캔들 행 복사본, 현재가, 게시 시각) — get_klines와 같은 범위 규칙"""
+        header = self.header
+        while True:
+            seq = int(header[0])
+            if seq % 2 == 0:
+                count = int(header[1])
+                open_time = self.rows[:count, 0]
+                if start_time is not None:
+                    lo = int(np.searchsorted(open_time, start_time))
+                    hi = min(count, lo + limit)
+                else:
+                    hi = count if end_time is None else int(np.searchsorted(open_time, end_time, side='right'))
+                    lo = max(0, hi - limit)
+                if start_time is not None and end_time is not None:
+                    hi = min(hi, int(np.searchsorted(open_time, end_time, side='right')))
+                rows = self.rows[lo:max(lo, hi)].copy()
+                price = float(self.quote[0])
+                updated = int(header[2])
+                if int(header[0]) == seq:
+                    return rows, price, updated
+            time.sleep(0)
+
+    def fresh(self, now_ms):
+        """진행 중 캔들이 아직 마감 전인지 (감독자가 마감 캔들을 게시했는지)"""
+        return int(self.header[3]) >= now_ms
+
+    def close(self):
+        # 뷰가 남아 있으면 공유 메모리를 닫을 수 없음
+        self.header = self.quote = self.rows = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class FeedPublisher:
+    """감독자 프로세스의 시세 수집 / 게시
+
+    체크마다 심볼별 현재가를 1회 받고, 게시한 진행 중 캔들이 마감됐을
+    때만 로컬 캔들 저장소를 증분 동기화해 캔들 블록을 다시 게시합니다.
+    """
+
+    def __init__(self, client, clock, store):
+        self.client = client
+        self.clock = clock
+        self.store = store
+        self.feeds = {}
+        self.live_close = {}
+        self.requests = 0
+
+    def add(self, symbol, interval, capacity):
+        key = (symbol, interval)
+        if key not in self.feeds:
+            self.feeds[key] = MarketFeed(symbol, interval, capacity)
+        return self.feeds[key]
+
+    def poll(self):
+        now = self.clock.time_ms()
+        prices = {}
+        for key, feed in self.feeds.items():
+            symbol, interval = key
+            try:
+                if symbol not in prices:
+                    self.requests += 1
+                    prices[symbol] = float(self.client.get_symbol_ticker(symbol=symbol)['price'])
+                if now > self.live_close.get(key, -1):
+                    self.publish_candles(feed, prices[symbol], now)
+                else:
+                    feed.publish(prices[symbol], now)
+            except Exception as e:
+                logger.warning(f"⚠️ 시세 갱신 실패 ({symbol} {interval}): {e}")
+
+    def publish_candles(self, feed, price, now):
+        """진행 중 캔들이 마감됨 → 저장소 증분 동기화 후 캔들 블록 전체 게시"""
+        series = self.store.series(feed.symbol, feed.interval)
+        before = series.length
+        self.requests += 1
+        live = series.sync(self.client, history=feed.capacity, now_ms=now)
+        window = series.window(feed.capacity - 1)
+        rows = np.column_stack([window[name] for name in KLINE_FIELDS]).astype(np.float64)
+        live_close = 0
+        if live is not None:
+            rows = np.vstack([rows, [float(value) for value in live[:ROW_FIELDS]]])
+            live_close = int(live[6])
+        feed.publish(price, now, rows, live_close)
+        self.live_close[(feed.symbol, feed.interval)] = live_close or now
+        logger.debug(f"🕯️ 캔들 게시: {feed.symbol} {feed.interval} (+{series.length - before}, 총 {len(rows)}개)")
+
+    def close(self):
+        for feed in self.feeds.values():
+            feed.close()
+
+
+class WorkerClient:
+    """전략 워커의 클라이언트
+
+    get_klines / get_symbol_ticker / get_exchange_info는 공유 메모리와
+    시작할 때 받은 exchangeInfo로 바로 답하고, 나머지(잔고 / 주문 / 호가창)는
+    계정 실행 워커에 요청을 보내 응답을 기다립니다.
+    """
+
+    def __init__(self, name, feeds, exchange_info, requests, replies, clock,
+                 timeout=30.0, stale_wait=2.0):
+        self.name = name
+        self.feeds = {(feed.symbol, feed.interval): feed for feed in feeds}
+        self.prices = {feed.symbol: feed for feed in feeds}
+        self.exchange_info = exchange_info
+        self.requests = requests
+        self.replies = replies
+        self.clock = clock
+        self.timeout = timeout
+        self.stale_wait = stale_wait  # 감독자가 마감 캔들을 게시할 때까지 기다리는 최대 시간(초)
+        self.lock = threading.Lock()
+        self.call_ids = itertools.count()
+        self.local_reads = 0
+        self.remote_calls = 0
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def call(**params):
+            return self.call(name, params)
+        return call
+
+    def call(self, method, params):
+        """실행 워커 요청 1회 (워커 안에서는 차례로)"""
+        with self.lock:
+            call_id = next(self.call_ids)
+            self.remote_calls += 1
+            self.requests.put((self.name, call_id, method, params))
+            deadline = time.monotonic() + self.timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise AccountError('Timeout', f"{method} 응답 없음 ({self.timeout:.0f}초)")
+                try:
+                    reply_id, result, error = self.replies.get(timeout=remaining)
+                except Exception:
+                    continue
+                if reply_id == call_id:
+                    break
+        if error is not None:
+            raise AccountError(*error)
+        return result
+
+    def get_klines(self, symbol, interval, startTime=None, endTime=None, limit=500, **kwargs):
+        feed = self.feeds.get((symbol, interval))
+        if feed is None:
+            return self.call('get_klines', dict(symbol=symbol, interval=interval, startTime=startTime,
+                                                endTime=endTime, limit=limit, **kwargs))
+        deadline = time.monotonic() + self.stale_wait
+        while not feed.fresh(self.clock.time_ms()) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.local_reads += 1
+        rows, _, _ = feed.read(startTime, endTime, limit)
+        return [[int(row[0]), *row[1:6], int(row[6])] for row in rows.tolist()]
+
+    def get_symbol_ticker(self, symbol=None, **kwargs):
+        feed = self.prices.get(symbol)
+        if feed is None:
+            return self.call('get_symbol_ticker', dict(symbol=symbol, **kwargs))
+        self.local_reads += 1
+        _, price, _ = feed.read(limit=0)
+        return {'symbol': symbol, 'price': f"{price:.8f}"}
+
+    def get_exchange_info(self, **kwargs):
+        return self.exchange_info
+
+
+# ----------------------------------------------------------------------
+# 프로세스 진입점 (spawn으로 시작하므로 모듈 최상위 함수)
+# ----------------------------------------------------------------------
+def make_client(account, clock):
+    """실행 워커 / 감독자의 실제 클라이언트 (mock이면 합성 경로 시뮬레이터)"""
+    if 'mock' in account:
+        from exchange_simulator import SimulatedExchange
+
+        exchange = SimulatedExchange.synthetic(**account['mock'])
+        if clock is not None:
+            exchange.clock = clock
+        return exchange
+
+    from binance.client import Client
+    from transport import resilient_client
+
+    api_key = os.getenv(account['api_key_env']) if 'api_key_env' in account else None
+    api_secret = os.getenv(account['api_secret_env']) if 'api_secret_env' in account else None
+    if 'api_key_env' in account and (not api_key or not api_secret):
+        raise ValueError(f"API 키 누락: {account['api_key_env']} / {account['api_secret_env']}")
+    client = Client(api_key, api_secret, testnet=True)
+    client.API_URL = 'https://testnet.binance.vision/api'
+    return resilient_client(client)
+
+
+def setup_process_logging(name, quiet):
+    """워커 프로세스 로깅: logs/workers/<name>/ 아래 로그 파일, 콘솔 줄에 워커 이름"""
+    import binance_testnet_bot as bot_module
+
+    worker_dir = os.path.join(bot_module.log_dir, 'workers', name)
+    bot_module.log_dir = worker_dir
+    bot_module.log_file = os.path.join(worker_dir, 'testnet_trading_bot.log')
+    if quiet:
+        os.environ['BOT_LOG_LEVEL'] = 'WARNING'
+    structured = bot_module.configure()
+    root = logging.getLogger()
+    if not structured:
+        for handler in root.handlers:
+            handler.setFormatter(logging.Formatter(
+                f'%(asctime)s - {name} - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
+            ))
+    return worker_dir
+
+
+def pin_cpu(cpu):
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {cpu % os.cpu_count()})
+
+
+def execution_worker(account_name, account, clock, requests, replies, results, threads, quiet):
+    """계정 실행 워커: 요청 큐를 읽어 스레드 풀에서 실행 (None을 받으면 종료)
+
+    Ctrl+C는 무시합니다. 전략 워커들이 종료 처리(포지션 청산)를 하는 동안
+    주문을 받아야 하므로 감독자가 마지막에 멈춥니다.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_process_logging(f'exec-{account_name}', quiet)
+    client = make_client(account, clock)
+    served = 0
+
+    def serve(message):
+        worker, call_id, method, params = message
+        try:
+            result, error = getattr(client, method)(**params), None
+        except Exception as e:
+            result, error = None, (type(e).__name__, str(e), getattr(e, 'code', None))
+            logger.warning(f"⚠️ [{account_name}] {worker} {method} 실패: {e}")
+        replies[worker].put((call_id, result, error))
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix=f'exec-{account_name}') as pool:
+        while True:
+            message = requests.get()
+            if message is None:
+                break
+            served += 1
+            pool.submit(serve, message)
+
+    summary = {'account': account_name, 'served': served}
+    if 'mock' in account:
+        summary['balances'] = dict(client.balances)
+        summary['orders'] = len(client.orders)
+    results.put(('account', summary))
+
+
+def strategy_worker(worker, feed_specs, exchange_info, clock, requests, replies, results,
+                    check_interval, quiet, cpu):
+    """전략 워커: 공유 시세 + 계정 실행 워커로 BinanceTestnetBot.run() 실행"""
+    pin_cpu(cpu)
+    name = worker['name']
+    setup_process_logging(name, quiet)
+    os.environ.update({key: str(value) for key, value in worker.get('env', {}).items()})
+    for key in WORKER_DISABLED_ENV:
+        os.environ.pop(key, None)
+
+    from binance_testnet_bot import BinanceTestnetBot
+    from kline_store import KlineStore
+
+    feeds = [MarketFeed.attach(spec) for spec in feed_specs]
+    client = WorkerClient(name, feeds, exchange_info, requests, replies, clock)
+    summary = {'name': name, 'account': worker['account']}
+    try:
+        # 캔들은 공유 시세에서 바로 받으므로 저장소는 실행 동안만 유지
+        with tempfile.TemporaryDirectory() as root:
+            bot = BinanceTestnetBot(client=client, clock=clock)
+            bot.kline_store = KlineStore(root)
+            bot.run(check_interval)
+            trades = bot.journal.session_trades()
+            bot.journal.close()
+        summary.update(trades=len(trades), pnl=sum(t['pnl_amount'] for t in trades))
+    except Exception as e:
+        logger.error(f"❌ 워커 {name} 중단: {e}")
+        summary['error'] = str(e)
+    finally:
+        summary.update(local_reads=client.local_reads, remote_calls=client.remote_calls)
+        for feed in feeds:
+            feed.close()
+        results.put(('worker', summary))
+
+
+# ----------------------------------------------------------------------
+# 감독자
+# ----------------------------------------------------------------------
+def load_config(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    names = [worker['name'] for worker in config['workers']]
+    if len(set(names)) != len(names):
+        raise ValueError("워커 이름이 겹칩니다")
+    for worker in config['workers']:
+        if worker['account'] not in config['accounts']:
+            raise ValueError(f"워커 {worker['name']}: 알 수 없는 계정 {worker['account']}")
+    return config
+
+
+def mock_config(workers, accounts, capital=10_000.0):
+    """--mock 기본 구성: 계정마다 워커를 나눠 배정, 운용 자본은 계정 잔고를 균등 분할
+    (홀수 번째 워커는 5m + 1h 멀티 타임프레임이라 5m 시세 블록이 하나 더 생김)"""
+    config = {'accounts': {f'acct{i}': {} for i in range(accounts)}, 'workers': []}
+    per_account = -(-workers // accounts)
+    for i in range(workers):
+        env = {'BOT_CAPITAL': f'{capital / per_account:.2f}'}
+        if i % 2:
+            env['BOT_TIMEFRAMES'] = '5m,1h'
+        config['workers'].append({'name': f'w{i}', 'account': f'acct{i % accounts}', 'env': env})
+    return config
+
+
+def candle_requirements(worker, symbol='BTCUSDT', interval='15m'):
+    """워커 환경변수로 봇이 받을 (심볼, 캔들 주기, 이력 캔들 수) 계산 (봇 __init__ / sync_candles와 같은 규칙)"""
+    from timeframes import MultiTimeframe
+
+    timeframes = [tf.strip() for tf in worker.get('env', {}).get('BOT_TIMEFRAMES', '').split(',') if tf.strip()]
+    if not timeframes:
+        return symbol, interval, 100
+    timeframes.append(interval)
+    base = min(timeframes, key=interval_to_ms)
+    return symbol, base, MultiTimeframe(base, timeframes).history_needed() + 1
+
+
+def run_supervisor(config, clock, feed_client, check_interval=60, poll_interval=1.0,
+                   store=None, exec_threads=4, quiet=False, pin_cpus=False):
+    """공유 시세 게시 + 계정 / 전략 워커 실행 → (워커 요약 목록, 계정 요약 목록, 시세 요청 수)"""
+    from kline_store import KlineStore
+
+    ctx = mp.get_context('spawn')
+    publisher = FeedPublisher(feed_client, clock, store or KlineStore())
+    needs = {}
+    for worker in config['workers']:
+        symbol, interval, history = candle_requirements(worker)
+        worker['feed'] = (symbol, interval)
+        needs[(symbol, interval)] = max(needs.get((symbol, interval), 0), history + 1)
+    for (symbol, interval), capacity in needs.items():
+        publisher.add(symbol, interval, capacity)
+    exchange_info = feed_client.get_exchange_info()
+    publisher.requests += 1
+    publisher.poll()
+
+    results = ctx.Queue()
+    account_queues = {name: ctx.Queue() for name in config['accounts']}
+    replies = {worker['name']: ctx.Queue() for worker in config['workers']}
+    accounts = []
+    for name, account in config['accounts'].items():
+        served_replies = {w['name']: replies[w['name']] for w in config['workers'] if w['account'] == name}
+        process = ctx.Process(
+            target=execution_worker, name=f'exec-{name}',
+            args=(name, account, clock, account_queues[name], served_replies, results,
+                  1 if 'mock' in account else exec_threads, quiet)
+        )
+        process.start()
+        accounts.append(process)
+
+    workers = []
+    for i, worker in enumerate(config['workers']):
+        specs = [publisher.feeds[worker['feed']].spec()]
+        process = ctx.Process(
+            target=strategy_worker, name=worker['name'],
+            args=(worker, specs, exchange_info, clock, account_queues[worker['account']],
+                  replies[worker['name']], results, check_interval, quiet, i + 1 if pin_cpus else None)
+        )
+        process.start()
+        workers.append(process)
+    logger.info(f"🧩 워커 {len(workers)}개 / 계정 {len(accounts)}개 / 시세 블록 {len(publisher.feeds)}개 시작")
+
+    try:
+        while any(process.is_alive() for process in workers):
+            publisher.poll()
+            clock.sleep(poll_interval)
+    except KeyboardInterrupt:
+        logger.info("⏹️ 감독자 종료 요청. 워커 종료 처리 대기")
+
+    # 전략 워커가 포지션을 정리하는 동안 시세는 마지막 게시 값으로, 주문은 실행 워커가 처리
+    summaries = {'worker': [], 'account': []}
+    for process in workers:
+        process.join()
+    for queue in account_queues.values():
+        queue.put(None)
+    for process in accounts:
+        process.join()
+    while len(summaries['worker']) + len(summaries['account']) < len(workers) + len(accounts):
+        try:
+            kind, summary = results.get(timeout=5)
+        except Exception:
+            break
+        summaries[kind].append(summary)
+    publisher.close()
+    return summaries['worker'], summaries['account'], publisher.requests
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='멀티 계정 / 멀티 봇 실행기 (시세 공유)')
+    parser.add_argument('--config', help='계정 / 워커 구성 JSON')
+    parser.add_argument('--mock', action='store_true', help='합성 경로 시뮬레이터 + 배속 시계로 실행')
+    parser.add_argument('--workers', type=int, default=4, help='--mock 워커 수 (--config가 없을 때)')
+    parser.add_argument('--accounts', type=int, default=2, help='--mock 계정 수 (--config가 없을 때)')
+    parser.add_argument('--speed', type=float, default=600.0, help='--mock 배속')
+    parser.add_argument('--minutes', type=float, default=2.0, help='--mock 실행 시간(실제 분)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check-interval', type=float, default=60, help='봇 체크 주기(초, --mock은 가상 초)')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='시세 게시 주기(초, --mock은 가상 초)')
+    parser.add_argument('--exec-threads', type=int, default=4, help='계정 실행 워커의 동시 요청 수')
+    parser.add_argument('--pin-cpus', action='store_true', help='전략 워커를 CPU 코어에 고정 (Linux)')
+    parser.add_argument('--quiet', action='store_true', help='워커 로그는 경고 이상만 출력')
+    args = parser.parse_args(argv)
+    if not args.config and not args.mock:
+        parser.error('--config 또는 --mock이 필요합니다')
+
+    from binance_testnet_bot import configure
+
+    configure()
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    config = load_config(args.config) if args.config else mock_config(args.workers, args.accounts)
+    with tempfile.TemporaryDirectory() as root:
+        store = None
+        if args.mock:
+            from kline_store import KlineStore
+
+            hours = args.minutes * args.speed / 60 + 1
+            mock = {'hours': hours, 'warmup_hours': 72, 'seed': args.seed}
+            for account in config['accounts'].values():
+                account['mock'] = mock
+            feed_client = make_client({'mock': mock}, None)
+            start_ms = feed_client.clock.time_ms()
+            clock = ScaledClock(start_ms, time.time(), args.speed,
+                                end_ms=start_ms + int(args.minutes * 60_000 * args.speed))
+            feed_client.clock = clock
+            store = KlineStore(root)
+        else:
+            clock = SystemClock()
+            feed_client = make_client({}, clock)
+
+        started = time.perf_counter()
+        workers, accounts, feed_requests = run_supervisor(
+            config, clock, feed_client, check_interval=args.check_interval,
+            poll_interval=args.poll_interval, store=store, exec_threads=args.exec_threads,
+            quiet=args.quiet, pin_cpus=args.pin_cpus
+        )
+        elapsed = time.perf_counter() - started
+
+    print(f"⏱️ 실제 {elapsed:.1f}초, 워커 {len(workers)}개 / 계정 {len(accounts)}개")
+    print(f"📡 시세 요청 {feed_requests:,}회 (워커 수와 무관, 공유 메모리로 배포)")
+    for summary in sorted(workers, key=lambda s: s['name']):
+        status = f"오류: {summary['error']}" if 'error' in summary else \
+            f"거래 {summary['trades']}건, 손익 ${summary['pnl']:+,.2f}"
+        print(f"  - {summary['name']:<8} [{summary['account']}] {status} | "
+              f"로컬 시세 읽기 {summary['local_reads']:,}회, 계정 요청 {summary['remote_calls']:,}회")
+    for summary in sorted(accounts, key=lambda s: s['account']):
+        line = f"  - 계정 {summary['account']}: 처리 요청 {summary['served']:,}회"
+        if 'balances' in summary:
+            balances = ', '.join(f"{asset} {amount:,.4f}" for asset, amount in summary['balances'].items())
+            line += f", 주문 {summary['orders']}건, 잔고 {balances}"
+        print(line)
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+    main()
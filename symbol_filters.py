@@ -0,0 +1,308 @@
+"""
+거래소 심볼 메타데이터 인덱스 (exchangeInfo 캐시)
+- exchangeInfo를 한 번 받아 디스크(data/exchange_info.json)에 저장, TTL 안에서는 재시작해도 재사용
+- 만료 전에 백그라운드 스레드가 갱신 (조회는 항상 메모리 dict → O(1))
+- 심볼별 tickSize / stepSize / 최소·최대 수량 / 최소 주문 금액 / 가격 범위
+- 주문 수량 / 가격을 전송 전에 로컬에서 반올림 · 검증 → 필터 위반 주문은 네트워크로 보내지 않음
+
+수량과 가격은 필터 값의 소수 자릿수에 맞춘 문자열(format_*)로 보냅니다.
+float를 그대로 보내면 1e-05 같은 지수 표기가 되어 거래소가 거절합니다.
+"""
+
+import os
+import json
+import math
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'exchange_info.json')
+DEFAULT_TTL = 24 * 3600  # 초
+
+
+class FilterError(ValueError):
+    """거래소 필터 위반 (거래소의 -1013 Filter failure와 같은 의미, 전송 전에 발생)"""
+
+    def __init__(self, symbol, filter_type, message):
+        super().__init__(f"{symbol} {filter_type}: {message}")
+        self.symbol = symbol
+        self.filter_type = filter_type
+
+
+def _decimals(value):
+    """'0.00001000' → 5"""
+    text = str(value).rstrip('0')
+    return len(text.split('.')[1]) if '.' in text else 0
+
+
+def _floor_to(value, step):
+    return math.floor(value / step + 1e-9) * step
+
+
+def _on_step(value, step):
+    ratio = value / step
+    return abs(ratio - round(ratio)) < 1e-6
+
+
+class SymbolFilters:
+    """심볼 하나의 거래 규칙 (PRICE_FILTER / LOT_SIZE / MARKET_LOT_SIZE / MIN_NOTIONAL · NOTIONAL)"""
+
+    __slots__ = ('symbol', 'status', 'base_asset', 'quote_asset',
+                 'tick_size', 'min_price', 'max_price', 'price_decimals',
+                 'step_size', 'min_qty', 'max_qty', 'qty_decimals',
+                 'market_step_size', 'market_min_qty', 'market_max_qty',
+                 'min_notional', 'max_notional', 'apply_min_to_market')
+
+    def __init__(self, symbol, status='TRADING', base_asset='', quote_asset='',
+                 tick_size=0.0, min_price=0.0, max_price=0.0, price_decimals=8,
+                 step_size=0.0, min_qty=0.0, max_qty=0.0, qty_decimals=8,
+                 market_step_size=0.0, market_min_qty=0.0, market_max_qty=0.0,
+                 min_notional=0.0, max_notional=0.0, apply_min_to_market=True):
+        self.symbol = symbol
+        self.status = status
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.tick_size = tick_size
+        self.min_price = min_price
+        self.max_price = max_price or math.inf
+        self.price_decimals = price_decimals
+        self.step_size = step_size
+        self.min_qty = min_qty
+        self.max_qty = max_qty or math.inf
+        self.qty_decimals = qty_decimals
+        self.market_step_size = market_step_size or step_size
+        self.market_min_qty = market_min_qty or min_qty
+        self.market_max_qty = market_max_qty or self.max_qty
+        self.min_notional = min_notional
+        self.max_notional = max_notional or math.inf
+        self.apply_min_to_market = apply_min_to_market
+
+    @classmethod
+    def from_symbol_info(cls, info):
+        """get_symbol_info / exchangeInfo의 심볼 항목 → SymbolFilters"""
+        filters = {f['filterType']: f for f in info.get('filters', ())}
+        price = filters.get('PRICE_FILTER', {})
+        lot = filters.get('LOT_SIZE', {})
+        market_lot = filters.get('MARKET_LOT_SIZE', {})
+        notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+        return cls(
+            info['symbol'], info.get('status', 'TRADING'),
+            info.get('baseAsset', ''), info.get('quoteAsset', ''),
+            tick_size=float(price.get('tickSize', 0)),
+            min_price=float(price.get('minPrice', 0)),
+            max_price=float(price.get('maxPrice', 0)),
+            price_decimals=_decimals(price['tickSize']) if float(price.get('tickSize', 0)) else 8,
+            step_size=float(lot.get('stepSize', 0)),
+            min_qty=float(lot.get('minQty', 0)),
+            max_qty=float(lot.get('maxQty', 0)),
+            qty_decimals=_decimals(lot['stepSize']) if float(lot.get('stepSize', 0)) else 8,
+            market_step_size=float(market_lot.get('stepSize', 0)),
+            market_min_qty=float(market_lot.get('minQty', 0)),
+            market_max_qty=float(market_lot.get('maxQty', 0)),
+            min_notional=float(notional.get('minNotional', 0)),
+            max_notional=float(notional.get('maxNotional', 0)),
+            apply_min_to_market=notional.get('applyMinToMarket', notional.get('applyToMarket', True)),
+        )
+
+    # ------------------------------------------------------------------
+    # 반올림 / 문자열
+    # ------------------------------------------------------------------
+    def round_quantity(self, quantity, market=False):
+        """stepSize 배수로 내림 (최대 수량 상한 적용)"""
+        step = self.market_step_size if market else self.step_size
+        max_qty = self.market_max_qty if market else self.max_qty
+        if step > 0:
+            quantity = _floor_to(quantity, step)
+        return round(min(quantity, max_qty), self.qty_decimals)
+
+    def round_price(self, price):
+        """tickSize 배수로 반올림"""
+        if self.tick_size > 0:
+            price = round(price / self.tick_size) * self.tick_size
+        return round(price, self.price_decimals)
+
+    def format_quantity(self, quantity):
+        return f"{quantity:.{self.qty_decimals}f}"
+
+    def format_price(self, price):
+        return f"{price:.{self.price_decimals}f}"
+
+    # ------------------------------------------------------------------
+    # 검증
+    # ------------------------------------------------------------------
+    def reject_reason(self, quantity, price, market=True):
+        """필터 위반 사유 (통과하면 None). price는 지정가 또는 시장가 주문의 기준가"""
+        try:
+            self.validate(quantity, price, market=market)
+        except FilterError as e:
+            return str(e)
+        return None
+
+    def validate(self, quantity, price=None, market=False):
+        """주문 수량 / 가격 검증 → 위반 시 FilterError
+
+        market=True면 가격 필터는 건너뛰고 price는 최소 주문 금액 확인에만 씁니다.
+        """
+        if self.status != 'TRADING':
+            raise FilterError(self.symbol, 'STATUS', f"거래 중지 상태 ({self.status})")
+
+        step = self.market_step_size if market else self.step_size
+        min_qty = self.market_min_qty if market else self.min_qty
+        max_qty = self.market_max_qty if market else self.max_qty
+        if quantity <= 0 or quantity < min_qty:
+            raise FilterError(self.symbol, 'LOT_SIZE', f"최소 수량 미달 ({quantity} < {min_qty})")
+        if quantity > max_qty:
+            raise FilterError(self.symbol, 'LOT_SIZE', f"최대 수량 초과 ({quantity} > {max_qty})")
+        if step > 0 and not _on_step(quantity - min_qty, step):
+            raise FilterError(self.symbol, 'LOT_SIZE', f"수량 {quantity}이 stepSize {step}의 배수가 아님")
+
+        if price is None:
+            return
+        if not market:
+            if price < self.min_price or price > self.max_price:
+                raise FilterError(self.symbol, 'PRICE_FILTER',
+                                  f"가격 범위 밖 ({price} not in [{self.min_price}, {self.max_price}])")
+            if self.tick_size > 0 and not _on_step(price - self.min_price, self.tick_size):
+                raise FilterError(self.symbol, 'PRICE_FILTER',
+                                  f"가격 {price}이 tickSize {self.tick_size}의 배수가 아님")
+
+        notional = quantity * price
+        if (not market or self.apply_min_to_market) and notional < self.min_notional:
+            raise FilterError(self.symbol, 'NOTIONAL',
+                              f"최소 주문 금액 미달 ({notional:,.2f} < {self.min_notional:,.2f})")
+        if not market and notional > self.max_notional:
+            raise FilterError(self.symbol, 'NOTIONAL',
+                              f"최대 주문 금액 초과 ({notional:,.2f} > {self.max_notional:,.2f})")
+
+
+class SymbolIndex:
+    """exchangeInfo 전체 → {심볼: SymbolFilters} (디스크 캐시 + TTL + 백그라운드 갱신)
+
+    loader는 exchangeInfo 응답(dict)을 돌려주는 함수입니다 (예:
+    client.get_exchange_info). path가 None이면 디스크에 저장하지 않습니다.
+    """
+
+    def __init__(self, loader=None, path=DEFAULT_PATH, ttl=DEFAULT_TTL, retry_interval=60.0):
+        self.loader = loader
+        self.path = path
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.symbols = {}
+        self.loaded_at = None  # 거래소에서 받은 시각 (time.time())
+        self.listeners = []
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # 조회 (메모리 dict)
+    # ------------------------------------------------------------------
+    def get(self, symbol):
+        return self.symbols.get(symbol)
+
+    def __getitem__(self, symbol):
+        filters = self.symbols.get(symbol)
+        if filters is None:
+            raise KeyError(f"exchangeInfo에 없는 심볼: {symbol}")
+        return filters
+
+    def __contains__(self, symbol):
+        return symbol in self.symbols
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def age(self):
+        return math.inf if self.loaded_at is None else time.time() - self.loaded_at
+
+    # ------------------------------------------------------------------
+    # 적재 / 저장
+    # ------------------------------------------------------------------
+    def update(self, exchange_info, loaded_at=None):
+        """exchangeInfo 응답 반영 (심볼 dict를 통째로 교체 → 조회 중인 스레드에 안전)"""
+        self.symbols = {
+            info['symbol']: SymbolFilters.from_symbol_info(info) for info in exchange_info['symbols']
+        }
+        self.loaded_at = loaded_at or time.time()
+        for callback in self.listeners:
+            callback(self)
+
+    def load(self):
+        """디스크 캐시가 TTL 안이면 그것을, 아니면 거래소에서 받아 저장"""
+        if self._read_disk():
+            logger.info(f"📚 exchangeInfo 캐시 사용 (심볼 {len(self):,}개, {self.age / 60:.0f}분 전)")
+            return self
+        self.fetch()
+        return self
+
+    def fetch(self):
+        """거래소에서 exchangeInfo를 받아 반영 + 디스크 저장"""
+        if self.loader is None:
+            raise RuntimeError("exchangeInfo loader가 없습니다")
+        exchange_info = self.loader()
+        self.update(exchange_info)
+        self._write_disk(exchange_info)
+        logger.info(f"📚 exchangeInfo 갱신 (심볼 {len(self):,}개)")
+        return self
+
+    def _read_disk(self):
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ exchangeInfo 캐시 읽기 실패: {e}")
+            return False
+        if time.time() - cached['saved_at'] >= self.ttl:
+            return False
+        self.update(cached['exchange_info'], loaded_at=cached['saved_at'])
+        return True
+
+    def _write_disk(self, exchange_info):
+        if not self.path:
+            return
+        # 필터 계산에 필요한 항목만 저장 (전체 응답은 수 MB)
+        compact = {'symbols': [
+            {key: info[key] for key in ('symbol', 'status', 'baseAsset', 'quoteAsset', 'filters')
+             if key in info}
+            for info in exchange_info['symbols']
+        ]}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': self.loaded_at, 'exchange_info': compact}, f)
+        os.replace(tmp, self.path)
+
+    # ------------------------------------------------------------------
+    # 백그라운드 갱신
+    # ------------------------------------------------------------------
+    def start_refresh(self, margin=0.1):
+        """TTL의 (1 - margin) 시점마다 백그라운드에서 다시 받기"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, args=(margin,),
+                                        name='symbol-index', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _refresh_loop(self, margin):
+        while True:
+            wait = self.ttl * (1 - margin) - self.age
+            if self._stop.wait(max(wait, 0.0)):
+                return
+            try:
+                self.fetch()
+            except Exception as e:
+                logger.warning(f"⚠️ exchangeInfo 갱신 실패 ({self.retry_interval:.0f}초 후 재시도): {e}")
+                if self._stop.wait(self.retry_interval):
+                    return
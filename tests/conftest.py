@@ -0,0 +1,60 @@
+"""
+테스트 공통 설정
+- 저장소 루트를 import 경로에 추가 (모듈이 최상위 파일)
+- 로컬 모의 거래소 / 모의 거래소에 붙은 봇 / 장비 시간대 픽스처
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SYMBOL = 'BTCUSDT'
+
+
+@pytest.fixture
+def seoul_tz(monkeypatch):
+    """UTC가 아닌 장비 시간대 (UTC 자정 = 현지 09시)"""
+    monkeypatch.setenv('TZ', 'Asia/Seoul')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+def exchange():
+    from mock_exchange import MockExchange
+
+    with MockExchange([SYMBOL], start_price=60_000.0) as mock:
+        yield mock
+
+
+def binance_client(base_url):
+    """base_url로 붙는 python-binance Client (서버 ping 없음)"""
+    from binance.client import Client
+
+    client = Client('test-key', 'test-secret', ping=False)
+    client.API_URL = base_url + '/api'
+    return client
+
+
+@pytest.fixture
+def make_bot(exchange, tmp_path):
+    """모의 거래소에 붙은 봇 생성기 (저널은 임시 DB, 같은 경로로 다시 만들면 재시작)"""
+    from binance_testnet_bot import BinanceTestnetBot
+    from trade_journal import TradeJournal
+
+    journals = []
+
+    def make(clock=None, journal_path=None):
+        journal = TradeJournal(str(journal_path or tmp_path / 'trade_journal.db'))
+        journals.append(journal)
+        return BinanceTestnetBot(client=binance_client(exchange.base_url), clock=clock, journal=journal)
+
+    yield make
+    for journal in journals:
+        journal.close()
@@ -0,0 +1,53 @@
+"""백테스트 (simulate ↔ 봇 청산 / 일일 목표 규칙)"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+
+from backtest import BacktestConfig, _format_time, simulate
+from binance_testnet_bot import BinanceTestnetBot
+from clock import VirtualClock
+from strategy import exit_reason
+
+HOUR_MS = 3_600_000
+START_MS = int(datetime(2024, 1, 1, 20, tzinfo=timezone.utc).timestamp() * 1000)
+
+# 20시 진입 → 21시 익절(일일 목표 달성) → 22, 23시 신호는 막힘
+# → UTC 자정(00시) 신호로 다시 진입 → 01시 익절
+CLOSE = np.array([100.0, 125.0, 125.0, 125.0, 125.0, 150.0, 150.0])
+ENTRIES = np.array([0, 2, 3, 4])
+
+
+def bot_rules(open_time, close, entries, config, quantity):
+    """봇이 캔들마다 하는 판단 (is_daily_target_reached → exit_reason)을 그대로 재생"""
+    clock = VirtualClock()
+    bot = SimpleNamespace(clock=clock, daily_profit=0.0, last_trade_date=None,
+                          daily_target=config.daily_target, save_state=lambda: None)
+    trades = []
+    entry = None
+    for t in range(len(close)):
+        clock.current_ms = int(open_time[t])
+        target_reached = BinanceTestnetBot.is_daily_target_reached(bot)
+        if entry is not None:
+            reason = exit_reason(close[entry], close[t], quantity, config.take_profit_percent,
+                                 config.stop_loss_percent, config.daily_target)
+            if reason:
+                bot.daily_profit += (close[t] - close[entry]) * quantity
+                trades.append((entry, t, reason))
+                entry = None
+        elif t in entries and not target_reached:
+            entry = t
+    return trades
+
+
+def test_simulate_matches_bot_rules_across_utc_midnight(seoul_tz):
+    open_time = START_MS + np.arange(len(CLOSE), dtype=np.int64) * HOUR_MS
+    config = BacktestConfig(daily_target=20)
+
+    trades = simulate(open_time, CLOSE, ENTRIES, config, quantity=1.0)
+    index = {_format_time(ms): t for t, ms in enumerate(open_time)}
+    simulated = [(index[t['open_time']], index[t['close_time']], t['reason']) for t in trades]
+
+    assert simulated == [(0, 1, '익절'), (4, 5, '익절')]
+    assert bot_rules(open_time, CLOSE, ENTRIES, config, 1.0) == simulated
@@ -0,0 +1,110 @@
+"""봇 거래소 보호 주문 (OCO 걸기, 체결 통보로 청산, 재시작 후 맞추기)"""
+
+import time
+
+import pytest
+
+from conftest import SYMBOL
+
+
+@pytest.fixture
+def protected_bot(exchange, make_bot, monkeypatch):
+    """가격을 직접 정하는 모의 거래소 + 보호 주문 모드 봇 생성기"""
+    monkeypatch.setenv('BINANCE_TESTNET_API_KEY', 'test-key')
+    monkeypatch.setenv('BINANCE_TESTNET_SECRET_KEY', 'test-secret')
+    monkeypatch.setenv('BOT_PROTECTIVE_EXITS', '1')
+    prices = {SYMBOL: 60_000.0}
+    exchange.price = prices.get
+    bots = []
+
+    def make(**settings):
+        bot = make_bot()
+        for name, value in settings.items():   # 설정을 바꿔 재시작
+            setattr(bot, name, value)
+        bot.start_execution(base_url=exchange.base_url, ws_url=exchange.ws_url)
+        bots.append(bot)
+        return bot
+
+    make.prices = prices
+    yield make
+    for bot in bots:
+        bot.executor.stop()
+
+
+def open_protected(bot):
+    assert bot.open_position('BUY', 60_000.0)
+    return bot.position['protection']
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def last_trade(bot):
+    return bot.journal.tail(1)[0]
+
+
+def test_open_places_oco(exchange, protected_bot):
+    bot = protected_bot()
+    protection = open_protected(bot)
+
+    legs = {exchange.open_orders[c]['type']: exchange.open_orders[c] for c in protection['orders']}
+    assert exchange.order_lists[protection['list_id']] == list(protection['orders'])
+    assert set(legs) == {'LIMIT_MAKER', 'STOP_LOSS_LIMIT'}
+    assert float(legs['LIMIT_MAKER']['price']) > 60_000.0
+    assert float(legs['STOP_LOSS_LIMIT']['stopPrice']) == pytest.approx(60_000.0 * 0.985, abs=0.01)
+    assert float(legs['LIMIT_MAKER']['origQty']) == bot.position['quantity']
+    assert bot.journal.load_state()['position']['protection'] == protection
+
+
+def test_take_profit_fill_closes_position(exchange, protected_bot):
+    bot = protected_bot()
+    protection = open_protected(bot)
+    take_profit = next(float(exchange.open_orders[c]['price']) for c, t in protection['orders'].items()
+                       if t == 'LIMIT_MAKER')
+
+    protected_bot.prices[SYMBOL] = take_profit + 1.0
+    bot.tick()                               # 보호 주문이 걸린 동안은 요청 없이 통보만 처리
+    assert wait_until(lambda: bot.process_executions() or bot.position is None)
+
+    trade = last_trade(bot)
+    assert trade['reason'] == '익절'
+    assert trade['exit_price'] == pytest.approx(take_profit + 1.0)
+    assert trade['pnl_amount'] > 0
+    assert bot.journal.load_state()['position'] is None
+    assert exchange.open_orders == {}        # 손절 다리는 OCO로 취소
+
+
+def test_reconcile_after_restart_records_missed_fill(exchange, protected_bot):
+    bot = protected_bot()
+    protection = open_protected(bot)
+    bot.executor.stop()                      # 봇 종료 (체결 통보를 받을 연결 없음)
+
+    stop_leg = next(c for c, t in protection['orders'].items() if t == 'STOP_LOSS_LIMIT')
+    exit_price = float(exchange.open_orders[stop_leg]['price']) + 1.0   # 스톱가와 지정가 사이
+    protected_bot.prices[SYMBOL] = exit_price
+    assert wait_until(lambda: exchange.open_orders.get(stop_leg) is None)
+
+    restarted = protected_bot()              # 저널로 포지션 복구 → 거래소 조회로 손절 반영
+    assert restarted.position is None
+    assert last_trade(restarted)['reason'] == '손절'
+    assert last_trade(restarted)['exit_price'] == pytest.approx(exit_price)
+
+
+def test_restart_with_new_exit_params_replaces_oco(exchange, protected_bot):
+    bot = protected_bot()
+    old = open_protected(bot)
+    bot.executor.stop()
+
+    restarted = protected_bot(take_profit_percent=2.0)
+
+    new = restarted.position['protection']
+    assert new['list_id'] != old['list_id']
+    assert new['take_profit_percent'] == 2.0
+    assert old['list_id'] not in exchange.order_lists
+    assert all(c not in exchange.open_orders for c in old['orders'])
+    assert sorted(exchange.open_orders) == sorted(new['orders'])
+    assert restarted.journal.load_state()['position']['protection'] == new
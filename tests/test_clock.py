@@ -0,0 +1,23 @@
+"""시계 (가상 시계 / 배속 시계 UTC, 거래일 경계)"""
+
+import time
+from datetime import datetime, timezone
+
+from clock import VirtualClock, trading_day
+from supervisor import ScaledClock
+
+# 2024-01-01 23:30 UTC = 2024-01-02 08:30 서울
+MS = int(datetime(2024, 1, 1, 23, 30, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def test_virtual_clock_is_utc(seoul_tz):
+    clock = VirtualClock(MS)
+    assert clock.now() == datetime(2024, 1, 1, 23, 30)
+    assert trading_day(clock) == datetime(2024, 1, 1).date()
+    clock.advance(30 * 60_000)
+    assert trading_day(clock) == datetime(2024, 1, 2).date()
+
+
+def test_scaled_clock_is_utc(seoul_tz):
+    clock = ScaledClock(MS, epoch=time.time(), speed=1.0)
+    assert abs(clock.now() - datetime(2024, 1, 1, 23, 30)).total_seconds() < 1
@@ -0,0 +1,169 @@
+"""비동기 주문 실행기 (체결 추적 / VWAP, 서버 시간 보정, 재시도, 응답 유실 주문 조회)"""
+
+import concurrent.futures
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from binance_testnet_bot import BinanceTestnetBot
+from conftest import SYMBOL, binance_client
+from execution import ExchangeError, OrderExecutor, OrderState, fill_summary
+from fault_proxy import FaultProxy
+from mock_exchange import MockExchange
+from transport import resilient_client
+
+
+def executor(base_url, exchange, **options):
+    options.setdefault('user_stream', False)
+    return OrderExecutor('test-key', 'test-secret', base_url=base_url, ws_url=exchange.ws_url,
+                         **options)
+
+
+def test_fill_summary_vwap():
+    order = {'fills': [{'price': '100', 'qty': '1', 'commission': '0.1'},
+                       {'price': '102', 'qty': '3', 'commission': '0.3'}]}
+    assert fill_summary(order) == pytest.approx((101.5, 4.0, 0.4))
+    assert fill_summary({'executedQty': '2', 'cummulativeQuoteQty': '210'}) == (105.0, 2.0, 0.0)
+    assert fill_summary({'executedQty': '0'}) == (None, 0.0, 0.0)
+
+
+def test_reports_and_response_in_any_order():
+    """체결 통보가 REST 응답보다 먼저 와도 같은 누적 값"""
+    response = {'orderId': 7, 'status': 'FILLED', 'executedQty': '2', 'cummulativeQuoteQty': '201',
+                'fills': [{'price': '100', 'qty': '1', 'commission': '0.1', 'tradeId': 1},
+                          {'price': '101', 'qty': '1', 'commission': '0.1', 'tradeId': 2}]}
+    reports = [{'i': 7, 'x': 'TRADE', 't': 1, 'L': '100', 'l': '1', 'n': '0.1', 'z': '1', 'Z': '100',
+                'X': 'PARTIALLY_FILLED'},
+               {'i': 7, 'x': 'TRADE', 't': 2, 'L': '101', 'l': '1', 'n': '0.1', 'z': '2', 'Z': '201',
+                'X': 'FILLED'}]
+
+    first = OrderState('a', SYMBOL, 'BUY', 'MARKET', 2)
+    first.apply_response(response)
+    assert [first.apply_report(r) for r in reports] == [False, False]   # 이미 아는 체결
+
+    second = OrderState('b', SYMBOL, 'BUY', 'MARKET', 2)
+    for report in reversed(reports):
+        second.apply_report(report)
+    second.apply_response(response)
+
+    for state in (first, second):
+        assert state.status == 'FILLED'
+        assert state.done.is_set()
+        assert state.avg_price == pytest.approx(100.5)
+        assert state.commission == pytest.approx(0.2)
+
+
+def test_user_stream_tracks_split_fills():
+    with MockExchange([SYMBOL], fill_levels=3, level_bps=5.0) as exchange:
+        with executor(exchange.base_url, exchange, user_stream=True) as orders:
+            assert orders.stream_connected.is_set()
+            state = orders.submit_market(SYMBOL, 'BUY', '0.003').result(timeout=10)
+            assert state.done.wait(5)
+
+            events = []
+            while len(events) < 3:
+                kind, event = orders.events.get(timeout=5)
+                if kind == 'execution':
+                    events.append(event)
+
+    assert all(event is state for event in events)
+    assert len(state.fills) == 3
+    price, quantity, commission = fill_summary(state.response)
+    assert state.avg_price == pytest.approx(price)
+    assert state.executed_qty == pytest.approx(quantity) == pytest.approx(0.003)
+    assert state.commission == pytest.approx(commission)
+
+
+def test_forget_keeps_live_orders(exchange):
+    with executor(exchange.base_url, exchange) as orders:
+        live = orders.track_order('live', SYMBOL, 'SELL', 'LIMIT_MAKER', 1)
+        orders.forget(live)
+        assert 'live' in orders.orders          # 아직 대기 중인 주문은 유지
+
+        state = orders.submit_market(SYMBOL, 'BUY', '0.001').result(timeout=10)
+        orders.forget(state)
+        assert list(orders.orders) == ['live']
+
+
+def test_exchange_error_carries_code(exchange):
+    with executor(exchange.base_url, exchange) as orders:
+        with pytest.raises(ExchangeError) as info:
+            orders.submit_market('DOGEUSDT', 'BUY', '1').result(timeout=10)
+        assert orders.breaker.state == 'closed'   # 업무 오류는 실패로 세지 않음
+    assert info.value.status_code == 400
+    assert info.value.code == -1121
+
+
+def test_timestamp_error_resyncs_standalone():
+    with MockExchange([SYMBOL], clock_offset_ms=10_000) as exchange:
+        with executor(exchange.base_url, exchange) as orders:
+            state = orders.submit_market(SYMBOL, 'BUY', '0.001').result(timeout=10)
+            assert state.status == 'FILLED'
+            assert orders.time_offset == pytest.approx(10_000, abs=500)
+            # 보정 뒤에는 바로 통과
+            orders.submit_market(SYMBOL, 'BUY', '0.001').result(timeout=10)
+        assert exchange.rejections[-1021] == 1
+
+
+def test_timestamp_error_resyncs_shared_time_client():
+    """봇의 ResilientClient와 서버 시간 보정값을 함께 씀"""
+    with MockExchange([SYMBOL], clock_offset_ms=-10_000) as exchange:
+        client = resilient_client(binance_client(exchange.base_url), time_sync_interval=None)
+        with executor(exchange.base_url, exchange, time_client=client) as orders:
+            orders.submit_market(SYMBOL, 'BUY', '0.001').result(timeout=10)
+            assert client.time_offset == pytest.approx(-10_000, abs=500)
+            client.get_account()   # REST 쪽도 -1021 없이 통과
+        assert exchange.rejections[-1021] == 1
+
+
+def test_lost_responses_are_looked_up_before_resend(exchange):
+    rates = {'lost_response': 0.2, 'reset': 0.05, 'unavailable': 0.05}
+    with FaultProxy(exchange.base_url, rates, paths=('/api/v3/order',), seed=2) as proxy:
+        with executor(proxy.base_url, exchange, base_delay=0.01) as orders:
+            for _ in range(40):
+                state = orders.submit_market(SYMBOL, 'BUY', '0.001').result(timeout=15)
+                assert state.status == 'FILLED'
+
+    assert proxy.injected['lost_response'] > 0
+    assert orders.stats['recovered_orders'] > 0
+    assert len(exchange.orders) == 40
+    assert max(Counter(o['clientOrderId'] for o in exchange.orders).values()) == 1
+
+
+def timed_out_future():
+    future = concurrent.futures.Future()
+    future.set_exception(concurrent.futures.TimeoutError())
+    return future
+
+
+def test_bot_looks_up_order_after_timeout(exchange):
+    """접수 응답이 제한 시간 안에 오지 않아도 거래소에 들어간 주문은 체결로 처리"""
+    with executor(exchange.base_url, exchange) as orders:
+        submit = orders.submit_market
+
+        def placed_but_timed_out(symbol, side, quantity, client_order_id=None):
+            submit(symbol, side, quantity, client_order_id=client_order_id).result(timeout=10)
+            return timed_out_future()
+
+        orders.submit_market = placed_but_timed_out
+        bot = SimpleNamespace(executor=orders, symbol=SYMBOL)
+        order = BinanceTestnetBot.execute_market_order(bot, 'BUY', '0.001')
+
+    assert order['status'] == 'FILLED'
+    assert fill_summary(order)[1] == 0.001
+    assert len(exchange.orders) == 1
+
+
+def test_bot_reports_failure_when_order_not_on_exchange(exchange):
+    with executor(exchange.base_url, exchange) as orders:
+        def never_sent(symbol, side, quantity, client_order_id=None):
+            orders.track_order(client_order_id, symbol, side, 'MARKET', quantity)
+            return timed_out_future()
+
+        orders.submit_market = never_sent
+        bot = SimpleNamespace(executor=orders, symbol=SYMBOL)
+        with pytest.raises(concurrent.futures.TimeoutError):
+            BinanceTestnetBot.execute_market_order(bot, 'BUY', '0.001')
+        assert orders.orders == {}   # 거래소에 없는 주문은 추적 목록에서 제거
+    assert exchange.orders == []
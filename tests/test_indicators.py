@@ -0,0 +1,82 @@
+"""증분 지표(IncrementalIndicators)와 pandas 기준 구현 비교"""
+
+import math
+
+import numpy as np
+import pytest
+
+from indicators import IncrementalIndicators, indicator_columns, verify_against_pandas
+from binance_testnet_bot import BinanceTestnetBot
+
+
+def random_walk(n, seed=0, start=60_000.0):
+    rng = np.random.default_rng(seed)
+    return (start * np.exp(np.cumsum(rng.normal(0, 0.002, n)))).tolist()
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_peek_matches_pandas(seed):
+    errors = verify_against_pandas(random_walk(300, seed))
+    for key, error in errors.items():
+        assert error < 1e-6, key
+
+
+def test_flat_prices_match_pandas():
+    """상승 / 하락이 없는 구간 (RSI 0 / 0, 표준편차 0)"""
+    prices = [100.0] * 40 + [101.0, 100.5] + [100.5] * 30
+    errors = verify_against_pandas(prices)
+    for key, error in errors.items():
+        # 분산 0 근처에서는 sqrt가 반올림 오차를 키움 (가격 100 기준 1e-7 수준)
+        assert error < 1e-6, key
+
+
+def test_columns_match_bot_functions():
+    prices = random_walk(120, seed=3)
+    columns = indicator_columns(prices)
+    for end in (30, 60, 119):
+        window = prices[:end + 1]
+        expected_rsi = BinanceTestnetBot.calculate_rsi(None, window)
+        expected_macd, expected_signal = BinanceTestnetBot.calculate_macd(None, window)
+        upper, middle, lower = BinanceTestnetBot.calculate_bollinger_bands(None, window)
+        assert columns['rsi'][end] == pytest.approx(expected_rsi, rel=1e-9)
+        assert columns['macd'][end] == pytest.approx(expected_macd, rel=1e-9)
+        assert columns['macd_signal'][end] == pytest.approx(expected_signal, rel=1e-9)
+        assert columns['bb_upper'][end] == pytest.approx(upper, rel=1e-9)
+        assert columns['bb_middle'][end] == pytest.approx(middle, rel=1e-9)
+        assert columns['bb_lower'][end] == pytest.approx(lower, rel=1e-9)
+
+
+def test_not_ready_before_history():
+    engine = IncrementalIndicators()
+    for close in random_walk(10):
+        engine.update(close)
+    assert not engine.ready
+    assert math.isnan(engine.peek(60_000.0)['bb_middle'])
+
+
+def test_sync_closed_applies_only_new_candles():
+    prices = random_walk(80, seed=4)
+    open_times = [i * 60_000 for i in range(len(prices))]
+
+    synced = IncrementalIndicators()
+    synced.sync_closed(open_times[:60], prices[:60])
+    synced.sync_closed(open_times[10:70], prices[10:70])   # 겹치는 구간은 건너뜀
+
+    seeded = IncrementalIndicators()
+    seeded.seed(prices[:70], open_times[69])
+
+    assert synced.count == 70
+    assert synced.peek(prices[70]) == pytest.approx(seeded.peek(prices[70]))
+
+
+def test_sync_closed_reseeds_after_gap():
+    prices = random_walk(80, seed=5)
+    open_times = [i * 60_000 for i in range(len(prices))]
+
+    engine = IncrementalIndicators()
+    engine.sync_closed(open_times[:30], prices[:30])
+    # 30 ~ 39번 캔들 누락: 마지막 반영 캔들을 찾을 수 없으므로 새 배열로 다시 구성
+    engine.sync_closed(open_times[40:80], prices[40:80])
+
+    assert engine.count == 40
+    assert engine.last_open_time == open_times[79]
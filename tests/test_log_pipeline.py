@@ -0,0 +1,40 @@
+"""구조화 로그 (JsonLineFormatter)"""
+
+import json
+import logging
+
+import numpy as np
+
+from log_pipeline import JsonLineFormatter
+
+
+def record(msg, fields=None):
+    rec = logging.LogRecord('bot', logging.INFO, __file__, 1, msg, None, None)
+    if fields is not None:
+        rec.fields = fields
+    return rec
+
+
+def test_event_fields():
+    line = JsonLineFormatter().format(record('order', {'side': 'BUY', 'qty': np.float32(0.5)}))
+    data = json.loads(line)
+    assert data['event'] == 'order'
+    assert data['side'] == 'BUY'
+    assert data['qty'] == 0.5
+
+
+def test_non_finite_values_become_null():
+    """워밍업 중 지표(NaN) / inf도 유효한 JSON 한 줄 (null)"""
+    fields = {'rsi': float('nan'), 'bands': [1.0, float('inf')], 'macd': np.float64('nan'),
+              'nested': {'x': float('-inf')}}
+    data = json.loads(JsonLineFormatter().format(record('analysis', fields)))
+    assert data['rsi'] is None
+    assert data['bands'] == [1.0, None]
+    assert data['macd'] is None
+    assert data['nested'] == {'x': None}
+
+
+def test_plain_message():
+    data = json.loads(JsonLineFormatter().format(record('hello')))
+    assert data['msg'] == 'hello'
+    assert data['lvl'] == 'INFO'
@@ -0,0 +1,104 @@
+"""웹소켓 시장 데이터 스트림 (FakeStreamServer 재생 → MarketStream)"""
+
+import json
+import time
+
+from market_stream import FakeStreamServer, MarketStream, load_frames
+from order_book import DepthSync
+
+MINUTE = 60_000
+
+
+def kline_frame(minute, close, closed):
+    return json.dumps({'stream': 'btcusdt@kline_1m', 'data': {
+        'e': 'kline', 's': 'BTCUSDT', 'k': {
+            't': minute * MINUTE, 'T': (minute + 1) * MINUTE - 1, 'o': str(close), 'h': str(close),
+            'l': str(close), 'c': str(close), 'v': '1.5', 'x': closed,
+        }}})
+
+
+def book_frame(update_id, bid, ask):
+    return json.dumps({'stream': 'btcusdt@bookTicker', 'data': {
+        'u': update_id, 's': 'BTCUSDT', 'b': str(bid), 'B': '1.0', 'a': str(ask), 'A': '2.0',
+    }})
+
+
+def depth_frame(first, last):
+    return json.dumps({'stream': 'btcusdt@depth@100ms', 'data': {
+        'e': 'depthUpdate', 's': 'BTCUSDT', 'U': first, 'u': last,
+        'b': [['99.5', '1.0']], 'a': [],
+    }})
+
+
+def collect(stream, count, timeout=5.0):
+    events = []
+    deadline = time.monotonic() + timeout
+    while len(events) < count and time.monotonic() < deadline:
+        event = stream.get(timeout=0.1)
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def test_replays_klines_and_book():
+    frames = [
+        (0.0, kline_frame(0, 100.0, False)),
+        (0.0, kline_frame(0, 101.0, True)),
+        (0.0, book_frame(1, 100.9, 101.1)),
+        (0.0, kline_frame(1, 102.0, False)),
+    ]
+    with FakeStreamServer(frames, close_after=False) as server:
+        stream = MarketStream('BTCUSDT', '1m', url=server.url)
+        stream.start()
+        try:
+            events = collect(stream, 4)
+            assert [kind for kind, _ in events] == ['kline', 'kline', 'book', 'kline']
+            assert [c['close'] for c in stream.candles] == [101.0]
+            assert stream.current_candle['open_time'] == MINUTE
+            assert stream.is_fresh()
+            assert stream.get_price() == 100.9   # 최우선 매수호가
+        finally:
+            stream.stop()
+
+
+def test_disconnect_and_reconnect():
+    """재생이 끝나면 서버가 끊음 → disconnect 이벤트, REST 폴백, 다시 연결"""
+    frames = [(0.0, kline_frame(0, 100.0, True))]
+    with FakeStreamServer(frames, close_after=True) as server:
+        stream = MarketStream('BTCUSDT', '1m', url=server.url, reconnect_delay=0.05)
+        stream.start()
+        try:
+            events = collect(stream, 3)
+            assert [kind for kind, _ in events] == ['kline', 'disconnect', 'kline']
+            assert server.connections >= 2
+        finally:
+            stream.stop()
+    assert not stream.connected
+    assert stream.get_price() is None
+
+
+def test_depth_events_go_to_order_book():
+    snapshot = {'lastUpdateId': 10, 'bids': [['99.0', '1.0']], 'asks': [['101.0', '1.0']]}
+    depth = DepthSync('BTCUSDT', lambda limit: snapshot, retry_interval=0.01)
+    frames = [(0.0, depth_frame(5, 10)), (0.05, depth_frame(11, 12)),
+              (0.0, book_frame(1, 99.5, 101.0))]
+    with FakeStreamServer(frames, close_after=False) as server:
+        stream = MarketStream('BTCUSDT', '1m', url=server.url, depth=depth)
+        assert stream.url.endswith('btcusdt@depth@100ms')
+        stream.start()
+        try:
+            # depth 이벤트는 큐를 거치지 않으므로 bookTicker 하나만 나옴
+            assert [kind for kind, _ in collect(stream, 1)] == ['book']
+            deadline = time.monotonic() + 5.0   # 스냅샷 재동기화는 백그라운드 스레드
+            while depth.syncing and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert depth.book.last_update_id == 12
+            assert depth.book.bids.best() == (99.5, 1.0)
+        finally:
+            stream.stop()
+
+
+def test_load_frames(tmp_path):
+    path = tmp_path / 'frames.jsonl'
+    path.write_text('{"delay": 0.5, "data": "a"}\n\n{"delay": 0.0, "data": "b"}\n', encoding='utf-8')
+    assert load_frames(str(path)) == [(0.5, 'a'), (0.0, 'b')]
@@ -0,0 +1,122 @@
+"""로컬 호가창 (OrderBook diff 반영, DepthSync 스냅샷 재동기화 / 버퍼링)"""
+
+import time
+import threading
+
+import pytest
+
+from order_book import DepthSync, OrderBook
+
+SNAPSHOT = {
+    'lastUpdateId': 100,
+    'bids': [['99.0', '1.0'], ['98.0', '2.0']],
+    'asks': [['101.0', '1.0'], ['102.0', '3.0']],
+}
+
+
+def diff(first, last, bids=(), asks=()):
+    return {'e': 'depthUpdate', 'U': first, 'u': last, 'b': list(bids), 'a': list(asks)}
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_apply_diff_rules():
+    book = OrderBook('BTCUSDT')
+    book.apply_snapshot(SNAPSHOT)
+
+    assert book.apply_diff(diff(90, 100, bids=[['99.0', '5.0']]))   # 스냅샷 이전: 버림
+    assert book.bids.best() == (99.0, 1.0)
+
+    assert book.apply_diff(diff(95, 101, bids=[['99.5', '1.0']], asks=[['101.0', '0']]))
+    assert book.bids.best() == (99.5, 1.0)
+    assert book.asks.best() == (102.0, 3.0)        # 잔량 0 → 레벨 삭제
+    assert book.last_update_id == 101
+
+    assert not book.apply_diff(diff(105, 106))      # 102 ~ 104 누락
+    assert not book.synced
+    assert book.gaps == 1
+
+
+def test_microstructure_signals():
+    book = OrderBook('BTCUSDT')
+    book.apply_snapshot(SNAPSHOT)
+    assert book.mid() == 100.0
+    assert book.spread_bps() == pytest.approx(200.0)
+    assert book.imbalance(2) == pytest.approx((3 - 4) / 7)
+    # 매수 2.0 = 101 × 1 + 102 × 1 → 평균 101.5
+    assert book.slippage_bps('BUY', 2.0) == pytest.approx(150.0)
+    assert book.slippage_bps('BUY', 10.0) is None
+
+
+class SlowSnapshot:
+    """release()할 때까지 스냅샷 응답을 붙잡아 두는 REST 흉내"""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = 0
+        self.released = threading.Event()
+
+    def __call__(self, limit):
+        self.calls += 1
+        self.released.wait(5)
+        return self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+
+    def release(self):
+        self.released.set()
+
+
+def test_buffers_events_during_snapshot():
+    fetch = SlowSnapshot([SNAPSHOT])
+    depth = DepthSync('BTCUSDT', fetch, retry_interval=0.01)
+    depth.resync()
+
+    # 스냅샷을 기다리는 동안 온 이벤트 (앞의 것은 스냅샷보다 오래됨)
+    depth.on_event(diff(95, 100, bids=[['99.0', '9.0']]))
+    depth.on_event(diff(101, 102, bids=[['99.5', '2.0']]))
+    depth.on_event(diff(103, 103, asks=[['100.5', '1.0']]))
+    assert depth.signals(1.0) is None
+
+    fetch.release()
+    assert wait_until(lambda: not depth.syncing)
+    assert depth.book.last_update_id == 103
+    assert depth.book.bids.best() == (99.5, 2.0)
+    assert depth.book.asks.best() == (100.5, 1.0)
+    assert depth.book.bids.depth(3) == pytest.approx(5.0)   # 99.0 잔량은 스냅샷 값 그대로
+    assert depth.resyncs == 1
+
+
+def test_gap_triggers_resync():
+    later = dict(SNAPSHOT, lastUpdateId=110, bids=[['97.0', '1.0']])
+    fetch = SlowSnapshot([SNAPSHOT, later])
+    fetch.release()
+    depth = DepthSync('BTCUSDT', fetch, retry_interval=0.01)
+    depth.resync()
+    assert wait_until(lambda: not depth.syncing)
+
+    depth.on_event(diff(101, 101))
+    depth.on_event(diff(108, 110))   # 102 ~ 107 누락 → 새 스냅샷
+    assert wait_until(lambda: depth.resyncs == 2)
+    assert fetch.calls == 2
+    assert depth.book.last_update_id == 110
+    assert depth.mid() == pytest.approx(99.0)
+
+
+def test_stale_snapshot_is_retried():
+    """스냅샷이 버퍼보다 오래되면 (이어지지 않음) 다시 요청"""
+    stale = dict(SNAPSHOT, lastUpdateId=50)
+    fetch = SlowSnapshot([stale, SNAPSHOT])
+    depth = DepthSync('BTCUSDT', fetch, retry_interval=0.05)
+    depth.resync()
+    depth.on_event(diff(101, 101))
+    fetch.release()
+
+    assert wait_until(lambda: not depth.syncing)
+    assert fetch.calls == 2
+    assert depth.book.last_update_id == 100
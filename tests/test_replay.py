@@ -0,0 +1,29 @@
+"""시세 녹화 / 재생 (워밍업 구간 녹화)"""
+
+import numpy as np
+
+from clock import VirtualClock
+from conftest import SYMBOL
+from exchange_simulator import SimulatedExchange
+from kline_store import KlineStore
+from replay import load_recording
+
+
+def test_recording_includes_store_warm_start(exchange, make_bot, tmp_path, monkeypatch):
+    """캔들 저장소로 워밍업한 세션도 재생 때 같은 과거 캔들에서 시작"""
+    path = tmp_path / 'session.rec'
+    monkeypatch.setenv('BOT_RECORD', str(path))
+    bot = make_bot()
+    bot.kline_store = KlineStore(str(tmp_path / 'klines'))
+    series = bot.kline_store.series(SYMBOL, bot.candle_interval)
+    series.append(exchange.klines(SYMBOL, bot.candle_interval, 121)[:-1])   # 이전 실행이 남긴 캔들
+
+    assert bot.warm_start() == 99
+    bot.recorder.close()
+
+    data = load_recording(str(path))
+    simulator = SimulatedExchange({SYMBOL: data}, clock=VirtualClock(data['start_ms']))
+    replayed = simulator.get_klines(symbol=SYMBOL, interval=bot.candle_interval, limit=100)[:-1]
+    stored = series.window(99)
+    np.testing.assert_array_equal([int(k[0]) for k in replayed], stored['open_time'])
+    np.testing.assert_allclose([float(k[4]) for k in replayed], stored['close'])
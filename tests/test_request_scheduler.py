@@ -0,0 +1,148 @@
+"""요청 가중치 스케줄러 (RequestScheduler / ScheduledClient + 로컬 모의 거래소)"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import SYMBOL, binance_client
+from mock_exchange import MockExchange
+from request_scheduler import (PRIORITY_MARKET_DATA, PRIORITY_ORDER, RequestScheduler,
+                               ScheduledClient, request_weight)
+
+
+def test_request_weight():
+    assert request_weight('get_symbol_ticker', {'symbol': SYMBOL}) == 2
+    assert request_weight('get_symbol_ticker', {}) == 4
+    assert request_weight('get_order_book', {'limit': 1000}) == 50
+    assert request_weight('order_market', {}) == 1
+
+
+def test_coalesces_and_caches(exchange):
+    client = ScheduledClient(binance_client(exchange.base_url))
+    with ThreadPoolExecutor(8) as pool:
+        prices = list(pool.map(lambda _: client.get_symbol_ticker(symbol=SYMBOL), range(8)))
+    client.get_symbol_ticker(symbol=SYMBOL)   # TTL 안: 캐시
+
+    assert len({p['price'] for p in prices}) == 1
+    assert exchange.request_counts['/api/v3/ticker/price'] == 1
+    stats = client.scheduler.stats
+    assert stats['sent'] == 1
+    assert stats['coalesced'] + stats['cached'] == 8
+
+
+def test_stays_under_weight_limit():
+    """스케줄러 한도 = 거래소 한도: 스스로 기다려 429를 받지 않음"""
+    with MockExchange([SYMBOL], weight_limit=40, weight_window_s=1.0) as exchange:
+        client = ScheduledClient(binance_client(exchange.base_url), ttls={},
+                                 weight_limit=40, window_s=1.0, order_reserve=0.0)
+        for _ in range(30):   # 가중치 2 × 30 = 60 > 40
+            client.get_symbol_ticker(symbol=SYMBOL)
+
+        assert exchange.rejections[429] == 0
+        assert client.scheduler.stats['throttled'] >= 1
+        assert exchange.request_counts['/api/v3/ticker/price'] == 30
+
+
+def test_retries_after_429():
+    """스케줄러가 모르는 한도(거래소가 더 작음) → 429 Retry-After만큼 멈춘 뒤 재시도"""
+    with MockExchange([SYMBOL], weight_limit=10, weight_window_s=1.0) as exchange:
+        client = ScheduledClient(binance_client(exchange.base_url), ttls={},
+                                 weight_limit=1000, window_s=1.0)
+        client.scheduler.observe = lambda headers: None   # 헤더로 한도를 미리 알지 못하게
+        for _ in range(8):
+            assert client.get_symbol_ticker(symbol=SYMBOL)['symbol'] == SYMBOL
+
+        assert exchange.rejections[429] >= 1
+        assert client.scheduler.stats['rate_limited'] >= 1
+
+
+def test_order_not_blocked_by_slow_reads():
+    scheduler = RequestScheduler(workers=1)
+    release = threading.Event()
+    slow = scheduler.submit(None, lambda: release.wait(5), priority=PRIORITY_MARKET_DATA)
+
+    started = time.perf_counter()
+    order = scheduler.submit(None, lambda: 'filled', priority=PRIORITY_ORDER)
+    assert order.result(timeout=1) == 'filled'
+    assert time.perf_counter() - started < 0.5
+    assert not slow.done()
+    release.set()
+    assert slow.result(timeout=1)
+
+
+def test_reads_run_concurrently():
+    """시작 시 조회처럼 동시에 보낸 조회는 조회용 스레드 여러 개에서 겹쳐 실행"""
+    scheduler = RequestScheduler(workers=4)
+    started = time.perf_counter()
+    futures = [scheduler.submit(None, lambda: time.sleep(0.2)) for _ in range(3)]
+    for future in futures:
+        future.result(timeout=2)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_expired_cache_entries_are_evicted():
+    scheduler = RequestScheduler()
+    for i in range(50):
+        scheduler.call(('get_klines', i), lambda: i, ttl=0.01)
+    time.sleep(0.05)
+    scheduler.call(('get_klines', 'last'), lambda: 0, ttl=0.01)
+
+    assert len(scheduler._cache) == 1
+    assert len(scheduler._expiry) == 1
+
+
+def test_errors_propagate_without_caching():
+    scheduler = RequestScheduler()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ValueError('boom')
+
+    for _ in range(2):
+        try:
+            scheduler.call('key', failing, ttl=10.0)
+        except ValueError:
+            pass
+    assert len(calls) == 2
+
+
+class SharedResponseClient:
+    """python-binance Client처럼 마지막 응답을 client.response 하나에 덮어쓰는 클라이언트"""
+
+    def __init__(self):
+        self.session = type('Session', (), {'hooks': {'response': []}})()
+        self.response = None
+        self.klines_sent = threading.Event()
+        self.account_sent = threading.Event()
+
+    def _respond(self, used_weight):
+        response = type('Response', (), {'headers': {'X-MBX-USED-WEIGHT-1M': str(used_weight)}})()
+        self.response = response
+        for hook in self.session.hooks['response']:
+            hook(response)
+
+    def get_klines(self, **params):
+        self._respond(10)
+        self.klines_sent.set()
+        self.account_sent.wait(2)    # 다른 스레드의 응답이 client.response를 덮어쓴 뒤 반환
+        return 'klines'
+
+    def get_account(self, **params):
+        self.klines_sent.wait(2)
+        self._respond(500)
+        self.account_sent.set()
+        return 'account'
+
+
+def test_headers_are_read_per_request():
+    """동시에 끝난 요청이 서로의 가중치 헤더를 읽지 않음"""
+    client = ScheduledClient(SharedResponseClient(), ttls={})
+    observed = []
+    client.scheduler.observe = lambda headers: observed.append(int(headers['X-MBX-USED-WEIGHT-1M']))
+
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(lambda call: call(), [client.get_klines, client.get_account]))
+
+    assert results == ['klines', 'account']
+    assert sorted(observed) == [10, 500]
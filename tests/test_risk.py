@@ -0,0 +1,97 @@
+"""포트폴리오 리스크 / 주문 수량 엔진 (RiskEngine)"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from clock import VirtualClock
+from risk import RiskEngine
+from symbol_filters import SymbolFilters
+
+
+def engine(cash=10_000.0, **options):
+    risk = RiskEngine(**options)
+    risk.update_account({'balances': [{'asset': 'USDT', 'free': str(cash), 'locked': '0'}]})
+    return risk
+
+
+def btc_rules():
+    return SymbolFilters('BTCUSDT', tick_size=0.01, price_decimals=2, step_size=0.001,
+                         min_qty=0.001, qty_decimals=3, min_notional=5.0)
+
+
+def test_size_scales_with_volatility():
+    risk = engine()
+    assert risk.size('BTCUSDT', 50_000.0) == pytest.approx(0.004)          # 10,000 × 2%
+    assert risk.size('BTCUSDT', 50_000.0, volatility=1.0) == pytest.approx(0.002)
+    assert risk.size('BTCUSDT', 50_000.0, volatility=0.01) == pytest.approx(0.008)   # 상한 2배
+    assert risk.size('BTCUSDT', 50_000.0, volatility=float('nan')) == pytest.approx(0.004)
+
+
+def test_size_respects_capital_and_exchange_rules():
+    assert engine(capital=1_000.0).size('BTCUSDT', 50_000.0) == pytest.approx(0.0004)
+
+    risk = engine()
+    risk.set_rules(btc_rules())
+    assert risk.size('BTCUSDT', 60_000.0) == 0.003      # 0.00333… → stepSize로 내림
+    assert engine(cash=100.0, rules={'BTCUSDT': btc_rules()}).size('BTCUSDT', 60_000.0) == 0.0
+
+
+def test_exposure_limits():
+    risk = engine(max_exposure=0.5, max_symbol_exposure=0.2)
+    for symbol in ('BTCUSDT', 'ETHUSDT'):
+        assert risk.check(symbol, 'BUY', 1.0, 2_000.0) is None
+        risk.on_fill(symbol, 'BUY', 1.0, 2_000.0)
+    assert risk.equity == pytest.approx(10_000.0)
+    assert risk.exposure == pytest.approx(4_000.0)
+
+    assert risk.check('BTCUSDT', 'BUY', 1.0, 100.0).startswith('심볼 노출 한도 초과')
+    assert risk.check('SOLUSDT', 'BUY', 1.0, 1_500.0).startswith('전체 노출 한도 초과')
+    assert risk.check('BTCUSDT', 'SELL', 1.0, 2_000.0) is None
+
+    # 수량도 남은 한도까지만
+    risk.risk_fraction = 0.5
+    assert risk.size('SOLUSDT', 100.0) == pytest.approx(10.0)    # 남은 전체 한도 $1,000
+
+
+def test_daily_loss_limit_halts_entries():
+    risk = engine(max_daily_loss=0.03, clock=VirtualClock())
+    risk.record_pnl(-200.0)
+    assert risk.check('BTCUSDT', 'BUY', 0.001, 50_000.0) is None
+    risk.record_pnl(-150.0)                     # 누적 -350 ≤ -300 (시작 자본의 3%)
+    assert risk.halted
+    assert risk.check('BTCUSDT', 'BUY', 0.001, 50_000.0) == "일일 손실 한도 도달"
+    assert risk.check('BTCUSDT', 'SELL', 0.001, 50_000.0) is None   # 청산은 허용
+
+
+def test_reserve_blocks_concurrent_order_and_release_restores():
+    risk = engine(max_exposure=0.5, max_symbol_exposure=0.5)
+    risk.reserve('BTCUSDT', 0.08, 50_000.0)     # 전송 중인 주문 $4,000
+    assert risk.exposure == pytest.approx(4_000.0)
+    assert risk.free_cash == pytest.approx(6_000.0)
+    assert risk.check('ETHUSDT', 'BUY', 1.0, 2_000.0).startswith('전체 노출 한도 초과')
+
+    risk.release('BTCUSDT', 0.08, 50_000.0)
+    assert risk.exposure == pytest.approx(0.0)
+    assert risk.free_cash == pytest.approx(10_000.0)
+    assert 'BTCUSDT' not in risk.positions
+    assert risk.check('ETHUSDT', 'BUY', 1.0, 2_000.0) is None
+
+
+def test_new_utc_day_resets_loss_limit():
+    start = datetime(2024, 1, 1, 22, tzinfo=timezone.utc).timestamp() * 1000
+    clock = VirtualClock(start)
+    risk = engine(max_daily_loss=0.03, clock=clock)
+    risk.record_pnl(-400.0)
+    assert risk.halted
+
+    clock.advance(3_600_000)                    # 23시: 같은 거래일
+    assert risk.check('BTCUSDT', 'BUY', 0.001, 50_000.0) == "일일 손실 한도 도달"
+
+    risk.on_fill('BTCUSDT', 'BUY', 0.01, 50_000.0)
+    clock.advance(3_600_000)                    # 00시 (UTC): 새 거래일
+    assert risk.check('BTCUSDT', 'BUY', 0.001, 50_000.0) is None
+    assert not risk.halted
+    assert risk.daily_pnl == 0.0
+    assert risk.day == datetime(2024, 1, 2).date()
+    assert risk.day_start_equity == pytest.approx(risk.equity)
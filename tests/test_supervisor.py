@@ -0,0 +1,153 @@
+"""감독자 (공유 메모리 시세 seqlock / get_klines 범위 규칙, 실행 워커 요청 시간 초과)"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from clock import VirtualClock
+from conftest import SYMBOL
+from exchange_simulator import SimulatedExchange
+from supervisor import AccountError, MarketFeed, WorkerClient
+
+MINUTE = 60_000
+INTERVAL = '15m'
+INTERVAL_MS = 15 * MINUTE
+START_MS = 1_700_000_100_000 - 1_700_000_100_000 % INTERVAL_MS
+
+
+@pytest.fixture
+def feed():
+    feed = MarketFeed(SYMBOL, INTERVAL, capacity=64)
+    yield feed
+    feed.close()
+
+
+def simulator():
+    """1분 표본 50캔들 분량, 마지막 캔들은 진행 중"""
+    rng = np.random.default_rng(1)
+    open_time = START_MS + np.arange(50 * 15 - 5, dtype=np.int64) * MINUTE
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.001, len(open_time))))
+    clock = VirtualClock(int(open_time[-1]))
+    return SimulatedExchange({SYMBOL: {'open_time': open_time, 'close': close}}, clock=clock)
+
+
+def as_rows(klines):
+    return np.array([[float(v) for v in k[:7]] for k in klines])
+
+
+def test_read_matches_get_klines_ranges(feed):
+    exchange = simulator()
+    klines = exchange.get_klines(symbol=SYMBOL, interval=INTERVAL, limit=50)
+    now = exchange.clock.time_ms()
+    feed.publish(float(klines[-1][4]), now, as_rows(klines), live_close_ms=int(klines[-1][6]))
+    worker = WorkerClient('w', [feed], {}, queue.Queue(), queue.Queue(), exchange.clock)
+
+    last = START_MS + 49 * INTERVAL_MS
+    ranges = [
+        (None, None, 10), (None, None, 50),
+        (START_MS, None, 5), (START_MS + 1, None, 5), (START_MS + 3 * INTERVAL_MS, None, 100),
+        (None, START_MS + 20 * INTERVAL_MS, 7), (None, START_MS + 20 * INTERVAL_MS - 1, 7),
+        (None, last + 1, 3),
+        (START_MS + INTERVAL_MS, START_MS + 10 * INTERVAL_MS, 100),
+        (START_MS + INTERVAL_MS, START_MS + 10 * INTERVAL_MS, 4),
+        (START_MS + 10 * INTERVAL_MS, START_MS + 10 * INTERVAL_MS + 5, 10),
+        (START_MS + 10 * INTERVAL_MS + 1, START_MS + 11 * INTERVAL_MS - 1, 10),   # 빈 구간
+    ]
+    for start, end, limit in ranges:
+        expected = exchange.get_klines(symbol=SYMBOL, interval=INTERVAL, startTime=start,
+                                       endTime=end, limit=limit)
+        got = worker.get_klines(SYMBOL, INTERVAL, startTime=start, endTime=end, limit=limit)
+        assert [k[0] for k in got] == [k[0] for k in expected], (start, end, limit)
+        np.testing.assert_allclose(as_rows(got).reshape(-1, 7), as_rows(expected).reshape(-1, 7))
+    assert worker.remote_calls == 0
+
+
+def test_reader_waits_for_writer(feed):
+    feed.publish(100.0, 1, np.ones((3, 7)))
+    feed.header[0] += 1                       # 쓰는 중 (홀수)
+    feed.rows[:3] = 2.0
+
+    result = []
+    reader = threading.Thread(target=lambda: result.append(feed.read()))
+    reader.start()
+    time.sleep(0.05)
+    assert not result                         # 쓰기가 끝날 때까지 결과를 내지 않음
+
+    feed.quote[0] = 200.0
+    feed.header[0] += 1
+    reader.join(1)
+    rows, price, _ = result[0]
+    assert (rows == 2.0).all() and price == 200.0
+
+
+def test_concurrent_reads_are_consistent(feed):
+    """게시 중에 읽어도 한 번의 게시 결과만 (행 / 현재가가 섞이지 않음)"""
+    stop = threading.Event()
+
+    def writer():
+        k = 0
+        while not stop.is_set():
+            k += 1
+            feed.publish(float(k), k, np.full((64, 7), float(k)))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2_000):
+            rows, price, updated = feed.read(limit=64)
+            if updated:
+                assert (rows == price).all() and price == updated
+    finally:
+        stop.set()
+        thread.join()
+
+
+def responder(requests, replies, handle):
+    def serve():
+        while True:
+            message = requests.get()
+            if message is None:
+                return
+            handle(message, replies)
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_call_times_out():
+    worker = WorkerClient('w', [], {}, queue.Queue(), queue.Queue(), VirtualClock(), timeout=0.1)
+    started = time.monotonic()
+    with pytest.raises(AccountError) as info:
+        worker.get_account()
+    assert info.value.kind == 'Timeout'
+    assert time.monotonic() - started < 1.0
+
+
+def test_stale_reply_after_timeout_is_skipped():
+    """시간 초과된 요청의 늦은 응답을 다음 요청의 응답으로 쓰지 않음"""
+    requests, replies = queue.Queue(), queue.Queue()
+    worker = WorkerClient('w', [], {}, requests, replies, VirtualClock(), timeout=0.1)
+    with pytest.raises(AccountError):
+        worker.get_account()
+    _, timed_out_id, _, _ = requests.get_nowait()
+
+    def handle(message, replies):
+        _, call_id, method, params = message
+        replies.put((timed_out_id, {'stale': True}, None))    # 앞 요청의 늦은 응답
+        if method == 'order_market':
+            replies.put((call_id, None, ('BinanceAPIException', 'insufficient balance', -2010)))
+        else:
+            replies.put((call_id, {'method': method, **params}, None))
+
+    responder(requests, replies, handle)
+    try:
+        worker.timeout = 5.0
+        assert worker.get_account(recvWindow=5000) == {'method': 'get_account', 'recvWindow': 5000}
+        with pytest.raises(AccountError) as info:
+            worker.order_market(symbol=SYMBOL, side='BUY', quantity='1')
+        assert (info.value.kind, info.value.code) == ('BinanceAPIException', -2010)
+    finally:
+        requests.put(None)
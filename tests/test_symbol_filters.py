@@ -0,0 +1,108 @@
+"""거래소 필터 반올림 / 검증 (symbol_filters)"""
+
+import pytest
+
+from symbol_filters import FilterError, SymbolFilters, SymbolIndex
+
+BTCUSDT = {
+    'symbol': 'BTCUSDT', 'status': 'TRADING', 'baseAsset': 'BTC', 'quoteAsset': 'USDT',
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.01000000', 'maxPrice': '1000000.00000000',
+         'tickSize': '0.01000000'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.00001000', 'maxQty': '9000.00000000',
+         'stepSize': '0.00001000'},
+        {'filterType': 'MARKET_LOT_SIZE', 'minQty': '0.00000000', 'maxQty': '100.00000000',
+         'stepSize': '0.00000000'},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000', 'applyMinToMarket': True,
+         'maxNotional': '9000000.00000000', 'applyMaxToMarket': False, 'avgPriceMins': 5},
+    ],
+}
+
+
+@pytest.fixture
+def filters():
+    return SymbolFilters.from_symbol_info(BTCUSDT)
+
+
+def test_parses_filters(filters):
+    assert filters.tick_size == 0.01
+    assert filters.step_size == 0.00001
+    assert filters.price_decimals == 2
+    assert filters.qty_decimals == 5
+    assert filters.min_notional == 5.0
+
+
+def test_round_quantity_floors_to_step(filters):
+    assert filters.round_quantity(0.123456789) == 0.12345
+    # 부동소수점 표현 오차로 한 칸 아래로 내려가지 않음
+    assert filters.round_quantity(0.3) == 0.3
+    assert filters.round_quantity(20_000) == 9000
+
+
+def test_round_quantity_market_uses_market_lot(filters):
+    # MARKET_LOT_SIZE stepSize 0 → 내림 없음, 최대 수량은 시장가 기준
+    assert filters.round_quantity(250.0, market=True) == 100.0
+
+
+def test_round_price_to_tick(filters):
+    assert filters.round_price(60_000.126) == 60_000.13
+    assert filters.round_price(0.004999) == 0.0
+
+
+def test_format_has_no_exponent(filters):
+    assert filters.format_quantity(0.00001) == '0.00001'
+    assert filters.format_price(60_000.1) == '60000.10'
+
+
+def test_validate_accepts_valid_order(filters):
+    filters.validate(0.001, 60_000.0)
+    filters.validate(0.001, 60_000.0, market=True)
+
+
+@pytest.mark.parametrize('quantity, price, market, filter_type', [
+    (0.000001, 60_000.0, False, 'LOT_SIZE'),      # 최소 수량 미달
+    (10_000.0, None, False, 'LOT_SIZE'),          # 최대 수량 초과
+    (0.000015, None, False, 'LOT_SIZE'),          # stepSize 배수 아님
+    (0.001, 60_000.005, False, 'PRICE_FILTER'),   # tickSize 배수 아님
+    (0.001, 0.001, False, 'PRICE_FILTER'),        # 가격 범위 밖
+    (0.00005, 60_000.0, False, 'NOTIONAL'),       # 최소 주문 금액 미달 (3 USDT)
+    (0.00005, 60_000.0, True, 'NOTIONAL'),        # 시장가에도 적용 (applyMinToMarket)
+])
+def test_validate_rejects(filters, quantity, price, market, filter_type):
+    with pytest.raises(FilterError) as info:
+        filters.validate(quantity, price, market=market)
+    assert info.value.filter_type == filter_type
+    assert filters.reject_reason(quantity, price, market=market) is not None
+
+
+def test_validate_skips_price_filter_for_market(filters):
+    # 시장가는 가격 필터를 보지 않고 금액 확인에만 씀
+    filters.validate(0.001, 60_000.005, market=True)
+
+
+def test_validate_rejects_halted_symbol():
+    halted = SymbolFilters.from_symbol_info(dict(BTCUSDT, status='BREAK'))
+    with pytest.raises(FilterError) as info:
+        halted.validate(0.001, 60_000.0)
+    assert info.value.filter_type == 'STATUS'
+
+
+def test_index_disk_cache(tmp_path):
+    path = str(tmp_path / 'exchange_info.json')
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {'symbols': [BTCUSDT]}
+
+    SymbolIndex(loader, path=path).load()
+    index = SymbolIndex(loader, path=path).load()   # TTL 안: 디스크 캐시 사용
+
+    assert len(calls) == 1
+    assert 'BTCUSDT' in index
+    assert index['BTCUSDT'].tick_size == 0.01
+    with pytest.raises(KeyError):
+        index['ETHUSDT']
+
+    SymbolIndex(loader, path=path, ttl=0).load()    # 만료: 다시 받음
+    assert len(calls) == 2
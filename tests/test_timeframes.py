@@ -0,0 +1,70 @@
+"""상위 주기 캔들 집계(CandleAggregator) / MultiTimeframe"""
+
+import pytest
+
+from timeframes import CandleAggregator, MultiTimeframe
+
+MINUTE = 60_000
+
+
+def candle(minute, close, high=None, low=None, volume=1.0):
+    return (minute * MINUTE, close, high or close, low or close, close, volume)
+
+
+def test_closes_on_last_base_candle():
+    aggregator = CandleAggregator(MINUTE, 5 * MINUTE)
+    closed = []
+    for minute, close in enumerate([10, 12, 9, 11, 13]):
+        closed += aggregator.add(*candle(minute, close))
+
+    assert closed == [(0, 10, 13, 9, 13, 5.0)]
+    assert aggregator.current is None
+
+
+def test_gap_closes_previous_bucket():
+    """다음 구간 캔들이 먼저 오면 (3 ~ 5분 누락) 진행 중이던 구간을 그때 마감"""
+    aggregator = CandleAggregator(MINUTE, 5 * MINUTE)
+    assert aggregator.add(*candle(0, 10)) == []
+    assert aggregator.add(*candle(1, 14, high=15)) == []
+    assert aggregator.add(*candle(2, 12, low=8)) == []
+
+    closed = aggregator.add(*candle(6, 20))
+    assert closed == [(0, 10, 15, 8, 12, 3.0)]
+    assert aggregator.current == [5 * MINUTE, 20, 20, 20, 20, 1.0]
+
+
+def test_gap_over_whole_bucket_closes_both():
+    """구간 마지막 캔들 하나만 있어도 그 구간은 바로 마감"""
+    aggregator = CandleAggregator(MINUTE, 5 * MINUTE)
+    aggregator.add(*candle(0, 10))
+    closed = aggregator.add(*candle(9, 30))
+    assert [c[0] for c in closed] == [0, 5 * MINUTE]
+    assert closed[1][1:5] == (30, 30, 30, 30)
+
+
+def test_rejects_uneven_interval():
+    with pytest.raises(ValueError):
+        CandleAggregator(3 * MINUTE, 5 * MINUTE)
+
+
+def test_multi_timeframe_callbacks_and_snapshot():
+    frames = MultiTimeframe('1m', ('5m', '15m'))
+    closes = {'1m': [], '5m': [], '15m': []}
+    for tf in closes:
+        frames.subscribe(tf, lambda close, open_time, tf=tf: closes[tf].append(open_time))
+
+    for minute in range(30):
+        frames.update(*candle(minute, 100 + minute))
+
+    assert len(closes['1m']) == 30
+    assert closes['5m'] == [i * 5 * MINUTE for i in range(6)]
+    assert closes['15m'] == [0, 15 * MINUTE]
+
+    snapshot = frames.snapshot(130.0)
+    assert snapshot['1m']['ready']
+    assert not snapshot['15m']['ready']
+
+
+def test_rejects_shorter_timeframe_than_base():
+    with pytest.raises(ValueError):
+        MultiTimeframe('5m', ('1m',))
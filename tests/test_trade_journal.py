@@ -0,0 +1,109 @@
+"""거래 저널 (WAL 배치 커밋, 재시작 복구, 청크 단위 열 읽기)"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from clock import trading_day
+from trade_journal import TradeJournal
+
+
+def trade(i, reason='익절'):
+    return {'open_time': f'2024-01-01 00:{i % 60:02d}:00', 'close_time': f'2024-01-01 01:{i % 60:02d}:00',
+            'side': 'BUY', 'entry_price': 100.0, 'exit_price': 100.0 + i, 'quantity': 0.5,
+            'pnl_percent': float(i), 'pnl_amount': i / 2, 'reason': reason, 'daily_profit': i / 2}
+
+
+def committed_rows(path):
+    """다른 연결(다른 프로세스)에서 보이는 = 커밋된 거래 수"""
+    with sqlite3.connect(path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM trades').fetchone()[0]
+
+
+def test_trades_commit_in_batches(tmp_path):
+    path = str(tmp_path / 'journal.db')
+    journal = TradeJournal(path, batch_size=3, flush_interval=3600)
+    assert journal.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    journal.append_trade(trade(1))
+    journal.append_trade(trade(2))
+    assert committed_rows(path) == 0      # 아직 같은 트랜잭션
+    assert journal.count() == 2           # 같은 연결에서는 보임
+
+    journal.append_trade(trade(3))        # batch_size 도달 → 커밋
+    assert committed_rows(path) == 3
+    assert journal.pending == 0
+
+    journal.append_trade(trade(4))
+    journal.close()
+    assert committed_rows(path) == 4
+
+
+def test_save_state_commits_pending_trades(tmp_path):
+    """포지션 변경은 즉시 커밋 → 대기 중인 거래 행도 같은 트랜잭션으로 기록"""
+    path = str(tmp_path / 'journal.db')
+    journal = TradeJournal(path, batch_size=100, flush_interval=3600)
+    journal.append_trade(trade(1))
+    journal.save_state(position=None, daily_profit=0.5)
+    assert committed_rows(path) == 1
+    journal.close()
+
+
+def test_state_survives_crash(tmp_path):
+    """close() 없이 새로 열어도 (강제 종료) 커밋된 상태 / 거래는 복구, 커밋 전 거래는 없음"""
+    path = str(tmp_path / 'journal.db')
+    position = {'side': 'BUY', 'entry_price': 60_000.0, 'quantity': 0.001, 'time': '2024-01-01 00:00:00'}
+    journal = TradeJournal(path, batch_size=100, flush_interval=3600)
+    journal.append_trade(trade(1))
+    journal.save_state(position=position, daily_profit=12.5, last_trade_date='2024-01-01')
+    journal.append_trade(trade(2))        # 커밋 전에 종료
+
+    restarted = TradeJournal(path)
+    assert restarted.load_state() == {'position': position, 'daily_profit': 12.5,
+                                      'last_trade_date': '2024-01-01'}
+    assert [t['pnl_percent'] for t in restarted.recent] == [1.0]
+    assert restarted.session_trades() == []
+    restarted.close()
+    journal.conn.close()
+
+
+def test_bot_recovers_open_position_after_restart(make_bot):
+    bot = make_bot()
+    bot.position = {'side': 'BUY', 'entry_price': 60_000.0, 'quantity': 0.001,
+                    'time': '2024-01-01 00:00:00', 'order_id': 1}
+    bot.daily_profit = 7.5
+    bot.last_trade_date = trading_day(bot.clock)
+    bot.save_state()
+
+    restarted = make_bot()                # 같은 저널 경로, 이전 봇은 닫지 않음
+    assert restarted.position == bot.position
+    assert restarted.daily_profit == 7.5
+    assert restarted.last_trade_date == bot.last_trade_date
+    assert restarted.risk.positions['BTCUSDT'] == [0.001, 60_000.0]
+    assert restarted.risk.daily_pnl == 7.5
+
+
+def test_columns_read_in_chunks(tmp_path):
+    with TradeJournal(str(tmp_path / 'journal.db'), batch_size=1000) as journal:
+        for i in range(25):
+            journal.append_trade(trade(i, reason='손절' if i % 2 else '익절'))
+        journal.append_trade({**trade(25), 'pnl_amount': None})
+        journal.flush()
+
+        whole = journal.columns()
+        chunked = journal.columns(chunk_size=4)
+        for name in whole:
+            np.testing.assert_array_equal(chunked[name], whole[name])
+
+        assert chunked['pnl_percent'].dtype == np.float64
+        np.testing.assert_array_equal(chunked['pnl_percent'], np.arange(26.0))
+        assert np.isnan(chunked['pnl_amount'][-1])      # NULL → nan
+        assert list(chunked['reason'][:3]) == ['익절', '손절', '익절']
+
+        tail = journal.columns(('pnl_percent',), since_id=20, chunk_size=4)
+        np.testing.assert_array_equal(tail['pnl_percent'], np.arange(20.0, 26.0))
+        assert journal.columns(('pnl_percent',), since_id=26)['pnl_percent'].shape == (0,)
+
+        with pytest.raises(ValueError):
+            journal.columns(('nope',))
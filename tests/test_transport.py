@@ -0,0 +1,152 @@
+"""전송 계층 (서킷 브레이커 상태 전이, 멱등 주문 복구, 서버 시간 보정)"""
+
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import SYMBOL, binance_client
+from fault_proxy import FaultProxy
+from mock_exchange import MockExchange
+from transport import CircuitBreaker, CircuitOpenError, is_transient, not_sent, resilient_client
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('order', failure_threshold=3, reset_timeout=60.0)
+    for _ in range(2):
+        breaker.before()
+        breaker.failure()
+    breaker.before()
+    breaker.success()             # 성공하면 연속 실패 수 초기화
+    for _ in range(3):
+        assert breaker.state == 'closed'
+        breaker.before()
+        breaker.failure()
+
+    assert breaker.state == 'open'
+    assert breaker.opens == 1
+    with pytest.raises(CircuitOpenError) as info:
+        breaker.before()
+    assert info.value.group == 'order'
+    assert breaker.rejected == 1
+
+
+def test_breaker_half_open_probe():
+    breaker = CircuitBreaker('market', failure_threshold=1, reset_timeout=0.05)
+    breaker.before()
+    breaker.failure()
+    assert breaker.state == 'open'
+
+    time.sleep(0.06)
+    breaker.before()              # 쿨다운 뒤 요청 하나만 통과
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+    breaker.failure()             # 확인 요청 실패 → 다시 열림
+    assert breaker.state == 'open'
+    assert breaker.opens == 2
+
+    time.sleep(0.06)
+    breaker.before()
+    breaker.success()
+    assert breaker.state == 'closed'
+    breaker.before()
+
+
+def test_error_classification():
+    from binance.exceptions import BinanceAPIException
+    from requests.exceptions import ConnectTimeout, ReadTimeout
+
+    class Response:
+        def __init__(self, status, code):
+            self.status_code = status
+            self.text = f'{{"code": {code}, "msg": "test"}}'
+
+    assert is_transient(BinanceAPIException(Response(503, -1001), 503, Response(503, -1001).text))
+    assert is_transient(BinanceAPIException(Response(400, -1021), 400, Response(400, -1021).text))
+    assert not is_transient(BinanceAPIException(Response(400, -2010), 400, Response(400, -2010).text))
+    assert is_transient(ReadTimeout())
+    assert not not_sent(ReadTimeout())        # 거래소에 닿았을 수 있음
+    assert not_sent(ConnectTimeout())
+    assert not_sent(CircuitOpenError('order', 1.0))
+
+
+def test_lost_order_responses_are_recovered_without_duplicates(exchange):
+    """응답 유실 → 같은 clientOrderId로 조회해 접수된 주문을 돌려주고, 없을 때만 재전송"""
+    rates = {'lost_response': 0.25, 'reset': 0.05, 'unavailable': 0.05}
+    with FaultProxy(exchange.base_url, rates, paths=('/api/v3/order',), seed=1) as proxy:
+        client = resilient_client(binance_client(proxy.base_url), base_delay=0.01,
+                                  time_sync_interval=None, seed=0)
+        for _ in range(40):
+            order = client.order_market(symbol=SYMBOL, side='BUY', quantity='0.001')
+            assert order['status'] == 'FILLED'
+
+    assert proxy.injected['lost_response'] > 0
+    assert client.stats['recovered_orders'] > 0
+    assert client.stats['failed'] == 0
+    assert len(exchange.orders) == 40
+    assert max(Counter(o['clientOrderId'] for o in exchange.orders).values()) == 1
+
+
+def test_circuit_opens_during_outage_and_recovers(exchange):
+    with FaultProxy(exchange.base_url, {'unavailable': 1.0}) as proxy:
+        client = resilient_client(binance_client(proxy.base_url), scheduler_options={'ttls': {}},
+                                  base_delay=0.001, failure_threshold=3, reset_timeout=0.2,
+                                  time_sync_interval=None, seed=0)
+        with pytest.raises(Exception):
+            client.get_symbol_ticker(symbol=SYMBOL)
+        assert client.breakers['market'].state == 'open'
+
+        started = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            client.get_symbol_ticker(symbol=SYMBOL)
+        assert time.perf_counter() - started < 0.05   # 거래소에 보내지 않고 바로 실패
+
+        proxy.rates = {}
+        time.sleep(0.25)
+        assert client.get_symbol_ticker(symbol=SYMBOL)['symbol'] == SYMBOL
+        assert client.breakers['market'].state == 'closed'
+        # 다른 그룹은 영향 없음
+        assert client.breakers['order'].state == 'closed'
+
+
+def test_timestamp_error_resyncs_clock():
+    """서버 시계가 10초 앞섬 → -1021 → 서버 시간 다시 맞추고 바로 재전송"""
+    with MockExchange([SYMBOL], clock_offset_ms=10_000) as exchange:
+        client = resilient_client(binance_client(exchange.base_url), time_sync_interval=None)
+        order = client.order_market(symbol=SYMBOL, side='BUY', quantity='0.001')
+
+    assert order['status'] == 'FILLED'
+    assert exchange.rejections[-1021] == 1
+    assert client.stats['time_syncs'] == 1
+    assert client.time_offset == pytest.approx(10_000, abs=500)
+    assert len(exchange.orders) == 1
+
+
+def test_concurrent_callers_share_one_time_sync():
+    with MockExchange([SYMBOL], latency_ms=50) as exchange:
+        client = resilient_client(binance_client(exchange.base_url))
+        with ThreadPoolExecutor(3) as pool:
+            list(pool.map(lambda call: call(), [
+                client.get_exchange_info, client.get_account,
+                lambda: client.get_symbol_ticker(symbol=SYMBOL),
+            ]))
+
+    assert exchange.request_counts['/api/v3/time'] == 1
+    assert client.stats['time_syncs'] == 1
+
+
+def test_recv_window_sent_on_signed_requests(exchange):
+    raw = binance_client(exchange.base_url)
+    client = resilient_client(raw, recv_window=7000, time_sync_interval=None)
+    client.get_account()
+    client.order_market(symbol=SYMBOL, side='BUY', quantity='0.001')
+    assert exchange.signed_params['/api/v3/account']['recvWindow'] == '7000'
+    assert exchange.signed_params['/api/v3/order']['recvWindow'] == '7000'
+
+    # REQUEST_RECVWINDOW를 쓰지 않는 python-binance(1.0.19 등)에서도 파라미터로 전송
+    raw.REQUEST_RECVWINDOW = None
+    client.get_open_orders(symbol=SYMBOL)
+    assert exchange.signed_params['/api/v3/openOrders']['recvWindow'] == '7000'
+    assert 'recvWindow' not in exchange.signed_params.get('/api/v3/ticker/price', {})
@@ -0,0 +1,134 @@
+"""
+멀티 타임프레임 분석
+- 가장 짧은 주기 캔들만 받아 상위 주기(5m / 15m / 1h / 4h ...)를 메모리에서 증분 집계
+- 주기마다 증분 지표(IncrementalIndicators)를 따로 유지
+- 모든 주기의 지표를 현재가 기준 스냅샷 하나로 제공 → 주기를 늘려도 네트워크 요청 없음
+"""
+
+import math
+
+from indicators import IncrementalIndicators
+from market_stream import interval_to_ms
+
+TIMEFRAMES = ('1m', '5m', '15m', '1h', '4h')
+
+
+class CandleAggregator:
+    """짧은 주기 마감 캔들 → interval 캔들 (OHLCV 증분 집계)
+
+    캔들은 (open_time, open, high, low, close, volume) 튜플입니다. 구간의
+    마지막 짧은 캔들이 들어오면 바로 마감하고, 누락으로 다음 구간 캔들이
+    먼저 들어오면 그때 진행 중이던 구간을 마감합니다.
+    """
+
+    __slots__ = ('base_ms', 'interval_ms', 'current')
+
+    def __init__(self, base_ms, interval_ms):
+        if interval_ms % base_ms:
+            raise ValueError(f"{interval_ms}ms 주기는 {base_ms}ms 캔들로 집계할 수 없습니다")
+        self.base_ms = base_ms
+        self.interval_ms = interval_ms
+        self.current = None  # 진행 중인 구간 [open_time, open, high, low, close, volume]
+
+    def add(self, open_time, open_, high, low, close, volume):
+        """짧은 주기 캔들 하나 반영 → 이번에 마감된 캔들 목록"""
+        bucket = open_time - open_time % self.interval_ms
+        closed = []
+
+        current = self.current
+        if current is not None and current[0] != bucket:
+            closed.append(tuple(current))
+            current = None
+
+        if current is None:
+            current = [bucket, open_, high, low, close, volume]
+        else:
+            if high > current[2]:
+                current[2] = high
+            if low < current[3]:
+                current[3] = low
+            current[4] = close
+            current[5] += volume
+
+        if open_time + self.base_ms >= bucket + self.interval_ms:
+            closed.append(tuple(current))
+            current = None
+
+        self.current = current
+        return closed
+
+
+class MultiTimeframe:
+    """주기별 집계기 + 증분 지표 묶음
+
+    update()에는 가장 짧은 주기(base_interval)의 마감 캔들만 넣습니다.
+    base_interval 자체도 하나의 주기로 취급해 같은 경로로 처리합니다.
+    """
+
+    def __init__(self, base_interval='1m', timeframes=TIMEFRAMES, **indicator_options):
+        self.base_interval = base_interval
+        self.base_ms = interval_to_ms(base_interval)
+        self.timeframes = tuple(sorted(set(timeframes) | {base_interval}, key=interval_to_ms))
+        if interval_to_ms(self.timeframes[0]) < self.base_ms:
+            raise ValueError(f"기준 주기({base_interval})보다 짧은 주기는 만들 수 없습니다")
+
+        self.aggregators = {
+            tf: CandleAggregator(self.base_ms, interval_to_ms(tf)) for tf in self.timeframes
+        }
+        self.indicators = {tf: IncrementalIndicators(**indicator_options) for tf in self.timeframes}
+        self.last_open_time = None  # 마지막으로 반영한 짧은 주기 캔들
+        self.listeners = {tf: [] for tf in self.timeframes}
+
+    def history_needed(self, candles=50):
+        """가장 긴 주기에서 지표용 캔들 candles개를 만들기 위한 짧은 주기 캔들 수"""
+        longest = interval_to_ms(self.timeframes[-1])
+        return (candles + 1) * longest // self.base_ms
+
+    def subscribe(self, timeframe, callback):
+        """timeframe 캔들이 마감될 때마다 callback(close, open_time) 호출"""
+        self.listeners[timeframe].append(callback)
+
+    def update(self, open_time, open_, high, low, close, volume=0.0):
+        """짧은 주기 마감 캔들 하나 반영 (주기 수만큼 O(1))"""
+        for tf, aggregator in self.aggregators.items():
+            for candle in aggregator.add(open_time, open_, high, low, close, volume):
+                self.indicators[tf].update(candle[4], candle[0])
+                for callback in self.listeners[tf]:
+                    callback(candle[4], candle[0])
+        self.last_open_time = open_time
+
+    def sync_closed(self, columns):
+        """저장소 캔들 열(dict)에서 아직 반영하지 않은 캔들만 update()"""
+        open_time = columns['open_time']
+        start = 0
+        if self.last_open_time is not None:
+            # 정렬된 열이므로 마지막 반영 캔들 다음 위치부터
+            start = int(open_time.searchsorted(self.last_open_time, side='right'))
+
+        rows = zip(
+            open_time[start:].tolist(), columns['open'][start:].tolist(),
+            columns['high'][start:].tolist(), columns['low'][start:].tolist(),
+            columns['close'][start:].tolist(), columns['volume'][start:].tolist(),
+        )
+        count = 0
+        for row in rows:
+            self.update(*row)
+            count += 1
+        return count
+
+    def snapshot(self, price):
+        """현재가 기준 전 주기 지표 {주기: {rsi, macd, ..., ready}}
+
+        아직 이력이 부족한 주기는 ready=False이고 값은 nan일 수 있습니다.
+        """
+        snapshot = {}
+        for tf, indicators in self.indicators.items():
+            if indicators.last_close is None:
+                snapshot[tf] = {'ready': False, 'rsi': math.nan, 'macd': math.nan,
+                                'macd_signal': math.nan, 'bb_upper': math.nan,
+                                'bb_middle': math.nan, 'bb_lower': math.nan}
+                continue
+            values = indicators.peek(price)
+            values['ready'] = indicators.ready
+            snapshot[tf] = values
+        return snapshot
@@ -0,0 +1,179 @@
+"""
+거래 / 포지션 저널 (SQLite WAL)
+- 청산된 거래는 append-only 테이블에 한 행씩 기록
+- 열린 포지션 / 일일 누적 수익은 상태 테이블에 기록 → 재시작 시 거래소 조회 없이 복구
+- 커밋은 묶어서 처리 (batch_size개 또는 flush_interval초마다), 포지션 변경은 즉시 커밋
+- synchronous=NORMAL: WAL 체크포인트 때만 fsync (프로세스 강제 종료에도 커밋된 내용 보존)
+- 메모리에는 최근 retention개 거래만 유지
+- 분석용으로 거래 열을 NumPy 배열로 청크 단위 일괄 읽기 (analytics.summarize_trades)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from collections import deque
+from operator import itemgetter
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 거래 기록 dict 키 = 테이블 열 (순서 고정)
+TRADE_FIELDS = (
+    'open_time', 'close_time', 'side', 'entry_price', 'exit_price', 'quantity',
+    'pnl_percent', 'pnl_amount', 'reason', 'daily_profit',
+)
+NUMERIC_FIELDS = frozenset(('entry_price', 'exit_price', 'quantity', 'pnl_percent', 'pnl_amount',
+                            'daily_profit'))
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    {', '.join(TRADE_FIELDS)}
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class TradeJournal:
+    """거래 저널
+
+    append_trade()는 현재 트랜잭션에 행을 추가하고 batch_size개가 쌓이거나
+    flush_interval초가 지나면 커밋합니다. save_state()는 같은 트랜잭션에
+    상태를 넣고 바로 커밋하므로, 거래 행과 포지션 / 일일 수익 상태가 항상
+    함께 기록됩니다.
+    """
+
+    def __init__(self, path, retention=500, batch_size=64, flush_interval=1.0,
+                 synchronous='NORMAL'):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(f'PRAGMA synchronous={synchronous}')
+        self.conn.executescript(_SCHEMA)
+
+        self.pending = 0
+        self._in_transaction = False
+        self._last_commit = time.monotonic()
+
+        # 최근 거래 (오래된 것부터)
+        self.recent = deque(self.tail(retention), maxlen=retention)
+        row = self.conn.execute('SELECT MAX(id) FROM trades').fetchone()
+        self.session_start_id = row[0] or 0
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def _begin(self):
+        if not self._in_transaction:
+            self.conn.execute('BEGIN')
+            self._in_transaction = True
+
+    def append_trade(self, record):
+        """거래 1건 추가 (배치 커밋)"""
+        self._begin()
+        self.conn.execute(
+            f"INSERT INTO trades ({', '.join(TRADE_FIELDS)}) VALUES ({', '.join('?' * len(TRADE_FIELDS))})",
+            tuple(record.get(f) for f in TRADE_FIELDS)
+        )
+        self.recent.append(record)
+        self.pending += 1
+        if (self.pending >= self.batch_size
+                or time.monotonic() - self._last_commit >= self.flush_interval):
+            self.flush()
+
+    def save_state(self, **state):
+        """포지션 / 일일 수익 등 상태 저장 후 즉시 커밋 (값은 JSON)"""
+        self._begin()
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)',
+            [(key, json.dumps(value, ensure_ascii=False)) for key, value in state.items()]
+        )
+        self.flush()
+
+    def flush(self):
+        """대기 중인 트랜잭션 커밋"""
+        if self._in_transaction:
+            self.conn.execute('COMMIT')
+            self._in_transaction = False
+        self.pending = 0
+        self._last_commit = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 읽기 / 복구
+    # ------------------------------------------------------------------
+    def load_state(self):
+        """저장된 상태 dict (재시작 시 복구용)"""
+        rows = self.conn.execute('SELECT key, value FROM state').fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def tail(self, n):
+        """최근 n개 거래 (오래된 것부터)"""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(TRADE_FIELDS)} FROM trades ORDER BY id DESC LIMIT ?", (n,)
+        ).fetchall()
+        return [dict(zip(TRADE_FIELDS, row)) for row in reversed(rows)]
+
+    def trades(self, since_id=0):
+        """id > since_id 인 거래를 순서대로 (dict 제너레이터)"""
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(TRADE_FIELDS)} FROM trades WHERE id > ? ORDER BY id", (since_id,)
+        )
+        for row in cursor:
+            yield dict(zip(TRADE_FIELDS, row))
+
+    def columns(self, names=('close_time', 'pnl_percent', 'pnl_amount', 'reason'), since_id=0,
+                chunk_size=100_000):
+        """id > since_id 인 거래의 열 dict (id 순서, 숫자 열은 float64 / 나머지는 문자열 배열)
+
+        chunk_size행씩 받아 바로 배열로 바꾸므로 수백만 건도 행 객체를
+        한꺼번에 들고 있지 않습니다.
+        """
+        unknown = set(names) - set(TRADE_FIELDS)
+        if unknown:
+            raise ValueError(f"알 수 없는 열: {', '.join(sorted(unknown))}")
+        dtypes = {name: np.float64 if name in NUMERIC_FIELDS else str for name in names}
+
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(names)} FROM trades WHERE id > ? ORDER BY id", (since_id,)
+        )
+        chunks = {name: [] for name in names}
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for i, name in enumerate(names):
+                # 숫자 열의 NULL(None)은 nan
+                chunks[name].append(np.array(list(map(itemgetter(i), rows)), dtype=dtypes[name]))
+        return {
+            name: np.concatenate(parts) if parts else np.empty(0, dtype=dtypes[name])
+            for name, parts in chunks.items()
+        }
+
+    def session_trades(self):
+        """이 저널을 연 뒤 기록된 거래"""
+        return list(self.trades(self.session_start_id))
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM trades').fetchone()[0]
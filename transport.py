@@ -0,0 +1,401 @@
+"""
+복원력 있는 REST 전송 계층
+- keep-alive 커넥션 풀(requests HTTPAdapter + TCP keepalive), 연결 / 읽기 분리 타임아웃
+- 일시적 오류(연결 끊김 / 타임아웃 / 5xx / 거래소 내부 오류)만 지터를 섞은 지수 백오프로 재시도
+- 시장가 / 일반 주문은 newClientOrderId로 멱등 처리: 전송 결과가 애매하면 같은 ID로 먼저
+  조회하고, 거래소에 없을 때만 같은 ID로 다시 전송 (중복 체결 방지)
+- 엔드포인트 그룹(주문 / 계정 / 시장 데이터)별 서킷 브레이커: 연속 실패가 쌓이면 쿨다운 동안
+  바로 실패시키고, 쿨다운 뒤 요청 하나로 회복 여부 확인
+- 서버 시간과의 차이를 Client.timestamp_offset으로 보정 (주기적으로, -1021 응답이면 즉시),
+  서명 요청마다 recvWindow 전송
+
+ResilientClient(client)는 ScheduledClient처럼 python-binance Client와 같은 메서드로
+감싸서 봇 코드를 바꾸지 않고 끼워 넣을 수 있습니다. 429 / 418은 스케줄러가 처리하므로
+여기서는 재시도하지 않습니다.
+"""
+
+import time
+import uuid
+import random
+import socket
+import logging
+import itertools
+import threading
+
+from request_scheduler import ScheduledClient, METHOD_WEIGHTS, ORDER_METHODS
+
+logger = logging.getLogger(__name__)
+
+# 같은 newClientOrderId로 조회 / 재전송해도 한 번만 체결되는 주문
+IDEMPOTENT_ORDER_METHODS = frozenset({
+    'order_market', 'order_market_buy', 'order_market_sell', 'create_order',
+})
+
+# 계정 그룹 (나머지 조회는 시장 데이터 그룹)
+ACCOUNT_METHODS = frozenset({'get_account', 'get_open_orders', 'get_order'})
+
+# 재시도할 거래소 오류 코드
+# -1001 내부 연결 끊김, -1007 백엔드 응답 시간 초과(전송 결과 모름), -1021 타임스탬프가 recvWindow 밖
+TIMESTAMP_ERROR = -1021
+TRANSIENT_CODES = frozenset({-1001, -1007, TIMESTAMP_ERROR})
+UNKNOWN_ORDER = -2013
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 보내지 않은 요청"""
+
+    def __init__(self, group, retry_in):
+        super().__init__(group, retry_in)
+        self.group = group
+        self.retry_in = retry_in
+
+    def __str__(self):
+        return f"{self.group} 요청 차단 중 (연속 실패로 서킷 열림, {self.retry_in:.1f}초 후 재확인)"
+
+
+def _status_code(error):
+    return getattr(error, 'status_code', None)
+
+
+def _error_code(error):
+    return getattr(error, 'code', None)
+
+
+def is_transient(error):
+    """다시 보내 볼 만한 오류인지 (네트워크 / 5xx / 거래소 내부 오류 / 타임스탬프)
+
+    4xx 업무 오류(잔고 부족, 필터 위반 등)는 다시 보내도 같으므로 False입니다.
+    """
+    if _status_code(error) is not None:
+        return _status_code(error) >= 500 or _error_code(error) in TRANSIENT_CODES
+    # requests 예외(연결 끊김 / 타임아웃)는 OSError(IOError) 하위
+    if isinstance(error, OSError):
+        return True
+    # 2xx인데 본문이 잘렸거나 JSON이 아님
+    from binance.exceptions import BinanceRequestException
+    return isinstance(error, BinanceRequestException)
+
+
+def not_sent(error):
+    """요청이 거래소에 닿지 않은 게 확실한 오류 (연결 시간 초과 / 서킷 차단)"""
+    if isinstance(error, CircuitOpenError):
+        return True
+    from requests.exceptions import ConnectTimeout
+    return isinstance(error, ConnectTimeout)
+
+
+def configure_session(client, pool_size=10, connect_timeout=3.05, read_timeout=10.0, keepalive_idle=60):
+    """python-binance Client의 requests 세션 조정
+
+    - 호스트별 keep-alive 풀 pool_size개 (동시 요청이 몰려도 연결을 버리고 새로 맺지 않게)
+    - urllib3 자체 재시도 끔 (재시도 여부는 ResilientClient가 멱등성을 보고 결정)
+    - 소켓 TCP keepalive: 유휴 keepalive_idle초 뒤 탐침, NAT / 로드밸런서가 조용히 끊은 연결을 빨리 발견
+    - (연결, 읽기) 타임아웃 분리: 연결은 빨리 포기하고 읽기는 거래소 처리 시간만큼 기다림
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+
+    options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        options += [
+            (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, keepalive_idle),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+            (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3),
+        ]
+
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+    adapter.init_poolmanager(4, pool_size, socket_options=options)
+    client.session.mount('https://', adapter)
+    client.session.mount('http://', adapter)
+    client.session.headers['Connection'] = 'keep-alive'
+    client.REQUEST_TIMEOUT = (connect_timeout, read_timeout)
+    return client
+
+
+class CircuitBreaker:
+    """엔드포인트 그룹 하나의 서킷 브레이커
+
+    닫힘: 그대로 통과, 연속 실패 failure_threshold번이면 열림
+    열림: reset_timeout초 동안 보내지 않고 CircuitOpenError
+    반열림: 요청 하나만 통과시켜 성공하면 닫힘, 실패하면 다시 열림
+
+    실패는 일시적 오류만 셉니다 (업무 오류 응답은 거래소가 살아 있다는 뜻이라 성공).
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before(self):
+        """요청 전 확인 (보내면 안 되면 CircuitOpenError)"""
+        with self._lock:
+            if self.state == 'closed':
+                return
+            if self.state == 'open':
+                retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, retry_in)
+                self.state = 'half_open'
+                self._probing = False
+            if self._probing:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, 0.0)
+            self._probing = True
+
+    def success(self):
+        with self._lock:
+            if self.state != 'closed':
+                logger.info(f"✅ {self.name} 서킷 닫힘 (요청 정상화)")
+            self.state = 'closed'
+            self.failures = 0
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == 'half_open' or (
+                    self.state == 'closed' and self.failures >= self.failure_threshold):
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                self.opens += 1
+                logger.warning(f"🔌 {self.name} 서킷 열림: 연속 실패 {self.failures}번, "
+                               f"{self.reset_timeout:.0f}초 동안 요청 차단")
+
+
+class ResilientClient:
+    """python-binance Client(또는 ScheduledClient)를 감싼 재시도 / 서킷 브레이커 프록시
+
+    METHOD_WEIGHTS에 있는 메서드만 감싸고 나머지 속성은 그대로 넘깁니다.
+    재시도는 최대 max_retries번, 대기는 base_delay·2^(n-1)(최대 max_delay)의
+    절반 + 균등 지터이고, 한 호출이 deadline초를 넘기면 마지막 오류를 그대로
+    던집니다. server_time(기본: client.get_server_time)으로 time_sync_interval초마다
+    시계 차이를 맞춥니다 (None이면 맞추지 않음).
+    """
+
+    _ATTRS = frozenset({
+        'client', 'max_retries', 'base_delay', 'max_delay', 'deadline', 'server_time',
+        'time_sync_interval', 'time_offset', 'recv_window', 'breakers', 'stats',
+        '_rng', '_prefix', '_ids', '_next_sync', '_sync_lock',
+    })
+
+    def __init__(self, client, max_retries=3, base_delay=0.2, max_delay=2.0, deadline=15.0,
+                 failure_threshold=5, reset_timeout=30.0, recv_window=5000,
+                 time_sync_interval=600.0, server_time=None, seed=None):
+        self.client = client
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.server_time = server_time or client.get_server_time
+        self.time_sync_interval = time_sync_interval
+        self.time_offset = 0
+        self.breakers = {
+            group: CircuitBreaker(group, failure_threshold, reset_timeout)
+            for group in ('order', 'account', 'market')
+        }
+        self.stats = {'calls': 0, 'retries': 0, 'recovered_orders': 0, 'failed': 0,
+                      'circuit_rejected': 0, 'time_syncs': 0}
+        self._rng = random.Random(seed)
+        # 프록시마다 다른 접두사 (재시작해도 이전 주문 ID와 겹치지 않음)
+        self._prefix = f"rc{uuid.uuid4().hex[:10]}-"
+        self._ids = itertools.count(1)
+        self._next_sync = 0.0 if time_sync_interval is not None else float('inf')
+        self._sync_lock = threading.Lock()
+        # 서명 요청 파라미터로 직접 보내고(_signed), REQUEST_RECVWINDOW가 있는
+        # python-binance는 그 값으로 덮어쓰므로 같은 값으로 맞춤
+        self.recv_window = recv_window
+        if recv_window is not None:
+            client.REQUEST_RECVWINDOW = recv_window
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name not in METHOD_WEIGHTS:
+            return attr
+
+        def resilient(**params):
+            return self.call(name, attr, params)
+
+        resilient.__name__ = name
+        return resilient
+
+    def __setattr__(self, name, value):
+        if name in self._ATTRS:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.client, name, value)
+
+    def new_client_order_id(self):
+        return f"{self._prefix}{next(self._ids)}"
+
+    # ------------------------------------------------------------------
+    # 호출
+    # ------------------------------------------------------------------
+    def call(self, name, func, params):
+        """재시도 / 서킷 브레이커를 거쳐 func(**params) 실행"""
+        idempotent = name in IDEMPOTENT_ORDER_METHODS
+        if name in ORDER_METHODS or name in ACCOUNT_METHODS:
+            params = self._signed(params)
+        if idempotent:
+            params = dict(params)
+            params.setdefault('newClientOrderId', self.new_client_order_id())
+        breaker = self.breakers[
+            'order' if name in ORDER_METHODS else 'account' if name in ACCOUNT_METHODS else 'market'
+        ]
+        deadline = time.monotonic() + self.deadline
+        self.stats['calls'] += 1
+
+        attempt = 0
+        unknown = False   # 이전 주문 전송 결과를 모름 (거래소에 들어갔을 수 있음)
+        while True:
+            self._maybe_sync_time()
+            try:
+                breaker.before()
+                if unknown:
+                    order = self._find_order(params)
+                    if order is not None:
+                        breaker.success()
+                        self.stats['recovered_orders'] += 1
+                        logger.info(f"🔎 {name} 응답 유실, 거래소에 접수된 주문 확인: "
+                                    f"{params['newClientOrderId']}")
+                        return order
+                    unknown = False
+                result = func(**params)
+            except CircuitOpenError:
+                self.stats['circuit_rejected'] += 1
+                self._give_up(name, params, unknown)
+                raise
+            except Exception as e:
+                code = _error_code(e)
+                if not is_transient(e):
+                    breaker.success()   # 거래소가 응답함 (업무 오류)
+                    raise
+                if code == TIMESTAMP_ERROR:
+                    # 서명 시각이 recvWindow 밖: 거래소가 거절했으므로 주문도 들어가지 않음
+                    breaker.success()
+                    self._sync_time_safely()
+                else:
+                    breaker.failure()
+                    if idempotent and not not_sent(e):
+                        unknown = True
+
+                attempt += 1
+                delay = 0.0 if code == TIMESTAMP_ERROR else self._backoff(attempt)
+                if (attempt > self.max_retries or time.monotonic() + delay > deadline
+                        or not self._retryable(name, e)):
+                    self._give_up(name, params, unknown)
+                    raise
+                self.stats['retries'] += 1
+                logger.warning(f"🔁 {name} 일시 오류, {delay:.2f}초 후 재시도 "
+                               f"({attempt}/{self.max_retries}): {e}")
+                time.sleep(delay)
+                continue
+
+            breaker.success()
+            return result
+
+    def _give_up(self, name, params, unknown):
+        self.stats['failed'] += 1
+        if unknown:
+            logger.error(f"❗ {name} 전송 결과 확인 불가: 거래소에 접수됐을 수 있음 "
+                         f"(clientOrderId {params['newClientOrderId']})")
+
+    def _retryable(self, name, error):
+        # 멱등 주문은 조회 후 재전송, 취소는 다시 보내도 결과가 같음
+        # OCO 등 나머지 주문은 거래소에 닿지 않은 게 확실할 때만
+        if name in ORDER_METHODS and name not in IDEMPOTENT_ORDER_METHODS and name != 'cancel_order':
+            return not_sent(error) or _error_code(error) == TIMESTAMP_ERROR
+        return True
+
+    def _backoff(self, attempt):
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return cap / 2 + self._rng.uniform(0, cap / 2)
+
+    def _signed(self, params):
+        """서명 요청 파라미터에 recvWindow 추가 (호출자가 준 값이 우선)"""
+        if self.recv_window is None or 'recvWindow' in params:
+            return params
+        return dict(params, recvWindow=self.recv_window)
+
+    def _find_order(self, params):
+        """같은 clientOrderId 주문 조회 → 주문 dict (거래소에 없으면 None)"""
+        try:
+            return self.client.get_order(**self._signed({
+                'symbol': params['symbol'], 'origClientOrderId': params['newClientOrderId'],
+            }))
+        except Exception as e:
+            if _error_code(e) == UNKNOWN_ORDER:
+                return None
+            raise
+
+    # ------------------------------------------------------------------
+    # 서버 시간 보정
+    # ------------------------------------------------------------------
+    def sync_time(self):
+        """서버 시간 - 로컬 시간 → Client.timestamp_offset (ms, 왕복 지연의 절반을 보정)"""
+        started = time.time()
+        server_ms = self.server_time()['serverTime']
+        finished = time.time()
+        offset = int(server_ms - (started + finished) / 2 * 1000)
+        self.client.timestamp_offset = offset
+        self.time_offset = offset
+        self.stats['time_syncs'] += 1
+        if self.time_sync_interval is not None:
+            self._next_sync = time.monotonic() + self.time_sync_interval
+        if abs(offset) >= 1000:
+            logger.warning(f"🕐 서버 시간 차이 {offset:+,}ms 보정 (왕복 {(finished - started) * 1000:.0f}ms)")
+        return offset
+
+    def _sync_time_safely(self, only_if_due=False):
+        with self._sync_lock:
+            # 기다리는 동안 다른 스레드가 이미 보정했으면 다시 보내지 않음 (동시 시작 조회)
+            if only_if_due and time.monotonic() < self._next_sync:
+                return
+            try:
+                self.sync_time()
+            except Exception as e:
+                # 다음 호출 때 다시 (time_sync_interval보다 짧게)
+                self._next_sync = time.monotonic() + min(30.0, self.time_sync_interval or 30.0)
+                logger.warning(f"⚠️ 서버 시간 조회 실패: {e}")
+
+    def _maybe_sync_time(self):
+        if time.monotonic() >= self._next_sync:
+            self._sync_time_safely(only_if_due=True)
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+    def snapshot(self):
+        """재시도 / 복구 / 서킷 상태 요약 (metrics 소스용)"""
+        return dict(
+            self.stats,
+            time_offset_ms=self.time_offset,
+            circuits={
+                name: {'state': b.state, 'opens': b.opens, 'rejected': b.rejected}
+                for name, b in self.breakers.items()
+            },
+        )
+
+
+def resilient_client(client, scheduler_options=None, session_options=None, **options):
+    """python-binance Client → 세션 조정 + 요청 가중치 스케줄러 + 재시도 / 서킷 브레이커
+
+    재시도가 스케줄러 큐를 다시 거치도록 ResilientClient가 바깥에 있습니다 (대기는
+    호출한 스레드에서, 재전송도 가중치에 포함). 시간 보정은 스케줄러 캐시를 거치지
+    않도록 원래 클라이언트로 조회합니다.
+    """
+    configure_session(client, **(session_options or {}))
+    return ResilientClient(
+        ScheduledClient(client, **(scheduler_options or {})),
+        server_time=client.get_server_time,
+        **options
+    )